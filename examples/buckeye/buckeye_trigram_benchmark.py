@@ -0,0 +1,59 @@
+import sys
+import os
+import time
+base = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.insert(0, base)
+
+from polyglotdb import CorpusContext
+
+corpus_name = 'buckeye'
+
+stops = ['p', 't', 'k', 'b', 'd', 'g']
+
+
+def call_back(*args):
+    args = [x for x in args if isinstance(x, str)]
+    if args:
+        print(' '.join(args))
+
+
+def trigram_queries(g):
+    """Phone and word trigram context queries, timing each one"""
+    times = {}
+
+    beg = time.time()
+    q = g.query_graph(g.phone).filter(g.phone.label == 'aa')
+    q = q.filter(g.phone.previous.label.in_(stops), g.phone.following.label.in_(stops))
+    q = q.columns(g.phone.previous.label.column_name('previous'), g.phone.following.label.column_name('following'),
+                  g.phone.duration.column_name('duration'))
+    results = q.all()
+    times['phone trigrams ({} rows)'.format(len(results))] = time.time() - beg
+
+    beg = time.time()
+    q = g.query_graph(g.word).filter(g.word.label == 'know')
+    q = q.columns(g.word.previous.previous.label.column_name('previous_previous'),
+                  g.word.previous.label.column_name('previous'),
+                  g.word.following.label.column_name('following'),
+                  g.word.following.following.label.column_name('following_following'))
+    results = q.all()
+    times['word five-grams ({} rows)'.format(len(results))] = time.time() - beg
+
+    beg = time.time()
+    q = g.query_graph(g.phone).filter(g.phone.label.in_(stops))
+    q = q.columns(g.phone.word.phone.position.column_name('position'))
+    results = q.all()
+    times['phone positions ({} rows)'.format(len(results))] = time.time() - beg
+    return times
+
+
+with CorpusContext(corpus_name) as g:
+    g.reset_ordinals()
+    relationship_times = trigram_queries(g)
+
+    beg = time.time()
+    g.encode_ordinals(call_back=call_back)
+    print('Encoding ordinals took: {}'.format(time.time() - beg))
+    ordinal_times = trigram_queries(g)
+
+    for k, v in relationship_times.items():
+        print('{}: {:.3f} s with precedes relationships, {:.3f} s with ordinals'.format(k, v, ordinal_times[k]))
@@ -0,0 +1,44 @@
+import sys
+import os
+import time
+base = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, base)
+
+from polyglotdb import CorpusContext, CorpusConfig
+from polyglotdb.io import inspect_textgrid
+
+# Requires a running Neo4j server
+graph_db = {'graph_http_port': 7474, 'graph_bolt_port': 7687, 'acoustic_http_port': 8086, 'host': 'localhost'}
+
+corpus_path = os.path.join(base, 'tests', 'data', 'textgrids', 'acoustic_corpus.TextGrid')
+
+# Lexicon rows for the words of the corpus, padded with words that are not in it, as a lexicon for a large corpus
+# would be
+sizes = [100, 1000, 10000, 100000]
+
+paths = [('LOAD CSV', 0), ('UNWIND', float('inf'))]
+
+
+def lexicon_data(c, size):
+    words = sorted(set(c.words))
+    data = {w: {'frequency': i} for i, w in enumerate(words[:size])}
+    for i in range(len(data), size):
+        data['word_{}'.format(i)] = {'frequency': i}
+    return data
+
+
+if __name__ == '__main__':
+    config = CorpusConfig('enrichment_benchmark', **graph_db)
+    with CorpusContext(config) as c:
+        c.reset()
+        c.load(inspect_textgrid(corpus_path), corpus_path)
+        for size in sizes:
+            data = lexicon_data(c, size)
+            for name, threshold in paths:
+                c.config.enrichment_unwind_threshold = threshold
+                # Properties already in the hierarchy are skipped, so each run sets a new one
+                property_name = 'frequency_{}_{}'.format(name.split()[0].lower(), size)
+                run_data = {k: {property_name: v['frequency']} for k, v in data.items()}
+                beg = time.time()
+                c.enrich_lexicon(run_data, {property_name: int})
+                print('{} rows, {}: {:.3f} s'.format(size, name, time.time() - beg))
@@ -0,0 +1,44 @@
+import sys
+import os
+import time
+import resource
+import contextlib
+from multiprocessing import Process, Queue
+base = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, base)
+
+from polyglotdb.io import inspect_buckeye, inspect_timit
+
+data_dir = os.path.join(base, 'tests', 'data')
+
+# The fixtures are short, so each one is parsed repeatedly and all parses are kept, as they are for a large
+# discourse before it is written to CSVs
+num_copies = 1000
+
+fixtures = [('buckeye', inspect_buckeye, os.path.join(data_dir, 'buckeye', 'test.words')),
+            ('timit', inspect_timit, os.path.join(data_dir, 'timit', 'test.WRD'))]
+
+
+def parse_fixture(inspect, path, queue):
+    """Parse a fixture in a fresh process and report the increase in its peak RSS"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        parser = inspect(path)
+        parses = [parser.parse_discourse(path)]
+        start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        beg = time.time()
+        for _ in range(num_copies - 1):
+            parses.append(parser.parse_discourse(path))
+        duration = time.time() - beg
+    num_annotations = sum(len(list(d[x])) for d in parses for x in d.annotation_types)
+    queue.put((num_annotations, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - start_rss, duration))
+
+
+if __name__ == '__main__':
+    for name, inspect, path in fixtures:
+        queue = Queue()
+        p = Process(target=parse_fixture, args=(inspect, path, queue))
+        p.start()
+        num_annotations, rss, duration = queue.get()
+        p.join()
+        print('{}: {} annotations, peak RSS increase {:.1f} MB, {:.2f} s'.format(name, num_annotations, rss / 1024,
+                                                                                 duration))
@@ -0,0 +1,65 @@
+import sys
+import os
+import time
+base = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, base)
+
+from polyglotdb import CorpusContext, CorpusConfig
+from polyglotdb.indexes import constraint_key
+from polyglotdb.io.importer.from_csv import import_precedence_csvs
+
+# Requires a running Neo4j server
+graph_db = {'graph_http_port': 7474, 'graph_bolt_port': 7687, 'acoustic_http_port': 8086, 'host': 'localhost'}
+
+sizes = [10000, 100000, 1000000]
+batch_sizes = [1000, 10000, 50000]
+
+
+def create_phones(c, size):
+    """Create a chain of phones for a single speaker, with its precedence file"""
+    c.reset_graph()
+    c.execute_cypher('''CREATE (:Speaker:{corpus} {{name: 'speaker'}})'''.format(corpus=c.cypher_safe_name))
+    c.schema_manager.ensure([constraint_key('phone')])
+    statement = '''UNWIND range({{begin}}, {{end}}) AS i
+    CREATE (:phone:{corpus}:speech {{id: toString(i)}})'''.format(corpus=c.cypher_safe_name)
+    for begin in range(0, size, 100000):
+        c.execute_cypher(statement, begin=begin, end=min(begin + 100000, size) - 1)
+    write_precedence_file(c, size)
+
+
+def write_precedence_file(c, size):
+    rows = ({'prev_id': str(i - 1) if i else '', 'id': str(i)} for i in range(size))
+    c.temporary_files.write('speaker_phone_precedes', ['prev_id', 'id'], rows)
+
+
+def remove_precedence(c):
+    c.execute_cypher('''MATCH (:phone:{corpus})-[r:precedes]->() DELETE r'''.format(corpus=c.cypher_safe_name))
+
+
+def load_csv_precedence(c):
+    """Create the relationships with a match per row of the file, as they were created during node import"""
+    statement = '''USING PERIODIC COMMIT 2000
+    LOAD CSV WITH HEADERS FROM "{url}" AS csvLine
+    WITH csvLine WHERE csvLine.prev_id <> ''
+    MATCH (p:phone:{corpus}:speech {{id: csvLine.prev_id}}), (t:phone:{corpus}:speech {{id: csvLine.id}})
+    CREATE (p)-[:precedes]->(t)'''.format(url=c.temporary_files.url('speaker_phone_precedes'),
+                                          corpus=c.cypher_safe_name)
+    c.execute_cypher(statement)
+    c.temporary_files.remove('speaker_phone_precedes')
+
+
+if __name__ == '__main__':
+    config = CorpusConfig('precedence_benchmark', **graph_db)
+    with CorpusContext(config) as c:
+        for size in sizes:
+            create_phones(c, size)
+            beg = time.time()
+            load_csv_precedence(c)
+            print('{} phones, LOAD CSV: {:.3f} s'.format(size, time.time() - beg))
+            for batch_size in batch_sizes:
+                remove_precedence(c)
+                write_precedence_file(c, size)
+                beg = time.time()
+                import_precedence_csvs(c, 'phone', ['phone_precedes'], batch_size=batch_size)
+                print('{} phones, UNWIND batches of {}: {:.3f} s'.format(size, batch_size, time.time() - beg))
+        c.reset()
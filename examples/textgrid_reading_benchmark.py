@@ -0,0 +1,61 @@
+import sys
+import os
+import time
+import random
+import tempfile
+base = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, base)
+
+from textgrid import TextGrid, IntervalTier
+
+from polyglotdb.io.textgrid_reader import read_textgrid
+
+num_words = 50000
+phones = ['aa', 'ae', 'b', 'd', 'eh', 'f', 'g', 'ih', 'k', 'l', 'm', 'n', 'p', 's', 't', 'uw', 'z']
+words = [''.join(random.choice(phones) for _ in range(3)) for _ in range(2000)]
+
+
+def make_aligner_textgrid(path):
+    """Write a TextGrid like the output of a forced aligner, with word and phone tiers"""
+    word_tier = IntervalTier('words', 0, num_words * 0.3)
+    phone_tier = IntervalTier('phones', 0, num_words * 0.3)
+    for i in range(num_words):
+        begin = i * 3
+        word_tier.add(begin / 10, (begin + 3) / 10, random.choice(words))
+        for j in range(3):
+            phone_tier.add((begin + j) / 10, (begin + j + 1) / 10, random.choice(phones))
+    tg = TextGrid(maxTime=num_words * 0.3)
+    tg.append(word_tier)
+    tg.append(phone_tier)
+    tg.write(path)
+
+
+def textgrid_package(path):
+    tg = TextGrid()
+    tg.read(path)
+    stats = []
+    for t in tg.tiers:
+        stats.append((sum(float(x.maxTime) - float(x.minTime) for x in t) / len(t),
+                      set(x.mark for x in t.intervals)))
+        list((x.mark.strip(), x.minTime, x.maxTime) for x in t)
+    return stats
+
+
+def builtin_reader(path):
+    tg = read_textgrid(path)
+    stats = []
+    for t in tg.tiers:
+        stats.append((t.average_duration(), t.unique_labels()))
+        list(t.annotations())
+    return stats
+
+
+with tempfile.TemporaryDirectory() as directory:
+    path = os.path.join(directory, 'aligned.TextGrid')
+    make_aligner_textgrid(path)
+    print('TextGrid with {} words and {} phones ({:.1f} MB)'.format(num_words, num_words * 3,
+                                                                   os.path.getsize(path) / 1e6))
+    for name, function in [('textgrid package', textgrid_package), ('built-in reader', builtin_reader)]:
+        beg = time.time()
+        function(path)
+        print('{}: {:.3f} s'.format(name, time.time() - beg))
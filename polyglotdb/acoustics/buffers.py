@@ -0,0 +1,176 @@
+from functools import lru_cache, partial
+
+import numpy as np
+import soundfile
+from scipy.io import wavfile
+
+from conch.analysis.functions import BaseAnalysisFunction, safe_path
+from conch.analysis.segments import SignalSegment
+
+
+@lru_cache(maxsize=16)
+def open_wav(path):
+    """Memory-maps a PCM wav file, so that segments can be sliced out without decoding the whole file.
+
+    Files are cached per process, and segment mappings are sorted by file, so each worker maps a
+    discourse's audio once and reads consecutive utterances from the same buffer.
+
+    Parameters
+    ----------
+    path : str
+        Path to the wav file
+
+    Returns
+    -------
+    int
+        Sampling rate
+    :class:`numpy.ndarray` or None
+        Memory-mapped samples (samples x channels), or None if the file cannot be memory-mapped
+        (i.e., it is not integer or float PCM)
+    """
+    try:
+        sr, data = wavfile.read(path, mmap=True)
+    except ValueError:
+        return soundfile.info(path).samplerate, None
+    if data.ndim == 1:
+        data = data[:, None]
+    return sr, data
+
+
+def to_float(samples):
+    """Scales PCM samples to floats between -1 and 1"""
+    if samples.dtype == np.uint8:
+        return (samples.astype(np.float64) - 128) / 128
+    if np.issubdtype(samples.dtype, np.integer):
+        return samples.astype(np.float64) / -np.iinfo(samples.dtype).min
+    return samples.astype(np.float64)
+
+
+def read_segment(segment):
+    """Reads the (padded) audio of a segment at its native sampling rate.
+
+    Parameters
+    ----------
+    segment : :class:`~conch.analysis.segments.FileSegment`
+        Segment to read
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Signal for the segment's channel
+    int
+        Sampling rate
+    float
+        Time in the file of the first sample
+    """
+    begin, end = segment['begin'], segment['end']
+    padding = segment['padding']
+    if padding:
+        begin = max(begin - padding, 0)
+        end += padding
+    path = safe_path(segment['file_path'])
+    sr, data = open_wav(path)
+    start, stop = int(round(begin * sr)), int(round(end * sr))
+    if data is None:
+        data, sr = soundfile.read(path, start=start, stop=stop, always_2d=True)
+        return data[:, segment['channel']], sr, begin
+    return to_float(data[start:stop, segment['channel']]), sr, begin
+
+
+def frame_view(signal, frame_length, step):
+    """Splits a signal into overlapping frames as a strided view, without copying the buffer.
+
+    As in Praat, frames are centred in the signal.
+
+    Parameters
+    ----------
+    signal : :class:`numpy.ndarray`
+        Signal to split
+    frame_length : int
+        Number of samples per frame
+    step : int
+        Number of samples between the starts of consecutive frames
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Frames, shape (num_frames, frame_length)
+    :class:`numpy.ndarray`
+        Sample position of each frame's centre
+    """
+    step = max(step, 1)
+    if signal.shape[0] < frame_length:
+        return np.zeros((0, frame_length)), np.zeros(0)
+    num_frames = (signal.shape[0] - frame_length) // step + 1
+    frames = np.lib.stride_tricks.sliding_window_view(signal, frame_length)[::step][:num_frames]
+    offset = (signal.shape[0] - frame_length - (num_frames - 1) * step) / 2
+    return frames, offset + frame_length / 2 + np.arange(num_frames) * step
+
+
+def to_segment_times(output, offset, begin, end):
+    """Converts a track with times relative to a buffer into file times within the segment"""
+    real_output = {}
+    for k, v in output.items():
+        t = round(float(k + offset), 3)
+        if t < begin or t > end:
+            continue
+        real_output[t] = v
+    return real_output
+
+
+def analyze_segment_signal(signal_function, segment, *arguments):
+    signal, sr, offset = read_segment(segment)
+    output = signal_function(signal, sr, *arguments)
+    return to_segment_times(output, offset, segment['begin'], segment['end'])
+
+
+def analyze_shared_buffer(functions, segment):
+    signal, sr, offset = read_segment(segment)
+    output = {}
+    for name, function in functions.items():
+        if isinstance(function, SignalAnalysisFunction):
+            track = function.signal_function(signal, sr, *function.arguments)
+            output[name] = to_segment_times(track, offset, segment['begin'], segment['end'])
+        else:
+            signal_segment = SignalSegment(signal, sr, begin=segment['begin'], padding=segment['begin'] - offset)
+            output[name] = function(signal_segment)
+    return output
+
+
+class SignalAnalysisFunction(BaseAnalysisFunction):
+    """Base class for in-process analysis functions that read segments from memory-mapped audio.
+
+    Parameters
+    ----------
+    signal_function : callable
+        Function taking a signal, its sampling rate and ``arguments``, and returning a track keyed by
+        time relative to the start of the signal
+    arguments : list
+        Extra arguments for ``signal_function``
+    """
+    def __init__(self, signal_function, arguments):
+        super(SignalAnalysisFunction, self).__init__()
+        self.signal_function = signal_function
+        self.arguments = arguments
+        self._function = partial(analyze_segment_signal, signal_function)
+        self.requires_segment_as_arg = True
+
+
+class SharedBufferFunction(BaseAnalysisFunction):
+    """Runs several track functions over a single decoded buffer per segment.
+
+    In-process functions (:class:`SignalAnalysisFunction`) analyze the buffer directly, and other conch
+    functions receive it as a :class:`~conch.analysis.segments.SignalSegment`, so the audio for a segment
+    is only read once however many measures are taken.
+
+    Parameters
+    ----------
+    functions : dict
+        Analysis functions keyed by measurement name; functions that read sound files themselves
+        (i.e., Praat ``Segment`` functions) are not supported
+    """
+    def __init__(self, functions):
+        super(SharedBufferFunction, self).__init__()
+        self.functions = functions
+        self._function = partial(analyze_shared_buffer, functions)
+        self.requires_segment_as_arg = True
@@ -1,6 +1,7 @@
 from conch import analyze_segments
 
 from ..segments import generate_vowel_segments, generate_utterance_segments
+from ..journal import AnalysisJournal, pending_segments
 
 from .helper import generate_formants_point_function, generate_base_formants_function
 
@@ -48,7 +49,8 @@ def analyze_formant_points(corpus_context, call_back=None, stop_check=None, vowe
     return output
 
 
-def analyze_formant_tracks(corpus_context, source='praat', call_back=None, stop_check=None, multiprocessing=True):
+def analyze_formant_tracks(corpus_context, source='praat', call_back=None, stop_check=None, multiprocessing=True,
+                           incremental=False):
     """
     Analyze formants of an entire utterance, and save the resulting formant tracks into the database.
 
@@ -56,12 +58,21 @@ def analyze_formant_tracks(corpus_context, source='praat', call_back=None, stop_
     ----------
     corpus_context : CorpusContext
         corpus context to use
+    source : str
+        Program to measure formants with, one of ``'praat'``, ``'burg'`` (in-process vectorized LPC)
+        or any other value for conch's Python LPC
     call_back : callable
         call back function, optional
     stop_check : callable
         stop check function, optional
+    incremental : bool
+        If True, only analyze discourses that the analysis journal does not record as analyzed with the same
+        source, or that have changed since
     """
+    journal = AnalysisJournal(corpus_context, 'formants', {'source': source})
     segment_mapping = generate_utterance_segments(corpus_context, padding=PADDING)
+    segment_mapping = pending_segments(corpus_context, journal, segment_mapping, ['formants'],
+                                       incremental=incremental)
     property_key = 'speaker'
     data = {x: [] for x in segment_mapping.levels(property_key)}
     for s in segment_mapping.segments:
@@ -82,7 +93,10 @@ def analyze_formant_tracks(corpus_context, source='praat', call_back=None, stop_
         else:
             formant_function = generate_base_formants_function(corpus_context, source=source)
         output = analyze_segments(v, formant_function, stop_check=stop_check, multiprocessing=multiprocessing)
+        if stop_check is not None and stop_check():
+            return
         corpus_context.save_formant_tracks(output, speaker)
+        journal.record(v)
     if 'formants' not in corpus_context.hierarchy.acoustics:
         corpus_context.hierarchy.acoustics.add('formants')
         corpus_context.encode_hierarchy()
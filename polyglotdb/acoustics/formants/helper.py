@@ -3,7 +3,6 @@ import sys
 from functools import partial
 import csv
 
-from statistics import mean, stdev
 import numpy as np
 import scipy
 
@@ -15,6 +14,8 @@ from pyraat.parse_outputs import parse_point_script_output
 
 from ...exceptions import AcousticError
 
+from .lpc import LpcFormantTrackFunction, LpcVariableFormantPointFunction
+
 from ..io import point_measures_from_csv, point_measures_to_csv
 
 
@@ -85,9 +86,12 @@ def parse_multiple_formant_output(output):
     return to_return
 
 
-def generate_variable_formants_point_function(corpus_context, min_formants, max_formants):
+def generate_variable_formants_point_function(corpus_context, min_formants, max_formants, source='praat'):
     """Generates a function used to call Praat to measure formants and bandwidths with variable num_formants.
 
+    With a ``source`` of ``'burg'``, the in-process vectorized LPC engine is used instead, which measures
+    every formant count setting from a single Burg recursion per vowel.
+
     Parameters
     ----------
     corpus_context : :class:`~polyglot.corpus.context.CorpusContext`
@@ -96,6 +100,8 @@ def generate_variable_formants_point_function(corpus_context, min_formants, max_
         The minimum number of formants to measure with on subsequent passes (default is 4).
     max_formants : int
         The maximum number of formants to measure with on subsequent passes (default is 7).
+    source : str
+        Either ``'praat'`` or ``'burg'``
 
     Returns
     -------
@@ -103,6 +109,9 @@ def generate_variable_formants_point_function(corpus_context, min_formants, max_
         The function used to call Praat.
     """
     max_freq = 5500
+    if source == 'burg':
+        return LpcVariableFormantPointFunction(min_formants=min_formants, max_formants=max_formants,
+                                               max_frequency=max_freq, time_step=0.01, window_length=0.025)
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
     script = os.path.join(script_dir, 'multiple_num_formants.praat')
@@ -153,39 +162,31 @@ def get_mean_SD(data):
         Means and covariance matrices per vowel class.
     """
     metadata = {}
-    phones = set()
-    for seg, value in data.items():
-        phones.add(seg['label'])
-
-    for phone in phones:
-
-        observation_list = []
-        for seg, value in data.items():
-            if seg['label'] == phone:
-                observation = [
-                    value['F1'],
-                    value['F2'],
-                    value['F3'],
-                    value['B1'],
-                    value['B2'],
-                    value['B3']
-                ]
-                observation_list.append([x if x else 0 for x in observation])
-
-        f1_mean, f2_mean, f3_mean = mean(x[0] for x in observation_list), mean(x[1] for x in observation_list), mean(
-            x[2] for x in observation_list)
-        b1_mean, b2_mean, b3_mean = mean(x[3] for x in observation_list), mean(x[4] for x in observation_list), mean(
-            x[5] for x in observation_list)
-        all_means = [f1_mean, f2_mean, f3_mean, b1_mean, b2_mean, b3_mean]
-
-        observation_list = np.array(observation_list)
-        cov = np.cov(observation_list.T)
-
-        measurements = [all_means, cov.tolist()]
-        metadata[phone] = measurements
+    columns = ['F1', 'F2', 'F3', 'B1', 'B2', 'B3']
+    labels = np.array([seg['label'] for seg in data.keys()])
+    observations = np.array([[value[x] if value[x] else 0 for x in columns] for value in data.values()],
+                            dtype=np.float64)
+    for phone in set(labels.tolist()):
+        metadata[phone] = get_mean_covariance(observations[labels == phone])
     return metadata
 
 
+def get_mean_covariance(observations):
+    """Gets the means and covariance matrix of a set of observations.
+
+    Parameters
+    ----------
+    observations : :class:`numpy.ndarray`
+        Observations, shape (num_observations, num_measures)
+
+    Returns
+    -------
+    list
+        Means and covariance matrix, as lists
+    """
+    return [observations.mean(axis=0).tolist(), np.cov(observations.T).tolist()]
+
+
 def get_mahalanobis(prototype, observation, inverse_covariance):
     """Gets the Mahalanobis distance between an observation and the prototype.
 
@@ -210,6 +211,61 @@ def get_mahalanobis(prototype, observation, inverse_covariance):
     return distance
 
 
+def get_mahalanobis_batch(prototype, observations, inverse_covariance):
+    """Gets the Mahalanobis distances between an array of observations and the prototype in one operation.
+
+    Parameters
+    ----------
+    prototype : list
+        Prototype data.
+    observations : :class:`numpy.ndarray`
+        Observations, with measures along the last axis (i.e., shape (tokens, candidates, measures))
+    inverse_covariance : list
+        The inverse of the covariance matrix for the vowel class.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        The Mahalanobis distance for each observation, with the shape of ``observations`` minus the last axis
+    """
+    difference = observations - np.asarray(prototype, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        return np.sqrt(np.einsum('...i,ij,...j->...', difference, np.asarray(inverse_covariance), difference))
+
+
+def get_candidate_array(data, columns):
+    """Stacks the candidate measurements of every token into a single array.
+
+    Tokens can have different numbers of candidates (i.e., when formants are dropped), so candidates
+    are padded and a mask marks the real ones.  Candidates keep their order within each token.
+
+    Parameters
+    ----------
+    data : list
+        Candidate measurements for each token, as dictionaries keyed by candidate
+    columns : list
+        Measures to use, with missing values set to 0
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Measurements, shape (tokens, candidates, measures)
+    :class:`numpy.ndarray`
+        Mask of real candidates, shape (tokens, candidates)
+    list
+        Candidate keys for each token
+    """
+    keys = [list(d.keys()) for d in data]
+    num_candidates = max(len(k) for k in keys) if keys else 0
+    candidates = np.zeros((len(data), num_candidates, len(columns)))
+    mask = np.zeros((len(data), num_candidates), dtype=bool)
+    for i, d in enumerate(data):
+        for j, point in enumerate(d.values()):
+            candidates[i, j] = [point[x] if point[x] else 0 for x in columns]
+            mask[i, j] = True
+    return candidates, mask, keys
+
+
 def save_formant_point_data(corpus_context, data, num_formants=False):
     header = ['id', 'F1', 'F2', 'F3', 'B1', 'B2', 'B3', 'A1', 'A2', 'A3', 'Ax', 'drop_formant']
     if num_formants:
@@ -238,6 +294,9 @@ def generate_base_formants_function(corpus_context, gender=None, source='praat')
         formant_function = PraatSegmentFormantTrackFunction(praat_path=corpus_context.config.praat_path,
                                                             max_frequency=max_freq, num_formants=5, window_length=0.025,
                                                             time_step=0.01)
+    elif source == 'burg':
+        formant_function = LpcFormantTrackFunction(max_frequency=max_freq, num_formants=5, window_length=0.025,
+                                                   time_step=0.01)
     else:
         formant_function = FormantTrackFunction(max_frequency=max_freq,
                                                 time_step=0.01, num_formants=5,
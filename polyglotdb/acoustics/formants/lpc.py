@@ -0,0 +1,286 @@
+import math
+from fractions import Fraction
+
+import numpy as np
+from scipy.signal import lfilter, resample_poly
+
+from conch.analysis.functions import BaseAnalysisFunction
+
+from ..buffers import SignalAnalysisFunction, read_segment, frame_view
+
+
+def burg_lpc(frames, order, all_orders=False):
+    """Estimates LPC coefficients with Burg's method for every frame at once.
+
+    The recursion runs over the model order, with every step operating on the whole
+    (frames x samples) matrix, so a segment is analyzed without a Python loop over frames.
+
+    Parameters
+    ----------
+    frames : :class:`numpy.ndarray`
+        Windowed frames, shape (num_frames, frame_length)
+    order : int
+        Order of the LPC model
+    all_orders : bool
+        If True, return the coefficients for every order from 0 to ``order``, which Burg's
+        method computes along the way
+
+    Returns
+    -------
+    :class:`numpy.ndarray` or list
+        Coefficients of shape (num_frames, order + 1), with the first coefficient equal to 1,
+        or a list of such arrays (one per order) if ``all_orders`` is True
+    """
+    frames = np.atleast_2d(np.asarray(frames, dtype=np.float64))
+    num_frames = frames.shape[0]
+    coeffs = np.zeros((num_frames, order + 1))
+    coeffs[:, 0] = 1
+    history = [coeffs[:, :1].copy()]
+    forward = frames[:, 1:]
+    backward = frames[:, :-1]
+    denominator = np.sum(forward ** 2, axis=1) + np.sum(backward ** 2, axis=1)
+    for i in range(order):
+        numerator = -2 * np.sum(backward * forward, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            reflection = np.where(denominator > 0, numerator / denominator, 0)
+        previous = coeffs.copy()
+        coeffs[:, 1:i + 2] = previous[:, 1:i + 2] + reflection[:, None] * previous[:, i::-1]
+        previous_forward = forward
+        forward = forward + reflection[:, None] * backward
+        backward = backward + reflection[:, None] * previous_forward
+        denominator = (1 - reflection ** 2) * denominator - backward[:, -1] ** 2 - forward[:, 0] ** 2
+        forward = forward[:, 1:]
+        backward = backward[:, :-1]
+        if all_orders:
+            history.append(coeffs[:, :i + 2].copy())
+    if all_orders:
+        return history
+    return coeffs
+
+
+def lpc_roots(coeffs):
+    """Finds the roots of a stack of LPC polynomials with one batched eigenvalue call.
+
+    Parameters
+    ----------
+    coeffs : :class:`numpy.ndarray`
+        LPC coefficients, shape (num_polynomials, order + 1), with the first coefficient equal to 1
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Complex roots, shape (num_polynomials, order)
+    """
+    coeffs = np.atleast_2d(coeffs)
+    num_polynomials, order = coeffs.shape[0], coeffs.shape[1] - 1
+    companion = np.zeros((num_polynomials, order, order))
+    companion[:, 0, :] = -coeffs[:, 1:]
+    companion[:, np.arange(1, order), np.arange(order - 1)] = 1
+    return np.linalg.eigvals(companion)
+
+
+def roots_to_formants(roots, sr, num_formants, max_frequency):
+    """Converts LPC roots to sorted formant frequencies and bandwidths.
+
+    Roots below 50 Hz or within 50 Hz of the ceiling are discarded, as in Praat.
+
+    Parameters
+    ----------
+    roots : :class:`numpy.ndarray`
+        Complex roots, shape (num_polynomials, order)
+    sr : int
+        Sampling rate the LPC model was estimated at
+    num_formants : int
+        Number of formants to return
+    max_frequency : int
+        Formant ceiling
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Formant frequencies, shape (num_polynomials, num_formants), NaN where undefined
+    :class:`numpy.ndarray`
+        Formant bandwidths, shape (num_polynomials, num_formants), NaN where undefined
+    """
+    magnitudes = np.abs(roots)
+    # Roots outside the unit circle are reflected inside before computing bandwidths
+    with np.errstate(divide='ignore'):
+        frequencies = np.abs(np.angle(roots)) * sr / (2 * np.pi)
+        bandwidths = -np.log(np.minimum(magnitudes, 1 / np.maximum(magnitudes, 1e-12))) * sr / np.pi
+    valid = (np.imag(roots) > 0) & (frequencies > 50) & (frequencies < max_frequency - 50)
+    frequencies = np.where(valid, frequencies, np.inf)
+    order = np.argsort(frequencies, axis=1)[:, :num_formants]
+    frequencies = np.take_along_axis(frequencies, order, axis=1)
+    bandwidths = np.take_along_axis(bandwidths, order, axis=1)
+    missing = np.isinf(frequencies)
+    frequencies[missing] = np.nan
+    bandwidths[missing] = np.nan
+    if frequencies.shape[1] < num_formants:
+        padding = np.full((frequencies.shape[0], num_formants - frequencies.shape[1]), np.nan)
+        frequencies = np.hstack([frequencies, padding])
+        bandwidths = np.hstack([bandwidths, padding])
+    return frequencies, bandwidths
+
+
+def gaussian_window(length):
+    """Praat's Gaussian analysis window"""
+    edge = math.exp(-12)
+    n = np.arange(length)
+    mid = (length - 1) / 2
+    return (np.exp(-48 * (n - mid) ** 2 / (length + 1) ** 2) - edge) / (1 - edge)
+
+
+def preprocess_signal(signal, sr, max_frequency):
+    """Resamples a signal to twice the formant ceiling and pre-emphasizes it from 50 Hz.
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Processed signal
+    int
+        New sampling rate
+    """
+    new_sr = int(2 * max_frequency)
+    if sr != new_sr:
+        ratio = Fraction(new_sr, int(sr)).limit_denominator(1000)
+        signal = resample_poly(signal, ratio.numerator, ratio.denominator)
+    alpha = math.exp(-2 * math.pi * 50 / new_sr)
+    signal = lfilter([1., -alpha], 1, signal)
+    return signal, new_sr
+
+
+def lpc_formant_track(signal, sr, num_formants, max_frequency, time_step, window_length):
+    """Measures a formant track over a signal, with all frames analyzed as one matrix.
+
+    As in Praat, the Gaussian window spans twice ``window_length``.
+
+    Parameters
+    ----------
+    signal : :class:`numpy.ndarray`
+        Signal to analyze
+    sr : int
+        Sampling rate of the signal
+
+    Returns
+    -------
+    dict
+        Formant values (``F1``, ``B1``, ...) keyed by time relative to the start of the signal,
+        in the same format as Praat tracks
+    """
+    signal, sr = preprocess_signal(signal, sr, max_frequency)
+    frame_length = int(round(2 * window_length * sr))
+    frames, centres = frame_view(signal, frame_length, int(round(time_step * sr)))
+    output = {}
+    if not len(centres):
+        return output
+    coeffs = burg_lpc(frames * gaussian_window(frame_length), int(2 * num_formants))
+    frequencies, bandwidths = roots_to_formants(lpc_roots(coeffs), sr, int(num_formants), max_frequency)
+    for i, centre in enumerate(centres):
+        values = {}
+        for j in range(int(num_formants)):
+            f, b = frequencies[i, j], bandwidths[i, j]
+            values['F{}'.format(j + 1)] = None if np.isnan(f) else float(f)
+            values['B{}'.format(j + 1)] = None if np.isnan(b) else float(b)
+        output[centre / sr] = values
+    return output
+
+
+def spectral_peak_levels(signal, sr, frequencies, bandwidths, max_bandwidth=300):
+    """Gets the maximum spectral level (dB) around each formant of a candidate, mirroring the
+    amplitude search window of ``multiple_num_formants.praat``."""
+    spectrum = np.abs(np.fft.rfft(signal, n=max(512, 2 ** int(np.ceil(np.log2(len(signal))))))) ** 2
+    spectrum = 10 * np.log10(np.maximum(spectrum / (len(signal) * sr), 1e-30) / 4e-10)
+    bins = np.fft.rfftfreq((len(spectrum) - 1) * 2, 1 / sr)
+    levels = []
+    for j, f in enumerate(frequencies):
+        if np.isnan(f):
+            levels.append(None)
+            continue
+        half_up = half_down = min(bandwidths[j], max_bandwidth) / 2
+        if j < len(frequencies) - 1 and not np.isnan(frequencies[j + 1]):
+            half_up = min(half_up, (frequencies[j + 1] - f) / 2)
+        below = max(f / 2, 200) if j == 0 else frequencies[j - 1]
+        if not np.isnan(below):
+            half_down = min(half_down, (f - below) / 2)
+        in_range = (bins >= f - half_down) & (bins <= f + half_up)
+        if in_range.any():
+            levels.append(float(spectrum[in_range].max()))
+        else:
+            levels.append(float(spectrum[np.argmin(np.abs(bins - f))]))
+    return levels
+
+
+def lpc_variable_formant_points(segment, time_step, window_length, min_formants, max_formants, max_frequency):
+    """Measures formants at 33% of a vowel for every formant count setting in one pass.
+
+    Burg's method is order-recursive, so a single recursion up to ``2 * max_formants`` yields
+    the models for every lower setting; all of their polynomials are then solved with one
+    batched root-finding call.  Counts step by 0.5 (odd LPC orders), as in
+    ``multiple_num_formants.praat``, and the output has the same structure as that script's
+    parsed output, including log10 bandwidths and formant amplitudes.
+
+    Parameters
+    ----------
+    segment : :class:`~conch.analysis.segments.FileSegment`
+        Segment to analyze
+
+    Returns
+    -------
+    dict
+        Measurements (``F1``, ``B1``, ``A1``, ...) keyed by number of formants
+    """
+    signal, sr, offset = read_segment(segment)
+    begin, end = segment['begin'] - offset, segment['end'] - offset
+    point = begin + (end - begin) * 0.33
+
+    clip = signal[int(max(begin, point - 0.025) * sr):int(min(point + 0.025, end) * sr)]
+    processed, new_sr = preprocess_signal(signal, sr, max_frequency)
+    frame_length = int(round(2 * window_length * new_sr))
+    centre = int(round(point * new_sr))
+    start = min(max(centre - frame_length // 2, 0), max(processed.shape[0] - frame_length, 0))
+    frame = processed[start:start + frame_length]
+    if frame.shape[0] < frame_length:
+        frame = np.pad(frame, (0, frame_length - frame.shape[0]))
+    frame = frame * gaussian_window(frame_length)
+
+    orders = list(range(int(2 * min_formants), int(2 * max_formants) + 1))
+    all_coeffs = burg_lpc(frame, orders[-1], all_orders=True)
+    stacked = np.zeros((len(orders), orders[-1] + 1))
+    for i, order in enumerate(orders):
+        stacked[i, :order + 1] = all_coeffs[order][0]
+    roots = lpc_roots(stacked)
+
+    output = {}
+    max_count = int(max_formants)
+    frequencies, bandwidths = roots_to_formants(roots, new_sr, max_count, max_frequency)
+    for i, order in enumerate(orders):
+        num_formants = order / 2
+        count = int(math.floor(num_formants))
+        freqs, bws = frequencies[i, :count], bandwidths[i, :count]
+        amplitudes = spectral_peak_levels(clip, sr, freqs, bws) if clip.shape[0] else [None] * count
+        measurements = {}
+        for j in range(count):
+            undefined = np.isnan(freqs[j])
+            measurements['F{}'.format(j + 1)] = None if undefined else round(float(freqs[j]), 2)
+            measurements['B{}'.format(j + 1)] = None if undefined else round(math.log10(bws[j]), 4)
+            measurements['A{}'.format(j + 1)] = amplitudes[j]
+        output[num_formants] = measurements
+    return output
+
+
+class LpcFormantTrackFunction(SignalAnalysisFunction):
+    """In-process formant tracker using vectorized Burg LPC, a drop-in alternative to
+    :class:`~conch.analysis.formants.PraatSegmentFormantTrackFunction`"""
+    def __init__(self, num_formants=5, max_frequency=5500, time_step=0.01, window_length=0.025):
+        super(LpcFormantTrackFunction, self).__init__(lpc_formant_track,
+                                                      [num_formants, max_frequency, time_step, window_length])
+
+
+class LpcVariableFormantPointFunction(BaseAnalysisFunction):
+    """In-process alternative to ``multiple_num_formants.praat`` that measures every formant
+    count setting from one Burg recursion per vowel"""
+    def __init__(self, min_formants=4, max_formants=7, max_frequency=5500, time_step=0.01, window_length=0.025):
+        super(LpcVariableFormantPointFunction, self).__init__()
+        self.arguments = [time_step, window_length, min_formants, max_formants, max_frequency]
+        self._function = lpc_variable_formant_points
+        self.requires_segment_as_arg = True
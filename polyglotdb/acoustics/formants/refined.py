@@ -1,11 +1,13 @@
 import math
 import os
+import time
 import numpy as np
 
 from conch import analyze_segments
 
 from ..segments import generate_vowel_segments
-from .helper import generate_variable_formants_point_function, get_mahalanobis, get_mean_SD, save_formant_point_data
+from .helper import generate_variable_formants_point_function, get_mean_SD, save_formant_point_data, \
+    get_mahalanobis_batch, get_mean_covariance, get_candidate_array
 
 def read_prototypes(vowel_prototypes_path):
 
@@ -42,7 +44,8 @@ def analyze_formant_points_refinement(corpus_context, vowel_label='vowel', durat
                                       stop_check=None,
                                       vowel_prototypes_path='', 
                                       drop_formant=False,
-                                      multiprocessing=True
+                                      multiprocessing=True,
+                                      source='praat'
                                       ):
     """Extracts F1, F2, F3 and B1, B2, B3.
 
@@ -55,13 +58,17 @@ def analyze_formant_points_refinement(corpus_context, vowel_label='vowel', durat
     duration_threshold : float, optional
         Segments with length shorter than this value (in milliseconds) will not be analyzed.
     num_iterations : int, optional
-        How many times the algorithm should iterate before returning values.
+        How many times the algorithm should iterate before returning values, at least 1.
+    source : str, optional
+        Either ``'praat'`` (one Praat call per vowel) or ``'burg'`` (in-process vectorized LPC)
 
     Returns
     -------
     prototype_metadata : dict
         Means of F1, F2, F3, B1, B2, B3 and covariance matrices per vowel class.
     """
+    if num_iterations < 1:
+        raise ValueError('num_iterations must be at least 1, got {}.'.format(num_iterations))
     if not corpus_context.hierarchy.has_type_subset('phone', vowel_label):
         raise Exception('Phones do not have a "{}" subset.'.format(vowel_label))
     # ------------- Step 2: Varying formants -------------
@@ -82,7 +89,8 @@ def analyze_formant_points_refinement(corpus_context, vowel_label='vowel', durat
     else:
         max_formants = 7
     default_formant = 5
-    formant_function = generate_variable_formants_point_function(corpus_context, min_formants, max_formants)
+    formant_function = generate_variable_formants_point_function(corpus_context, min_formants, max_formants,
+                                                                  source=source)
     best_prototype_metadata = {}
 
     use_vowel_prototypes = vowel_prototypes_path and os.path.exists(vowel_prototypes_path)
@@ -92,12 +100,23 @@ def analyze_formant_points_refinement(corpus_context, vowel_label='vowel', durat
     # For each vowel token, collect the formant measurements
     # Pick the best track that is closest to the averages gotten from prototypes
 
-    total_speaker_vowel_pairs = len(segment_mapping.grouped_mapping('speaker', 'label').items())
-    for i, ((speaker, vowel), seg) in enumerate(segment_mapping.grouped_mapping('speaker', 'label').items()):
+    # Analyze every vowel token in one pass, so that a single pool of workers is used for the whole corpus
+    time_section = time.time()
+    all_output = analyze_segments(segment_mapping.segments, formant_function, stop_check=stop_check,
+                                  multiprocessing=multiprocessing)
+    if stop_check is not None and stop_check():
+        return
+    if call_back is not None:
+        call_back('Analyzing vowels took: {}'.format(time.time() - time_section))
+    iteration_times = []
+
+    grouped_mapping = segment_mapping.grouped_mapping('speaker', 'label')
+    total_speaker_vowel_pairs = len(grouped_mapping)
+    for i, ((speaker, vowel), seg) in enumerate(grouped_mapping.items()):
         if len(seg) == 0:
             continue
         print (speaker+' '+vowel+': '+str(i+1)+' of '+str(total_speaker_vowel_pairs))
-        output = analyze_segments(seg, formant_function, stop_check=stop_check, multiprocessing=multiprocessing)  # Analyze the phone
+        output = {s: all_output[s] for s in seg if s in all_output}
         if len(seg) < 6:
             print("Not enough observations of vowel {}, at least 6 are needed, only found {}.".format(vowel, len(seg)))
             for s, data in output.items():
@@ -150,15 +169,19 @@ def analyze_formant_points_refinement(corpus_context, vowel_label='vowel', durat
                 # print (s)
                 # print (output[s])
 
-        selected_tracks = {}
-        for s, data in output.items():
-            selected_tracks[s] = data[default_formant]
+        # Tokens x candidates x measures, so that each iteration scores every candidate of every token at once
+        tokens = list(output.keys())
+        candidates, mask, candidate_keys = get_candidate_array([output[s] for s in tokens], columns)
+        default_index = np.array([keys.index(default_formant) for keys in candidate_keys], dtype=int)
+        token_index = np.arange(len(tokens))
+
+        selected = candidates[token_index, default_index]
         if not use_vowel_prototypes:
             print ('no prototypes, using get_mean_SD()')
-            prev_prototype_metadata = get_mean_SD(selected_tracks)
+            prev_prototype_metadata = {vowel: get_mean_covariance(selected)}
         elif not vowel in vowel_prototype_metadata:
             print ('no prototype for',vowel,'so using get_mean_SD()')
-            prev_prototype_metadata = get_mean_SD(selected_tracks)
+            prev_prototype_metadata = {vowel: get_mean_covariance(selected)}
         else:
             # print ('using prototype')
             prev_prototype_metadata = vowel_prototype_metadata
@@ -169,60 +192,53 @@ def analyze_formant_points_refinement(corpus_context, vowel_label='vowel', durat
         else:
             my_iterations = range(num_iterations)
 
+        last_iteration_best = None
         for _ in my_iterations:
-
-            best_numbers = []
-            selected_tracks = {}
+            time_section = time.time()
             prototype_means = prev_prototype_metadata[vowel][0]
             # Get Mahalanobis distance between every new observation and the sample/means
             covariance = np.array(prev_prototype_metadata[vowel][1])
             inverse_covariance = np.linalg.pinv(covariance)
-            best_number = 5
 
-            for s, data in output.items():
-                best_distance = math.inf
-                best_track = 0
-                for number, point in data.items():
-                    point = [point[x] if point[x] else 0 for x in columns]
-                    distance = get_mahalanobis(prototype_means, point, inverse_covariance)
-                    if distance < best_distance:  # Update "best" measures when new best distance is found
-                        best_distance = distance
-                        best_track = point
-                        best_number = number
-                selected_tracks[s] = {k: best_track[i] for i, k in enumerate(columns)}
-                best_data[s] = {k: best_track[i] for i, k in enumerate(columns)}
-                best_data[s]['num_formants'] = float(str(best_number).split('x')[0])
-                # print ('best number is',best_number)
-                if drop_formant:
-                    for extra_column in extra_columns:
-                        best_data[s][extra_column] = output[s][best_number][extra_column]
-
-                    # best_data[s]['Fx'] = str(best_number)
-                    best_data[s]['Fx'] = int(str(best_number)[0])
-                    if 'x' in str(best_number):
-                        best_data[s]['drop_formant'] = int(str(best_number).split('x')[-1])
-                    else:
-                        best_data[s]['drop_formant'] = 0
-
-                best_numbers.append(best_number)
+            distances = get_mahalanobis_batch(prototype_means, candidates, inverse_covariance)
+            distances[~mask | np.isnan(distances)] = np.inf
+            # argmin keeps the first candidate among ties, as a sequential search for a strictly lower distance would
+            best = np.argmin(distances, axis=1)
+            selected = candidates[token_index, best]
 
             if len(seg) >= 6:
-                prototype_metadata = get_mean_SD(selected_tracks)
+                prototype_metadata = {vowel: get_mean_covariance(selected)}
                 prev_prototype_metadata = prototype_metadata
                 best_prototype_metadata.update(prototype_metadata)
 
-            if _ > 0:
-                changed_numbers = 0
-                for i,bn in enumerate(best_numbers):
-                    if bn != last_iteration_best_numbers[i]:
-                        changed_numbers += 1
-                # print (_, ':', changed_numbers, 'changed out of', len(output))
-                if changed_numbers == 0:
-                    break
-            last_iteration_best_numbers = best_numbers
+            if len(iteration_times) <= _:
+                iteration_times.append(0)
+            iteration_times[_] += time.time() - time_section
+            if last_iteration_best is not None and np.array_equal(best, last_iteration_best):
+                break
+            last_iteration_best = best
+
+        for j, s in enumerate(tokens):
+            best_number = candidate_keys[j][best[j]]
+            best_track = selected[j].tolist()
+            best_data[s] = {k: best_track[i] for i, k in enumerate(columns)}
+            best_data[s]['num_formants'] = float(str(best_number).split('x')[0])
+            if drop_formant:
+                for extra_column in extra_columns:
+                    best_data[s][extra_column] = output[s][best_number][extra_column]
+
+                best_data[s]['Fx'] = int(str(best_number)[0])
+                if 'x' in str(best_number):
+                    best_data[s]['drop_formant'] = int(str(best_number).split('x')[-1])
+                else:
+                    best_data[s]['drop_formant'] = 0
         log_output.append(','.join([speaker,vowel,str(len(output)),str(_+1)]))
         # print (speaker+' '+vowel+': '+str(i+1)+' of '+str(total_speaker_vowel_pairs))
 
+    if call_back is not None:
+        for i, t in enumerate(iteration_times):
+            call_back('Iteration {} of prototype selection took: {}'.format(i + 1, t))
+
     with open('iterations_log.csv', 'w') as f:
         for i in log_output:
             f.write(i+'\n')
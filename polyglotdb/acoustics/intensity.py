@@ -1,7 +1,11 @@
+import numpy as np
+
 from conch import analyze_segments
 from conch.analysis.intensity import PraatSegmentIntensityTrackFunction
 
 from .segments import generate_utterance_segments
+from .buffers import SignalAnalysisFunction, frame_view
+from .journal import AnalysisJournal, pending_segments
 from ..exceptions import AcousticError, SpeakerAttributeError
 
 from .utils import PADDING
@@ -10,7 +14,7 @@ from .utils import PADDING
 def analyze_intensity(corpus_context,
                       source='praat',
                       call_back=None,
-                      stop_check=None, multiprocessing=True):
+                      stop_check=None, multiprocessing=True, incremental=False):
     """
     Analyze intensity of an entire utterance, and save the resulting intensity tracks into the database.
 
@@ -18,25 +22,82 @@ def analyze_intensity(corpus_context,
     ----------
     corpus_context : :class:`~polyglot.corpus.context.CorpusContext`
         corpus context to use
+    source : str
+        Either ``'praat'`` or ``'native'`` (computed in-process from memory-mapped audio)
     call_back : callable
         call back function, optional
     stop_check : function
         stop check function, optional
+    incremental : bool
+        If True, only analyze discourses that the analysis journal does not record as analyzed with the same
+        source, or that have changed since
     """
+    journal = AnalysisJournal(corpus_context, 'intensity', {'source': source})
     segment_mapping = generate_utterance_segments(corpus_context, padding=PADDING, file_type='consonant')
+    segment_mapping = pending_segments(corpus_context, journal, segment_mapping, ['intensity'],
+                                       incremental=incremental)
     segment_mapping = segment_mapping.grouped_mapping('speaker')
     if call_back is not None:
         call_back('Analyzing files...')
     for i, ((speaker,), v) in enumerate(segment_mapping.items()):
-        intensity_function = generate_base_intensity_function(corpus_context)
+        intensity_function = generate_base_intensity_function(corpus_context, source=source)
         output = analyze_segments(v, intensity_function, stop_check=stop_check, multiprocessing=multiprocessing)
+        if stop_check is not None and stop_check():
+            return
         corpus_context.save_intensity_tracks(output, speaker)
+        journal.record(v)
     if 'intensity' not in corpus_context.hierarchy.acoustics:
         corpus_context.hierarchy.acoustics.add('intensity')
         corpus_context.encode_hierarchy()
 
 
-def generate_base_intensity_function(corpus_context):
+def intensity_track(signal, sr, min_pitch, time_step, subtract_mean=True):
+    """
+    Compute an intensity contour the way Praat's "To Intensity" does, with all frames computed at once
+    from a strided view of the signal.
+
+    Each frame is weighted by a Kaiser-20 window with an effective duration of 3.2 / ``min_pitch``,
+    and the weighted mean square pressure is converted to dB re 2e-5 Pa.
+
+    Parameters
+    ----------
+    signal : :class:`numpy.ndarray`
+        Signal to analyze
+    sr : int
+        Sampling rate of the signal
+    min_pitch : float
+        Minimum pitch, which determines the window length
+    time_step : float
+        Time between frames
+    subtract_mean : bool
+        Whether to subtract the (windowed) mean pressure of each frame
+
+    Returns
+    -------
+    dict
+        Intensity values keyed by time relative to the start of the signal
+    """
+    frame_length = int(round(6.4 / min_pitch * sr))
+    frames, centres = frame_view(signal, frame_length, int(round(time_step * sr)))
+    window = np.kaiser(frame_length, 20)
+    window /= window.sum()
+    power = np.einsum('ij,ij,j->i', frames, frames, window)
+    if subtract_mean:
+        power -= (frames @ window) ** 2
+    with np.errstate(divide='ignore'):
+        values = np.where(power > 0, 10 * np.log10(np.maximum(power, 1e-30) / 4e-10), -300)
+    return {centre / sr: {'Intensity': round(float(value), 2)} for centre, value in zip(centres, values)}
+
+
+class IntensityTrackFunction(SignalAnalysisFunction):
+    """In-process alternative to :class:`~conch.analysis.intensity.PraatSegmentIntensityTrackFunction`"""
+    def __init__(self, min_pitch=100, time_step=0.01, subtract_mean=True):
+        super(IntensityTrackFunction, self).__init__(intensity_track, [min_pitch, time_step, subtract_mean])
+
+
+def generate_base_intensity_function(corpus_context, source='praat'):
+    if source == 'native':
+        return IntensityTrackFunction(time_step=0.01)
     if getattr(corpus_context.config, 'praat_path', None) is None:
         raise (AcousticError('Could not find the Praat executable'))
     intensity_function = PraatSegmentIntensityTrackFunction(praat_path=corpus_context.config.praat_path, time_step=0.01)
@@ -1,13 +1,12 @@
 import os
 import subprocess
 import shutil
-import csv
 import librosa
 import audioread
 
 from conch.utils import write_wav
 
-from ..io.importer.from_csv import make_path_safe
+from ..indexes import index_key
 
 
 def resample_audio(filepath, new_filepath, new_sr):
@@ -79,18 +78,11 @@ def point_measures_to_csv(corpus_context, data, header):
     if header[0] != 'id':
         header.insert(0, 'id')
     for s in corpus_context.speakers:
-        path = os.path.join(corpus_context.config.temporary_directory('csv'),
-                            '{}_point_measures.csv'.format(s))
-        with open(path, 'w', newline='', encoding='utf8') as f:
-            writer = csv.DictWriter(f, header, delimiter=',')
-            writer.writeheader()
+        corpus_context.temporary_files.write('{}_point_measures'.format(s), header, [])
     for seg, seg_data in data.items():
-        path = os.path.join(corpus_context.config.temporary_directory('csv'),
-                            '{}_point_measures.csv'.format(seg['speaker']))
-        with open(path, 'a', newline='', encoding='utf8') as f:
-            writer = csv.DictWriter(f, header, delimiter=',')
-            row = dict(id=seg['id'], **{k: v for k, v in seg_data.items() if k in header and k != 'id'})
-            writer.writerow(row)
+        writer = corpus_context.temporary_files.writer('{}_point_measures'.format(seg['speaker']), header)
+        row = dict(id=seg['id'], **{k: v for k, v in seg_data.items() if k in header and k != 'id'})
+        writer.writerow(row)
 
 
 def point_measures_from_csv(corpus_context, header_info):
@@ -111,13 +103,8 @@ def point_measures_from_csv(corpus_context, header_info):
     properties = ',\n'.join(properties)
 
     for s in corpus_context.speakers:
-        path = os.path.join(corpus_context.config.temporary_directory('csv'),
-                            '{}_point_measures.csv'.format(s))
-        # If on the Docker version, the files live in /site/proj
-        if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-            import_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-        else:
-            import_path = 'file:///{}'.format(make_path_safe(path))
+        name = '{}_point_measures'.format(s)
+        import_path = corpus_context.temporary_files.url(name)
 
         import_statement = '''
                 USING PERIODIC COMMIT 2000
@@ -130,10 +117,9 @@ def point_measures_from_csv(corpus_context, header_info):
                                             phone_type=corpus_context.phone_name,
                                             new_properties=properties)
         corpus_context.execute_cypher(statement)
-    for h in header_info.keys():
-        if h == 'id':
-            continue
-        corpus_context.execute_cypher('CREATE INDEX ON :%s(%s)' % (corpus_context.phone_name, h))
+        corpus_context.temporary_files.remove(name)
+    corpus_context.schema_manager.ensure(index_key(corpus_context.phone_name, h) for h in header_info.keys()
+                                         if h != 'id')
     corpus_context.hierarchy.add_token_properties(corpus_context, corpus_context.phone_name,
                                                   [(h, t) for h, t in header_info.items() if h != 'id'])
     corpus_context.encode_hierarchy()
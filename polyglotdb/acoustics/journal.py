@@ -0,0 +1,188 @@
+import os
+import json
+import hashlib
+from datetime import datetime
+
+from conch.analysis.functions import safe_path
+from conch.analysis.segments import SegmentMapping
+
+
+def segment_fingerprint(segments):
+    """
+    Generate a fingerprint for the segments of a speaker in a discourse, which changes if the utterances
+    or the audio file change
+
+    Parameters
+    ----------
+    segments : list
+        List of :class:`~conch.analysis.segments.FileSegment`
+
+    Returns
+    -------
+    str
+        Fingerprint of the segments
+    """
+    h = hashlib.md5()
+    paths = sorted(set(safe_path(s.file_path) for s in segments))
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            h.update('{}:{}:{}'.format(path, stat.st_size, stat.st_mtime_ns).encode('utf8'))
+        except OSError:
+            h.update(path.encode('utf8'))
+    for s in sorted(segments):
+        h.update('{}:{}:{}:{}'.format(s['id'], s.begin, s.end, s.channel).encode('utf8'))
+    return h.hexdigest()
+
+
+class AnalysisJournal(object):
+    """
+    Journal of the discourses that an acoustic analysis has been run on, so that interrupted runs can be
+    resumed and later runs can be restricted to new or changed discourses.
+
+    The journal is stored as JSON in the corpus's base directory, with an entry per analysis recording the
+    parameters it was run with and, for each discourse and speaker, a fingerprint of the analyzed
+    utterances and audio file along with the time of analysis.  Changing the parameters of an analysis
+    invalidates its entry.
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.AudioContext`
+        Corpus context of the analysis
+    analysis : str
+        Name of the analysis (i.e., ``'pitch'``)
+    parameters : dict
+        Parameters of the analysis, such as the source program
+    """
+    file_name = 'analysis_journal.json'
+
+    def __init__(self, corpus_context, analysis, parameters):
+        self.path = os.path.join(corpus_context.config.base_dir, self.file_name)
+        self.analysis = analysis
+        self.parameters = {k: str(v) for k, v in parameters.items()}
+        self.data = self.load()
+        entry = self.data.get(analysis, None)
+        if entry is None or entry['parameters'] != self.parameters:
+            entry = {'parameters': self.parameters, 'discourses': {}}
+            self.data[analysis] = entry
+        self.entry = entry
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r', encoding='utf8') as f:
+            try:
+                return json.load(f)
+            except ValueError:
+                return {}
+
+    def save(self):
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf8') as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def reset(self):
+        """Clear the record of analyzed discourses, for a full run of the analysis"""
+        self.entry['discourses'] = {}
+        self.save()
+
+    def analyzed(self, discourse, speaker):
+        """
+        Get the journal record for a speaker in a discourse
+
+        Returns
+        -------
+        dict or None
+            Record with the fingerprint, number of utterances and time of analysis, or None if not analyzed
+        """
+        return self.entry['discourses'].get(discourse, {}).get(speaker, None)
+
+    def pending(self, segment_mapping):
+        """
+        Filter segments to those of discourses that have not been analyzed with the current parameters, or
+        that have changed since they were analyzed
+
+        Parameters
+        ----------
+        segment_mapping : :class:`~conch.analysis.segments.SegmentMapping`
+            All segments for the analysis
+
+        Returns
+        -------
+        :class:`~conch.analysis.segments.SegmentMapping`
+            Segments still to analyze
+        list
+            (discourse, speaker) pairs that were analyzed before but have changed since
+        """
+        pending_mapping = SegmentMapping()
+        changed = []
+        for (discourse, speaker), segments in segment_mapping.grouped_mapping('discourse', 'speaker').items():
+            if not segments:
+                continue
+            record = self.analyzed(discourse, speaker)
+            if record is not None:
+                if record['fingerprint'] == segment_fingerprint(segments):
+                    continue
+                changed.append((discourse, speaker))
+            pending_mapping.segments.extend(segments)
+        return pending_mapping, changed
+
+    def record(self, segments, time_stamp=None):
+        """
+        Record segments as analyzed and save the journal
+
+        Parameters
+        ----------
+        segments : list
+            List of analyzed :class:`~conch.analysis.segments.FileSegment`, covering every segment for
+            the speakers and discourses involved
+        time_stamp : float, optional
+            Time of analysis, defaults to now
+        """
+        if time_stamp is None:
+            time_stamp = datetime.utcnow().timestamp()
+        grouped = {}
+        for s in segments:
+            grouped.setdefault((s['discourse'], s['speaker']), []).append(s)
+        for (discourse, speaker), v in grouped.items():
+            self.entry['discourses'].setdefault(discourse, {})[speaker] = {'fingerprint': segment_fingerprint(v),
+                                                                          'utterances': len(v),
+                                                                          'analyzed': time_stamp}
+        self.save()
+
+
+def pending_segments(corpus_context, journal, segment_mapping, measurements, incremental=False):
+    """
+    Get the segments an analysis run should process.
+
+    For a full run, the journal is cleared and all segments are returned.  For an incremental run, only
+    segments of new or changed discourses are returned, and the existing tracks of changed discourses are
+    removed before they are reanalyzed.
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.AudioContext`
+        Corpus context of the analysis
+    journal : :class:`AnalysisJournal`
+        Journal for the analysis
+    segment_mapping : :class:`~conch.analysis.segments.SegmentMapping`
+        All segments for the analysis
+    measurements : list
+        Acoustic measurements the analysis saves (i.e., ``['pitch']``)
+    incremental : bool
+        Flag for only analyzing new or changed discourses
+
+    Returns
+    -------
+    :class:`~conch.analysis.segments.SegmentMapping`
+        Segments to analyze
+    """
+    if not incremental:
+        journal.reset()
+        return segment_mapping
+    pending_mapping, changed = journal.pending(segment_mapping)
+    for discourse, speaker in changed:
+        for measurement in measurements:
+            corpus_context.reset_discourse_measurement(measurement, discourse, speaker)
+    return pending_mapping
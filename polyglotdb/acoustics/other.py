@@ -1,13 +1,45 @@
+import os
 import time
 
 from conch import analyze_segments
+from conch.analysis.functions import BaseAnalysisFunction, safe_path
+from conch.analysis.segments import SegmentMapping
 
 from conch.analysis.praat import PraatAnalysisFunction
 
+from pyraat.exceptions import PyraatError
+from pyraat.parse_outputs import parse_point_script_output
+from pyraat.run_scripts import run_script
+
 from .segments import generate_segments
 
 from .io import point_measures_to_csv, point_measures_from_csv
 
+BATCH_MARKER = '#polyglotdb-segment'
+
+BATCH_SCRIPT_TEMPLATE = '''form Batch
+    sentence manifest
+endform
+
+table = Read Table from tab-separated file: manifest$
+num_segments = Get number of rows
+for i from 1 to num_segments
+    selectObject: table
+    segment_id$ = Get value: i, "id"
+    file$ = Get value: i, "file"
+    begin = Get value: i, "begin"
+    end = Get value: i, "end"
+    channel = Get value: i, "channel"
+    padding = Get value: i, "padding"
+    appendInfoLine: "{marker} ", segment_id$
+    runScript: "{script_path}", file$, begin, end, channel, padding{arguments}
+    select all
+    minusObject: table
+    nocheck Remove
+endfor
+appendInfoLine: "{marker}"
+'''
+
 
 def generate_praat_script_function(praat_path, script_path, arguments=None):
     """
@@ -32,13 +64,177 @@ def generate_praat_script_function(praat_path, script_path, arguments=None):
     return praat_function
 
 
+def supports_batch(script_function):
+    """
+    Check whether a Praat script can be run over a manifest of segments in a single Praat process, which
+    requires a script that opens the long sound file itself (i.e., takes the file path, begin, end, channel and padding)
+    and outputs a point measure
+
+    Parameters
+    ----------
+    script_function : :class:`~conch.analysis.praat.PraatAnalysisFunction`
+        Function for the script
+
+    Returns
+    -------
+    bool
+        True if the script can be batched
+    """
+    return script_function.uses_segments and script_function._function.point_measure
+
+
+def praat_literal(value):
+    if isinstance(value, str):
+        return '"{}"'.format(value.replace('"', '""'))
+    if isinstance(value, bool):
+        return str(int(value))
+    return str(value)
+
+
+def write_batch_script(directory, script_function):
+    """
+    Write a Praat script that reads a manifest of segments and runs a script over each of them, printing a marker
+    line with the segment's ID before the script's output
+
+    Parameters
+    ----------
+    directory : str
+        Directory to save the script in
+    script_function : :class:`~conch.analysis.praat.PraatAnalysisFunction`
+        Function for the script to run
+
+    Returns
+    -------
+    str
+        Path to the batch script
+    """
+    praat_function = script_function._function
+    arguments = ''.join(', ' + praat_literal(x) for x in praat_function.arguments)
+    path = os.path.join(directory, 'analyze_script_batch.praat')
+    with open(path, 'w', encoding='utf8') as f:
+        f.write(BATCH_SCRIPT_TEMPLATE.format(marker=BATCH_MARKER,
+                                             script_path=os.path.abspath(praat_function.praat_script_path).replace(
+                                                 '"', '""'),
+                                             arguments=arguments))
+    return path
+
+
+def write_segment_manifest(path, segments):
+    """
+    Write a tab-separated manifest of segments (file, begin, end, channel, padding and ID) for a batch script
+
+    Parameters
+    ----------
+    path : str
+        Path to save the manifest
+    segments : list
+        List of :class:`~conch.analysis.segments.FileSegment` to analyze
+    """
+    with open(path, 'w', encoding='utf8') as f:
+        f.write('id\tfile\tbegin\tend\tchannel\tpadding\n')
+        for s in segments:
+            padding = s['padding']
+            if padding is None:
+                padding = 0
+            f.write('\t'.join(map(str, [s['id'], safe_path(s.file_path), s.begin, s.end, s.channel, padding])) + '\n')
+
+
+def parse_batch_output(text):
+    """
+    Parse the output of a batch script into point measures per segment
+
+    Parameters
+    ----------
+    text : str
+        Output from Praat
+
+    Returns
+    -------
+    dict
+        Measurements keyed by segment ID, only for segments that the script finished and produced output for
+    """
+    blocks = []
+    segment_id = None
+    lines = []
+    for line in text.splitlines():
+        if line.startswith(BATCH_MARKER):
+            if segment_id is not None:
+                blocks.append((segment_id, lines))
+            segment_id = line[len(BATCH_MARKER):].strip()
+            lines = []
+        else:
+            lines.append(line)
+    output = {}
+    # The last block only ends with a marker if the script ran over all the segments
+    for segment_id, lines in blocks:
+        measures = parse_point_script_output('\n'.join(lines))
+        if measures:
+            output[segment_id] = measures
+    return output
+
+
+def analyze_segment_batch(batch, praat_path, script_path, script_function):
+    segments = batch['segments']
+    try:
+        output = parse_batch_output(run_script(praat_path, script_path, batch['manifest']))
+    except PyraatError:
+        output = {}
+    results = {}
+    for s in segments:
+        if s['id'] in output:
+            results[s['id']] = output[s['id']]
+        else:
+            # Fall back to running the script on its own for any segment the batch did not measure
+            results[s['id']] = script_function(s)
+    return results
+
+
+class PraatBatchFunction(BaseAnalysisFunction):
+    """
+    Runs a Praat script over all the segments of a discourse in one Praat process, falling back to one process per
+    segment for segments that the batch fails to measure
+    """
+    def __init__(self, script_function, batch_script_path):
+        super(PraatBatchFunction, self).__init__()
+        self.arguments = [script_function._function.praat_path, batch_script_path, script_function]
+        self._function = analyze_segment_batch
+        self.requires_segment_as_arg = True
+
+
+def generate_segment_batches(segment_mapping, directory):
+    """
+    Group segments by sound file and write a manifest for each group
+
+    Parameters
+    ----------
+    segment_mapping : :class:`~conch.analysis.segments.SegmentMapping`
+        Segments to analyze
+    directory : str
+        Directory to save manifests in
+
+    Returns
+    -------
+    :class:`~conch.analysis.segments.SegmentMapping`
+        One segment per sound file, with the file's segments and manifest path as properties
+    """
+    grouped = {}
+    for s in segment_mapping.segments:
+        grouped.setdefault(s.file_path, []).append(s)
+    batch_mapping = SegmentMapping()
+    for i, (file_path, segments) in enumerate(sorted(grouped.items())):
+        manifest_path = os.path.join(directory, 'analyze_script_manifest_{}.txt'.format(i))
+        write_segment_manifest(manifest_path, segments)
+        batch_mapping.add_file_segment(file_path, 0, 0, 0, segments=segments, manifest=manifest_path)
+    return batch_mapping
+
+
 def analyze_script(corpus_context,
                    phone_class,
                    script_path,
                    duration_threshold=0.01,
                    arguments=None,
                    call_back=None,
-                   stop_check=None, multiprocessing=True):
+                   stop_check=None, multiprocessing=True, batch=True):
     """
     Perform acoustic analysis of phones using an input praat script.
 
@@ -49,6 +245,11 @@ def analyze_script(corpus_context,
             -the first row is a space-separated list of measurement names: these are the names that will be saved into the database
             -the second row is a space-separated list of the value for each measurement
 
+    Scripts that instead open the long sound file (i.e., take the file path, begin, end, channel and padding as inputs)
+    are run in batches, with one Praat process per sound file looping over a manifest of that file's segments, rather
+    than one Praat process per phone.  Other scripts, and any segments that a batch fails to measure, are analyzed one
+    phone at a time.
+
     Parameters
     ----------
     corpus_context : :class:`~polyglot.corpus.context.CorpusContext`
@@ -63,6 +264,8 @@ def analyze_script(corpus_context,
         call back function, optional
     stop_check : callable
         stop check function, optional
+    batch : bool
+        Flag for running scripts that support it over a whole sound file per Praat process, defaults to True
     """
     # print("analyzing sibilants")
     if call_back is not None:
@@ -80,7 +283,26 @@ def analyze_script(corpus_context,
     praat_path = corpus_context.config.praat_path
     script_function = generate_praat_script_function(praat_path, script_path, arguments=arguments)
     time_section = time.time()
-    output = analyze_segments(segment_mapping.segments, script_function, stop_check=stop_check, multiprocessing=multiprocessing)
+    if batch and supports_batch(script_function):
+        batch_directory = corpus_context.config.temporary_directory('praat_batch')
+        batch_script_path = write_batch_script(batch_directory, script_function)
+        batch_mapping = SegmentMapping()
+        try:
+            batch_mapping = generate_segment_batches(segment_mapping, batch_directory)
+            batch_function = PraatBatchFunction(script_function, batch_script_path)
+            batch_output = analyze_segments(batch_mapping.segments, batch_function, stop_check=stop_check,
+                                            multiprocessing=multiprocessing)
+        finally:
+            for path in [batch_script_path] + [b['manifest'] for b in batch_mapping.segments]:
+                if os.path.exists(path):
+                    os.remove(path)
+        output = {}
+        for b, results in batch_output.items():
+            for s in b['segments']:
+                output[s] = results[s['id']]
+    else:
+        output = analyze_segments(segment_mapping.segments, script_function, stop_check=stop_check,
+                                  multiprocessing=multiprocessing)
     if call_back is not None:
         call_back("time analyzing segments: " + str(time.time() - time_section))
     header = sorted(list(output.values())[0].keys())
@@ -6,6 +6,9 @@ from conch.analysis.segments import SegmentMapping
 
 from .helper import generate_pitch_function
 from ..segments import generate_utterance_segments
+from ..intensity import generate_base_intensity_function
+from ..buffers import SharedBufferFunction
+from ..journal import AnalysisJournal, pending_segments
 from ...exceptions import SpeakerAttributeError
 from ..classes import Track, TimePoint
 
@@ -135,7 +138,7 @@ def update_utterance_pitch_track(corpus_context, utterance, new_track):
 def analyze_pitch(corpus_context,
                   source='praat',
                   call_back=None,
-                  stop_check=None, multiprocessing=True):
+                  stop_check=None, multiprocessing=True, with_intensity=False, incremental=False):
     """
 
     Parameters
@@ -144,6 +147,12 @@ def analyze_pitch(corpus_context,
     source
     call_back
     stop_check
+    with_intensity : bool
+        If True, also measure intensity (in-process) from the same decoded audio buffer as pitch, so each
+        utterance is only read once; intensity is then measured on the same audio file as pitch
+    incremental : bool
+        If True, only analyze discourses that the analysis journal does not record as analyzed with the same
+        parameters, or that have changed since, so that interrupted runs resume and new discourses can be added
 
     Returns
     -------
@@ -153,9 +162,15 @@ def analyze_pitch(corpus_context,
     absolute_max_pitch = 500
     if not 'utterance' in corpus_context.hierarchy:
         raise (Exception('Must encode utterances before pitch can be analyzed'))
-    segment_mapping = generate_utterance_segments(corpus_context, padding=PADDING).grouped_mapping('speaker')
-    num_speakers = len(segment_mapping)
     algorithm = corpus_context.config.pitch_algorithm
+    journal = AnalysisJournal(corpus_context, 'pitch', {'source': source, 'algorithm': algorithm,
+                                                        'with_intensity': with_intensity})
+    measurements = ['pitch', 'intensity'] if with_intensity else ['pitch']
+    segment_mapping = generate_utterance_segments(corpus_context, padding=PADDING)
+    all_segments = segment_mapping.grouped_mapping('speaker')
+    segment_mapping = pending_segments(corpus_context, journal, segment_mapping, measurements,
+                                       incremental=incremental).grouped_mapping('speaker')
+    num_speakers = len(segment_mapping)
     path = None
     if source == 'praat':
         path = corpus_context.config.praat_path
@@ -166,7 +181,9 @@ def analyze_pitch(corpus_context,
         path = corpus_context.config.reaper_path
         # kwargs = None
     pitch_function = generate_pitch_function(source, absolute_min_pitch, absolute_max_pitch,
-                                             path=path)
+                                             path=path, signal_input=with_intensity)
+    if with_intensity:
+        intensity_function = generate_base_intensity_function(corpus_context, source='native')
     if algorithm == 'speaker_adjusted':
         speaker_data = {}
         if call_back is not None:
@@ -174,7 +191,9 @@ def analyze_pitch(corpus_context,
         for i, ((k,), v) in enumerate(segment_mapping.items()):
             if call_back is not None:
                 call_back('Analyzing speaker {} ({} of {})'.format(k, i, num_speakers))
-            output = analyze_segments(v, pitch_function, stop_check=stop_check, multiprocessing=multiprocessing)
+            # Speaker statistics use all of the speaker's utterances, even if only some are being analyzed
+            output = analyze_segments(all_segments[(k,)], pitch_function, stop_check=stop_check,
+                                      multiprocessing=multiprocessing)
 
             sum_pitch = 0
             sum_square_pitch = 0
@@ -208,7 +227,7 @@ def analyze_pitch(corpus_context,
             except SpeakerAttributeError:
                 pass
             pitch_function = generate_pitch_function(source, min_pitch, max_pitch,
-                                                     path=path)
+                                                     path=path, signal_input=with_intensity)
         elif algorithm == 'speaker_adjusted':
             mean_pitch, sd_pitch = speaker_data[speaker]
             min_pitch = int(mean_pitch - 3 * sd_pitch)
@@ -218,12 +237,26 @@ def analyze_pitch(corpus_context,
             if max_pitch > absolute_max_pitch:
                 max_pitch = absolute_max_pitch
             pitch_function = generate_pitch_function(source, min_pitch, max_pitch,
-                                                     path=path)
-        output = analyze_segments(v, pitch_function, stop_check=stop_check, multiprocessing=multiprocessing)
+                                                     path=path, signal_input=with_intensity)
+        if with_intensity:
+            shared_function = SharedBufferFunction({'pitch': pitch_function, 'intensity': intensity_function})
+            output = analyze_segments(v, shared_function, stop_check=stop_check, multiprocessing=multiprocessing)
+        else:
+            output = analyze_segments(v, pitch_function, stop_check=stop_check, multiprocessing=multiprocessing)
+        if stop_check is not None and stop_check():
+            return
+        if with_intensity:
+            corpus_context.save_intensity_tracks({seg: x['intensity'] for seg, x in output.items()}, speaker)
+            output = {seg: x['pitch'] for seg, x in output.items()}
         corpus_context.save_pitch_tracks(output, speaker)
         corpus_context.hierarchy.add_token_properties(corpus_context, 'utterance', [('pitch_last_edited', int)])
         corpus_context.encode_hierarchy()
         today = datetime.utcnow()
-        corpus_context.query_graph(corpus_context.utterance).set_properties(pitch_last_edited=today.timestamp())
+        q = corpus_context.query_graph(corpus_context.utterance)
+        q = q.filter(corpus_context.utterance.id.in_([seg['id'] for seg in v]))
+        q.set_properties(pitch_last_edited=today.timestamp())
+        journal.record(v, today.timestamp())
         corpus_context.hierarchy.acoustics.add('pitch')
+        if with_intensity:
+            corpus_context.hierarchy.acoustics.add('intensity')
         corpus_context.encode_hierarchy()
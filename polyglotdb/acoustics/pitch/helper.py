@@ -1,7 +1,14 @@
-from conch.analysis.pitch import ReaperPitchTrackFunction, PraatSegmentPitchTrackFunction, PitchTrackFunction
+from conch.analysis.pitch import ReaperPitchTrackFunction, PraatSegmentPitchTrackFunction, PraatPitchTrackFunction, \
+    PitchTrackFunction
 
 
-def generate_pitch_function(algorithm, min_pitch, max_pitch, path=None, kwargs=None):
+def generate_pitch_function(algorithm, min_pitch, max_pitch, path=None, kwargs=None, signal_input=False):
+    """Generates a pitch function for a source program.
+
+    If ``signal_input`` is True, Praat functions analyze the audio they are given rather than opening the
+    long sound file themselves, so they can be run on a decoded buffer shared with other measures
+    (see :class:`~polyglotdb.acoustics.buffers.SharedBufferFunction`).
+    """
     time_step = 0.01
     if algorithm == 'reaper':
         pitch_function = ReaperPitchTrackFunction(reaper_path=path, min_pitch=min_pitch, max_pitch=max_pitch,
@@ -9,8 +16,12 @@ def generate_pitch_function(algorithm, min_pitch, max_pitch, path=None, kwargs=N
     elif algorithm == 'praat':
         if kwargs is None:
             kwargs = {}
-        pitch_function = PraatSegmentPitchTrackFunction(praat_path=path, min_pitch=min_pitch, max_pitch=max_pitch,
-                                                 time_step=time_step, **kwargs)
+        if signal_input:
+            pitch_function = PraatPitchTrackFunction(praat_path=path, min_pitch=min_pitch, max_pitch=max_pitch,
+                                                     time_step=time_step, **kwargs)
+        else:
+            pitch_function = PraatSegmentPitchTrackFunction(praat_path=path, min_pitch=min_pitch, max_pitch=max_pitch,
+                                                     time_step=time_step, **kwargs)
     else:
         pitch_function = PitchTrackFunction(min_pitch=min_pitch, max_pitch=max_pitch, time_step=time_step)
     return pitch_function
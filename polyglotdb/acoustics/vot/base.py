@@ -10,6 +10,7 @@ from ...query.annotations.models import LinguisticAnnotation
 from ...exceptions import SpeakerAttributeError
 from ..classes import Track, TimePoint
 from ..utils import PADDING
+from ..journal import AnalysisJournal
 
 
 def analyze_vot(corpus_context,
@@ -20,7 +21,7 @@ def analyze_vot(corpus_context,
                   window_min=-30,
                   window_max=30,
                   call_back=None,
-                  stop_check=None, multiprocessing=False):
+                  stop_check=None, multiprocessing=False, incremental=False):
     """
 
     Parameters
@@ -29,6 +30,9 @@ def analyze_vot(corpus_context,
     source
     call_back
     stop_check
+    incremental : bool
+        If True, only analyze discourses that the analysis journal does not record as analyzed with the same
+        parameters, or that have changed since
 
     Returns
     -------
@@ -36,7 +40,27 @@ def analyze_vot(corpus_context,
     """
     if not corpus_context.hierarchy.has_token_subset('phone', stop_label) and not corpus_context.hierarchy.has_type_subset('phone', stop_label):
         raise Exception('Phones do not have a "{}" subset.'.format(stop_label))
-    stop_mapping = generate_segments(corpus_context, annotation_type='phone', subset=stop_label, padding=PADDING, file_type="consonant").grouped_mapping('discourse')
+    journal = AnalysisJournal(corpus_context, 'vot', {'stop_label': stop_label, 'classifier': classifier,
+                                                      'vot_min': vot_min, 'vot_max': vot_max,
+                                                      'window_min': window_min, 'window_max': window_max})
+    stop_mapping = generate_segments(corpus_context, annotation_type='phone', subset=stop_label, padding=PADDING, file_type="consonant")
+    if incremental:
+        pending_mapping, changed = journal.pending(stop_mapping)
+        for discourse, speaker in changed:
+            statement = '''MATCH (v:vot:{corpus_name})-[:annotates]->(p:{phone_type}:{corpus_name}),
+                        (p)-[:spoken_in]->(d:Discourse:{corpus_name}),
+                        (p)-[:spoken_by]->(s:Speaker:{corpus_name})
+                        WHERE d.name = {{discourse}} AND s.name = {{speaker}}
+                        DETACH DELETE v'''.format(corpus_name=corpus_context.cypher_safe_name,
+                                                  phone_type=corpus_context.phone_name)
+            corpus_context.execute_cypher(statement, discourse=discourse, speaker=speaker)
+        stop_mapping = pending_mapping
+    else:
+        journal.reset()
+    analyzed_stops = stop_mapping.segments
+    if not analyzed_stops:
+        return
+    stop_mapping = stop_mapping.grouped_mapping('discourse')
     segment_mapping = SegmentMapping()
     vot_func = AutoVOTAnalysisFunction(classifier_to_use=classifier,
             min_vot_length=vot_min,
@@ -72,3 +96,4 @@ def analyze_vot(corpus_context,
                                   "annotated_id":stop_id})
 
     corpus_context.import_subannotations(list_of_stops, property_types, "vot", "phone")
+    journal.record(analyzed_stops)
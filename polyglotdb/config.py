@@ -8,12 +8,15 @@ CONFIG_DIR = os.path.expanduser('~/.pgdb')
 
 BASE_DIR = os.path.join(CONFIG_DIR, 'data')
 
+NEO4J_DIR = os.path.join(CONFIG_DIR, 'neo4j')
+
 CONFIG_PATH = os.path.join(CONFIG_DIR, 'config.ini')
 
 CONFIG = configparser.ConfigParser()
 if os.path.exists(CONFIG_PATH):
     CONFIG.read(CONFIG_PATH)
     BASE_DIR = os.path.expanduser(os.path.join(CONFIG['Data']['directory'], 'data'))
+    NEO4J_DIR = os.path.expanduser(os.path.join(CONFIG['Data']['directory'], 'neo4j'))
 
 
 def setup_logger(logger_name, log_file, level=logging.INFO):
@@ -59,6 +62,19 @@ class CorpusConfig(object):
     base_dir : str
         Base directory to store information and temporary files for the corpus
         defaults to "Documents/SCT" under the current user's home directory
+    neo4j_home : str
+        Directory of the local Neo4j installation, used for offline bulk imports
+    compress_temporary_files : bool
+        Flag for compressing the temporary CSV files of imports and enrichments with gzip, defaults to False
+    temporary_file_buffer_size : int
+        Size in bytes of the write buffers of temporary CSV files, defaults to 1 MB
+    keep_temporary_files : bool
+        Flag for keeping temporary CSV files after they are loaded, for debugging imports, defaults to False
+    enrichment_unwind_threshold : int
+        Number of rows of enrichment data up to which it is written to the graph database directly with ``UNWIND``
+        rather than through a temporary CSV file, defaults to 50000
+    enrichment_batch_size : int
+        Number of rows of enrichment data written per transaction with ``UNWIND``, defaults to 5000
     """
 
     def __init__(self, corpus_name, data_dir=None, **kwargs):
@@ -72,6 +88,7 @@ class CorpusConfig(object):
         self.query_behavior = 'speaker'
         self.graph_http_port = 7474
         self.graph_bolt_port = 7687
+        self.neo4j_home = NEO4J_DIR
 
         if data_dir is None:
             data_dir = BASE_DIR
@@ -97,6 +114,12 @@ class CorpusConfig(object):
         self.formant_algorithm = 'fave'
         self.time_sampling = 0.01
 
+        self.compress_temporary_files = False
+        self.temporary_file_buffer_size = 1024 * 1024
+        self.keep_temporary_files = False
+        self.enrichment_unwind_threshold = 50000
+        self.enrichment_batch_size = 5000
+
         for k, v in kwargs.items():
             setattr(self, k, v)
 
@@ -7,6 +7,8 @@ from decimal import Decimal
 
 from influxdb import InfluxDBClient
 
+from ..profiling import ProfiledInfluxDBClient
+
 from ..acoustics import analyze_pitch, analyze_formant_tracks, analyze_vowel_formant_tracks, analyze_intensity, \
     analyze_script, analyze_utterance_pitch, update_utterance_pitch_track, analyze_vot
 from ..acoustics.classes import Track, TimePoint
@@ -103,8 +105,10 @@ class AudioContext(SyllabicContext):
         signal, sr = librosa.load(path, sr=None)
         return signal, sr
 
-    def analyze_pitch(self, source='praat', stop_check=None, call_back=None, multiprocessing=True):
-        analyze_pitch(self, source, stop_check, call_back, multiprocessing=multiprocessing)
+    def analyze_pitch(self, source='praat', stop_check=None, call_back=None, multiprocessing=True,
+                      with_intensity=False, incremental=False):
+        analyze_pitch(self, source, stop_check, call_back, multiprocessing=multiprocessing,
+                      with_intensity=with_intensity, incremental=incremental)
 
     def analyze_utterance_pitch(self, utterance, source='praat', **kwargs):
         return analyze_utterance_pitch(self, utterance, source, **kwargs)
@@ -121,27 +125,32 @@ class AudioContext(SyllabicContext):
             vot_min=5,
             vot_max=100,
             window_min=-30,
-            window_max=30):
+            window_max=30,
+            incremental=False):
         analyze_vot(self, stop_label=stop_label, stop_check=stop_check,\
                 call_back=call_back, multiprocessing=multiprocessing,\
                 vot_min=vot_min, vot_max=vot_max, window_min=window_min,\
-                window_max=window_max, classifier=classifier)
+                window_max=window_max, classifier=classifier, incremental=incremental)
 
-    def analyze_formant_tracks(self, source='praat', stop_check=None, call_back=None, multiprocessing=True):
-        analyze_formant_tracks(self, source, stop_check, call_back, multiprocessing=multiprocessing)
+    def analyze_formant_tracks(self, source='praat', stop_check=None, call_back=None, multiprocessing=True,
+                               incremental=False):
+        analyze_formant_tracks(self, source, stop_check, call_back, multiprocessing=multiprocessing,
+                               incremental=incremental)
 
     def analyze_vowel_formant_tracks(self, source='praat', stop_check=None, call_back=None, vowel_label='vowel',
                                      multiprocessing=True):
         analyze_vowel_formant_tracks(self, source, stop_check, call_back, vowel_label,
                                      multiprocessing=multiprocessing)
 
-    def analyze_intensity(self, source='praat', stop_check=None, call_back=None, multiprocessing=True):
-        analyze_intensity(self, source, stop_check, call_back, multiprocessing=multiprocessing)
+    def analyze_intensity(self, source='praat', stop_check=None, call_back=None, multiprocessing=True,
+                          incremental=False):
+        analyze_intensity(self, source, stop_check, call_back, multiprocessing=multiprocessing,
+                          incremental=incremental)
 
     def analyze_script(self, phone_class, script_path, duration_threshold=0.01, arguments=None, stop_check=None,
-                       call_back=None, multiprocessing=True):
+                       call_back=None, multiprocessing=True, batch=True):
         return analyze_script(self, phone_class, script_path, duration_threshold=duration_threshold, arguments=arguments,
-                       stop_check=stop_check, call_back=call_back, multiprocessing=multiprocessing)
+                       stop_check=stop_check, call_back=call_back, multiprocessing=multiprocessing, batch=batch)
 
     def reset_formant_points(self):
         encoded_props = []
@@ -193,8 +202,42 @@ class AudioContext(SyllabicContext):
             self.hierarchy.acoustics.remove('intensity')
             self.encode_hierarchy()
 
+    def remove_discourse(self, name):
+        """
+        Remove a discourse from the corpus, along with its acoustic measurements
+
+        Parameters
+        ----------
+        name : str
+            Name of the discourse to remove
+        """
+        for m in sorted(self.hierarchy.acoustics):
+            self.reset_discourse_measurement(m, name)
+        super(AudioContext, self).remove_discourse(name)
+
+    def reset_discourse_measurement(self, measurement, discourse, speaker=None):
+        """
+        Remove the points of an acoustic measurement for a discourse, optionally only for one speaker
+
+        Parameters
+        ----------
+        measurement : str
+            Name of the measurement (i.e., 'pitch')
+        discourse : str
+            Name of the discourse
+        speaker : str, optional
+            Name of the speaker
+        """
+        query = '''DELETE FROM "{}" WHERE "discourse" = '{}' '''.format(measurement, discourse)
+        if speaker is not None:
+            query += '''AND "speaker" = '{}' '''.format(speaker)
+        self.acoustic_client().query(query.strip() + ';')
+
     def acoustic_client(self):
-        client = InfluxDBClient(**self.config.acoustic_conncetion_kwargs)
+        if self.profiler is not None:
+            client = ProfiledInfluxDBClient(self.profiler, **self.config.acoustic_conncetion_kwargs)
+        else:
+            client = InfluxDBClient(**self.config.acoustic_conncetion_kwargs)
         databases = client.get_list_database()
         if self.corpus_name not in databases:
             client.create_database(self.corpus_name)
@@ -1080,6 +1123,14 @@ class AudioContext(SyllabicContext):
             client.write_points(data, batch_size=1000, time_precision='ms')
 
     def reassess_utterances(self, measure):
+        """
+        Update the utterance ids of an acoustic measure's points from the encoded utterances
+
+        Parameters
+        ----------
+        measure : str
+            Name of the acoustic measure
+        """
         client = self.acoustic_client()
         q = self.query_discourses()
         q = q.columns(self.discourse.name.column_name('name'),
@@ -1096,47 +1147,73 @@ class AudioContext(SyllabicContext):
                               self.utterance.begin.column_name('begin'),
                               self.utterance.end.column_name('end'))
                 utterances = q.all()
-                all_query = '''select * from "{}"
-                                where "phone" != '' and 
-                                "discourse" = '{}' and 
-                                "speaker" = '{}';'''.format(measure, discourse_name, s)
-                all_results = client.query(all_query)
-                cur_index = 0
-                for _, r in all_results.items():
-                    for t_dict in r:
-                        phone = t_dict.pop('phone')
-                        utterance_id = t_dict.pop('utterance_id', '')
-                        value = None
-                        if measure == 'intensity':
-                            value = t_dict.pop('Intensity')
-                            rel_value = t_dict.pop('Intensity_relativized', None)
-                        elif measure == 'pitch':
-                            value = t_dict.pop('F0')
-                            rel_value = t_dict.pop('F0_relativized', None)
-                        elif measure == 'formants':
-                            F2 = t_dict.pop('F2')
-                            new_F2 = t_dict.pop('F2_relativized', None)
-                            F3 = t_dict.pop('F3')
-                            new_F3 = t_dict.pop('F3_relativized', None)
-                            value = t_dict.pop('F1')
-                            rel_value = t_dict.pop('F1_relativized', None)
-
-                        if value is None:
-                            continue
-                        time_point = to_seconds(t_dict.pop('time'))
-                        for i in range(cur_index, len(utterances)):
-                            if utterances[i]['begin'] <= time_point <= utterances[i]['end']:
-                                cur_index = i
-                                break
-                        time_point = s_to_ms(time_point)
-                        d = {'measurement': measure,
-                             'tags': t_dict,
-                             "time": time_point,
-                             "fields": {'utterance_id': utterances[cur_index]['utterance_id']}
-                             }
-                        data.append(d)
+                data.extend(self._utterance_points(client, measure, discourse_name, s, utterances))
             client.write_points(data, batch_size=1000, time_precision='ms')
 
+    def _utterance_points(self, client, measure, discourse, speaker, utterances):
+        """
+        Generate points for an acoustic measure of a speaker in a discourse with updated utterance ids
+
+        Parameters
+        ----------
+        client : :class:`~influxdb.InfluxDBClient`
+            InfluxDB client for the corpus
+        measure : str
+            Name of the acoustic measure
+        discourse : str
+            Name of the discourse
+        speaker : str
+            Name of the speaker
+        utterances : list
+            Dictionaries with 'utterance_id', 'begin' and 'end' keys for the speaker's utterances, ordered by begin
+
+        Returns
+        -------
+        list
+            Points to write
+        """
+        data = []
+        all_query = '''select * from "{}"
+                        where "phone" != '' and 
+                        "discourse" = '{}' and 
+                        "speaker" = '{}';'''.format(measure, discourse, speaker)
+        all_results = client.query(all_query)
+        cur_index = 0
+        for _, r in all_results.items():
+            for t_dict in r:
+                phone = t_dict.pop('phone')
+                utterance_id = t_dict.pop('utterance_id', '')
+                value = None
+                if measure == 'intensity':
+                    value = t_dict.pop('Intensity')
+                    rel_value = t_dict.pop('Intensity_relativized', None)
+                elif measure == 'pitch':
+                    value = t_dict.pop('F0')
+                    rel_value = t_dict.pop('F0_relativized', None)
+                elif measure == 'formants':
+                    F2 = t_dict.pop('F2')
+                    new_F2 = t_dict.pop('F2_relativized', None)
+                    F3 = t_dict.pop('F3')
+                    new_F3 = t_dict.pop('F3_relativized', None)
+                    value = t_dict.pop('F1')
+                    rel_value = t_dict.pop('F1_relativized', None)
+
+                if value is None:
+                    continue
+                time_point = to_seconds(t_dict.pop('time'))
+                for i in range(cur_index, len(utterances)):
+                    if utterances[i]['begin'] <= time_point <= utterances[i]['end']:
+                        cur_index = i
+                        break
+                time_point = s_to_ms(time_point)
+                d = {'measurement': measure,
+                     'tags': t_dict,
+                     "time": time_point,
+                     "fields": {'utterance_id': utterances[cur_index]['utterance_id']}
+                     }
+                data.append(d)
+        return data
+
     def reset_relativized_formants(self):
         client = self.acoustic_client()
         query = """SELECT "phone", "F1", "F2", "F3", "utterance_id" INTO "formants_copy" FROM "formants" GROUP BY *;"""
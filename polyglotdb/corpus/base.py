@@ -13,6 +13,9 @@ from ..query.lexicon import LexiconQuery, LexiconNode
 from ..query.speaker import SpeakerQuery, SpeakerNode
 from ..query.discourse import DiscourseQuery, DiscourseNode
 from ..config import CorpusConfig
+from ..profiling import QueryProfiler, setup_query_logger, sum_db_hits
+from ..indexes import IndexManager, SchemaManager
+from ..io.importer.temporary_files import TemporaryFileManager
 from ..exceptions import (CorpusConfigError, GraphQueryError,
                           ConnectionError, AuthorizationError, TemporaryConnectionError,
                           NetworkAddressError)
@@ -49,6 +52,10 @@ class BaseContext(object):
 
         self._has_sound_files = None
         self._has_all_sound_files = None
+        self.profiler = None
+        self.index_manager = IndexManager(self)
+        self.schema_manager = SchemaManager(self)
+        self.temporary_files = TemporaryFileManager(self)
         if getattr(sys, 'frozen', False):
             self.config.reaper_path = os.path.join(sys.path[-1], 'reaper')
         else:
@@ -91,6 +98,8 @@ class BaseContext(object):
         for k, v in parameters.items():
             if isinstance(v, Decimal):
                 parameters[k] = float(v)
+        if self.profiler is not None:
+            return self._execute_profiled_cypher(statement, **parameters)
         try:
             with self.graph_driver.session() as session:
                 #print(statement)
@@ -100,6 +109,81 @@ class BaseContext(object):
         except Exception as e:
             raise
 
+    def _execute_profiled_cypher(self, statement, **parameters):
+        profiled_statement = self.profiler.profile_statement(statement)
+        begin = time.time()
+        with self.graph_driver.session() as session:
+            results = session.run(profiled_statement, **parameters)
+        # Closing the session buffers the remaining records, so the time includes fetching them
+        elapsed = time.time() - begin
+        db_hits = None
+        if profiled_statement != statement:
+            db_hits = sum_db_hits(results.summary().profile)
+        self.profiler.record('cypher', statement, elapsed, len(getattr(results, '_records', [])), db_hits)
+        return results
+
+    def start_profiling(self, profile_db_hits=False, slow_threshold=None, log=False):
+        """
+        Start recording the wall time and rows returned of every Cypher and InfluxQL statement, aggregated by
+        statement template
+
+        Parameters
+        ----------
+        profile_db_hits : bool
+            If True, also record Neo4j database hits by running Cypher statements with ``PROFILE``, which
+            adds overhead
+        slow_threshold : float, optional
+            Statements taking longer than this number of seconds are added to the slow query log
+        log : bool
+            If True, slow queries and reports are written to ``queries.log`` in the corpus's log directory
+
+        Returns
+        -------
+        :class:`~polyglotdb.profiling.QueryProfiler`
+            The profiler
+        """
+        logger_name = None
+        if log:
+            logger_name = setup_query_logger(self.config)
+        self.profiler = QueryProfiler(profile_db_hits=profile_db_hits, slow_threshold=slow_threshold,
+                                      logger_name=logger_name)
+        return self.profiler
+
+    def stop_profiling(self):
+        """
+        Stop recording statements, writing the final report to the query log if logging
+
+        Returns
+        -------
+        :class:`~polyglotdb.profiling.QueryProfiler`
+            The profiler, with the statistics recorded
+        """
+        profiler = self.profiler
+        self.profiler = None
+        if profiler is not None:
+            profiler.log_report()
+        return profiler
+
+    def query_report(self, sort_by='total_time', limit=20):
+        """
+        Generate a report of the most expensive statements recorded since profiling started
+
+        Parameters
+        ----------
+        sort_by : str
+            One of ``'total_time'``, ``'max_time'``, ``'mean_time'``, ``'count'``, ``'rows'`` or ``'db_hits'``
+        limit : int
+            Maximum number of statement templates to include
+
+        Returns
+        -------
+        str
+            Report
+        """
+        if self.profiler is None:
+            raise (GraphQueryError('Profiling has not been started, use start_profiling first.'))
+        return self.profiler.report(sort_by, limit)
+
     @property
     def cypher_safe_name(self):
         return '`{}`'.format(self.corpus_name)
@@ -153,11 +237,9 @@ class BaseContext(object):
 
     def __exit__(self, exc_type, exc, exc_tb):
         self.graph_driver.close()
+        self.temporary_files.close()
         if exc_type is None:
-            # try:
-            #    shutil.rmtree(self.config.temp_dir)
-            # except:
-            #    pass
+            self.temporary_files.cleanup()
             return True
         else:
             return False
@@ -401,7 +483,22 @@ class BaseContext(object):
         name : str
             Name of the discourse to remove
         '''
-        self.execute_cypher('''MATCH (n:{}:{})-[r]->() DELETE n, r'''.format(self.cypher_safe_name, name))
+        delete_statement = '''MATCH (n:{corpus})-[:spoken_in]->(d:Discourse:{corpus})
+        WHERE d.name = {{discourse}}
+        WITH n LIMIT 1000
+        OPTIONAL MATCH (n)<-[:annotates]-(sub)
+        DETACH DELETE sub, n
+        RETURN count(n) AS deleted_count'''.format(corpus=self.cypher_safe_name)
+        deleted = 1000
+        while deleted > 0:
+            deleted = self.execute_cypher(delete_statement, discourse=name).single()['deleted_count']
+        self.execute_cypher('''MATCH (d:Discourse:{corpus}) WHERE d.name = {{discourse}}
+        DETACH DELETE d'''.format(corpus=self.cypher_safe_name), discourse=name)
+        self.execute_cypher('''MATCH (s:Speaker:{corpus}) WHERE NOT (s)-[:speaks_in]->()
+        DETACH DELETE s'''.format(corpus=self.cypher_safe_name))
+        for a in self.hierarchy.annotation_types:
+            self.execute_cypher('''MATCH (t:{anno}_type:{corpus}) WHERE NOT (t)<-[:is_a]-()
+            DETACH DELETE t'''.format(anno=a, corpus=self.cypher_safe_name))
 
     def discourse_annotations(self, name, annotations=None):
         '''
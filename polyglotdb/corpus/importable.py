@@ -1,23 +1,72 @@
 import os
+import copy
 import logging
 import time
-import csv
 from collections import defaultdict
 
-from ..acoustics.io import setup_audio
+from ..acoustics.io import setup_audio, add_discourse_sound_info
 
 from ..io.importer import (data_to_graph_csvs, import_csvs,
-                           data_to_type_csvs, import_type_csvs)
-
-from ..exceptions import ParseError
+                           data_to_type_csvs, import_type_csvs,
+                           initialize_bulk_csvs, data_to_bulk_type_csvs, data_to_bulk_csvs,
+                           bulk_import_csvs)
+from ..io.importer.journal import ImportJournal
+from ..io.helper import type_id_cache
+from ..indexes import constraint_key, index_key
+
+from ..exceptions import ParseError, HierarchyError, CorpusIntegrityError
 from .structured import StructuredContext
 
 
+def check_parsed_hierarchy(hierarchy, parsed):
+    """
+    Check that the annotation types of a parser's hierarchy are all in the hierarchy of an existing corpus
+
+    Parameters
+    ----------
+    hierarchy : :class:`~polyglotdb.structure.Hierarchy`
+        Hierarchy of the corpus
+    parsed : :class:`~polyglotdb.structure.Hierarchy`
+        Hierarchy of a parser or parsed discourse
+
+    Raises
+    ------
+    :class:`~polyglotdb.exceptions.HierarchyError`
+        If an annotation type is not in the corpus
+    """
+    missing = [x for x in parsed.annotation_types if x not in hierarchy.annotation_types]
+    if missing:
+        raise HierarchyError('The annotation types {} are not in the corpus.'.format(', '.join(sorted(missing))))
+
+
+def merge_parsed_hierarchy(hierarchy, parsed):
+    """
+    Merge the properties of a parsed discourse's hierarchy into the hierarchy of an existing corpus, keeping the
+    annotation types and properties encoded in the corpus (i.e., utterances)
+
+    Parameters
+    ----------
+    hierarchy : :class:`~polyglotdb.structure.Hierarchy`
+        Hierarchy of the corpus
+    parsed : :class:`~polyglotdb.structure.Hierarchy`
+        Hierarchy of a parsed discourse
+    """
+    check_parsed_hierarchy(hierarchy, parsed)
+    for k, v in parsed.token_properties.items():
+        hierarchy.token_properties.setdefault(k, set()).update(v)
+    for k, v in parsed.type_properties.items():
+        hierarchy.type_properties.setdefault(k, set()).update(v)
+    for k, v in parsed.subannotations.items():
+        hierarchy.subannotations.setdefault(k, set()).update(v)
+    for k, v in parsed.subannotation_properties.items():
+        hierarchy.subannotation_properties.setdefault(k, set()).update(v)
+
+
 class ImportContext(StructuredContext):
     """
     Class that contains methods for dealing with the initial import of corpus data
     """
-    def add_types(self, types, type_headers):
+    def add_types(self, types, type_headers, bulk_import=False):
         '''
         This function imports types of annotations into the corpus.
 
@@ -26,52 +75,52 @@ class ImportContext(StructuredContext):
         parsed_data: dict
             Dictionary with keys for discourse names and values of :class:`~polyglotdb.io.helper.DiscourseData`
             objects
+        bulk_import : bool
+            Flag for writing the types for the offline importer instead of loading them
         '''
+        if bulk_import:
+            data_to_bulk_type_csvs(self, types, type_headers)
+            return
         data_to_type_csvs(self, types, type_headers)
         import_type_csvs(self, type_headers)
 
-    def initialize_import(self, speakers, token_headers, subannotations=None):
+    def initialize_import(self, speakers, token_headers, subannotations=None, supertypes=None, bulk_import=False):
         """ prepares corpus for import of types of annotations """
-        directory = self.config.temporary_directory('csv')
+        if bulk_import:
+            self._bulk_discourses = {}
+            initialize_bulk_csvs(self, token_headers, subannotations, supertypes)
+            return
         for s in speakers:
             for k, v in token_headers.items():
-                path = os.path.join(directory, '{}_{}.csv'.format(s, k))
-                with open(path, 'w', newline='', encoding='utf8') as f:
-                    w = csv.DictWriter(f, v, delimiter=',')
-                    w.writeheader()
+                self.temporary_files.write('{}_{}'.format(s, k), v, [])
+                self.temporary_files.write('{}_{}_precedes'.format(s, k), ['prev_id', 'id'], [])
             if subannotations is not None:
                 for k, v in subannotations.items():
                     for sub in v:
-                        path = os.path.join(directory, '{}_{}_{}.csv'.format(s, k, sub))
-                        with open(path, 'w', newline='', encoding='utf8') as f:
-                            header = ['id', 'begin', 'end', 'annotation_id', 'label']
-                            w = csv.DictWriter(f, header, delimiter=',')
-                            w.writeheader()
-
-        def corpus_index(tx):
-            tx.run('CREATE CONSTRAINT ON (node:Corpus) ASSERT node.name IS UNIQUE')
-
-        def discourse_index(tx):
-            tx.run('CREATE INDEX ON :Discourse(name)')
-
-        def speaker_index(tx):
-            tx.run('CREATE INDEX ON :Speaker(name)')
+                        header = ['id', 'begin', 'end', 'annotation_id', 'label']
+                        self.temporary_files.write('{}_{}_{}'.format(s, k, sub), header, [])
 
         def corpus_create(tx, corpus_name):
             tx.run('MERGE (n:Corpus {name: $corpus_name}) return n', corpus_name=corpus_name)
 
+        self.schema_manager.ensure([constraint_key('Corpus', 'name'), index_key('Discourse', 'name'),
+                                    index_key('Speaker', 'name')])
         with self.graph_driver.session() as session:
-            session.write_transaction(corpus_index)
-            session.write_transaction(discourse_index)
-            session.write_transaction(speaker_index)
             session.write_transaction(corpus_create, self.corpus_name)
 
-    def finalize_import(self, data, call_back=None, stop_check=None):
+    def finalize_import(self, data, call_back=None, stop_check=None, bulk_import=False):
         """ generates hierarchy and saves variables"""
-        import_csvs(self, data, call_back, stop_check)
+        if bulk_import:
+            bulk_import_csvs(self, call_back=call_back, stop_check=stop_check)
+            self.schema_manager.ensure(call_back=call_back)
+            for name, wav_path in sorted(self._bulk_discourses.items()):
+                if wav_path is not None and os.path.exists(wav_path):
+                    add_discourse_sound_info(self, name, wav_path)
+        else:
+            import_csvs(self, data, call_back, stop_check)
         self.encode_hierarchy()
 
-    def add_discourse(self, data):
+    def add_discourse(self, data, bulk_import=False):
         '''
         Add a discourse to the graph database for corpus.
 
@@ -79,12 +128,22 @@ class ImportContext(StructuredContext):
         ----------
         data : :class:`~polyglotdb.io.helper.DiscourseData`
             Data for the discourse to be added
+        bulk_import : bool
+            Flag for writing the discourse for the offline importer, run by :meth:`finalize_import`
         '''
-        if data.name in self.discourses:
+        if data.name in self.discourses or (bulk_import and data.name in self._bulk_discourses):
             raise (ParseError('The discourse \'{}\' already exists in this corpus.'.format(data.name)))
         log = logging.getLogger('{}_loading'.format(self.corpus_name))
         log.info('Begin adding discourse {}...'.format(data.name))
         begin = time.time()
+        if bulk_import:
+            data.corpus_name = self.corpus_name
+            data_to_bulk_csvs(self, data)
+            self.hierarchy.update(data.hierarchy)
+            self._bulk_discourses[data.name] = data.wav_path
+            log.info('Finished adding discourse {}!'.format(data.name))
+            log.debug('Total time taken: {} seconds'.format(time.time() - begin))
+            return
 
         def create_speaker_discourse(tx, speaker_name, discourse_name, channel):
             tx.run('''MERGE (n:Speaker:{corpus_name} {{name: $speaker_name}})
@@ -108,7 +167,7 @@ class ImportContext(StructuredContext):
         log.info('Finished adding discourse {}!'.format(data.name))
         log.debug('Total time taken: {} seconds'.format(time.time() - begin))
 
-    def load(self, parser, path):
+    def load(self, parser, path, bulk_import=False, incremental=False):
         """
         Use a specified parser on a path to either a directory or a single
         file
@@ -121,21 +180,38 @@ class ImportContext(StructuredContext):
         path : str
             The location of the corpus
 
+        bulk_import : bool
+            Flag for loading a new corpus into an empty graph database with the offline importer of the local
+            Neo4j installation, which stops and restarts the database, defaults to False
+
+        incremental : bool
+            Flag for only importing the source files that are new or have changed since the corpus was loaded,
+            see :meth:`load_incremental`, defaults to False
+
         Returns
         -------
         could_not_parse : list
             list of files that it could not parse
         """
-
-        if os.path.isdir(path):
-            print("loading {} with {}".format(path, parser))
-            could_not_parse = self.load_directory(parser, path)
-
-        else:
-            could_not_parse = self.load_discourse(parser, path)
+        if incremental and bulk_import:
+            raise CorpusIntegrityError('The offline importer can only be used to load new corpora.')
+        type_id_cache.clear()
+        with self.temporary_files.operation():
+            if incremental:
+                could_not_parse = self.load_incremental(parser, path)
+            elif os.path.isdir(path):
+                print("loading {} with {}".format(path, parser))
+                could_not_parse = self.load_directory(parser, path, bulk_import)
+
+            else:
+                could_not_parse = self.load_discourse(parser, path, bulk_import)
+        log = logging.getLogger('{}_loading'.format(self.corpus_name))
+        log.debug('Type id cache: {}'.format(type_id_cache.cache_info()))
+        type_id_cache.clear()
+        self.temporary_files.report()
         return could_not_parse
 
-    def load_discourse(self, parser, path):
+    def load_discourse(self, parser, path, bulk_import=False):
         """
         initializes, adds types, adds data, and finalizes import
 
@@ -145,6 +221,8 @@ class ImportContext(StructuredContext):
                 the type of parser used for corpus
         path : str
             the location of the discourse
+        bulk_import : bool
+            Flag for using the offline importer, defaults to False
 
         Returns
         -------
@@ -152,13 +230,14 @@ class ImportContext(StructuredContext):
 
         """
         data = parser.parse_discourse(path)
-        self.initialize_import(data.speakers, data.token_headers, data.hierarchy.subannotations)
-        self.add_types(*data.types(self.corpus_name))
-        self.add_discourse(data)
-        self.finalize_import(data)
+        self.initialize_import(data.speakers, data.token_headers, data.hierarchy.subannotations,
+                               dict(data.hierarchy.items()), bulk_import=bulk_import)
+        self.add_types(*data.types(self.corpus_name), bulk_import=bulk_import)
+        self.add_discourse(data, bulk_import=bulk_import)
+        self.finalize_import(data, bulk_import=bulk_import)
         return []
 
-    def load_directory(self, parser, path):
+    def load_directory(self, parser, path, bulk_import=False):
         """
         Checks if it can parse each file in dir,
         initializes, adds types, adds data, and finalizes import
@@ -169,6 +248,8 @@ class ImportContext(StructuredContext):
                 the type of parser used for corpus
         path : str
             the location of the directory
+        bulk_import : bool
+            Flag for using the offline importer, defaults to False
 
         Returns
         -------
@@ -177,6 +258,52 @@ class ImportContext(StructuredContext):
         """
         call_back = parser.call_back
         parser.call_back = None
+        file_tuples = self._find_files(parser, path, call_back)
+        if file_tuples is None:
+            return
+        information = self._parse_types(parser, [os.path.join(*t) for t in file_tuples], call_back)
+        if information is None:
+            return
+        speakers, types, type_headers, token_headers, subannotations = information
+        if call_back is not None:
+            call_back('Importing types...')
+        self.initialize_import(speakers, token_headers, subannotations, dict(parser.hierarchy.items()),
+                               bulk_import=bulk_import)
+        self.add_types(types, type_headers, bulk_import=bulk_import)
+
+        if call_back is not None:
+            call_back('Parsing files...')
+            call_back(0, len(file_tuples))
+            cur = 0
+        could_not_parse = []
+        for i, t in enumerate(file_tuples):
+            if parser.stop_check is not None and parser.stop_check():
+                return
+            root, filename = t
+            name = os.path.splitext(filename)[0]
+            if call_back is not None:
+                call_back('Parsing file {} of {} ({})...'.format(i + 1, len(file_tuples), name))
+                call_back(i)
+            path = os.path.join(root, filename)
+            try:
+                data = parser.parse_discourse(path)
+            except ParseError:
+                could_not_parse.append(path)
+                continue
+            self.add_discourse(data, bulk_import=bulk_import)
+        self.finalize_import(data, call_back, parser.stop_check, bulk_import=bulk_import)
+        parser.call_back = call_back
+        return could_not_parse
+
+    def _find_files(self, parser, path, call_back=None):
+        """
+        Find the files in a directory that match a parser
+
+        Returns
+        -------
+        list
+            Tuples of the directory and name of each file, or None if stopped
+        """
         if call_back is not None:
             call_back('Finding  files...')
             call_back(0, 0)
@@ -191,23 +318,31 @@ class ImportContext(StructuredContext):
         if len(file_tuples) == 0:
             raise (ParseError(
                 'No files in the specified directory matched the parser. Please check to make sure you have the correct parser.'))
+        return file_tuples
+
+    def _parse_types(self, parser, paths, call_back=None):
+        """
+        Parse the speakers and types of files
+
+        Returns
+        -------
+        tuple
+            Speakers, types, type headers, token headers and subannotations of the files, or None if stopped
+        """
         if call_back is not None:
             call_back('Parsing types...')
-            call_back(0, len(file_tuples))
-            cur = 0
+            call_back(0, len(paths))
         speakers = set()
         types = defaultdict(set)
         type_headers = None
         token_headers = None
         subannotations = None
-        for i, t in enumerate(file_tuples):
+        for i, path in enumerate(paths):
             if parser.stop_check is not None and parser.stop_check():
                 return
             if call_back is not None:
-                call_back('Parsing types from file {} of {}...'.format(i + 1, len(file_tuples)))
+                call_back('Parsing types from file {} of {}...'.format(i + 1, len(paths)))
                 call_back(i)
-            root, filename = t
-            path = os.path.join(root, filename)
             try:
                 information = parser.parse_information(path, self.corpus_name)
                 if not information['type_headers']:
@@ -217,36 +352,161 @@ class ImportContext(StructuredContext):
                 token_headers = information['token_headers']
                 subannotations = information['subannotations']
             except ParseError:
-                print (t)
+                print(path)
                 raise
-                continue
             for k, v in information['types'].items():
                 types[k].update(v)
+        return speakers, types, type_headers, token_headers, subannotations
+
+    def load_incremental(self, parser, path):
+        """
+        Import the discourses of source files that are new or have changed since they were imported into an
+        existing corpus, without reprocessing the rest of the corpus
+
+        Source files are fingerprinted in an import journal (:code:`import_journal.json` in the corpus's
+        directory), see :class:`~polyglotdb.io.importer.journal.ImportJournal`.  Discourses whose source files
+        have changed or have been deleted from the directory are removed before the new and changed files are
+        imported, new types are merged with the existing ones, and the pauses, utterances, syllables, ordinals
+        and utterance positions that the corpus has are encoded for the imported discourses, see
+        :meth:`encode_discourse_enrichments`.
+
+        Parameters
+        ----------
+        parser : :class:`~polyglotdb.io.parsers.BaseParser`
+            The type of parser used for corpus
+        path : str
+            The location of the corpus, either a directory or a single file
+
+        Returns
+        -------
+        could_not_parse : list
+            list of files that were not able to be parsed
+        """
+        call_back = parser.call_back
+        parser.call_back = None
+        if os.path.isdir(path):
+            file_tuples = self._find_files(parser, path, call_back)
+            if file_tuples is None:
+                return
+            paths = [os.path.join(*t) for t in file_tuples]
+        else:
+            paths = [path]
+        journal = ImportJournal(self)
+        discourses = self.discourses
+        if discourses:
+            # Annotation types cannot be added to an existing corpus, so fail before changing anything
+            check_parsed_hierarchy(self.hierarchy, parser.hierarchy)
+        pending, changed = journal.pending(paths, discourses)
+        if os.path.isdir(path):
+            changed += journal.removed(path, discourses)
+        for name in changed:
+            if call_back is not None:
+                call_back('Removing discourse {}...'.format(name))
+            self.remove_discourse(name)
+            journal.remove(name)
+        if not pending:
+            parser.call_back = call_back
+            return []
+
+        hierarchy = None
+        if discourses:
+            hierarchy = copy.deepcopy(self.hierarchy)
+        information = self._parse_types(parser, pending, call_back)
+        if information is None:
+            return
+        speakers, types, type_headers, token_headers, subannotations = information
         if call_back is not None:
             call_back('Importing types...')
-        self.initialize_import(speakers, token_headers, subannotations)
+        self.initialize_import(speakers | set(self.speakers), token_headers, subannotations,
+                               dict(parser.hierarchy.items()))
         self.add_types(types, type_headers)
 
         if call_back is not None:
             call_back('Parsing files...')
-            call_back(0, len(file_tuples))
-            cur = 0
+            call_back(0, len(pending))
         could_not_parse = []
-        for i, t in enumerate(file_tuples):
+        imported = {}
+        for i, p in enumerate(pending):
             if parser.stop_check is not None and parser.stop_check():
                 return
-            root, filename = t
-            name = os.path.splitext(filename)[0]
             if call_back is not None:
-                call_back('Parsing file {} of {} ({})...'.format(i + 1, len(file_tuples), name))
+                call_back('Parsing file {} of {} ({})...'.format(i + 1, len(pending), p))
                 call_back(i)
-            path = os.path.join(root, filename)
             try:
-                data = parser.parse_discourse(path)
+                data = parser.parse_discourse(p)
             except ParseError:
-                could_not_parse.append(path)
+                could_not_parse.append(p)
                 continue
             self.add_discourse(data)
-        self.finalize_import(data, call_back, parser.stop_check)
+            if hierarchy is not None:
+                merge_parsed_hierarchy(hierarchy, data.hierarchy)
+            imported[data.name] = p
+        if hierarchy is not None:
+            self.hierarchy = hierarchy
+        if imported:
+            self.finalize_import(data, call_back, parser.stop_check)
+            for name, p in sorted(imported.items()):
+                journal.record(name, p, save=False)
+            journal.save()
+            if hierarchy is not None:
+                self.encode_discourse_enrichments(sorted(imported), call_back=call_back,
+                                                  stop_check=parser.stop_check)
         parser.call_back = call_back
         return could_not_parse
+
+    def encode_discourse_enrichments(self, discourses, call_back=None, stop_check=None):
+        """
+        Encode the pauses, utterances, syllables, ordinals and utterance positions that the corpus has for
+        discourses that have been added to it, without resetting them for the rest of the corpus
+
+        Pauses, utterances and syllables are encoded with the parameters recorded in the import journal when
+        they were encoded for the whole corpus.  For enrichments encoded before the journal recorded them, the
+        pause words are the labels of the existing pauses, and the defaults are used for utterances and
+        syllables.  Acoustic measures of the discourses are not analyzed, see the ``incremental`` flag of the
+        acoustic analysis functions.
+
+        Parameters
+        ----------
+        discourses : list
+            Names of the discourses
+        call_back : callable, optional
+            Function to report progress
+        stop_check : callable, optional
+            Function to check whether to stop
+        """
+        log = logging.getLogger('{}_loading'.format(self.corpus_name))
+        journal = ImportJournal(self)
+        if self.has_pauses:
+            parameters = journal.enrichment('pauses')
+            if parameters is None:
+                statement = '''MATCH (n:{word_type}:pause:{corpus}) RETURN DISTINCT n.label AS label'''.format(
+                    word_type=self.word_name, corpus=self.cypher_safe_name)
+                parameters = {'pause_words': [x['label'] for x in self.execute_cypher(statement)]}
+                log.warning('Using the labels of existing pauses as pause words: {}'.format(
+                    ', '.join(sorted(parameters['pause_words']))))
+            self.encode_pauses(parameters['pause_words'], discourses=discourses, call_back=call_back,
+                               stop_check=stop_check)
+        if stop_check is not None and stop_check():
+            return
+        if self.has_utterances:
+            parameters = journal.enrichment('utterances')
+            if parameters is None:
+                parameters = {}
+                log.warning('No parameters recorded for utterances, using the defaults.')
+            self.encode_utterances(discourses=discourses, call_back=call_back, stop_check=stop_check,
+                                   **parameters)
+        if stop_check is not None and stop_check():
+            return
+        if self.has_syllables:
+            parameters = journal.enrichment('syllables')
+            if parameters is None:
+                parameters = {}
+                log.warning('No parameters recorded for syllables, using the defaults.')
+            self.encode_syllables(discourses=discourses, call_back=call_back, stop_check=stop_check,
+                                  **parameters)
+        if stop_check is not None and stop_check():
+            return
+        self.refresh_ordinals(self.hierarchy.highest_to_lowest, discourses=discourses, call_back=call_back,
+                              stop_check=stop_check)
+        if self.hierarchy.has_token_property(self.word_name, 'position_in_utterance'):
+            self.encode_utterance_position(discourses=discourses, call_back=call_back, stop_check=stop_check)
@@ -1,5 +1,46 @@
+from ..io.importer.journal import ImportJournal
 from .importable import ImportContext
 
+PAUSE_ADJACENCY_PROPERTIES = [('previous_speech_id', str), ('following_speech_id', str),
+                              ('previous_pause_duration', float), ('following_pause_duration', float)]
+
+
+def pause_adjacency(words):
+    """
+    Compute the neighbouring speech words and pause durations for a speaker's words in a discourse, in a single pass
+
+    Parameters
+    ----------
+    words : list
+        Dictionaries with 'id', 'begin', 'end' and 'pause' keys for all of a speaker's words in a discourse,
+        ordered by begin
+
+    Returns
+    -------
+    list
+        Dictionaries for each speech word with its 'id', 'previous_speech_id', 'following_speech_id',
+        'previous_pause_duration' and 'following_pause_duration' (the time from the beginning of the first pause
+        to the end of the last pause between two speech words, or None if there are no pauses between them)
+    """
+    rows = []
+    pauses = []
+    for w in words:
+        if w['pause']:
+            pauses.append(w)
+            continue
+        row = {'id': w['id'], 'previous_speech_id': None, 'following_speech_id': None,
+               'previous_pause_duration': None, 'following_pause_duration': None}
+        if rows:
+            row['previous_speech_id'] = rows[-1]['id']
+            rows[-1]['following_speech_id'] = w['id']
+            if pauses:
+                duration = pauses[-1]['end'] - pauses[0]['begin']
+                row['previous_pause_duration'] = duration
+                rows[-1]['following_pause_duration'] = duration
+        pauses = []
+        rows.append(row)
+    return rows
+
 
 class PauseContext(ImportContext):
     """
@@ -9,7 +50,7 @@ class PauseContext(ImportContext):
     def has_pauses(self):
         return 'pause' in self.hierarchy.subset_tokens[self.word_name]
 
-    def encode_pauses(self, pause_words, call_back=None, stop_check=None):
+    def encode_pauses(self, pause_words, discourses=None, call_back=None, stop_check=None):
         """
         Set words to be pauses, as opposed to speech.
 
@@ -18,8 +59,16 @@ class PauseContext(ImportContext):
         pause_words : str, list, tuple, or set
             Either a list of words that are pauses or a string containing
             a regular expression that specifies pause words
+        discourses : list, optional
+            Discourses to encode pauses in, such as newly imported ones, without resetting the pauses of the
+            rest of the corpus, defaults to all discourses
         """
-        self.reset_pauses()
+        if discourses is None:
+            self.reset_pauses()
+            if isinstance(pause_words, (list, tuple, set)):
+                ImportJournal(self).record_enrichment('pauses', {'pause_words': sorted(pause_words)})
+            else:
+                ImportJournal(self).record_enrichment('pauses', {'pause_words': pause_words})
         word = getattr(self, self.word_name)
         q = self.query_graph(word)
         if call_back is not None:
@@ -32,37 +81,104 @@ class PauseContext(ImportContext):
             q = q.filter(word.label.regex(pause_words))
         else:
             raise (NotImplementedError)
+        if discourses is not None:
+            q = q.filter(word.discourse.name.in_(discourses))
         q.set_pause()
 
         if call_back is not None:
             call_back('Finishing up...')
-        statement = '''MATCH (prec:{corpus}:{word_type}:speech)
-        WHERE not (prec)-[:precedes]->()
-        WITH prec
-        MATCH p = (prec)-[:precedes_pause*]->(foll:{corpus}:{word_type}:speech)
-        WITH prec, foll, p
-        WHERE NONE (x in nodes(p)[1..-1] where x:speech)
-        MERGE (prec)-[:precedes]->(foll)'''.format(corpus=self.cypher_safe_name,
-                                                   word_type=self.word_name)
-
-        self.execute_cypher(statement)
+        self.encode_pause_adjacency(discourses=discourses, call_back=call_back, stop_check=stop_check)
 
         statement = '''MATCH (w:{word_type}:{corpus}:speech)-[:spoken_in]->(d:Discourse:{corpus})
+            WHERE {{discourses}} IS NULL OR d.name IN {{discourses}}
             with d, max(w.end) as speech_end, min(w.begin) as speech_begin
             set d.speech_begin = speech_begin,
                 d.speech_end = speech_end
             return d'''.format(corpus=self.cypher_safe_name,
                                word_type=self.word_name)
 
-        results = self.execute_cypher(statement)
+        results = self.execute_cypher(statement, discourses=discourses)
         self.hierarchy.add_token_labels(self, self.word_name, ['pause'])
         self.hierarchy.add_discourse_properties(self, [('speech_begin', float), ('speech_end', float)])
         self.encode_hierarchy()
+        self.refresh_ordinals([self.word_name], discourses=discourses)
+
+    def encode_pause_adjacency(self, discourses=None, call_back=None, stop_check=None):
+        """
+        Encode the neighbouring speech words of each speech word and the durations of the pauses between them,
+        and link speech words separated by pauses with ``precedes`` relationships
+
+        The words of each speaker in a discourse are scanned once in order, and the results are stored as the
+        ``previous_speech_id``, ``following_speech_id``, ``previous_pause_duration`` and
+        ``following_pause_duration`` properties of words, which pause queries and utterance encoding use rather
+        than matching paths of pauses.  This is run as part of :meth:`encode_pauses`.
+
+        Parameters
+        ----------
+        discourses : list, optional
+            Discourses to encode pause adjacency in, defaults to all discourses
+        """
+        set_statement = '''UNWIND {{data}} AS row
+        MATCH (n:{word_type}:{corpus}:speech {{id: row.id}})
+        SET n.previous_speech_id = row.previous_speech_id, n.following_speech_id = row.following_speech_id,
+        n.previous_pause_duration = row.previous_pause_duration,
+        n.following_pause_duration = row.following_pause_duration'''.format(corpus=self.cypher_safe_name,
+                                                                            word_type=self.word_name)
+        precedes_statement = '''UNWIND {{data}} AS row
+        MATCH (prec:{word_type}:{corpus}:speech {{id: row.id}}),
+        (foll:{word_type}:{corpus}:speech {{id: row.following_speech_id}})
+        MERGE (prec)-[:precedes]->(foll)'''.format(corpus=self.cypher_safe_name, word_type=self.word_name)
+        self.hierarchy.add_token_properties(self, self.word_name, PAUSE_ADJACENCY_PROPERTIES)
+        if discourses is None:
+            discourses = self.discourses
+        if call_back is not None:
+            call_back('Encoding pause adjacency...')
+            call_back(0, len(discourses))
+        for i, d in enumerate(discourses):
+            if stop_check is not None and stop_check():
+                return
+            if call_back is not None:
+                call_back(i)
+            data = []
+            for words in self.get_word_sequences(d).values():
+                data.extend(pause_adjacency(words))
+            self.execute_cypher(set_statement, data=data)
+            self.execute_cypher(precedes_statement, data=[x for x in data if x['following_pause_duration'] is not None])
+        self.encode_hierarchy()
+
+    def get_word_sequences(self, discourse):
+        """
+        Get the words of each speaker in a discourse in order, with a single query
+
+        Parameters
+        ----------
+        discourse : str
+            Name of the discourse
+
+        Returns
+        -------
+        dict
+            Lists of records with 'id', 'begin', 'end' and 'pause' keys ordered by begin, keyed by speaker name
+        """
+        statement = '''MATCH (w:{word_type}:{corpus})-[:spoken_in]->(d:Discourse:{corpus}),
+        (w)-[:spoken_by]->(s:Speaker:{corpus})
+        WHERE d.name = {{discourse}}
+        RETURN s.name AS speaker, w.id AS id, w.begin AS begin, w.end AS end, w:pause AS pause
+        ORDER BY w.begin'''.format(corpus=self.cypher_safe_name, word_type=self.word_name)
+        speaker_words = {}
+        for r in self.execute_cypher(statement, discourse=discourse):
+            speaker_words.setdefault(r['speaker'], []).append(r)
+        return speaker_words
+
+    @property
+    def has_pause_adjacency(self):
+        return self.hierarchy.has_token_property(self.word_name, 'following_speech_id')
 
     def reset_pauses(self):
         """
         Revert all words marked as pauses to regular words marked as speech
         """
+        had_pauses = 'pause' in self.hierarchy.subset_tokens.get(self.word_name, set())
         statement = '''MATCH (n:{corpus}:{word_type}:speech)-[r:precedes]->(m:{corpus}:{word_type}:speech)
         WHERE (n)-[:precedes_pause]->()
         DELETE r'''.format(corpus=self.cypher_safe_name, word_type=self.word_name)
@@ -77,9 +193,14 @@ class PauseContext(ImportContext):
         SET n :speech
         REMOVE n:pause'''.format(corpus=self.cypher_safe_name)
         self.execute_cypher(statement)
+        if self.has_pause_adjacency:
+            self.hierarchy.remove_token_properties(self, self.word_name, [x[0] for x in PAUSE_ADJACENCY_PROPERTIES])
+            self.encode_hierarchy()
         try:
             self.hierarchy.annotation_types.remove('pause')
             self.hierarchy.subset_tokens[self.word_name].remove('pause')
             self.encode_hierarchy()
         except KeyError:
             pass
+        if had_pauses:
+            self.refresh_ordinals([self.word_name])
@@ -1,5 +1,6 @@
 from ..io.importer import (speaker_data_to_csvs, import_speaker_csvs,
-                           discourse_data_to_csvs, import_discourse_csvs)
+                           discourse_data_to_csvs, import_discourse_csvs,
+                           use_unwind, import_speaker_data, import_discourse_data)
 from .audio import AudioContext
 from ..io.enrichment.spoken import enrich_speakers_from_csv, enrich_discourses_from_csv, parse_file
 
@@ -82,8 +83,11 @@ class SpokenContext(AudioContext):
         speakers = set(self.speakers)
         speaker_data = {k: v for k, v in speaker_data.items() if k in speakers}
 
-        speaker_data_to_csvs(self, speaker_data)
-        import_speaker_csvs(self, type_data)
+        if use_unwind(self, speaker_data):
+            import_speaker_data(self, speaker_data, type_data)
+        else:
+            speaker_data_to_csvs(self, speaker_data)
+            import_speaker_csvs(self, type_data)
         self.hierarchy.add_speaker_properties(self, type_data.items())
         self.encode_hierarchy()
 
@@ -124,8 +128,11 @@ class SpokenContext(AudioContext):
         discourses = set(self.discourses)
         print(discourses, discourse_data)
         discourse_data = {k: v for k, v in discourse_data.items() if k in discourses}
-        discourse_data_to_csvs(self, discourse_data)
-        import_discourse_csvs(self, type_data)
+        if use_unwind(self, discourse_data):
+            import_discourse_data(self, discourse_data, type_data)
+        else:
+            discourse_data_to_csvs(self, discourse_data)
+            import_discourse_csvs(self, type_data)
         self.hierarchy.add_discourse_properties(self, type_data.items())
         self.encode_hierarchy()
 
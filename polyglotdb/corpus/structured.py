@@ -3,6 +3,7 @@ from ..query import value_for_cypher
 from ..query.annotations.query import SplitQuery
 from ..query.metadata.query import MetaDataQuery
 from ..structure import Hierarchy
+from ..indexes import index_key
 from .base import BaseContext
 
 
@@ -240,6 +241,115 @@ class StructuredContext(BaseContext):
         self.hierarchy.add_token_properties(self, lower_annotation_type, [(name, float)])
         self.encode_hierarchy()
 
+    def encode_ordinals(self, annotation_types=None, discourses=None, call_back=None, stop_check=None):
+        """
+        Encodes the ordinal position of tokens in their speaker's sequence of speech tokens in a discourse
+        (``sequence_id`` and ``sequence_ordinal``), and in each higher annotation containing them
+        (i.e., ``ordinal_in_word`` for phones)
+
+        Once encoded, queries on preceding and following annotations look tokens up by an indexed
+        sequence ordinal rather than following ``precedes`` relationships, and position attributes
+        (as used in ``encode_position``) are read from the ordinal properties.
+
+        Parameters
+        ----------
+        annotation_types : list, optional
+            Annotation types to encode ordinals for, defaults to all annotation types
+        discourses : list, optional
+            Discourses to encode ordinals for, defaults to all discourses
+        call_back : callable, optional
+            Function to report progress
+        stop_check : callable, optional
+            Function to check whether to stop
+        """
+        if annotation_types is None:
+            annotation_types = self.hierarchy.highest_to_lowest
+        sequence_statement = '''MATCH (n:{annotation_type}:speech:{corpus_name})-[:spoken_in]->(d:Discourse:{corpus_name})
+        WHERE d.name = {{discourse}}
+        MATCH (n)-[:spoken_by]->(s:Speaker:{corpus_name})
+        WITH d, s, n
+        ORDER BY n.begin
+        WITH d, s, collect(n) AS nodes
+        UNWIND range(0, size(nodes) - 1) AS i
+        WITH nodes[i] AS n, i, d.name + '|' + s.name AS sequence_id
+        SET n.sequence_id = sequence_id, n.sequence_ordinal = i + 1'''
+        higher_statement = '''MATCH (n:{annotation_type}:{corpus_name})-[:spoken_in]->(d:Discourse:{corpus_name})
+        WHERE d.name = {{discourse}}
+        MATCH (n)-[:contained_by{depth}]->(h:{higher_type}:{corpus_name})
+        WITH h, n
+        ORDER BY n.begin
+        WITH h, collect(n) AS nodes
+        UNWIND range(0, size(nodes) - 1) AS i
+        WITH nodes[i] AS n, i
+        SET n.ordinal_in_{higher_type} = i + 1'''
+        if discourses is None:
+            discourses = self.discourses
+        if call_back is not None:
+            call_back('Encoding ordinals...')
+            call_back(0, len(annotation_types) * len(discourses))
+        cur = 0
+        for at in annotation_types:
+            higher_types = self.hierarchy.get_higher_types(at)
+            properties = [('sequence_id', str), ('sequence_ordinal', int)]
+            properties += [('ordinal_in_{}'.format(h), int) for h in higher_types]
+            self.hierarchy.add_token_properties(self, at, properties)
+            self.schema_manager.ensure([index_key(at, 'sequence_id', 'sequence_ordinal')])
+            statements = [sequence_statement.format(annotation_type=at, corpus_name=self.cypher_safe_name)]
+            for h in higher_types:
+                depth = self.hierarchy.get_depth(at, h)
+                depth_string = ''
+                if depth > 1:
+                    depth_string = '*{}'.format(depth)
+                statements.append(higher_statement.format(annotation_type=at, higher_type=h, depth=depth_string,
+                                                          corpus_name=self.cypher_safe_name))
+            for d in discourses:
+                if stop_check is not None and stop_check():
+                    return
+                if call_back is not None:
+                    call_back(cur)
+                    cur += 1
+                for statement in statements:
+                    self.execute_cypher(statement, discourse=d)
+        self.encode_hierarchy()
+
+    def reset_ordinals(self, annotation_types=None):
+        """
+        Removes encoded ordinals, so that queries on preceding and following annotations follow ``precedes``
+        relationships again
+
+        Parameters
+        ----------
+        annotation_types : list, optional
+            Annotation types to remove ordinals from, defaults to all annotation types
+        """
+        if annotation_types is None:
+            annotation_types = self.hierarchy.highest_to_lowest
+        for at in annotation_types:
+            properties = [x[0] for x in self.hierarchy.token_properties.get(at, set())
+                          if x[0] in ('sequence_id', 'sequence_ordinal') or x[0].startswith('ordinal_in_')]
+            if properties:
+                self.hierarchy.remove_token_properties(self, at, properties)
+        self.encode_hierarchy()
+
+    def refresh_ordinals(self, annotation_types, discourses=None, call_back=None, stop_check=None):
+        """
+        Re-encodes ordinals for any of the annotation types that have them, after changes to the
+        precedence or containment of tokens (i.e., encoding pauses or utterances)
+
+        Parameters
+        ----------
+        annotation_types : list
+            Annotation types that have changed
+        discourses : list, optional
+            Discourses that have changed, which are re-encoded without resetting the ordinals of the rest of
+            the corpus, defaults to all discourses
+        """
+        to_encode = [x for x in annotation_types if self.hierarchy.has_token_property(x, 'sequence_ordinal')]
+        if to_encode:
+            if discourses is None:
+                self.reset_ordinals(to_encode)
+            self.encode_ordinals(to_encode, discourses=discourses, call_back=call_back, stop_check=stop_check)
+
     def encode_rate(self, higher_annotation_type, lower_annotation_type, name, subset=None):
         """
         Encodes the rate of the lower type in the higher type
@@ -4,6 +4,14 @@ from .phonological import PhonologicalContext
 
 from ..query.base.func import Average
 
+summary_statistic_functions = {'count': 'count({})', 'mean': 'avg({})', 'sd': 'stdev({})',
+                               'median': 'percentileDisc({}, 0.5)'}
+
+
+def quantile_name(quantile):
+    """Name of a quantile statistic, i.e. 'q25' for 0.25 and 'q2_5' for 0.025"""
+    return 'q{:g}'.format(quantile * 100).replace('.', '_')
+
 
 class SummarizedContext(PhonologicalContext):
     """
@@ -43,7 +51,7 @@ class SummarizedContext(PhonologicalContext):
             percent = ", .5"
         elif statistic == "baseline":
             baseline = True
-            result = self.baseline_duration(annotation_type, speaker)
+            result = self.baseline_duration(annotation_type, speaker, by_speaker)
         else:
             raise (AttributeError(
                 "The statistic {} is not a valid option. Options are mean, median, stdev, or baseline".format(
@@ -74,68 +82,113 @@ class SummarizedContext(PhonologicalContext):
 
         return result
 
-    def baseline_duration(self, annotation, speaker=None):
+    def baseline_duration(self, annotation, speaker=None, by_speaker=False, call_back=None, stop_check=None):
         """
         Get the baseline duration of each word in corpus.
         Baseline duration is determined by summing the average durations of constituent phones for a word.
         If there is no underlying transcription available, the longest duration is considered the baseline.
 
+        Phones are found through the annotation's containment hierarchy, one discourse at a time, and baselines
+        are written back in batches.
+
         Parameters
         ----------
+        annotation : str
+            the annotation type to get baseline durations for
         speaker : str
-            a speaker name, if desired (defaults to None)
+            a speaker name, if desired (defaults to None), in which case average phone durations are calculated
+            from, and baselines are encoded for, that speaker only
+        by_speaker : bool
+            if True, average phone durations are calculated for each speaker, and each annotation's baseline uses
+            its speaker's averages, encoded as ``baseline_duration_by_speaker`` (defaults to False)
+        call_back : callable
+            Function to report progress
+        stop_check : callable
+            Function to check whether to stop
+
         Returns
         -------
         word_totals : dict
-            a dictionary of words and baseline durations
+            a dictionary of words and baseline durations, or of speakers and dictionaries of words and baseline
+            durations if ``by_speaker`` is True
         """
 
         index = 'label'
-        word = getattr(self, self.word_name)
-        phone = getattr(self, self.phone_name)
-        # if annotation == 'word':
-        #     annotation = word
         if annotation == 'utterance':
             ## TODO: find a good key for utterances (labels too long anyway and are None)
             index = 'id'
-            if not self.hierarchy.has_type_property('utterance', 'label'):
-                raise (AttributeError('Annotation type \'{}\' not found.'.format(annotation)))
-        if annotation == 'syllable':
-            if not self.hierarchy.has_type_property('syllable', 'label'):
-                raise (AttributeError('Annotation type \'{}\' not found.'.format(annotation)))
-
-        speaker_statement = '''
-MATCH (m:phone:{corpus_name})-[:spoken_by]->(s:Speaker:{corpus_name}) where s.name = '{speaker}'
-with m.{index} as target, avg(m.end-m.begin) as dur 
-with target,dur
-match (p:phone:{corpus_name})
-where p.{index} = target set p.average_duration = dur 
-with p as phone
-match(n:{higher_annotation}:{corpus_name}) where phone.begin>=n.begin and phone.end<=n.end
-with n,phone with n, n.{index} as target, sum(phone.average_duration) as baseline 
-set n.baseline_duration = baseline return n.{index}, n.baseline_duration'''.format(higher_annotation=annotation, \
-                                                                                   corpus_name=self.cypher_safe_name,
-                                                                                   index=index, speaker=speaker)
-
-        statement = '''
-MATCH (m:phone:{corpus_name})
-with m.{index} as target, avg(m.end-m.begin) as dur 
-with target,dur match (p:phone:{corpus_name}) 
-where p.{index} = target set p.average_duration = dur 
-with p as phone
-match(n:{higher_annotation}:{corpus_name}) where phone.begin>=n.begin and phone.end<=n.end
-with n,phone
-with n, n.{index} as target, sum(phone.average_duration) as baseline
-set n.baseline_duration = baseline return n.{index}, n.baseline_duration'''.format(higher_annotation=annotation, \
-                                                                                   corpus_name=self.cypher_safe_name,
-                                                                                   index=index)
+        if annotation not in self.hierarchy.annotation_types or \
+                annotation not in self.hierarchy.get_higher_types(self.phone_name):
+            raise (AttributeError('Annotation type \'{}\' not found.'.format(annotation)))
+        depth = self.hierarchy.get_depth(self.phone_name, annotation)
+        property_name = 'baseline_duration'
+        if by_speaker:
+            property_name = 'baseline_duration_by_speaker'
+        speaker_filter = ''
         if speaker is not None:
-            statement = speaker_statement
+            speaker_filter = 'WHERE s.name = {speaker}'
+
+        statement = '''MATCH (p:{phone_name}:{corpus_name})-[:spoken_by]->(s:Speaker:{corpus_name})
+        {speaker_filter}
+        RETURN s.name AS speaker, p.label AS label, sum(p.end - p.begin) AS total, count(p) AS count'''.format(
+            phone_name=self.phone_name, corpus_name=self.cypher_safe_name, speaker_filter=speaker_filter)
+        totals = {}
+        counts = {}
+        for r in self.execute_cypher(statement, speaker=speaker):
+            key = (r['speaker'] if by_speaker else None, r['label'])
+            totals[key] = totals.get(key, 0) + r['total']
+            counts[key] = counts.get(key, 0) + r['count']
+        average_durations = {k: v / counts[k] for k, v in totals.items()}
+
+        if by_speaker or speaker is not None:
+            phone_statement = '''UNWIND {{data}} AS row
+            MATCH (p:{phone_name}:{corpus_name} {{label: row.label}})-[:spoken_by]->(s:Speaker:{corpus_name})
+            WHERE s.name = row.speaker
+            SET p.average_duration = row.duration'''
+            data = [{'speaker': k[0] if by_speaker else speaker, 'label': k[1], 'duration': v}
+                    for k, v in average_durations.items()]
+        else:
+            phone_statement = '''UNWIND {{data}} AS row
+            MATCH (p:{phone_name}:{corpus_name} {{label: row.label}})
+            SET p.average_duration = row.duration'''
+            data = [{'label': k[1], 'duration': v} for k, v in average_durations.items()]
+        self.execute_cypher(phone_statement.format(phone_name=self.phone_name, corpus_name=self.cypher_safe_name),
+                            data=data)
 
-        res = self.execute_cypher(statement)
+        self.hierarchy.add_token_properties(self, annotation, [(property_name, float)])
+        statement = '''MATCH (n:{annotation}:{corpus_name})-[:spoken_in]->(d:Discourse:{corpus_name}),
+        (n)-[:spoken_by]->(s:Speaker:{corpus_name})
+        WHERE d.name = {{discourse}}{speaker_filter}
+        WITH n, s
+        MATCH (n)<-[:contained_by*{depth}]-(p:{phone_name}:{corpus_name})
+        RETURN n.id AS id, n.{index} AS key, s.name AS speaker, collect(p.label) AS phones'''.format(
+            annotation=annotation, corpus_name=self.cypher_safe_name, phone_name=self.phone_name, index=index,
+            depth=depth, speaker_filter=' AND s.name = {speaker}' if speaker is not None else '')
+        set_statement = '''UNWIND {{data}} AS row
+        MATCH (n:{annotation}:{corpus_name} {{id: row.id}})
+        SET n.{property_name} = row.baseline'''.format(annotation=annotation, corpus_name=self.cypher_safe_name,
+                                                         property_name=property_name)
+        discourses = self.discourses
+        if call_back is not None:
+            call_back('Encoding baseline durations...')
+            call_back(0, len(discourses))
         result = {}
-        for c in res:
-            result.update({c[0]: c[1]})
+        for i, d in enumerate(discourses):
+            if stop_check is not None and stop_check():
+                break
+            if call_back is not None:
+                call_back(i)
+            data = []
+            for r in self.execute_cypher(statement, discourse=d, speaker=speaker):
+                s = r['speaker'] if by_speaker else None
+                baseline = sum(average_durations.get((s, x), 0) for x in r['phones'])
+                data.append({'id': r['id'], 'baseline': baseline})
+                if by_speaker:
+                    result.setdefault(s, {})[r['key']] = baseline
+                else:
+                    result[r['key']] = baseline
+            self.execute_cypher(set_statement, data=data)
+        self.encode_hierarchy()
         return result
 
     # SPEAKER
@@ -221,12 +274,114 @@ set n.baseline_duration = baseline return n.{index}, n.baseline_duration'''.form
         self.hierarchy.add_type_properties(self, annotation_type, [('_'.join([name, property_name]), float)])
         self.encode_hierarchy()
 
+    def encode_summary_statistics(self, annotation_type, property_names, statistics=None, quantiles=None,
+                                  by_speaker=False):
+        """
+        Encode several statistics of several properties of an annotation type, grouped by label and optionally
+        speaker, with a single aggregation query
+
+        Statistics are encoded as properties of the annotation type (i.e., ``mean_duration`` on phone types), or
+        of the relationship between the annotation type and each speaker if ``by_speaker`` is True, and are used by
+        :meth:`encode_relativized` and :meth:`encode_baseline` rather than being recalculated.
+
+        Parameters
+        ----------
+        annotation_type : str
+            Annotation type to summarize
+        property_names : list
+            Properties to summarize, where 'duration' is calculated from begin and end
+        statistics : list, optional
+            Statistics to encode, from 'count', 'mean', 'sd' and 'median', defaults to all of them
+        quantiles : list, optional
+            Quantiles between 0 and 1 to encode as well, named like ``q25_duration`` for 0.25
+        by_speaker : bool
+            Flag for grouping by speaker as well as by label, defaults to False
+
+        Returns
+        -------
+        dict
+            Dictionaries of statistic names and values, keyed by label, or by speaker and label tuples
+            if ``by_speaker`` is True
+        """
+        if statistics is None:
+            statistics = ['count', 'mean', 'sd', 'median']
+        if quantiles is None:
+            quantiles = []
+        if isinstance(property_names, str):
+            property_names = [property_names]
+        aggregates = []
+        names = []
+        for property_name in property_names:
+            if property_name == 'duration':
+                property = 'a.end - a.begin'
+            else:
+                property = 'a.{}'.format(property_name)
+            for statistic in statistics:
+                if statistic not in summary_statistic_functions:
+                    raise (AttributeError(
+                        "The statistic {} is not a valid option. Options are {}".format(
+                            statistic, ', '.join(sorted(summary_statistic_functions)))))
+                names.append('{}_{}'.format(statistic, property_name))
+                aggregates.append(summary_statistic_functions[statistic].format(property))
+            for q in quantiles:
+                names.append('{}_{}'.format(quantile_name(q), property_name))
+                aggregates.append('percentileDisc({}, {})'.format(property, float(q)))
+        aggregate_string = ', '.join('{} AS {}'.format(a, n) for a, n in zip(aggregates, names))
+        if by_speaker:
+            set_string = ', '.join('r.{0} = {0}'.format(n) for n in names)
+            statement = '''MATCH (a_type:{annotation_type}_type:{corpus_name})<-[:is_a]-(a:{annotation_type}:{corpus_name})-[:spoken_by]->(s:Speaker:{corpus_name})
+            WITH a_type, s, {aggregates}
+            MERGE (a_type)-[r:spoken_by]->(s)
+            SET {sets}
+            RETURN s.name AS speaker, a_type.label AS label, {names}'''
+        else:
+            set_string = ', '.join('a_type.{0} = {0}'.format(n) for n in names)
+            statement = '''MATCH (a_type:{annotation_type}_type:{corpus_name})<-[:is_a]-(a:{annotation_type}:{corpus_name})
+            WITH a_type, {aggregates}
+            SET {sets}
+            RETURN a_type.label AS label, {names}'''
+        statement = statement.format(annotation_type=annotation_type, corpus_name=self.cypher_safe_name,
+                                     aggregates=aggregate_string, sets=set_string, names=', '.join(names))
+        results = {}
+        for r in self.execute_cypher(statement):
+            key = (r['speaker'], r['label']) if by_speaker else r['label']
+            results[key] = {n: r[n] for n in names}
+        if not by_speaker:
+            self.hierarchy.add_type_properties(self, annotation_type,
+                                               [(n, int if n.startswith('count_') else float) for n in names])
+            self.encode_hierarchy()
+        return results
+
+    def has_summary_statistics(self, annotation_type, names, by_speaker=False):
+        """
+        Check whether statistics have been encoded for an annotation type
+
+        Parameters
+        ----------
+        annotation_type : str
+            Annotation type
+        names : list
+            Statistic names, i.e. 'mean_duration'
+        by_speaker : bool
+            Flag for checking statistics encoded by speaker, defaults to False
+
+        Returns
+        -------
+        bool
+            True if all the statistics are encoded
+        """
+        if not by_speaker:
+            return all(self.hierarchy.has_type_property(annotation_type, n) for n in names)
+        statement = '''MATCH (a_type:{annotation_type}_type:{corpus_name})-[r:spoken_by]->(s:Speaker:{corpus_name})
+        WHERE {conditions}
+        RETURN 1 LIMIT 1'''.format(annotation_type=annotation_type, corpus_name=self.cypher_safe_name,
+                                   conditions=' AND '.join('exists(r.{})'.format(n) for n in names))
+        return len(list(self.execute_cypher(statement))) > 0
+
     def encode_baseline(self, annotation_type, property_name, by_speaker=False):
         if by_speaker:
-            exists_statement = '''MATCH (a_type:{annotation_type}_type:{corpus_name})-[:spoken_by]->(s:Speaker:{corpus_name})
-                            RETURN 1 LIMIT 1'''.format(annotation_type=annotation_type, corpus_name=self.cypher_safe_name)
-            if len(list(self.execute_cypher(exists_statement))) == 0:
-                self.encode_measure('duration', 'mean', 'phone', by_speaker)
+            if not self.has_summary_statistics('phone', ['mean_duration'], by_speaker):
+                self.encode_summary_statistics('phone', ['duration'], ['mean'], by_speaker=by_speaker)
             statement = '''MATCH (a:{annotation_type}:{corpus_name})-[:spoken_by]->(s:Speaker:{corpus_name})
             with a, s
             MATCH (a)<-[:contained_by*]-(p:{phone_name}:{corpus_name})-[:is_a]->(pt:{phone_name}_type:{corpus_name})-[r:spoken_by]->(s)
@@ -238,8 +393,8 @@ set n.baseline_duration = baseline return n.{index}, n.baseline_duration'''.form
             self.execute_cypher(statement)
             self.hierarchy.add_token_properties(self, annotation_type, [('baseline_duration_by_speaker', float)])
         else:
-            if not self.hierarchy.has_type_property('phone', 'mean_duration'):
-                self.encode_measure('duration', 'mean', 'phone', by_speaker)
+            if not self.has_summary_statistics('phone', ['mean_duration']):
+                self.encode_summary_statistics('phone', ['duration'], ['mean'])
             statement = '''MATCH (a:{annotation_type}:{corpus_name})
             with a
             MATCH (a)<-[:contained_by*]-(p:{phone_name}:{corpus_name})-[:is_a]->(pt:{phone_name}_type:{corpus_name})
@@ -257,22 +412,10 @@ set n.baseline_duration = baseline return n.{index}, n.baseline_duration'''.form
             property_descriptor = '(p.end - p.begin)'
         else:
             property_descriptor = 'p.{}'.format(property_name)
+        statistic_names = ['mean_{}'.format(property_name), 'sd_{}'.format(property_name)]
+        if not self.has_summary_statistics('phone', statistic_names, by_speaker):
+            self.encode_summary_statistics('phone', [property_name], ['mean', 'sd'], by_speaker=by_speaker)
         if by_speaker:
-            exists_statement = '''MATCH (a_type:{annotation_type}_type:{corpus_name})-[:spoken_by]->(s:Speaker:{corpus_name})
-                            RETURN 1 LIMIT 1'''.format(annotation_type=annotation_type, corpus_name=self.cypher_safe_name)
-            res = list(self.execute_cypher(exists_statement))
-            if len(res) == 0:
-                self.encode_measure(property_name, 'mean', 'phone', by_speaker)
-                self.encode_measure(property_name, 'sd', 'phone', by_speaker)
-            else:
-                try:
-                    res[0]['mean_{}'.format(property_name)]
-                except KeyError:
-                    self.encode_measure(property_name, 'mean', 'phone', by_speaker)
-                try:
-                    res[0]['sd_{}'.format(property_name)]
-                except KeyError:
-                    self.encode_measure(property_name, 'sd', 'phone', by_speaker)
             if annotation_type == self.phone_name:
                 statement = '''MATCH (p:{annotation_type}:{corpus_name})-[:spoken_by]->(s:Speaker:{corpus_name})
                 with p, s
@@ -297,10 +440,6 @@ set n.baseline_duration = baseline return n.{index}, n.baseline_duration'''.form
             self.hierarchy.add_token_properties(self, annotation_type,
                                                 [('relativized_{}_by_speaker'.format(property_name), float)])
         else:
-            if not self.hierarchy.has_type_property('phone', 'mean_{}'.format(property_name)):
-                self.encode_measure(property_name, 'mean', 'phone', by_speaker)
-            if not self.hierarchy.has_type_property('phone', 'sd_{}'.format(property_name)):
-                self.encode_measure(property_name, 'sd', 'phone', by_speaker)
             if annotation_type == self.phone_name:
                 statement = '''MATCH (p:{annotation_type}:{corpus_name})
                 with p
@@ -1,16 +1,17 @@
-from uuid import uuid1
-
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from ..io.importer import (syllables_data_to_csvs, import_syllable_csv,
                            nonsyls_data_to_csvs, import_nonsyl_csv,
                            create_syllabic_csvs, create_nonsyllabic_csvs,
-                           syllables_enrichment_data_to_csvs, import_syllable_enrichment_csvs)
+                           syllables_enrichment_data_to_csvs, import_syllable_enrichment_csvs,
+                           import_precedence_csvs, use_unwind, import_syllable_enrichment_data)
+from ..io.importer.journal import ImportJournal
 
 # from ..io.importer import syllables_enrichment_data_to_csvs
-from ..io.helper import make_type_id
 
-from ..syllabification.probabilistic import norm_count_dict, split_nonsyllabic_prob, split_ons_coda_prob
-from ..syllabification.maxonset import split_nonsyllabic_maxonset, split_ons_coda_maxonset
+from ..syllabification.main import (Syllabifier, combine_cache_info, format_cache_info, _initialize_worker,
+                                    _syllabify_in_worker)
 from .utterance import UtteranceContext
 
 
@@ -153,7 +154,37 @@ return coda, count(coda) as freq'''.format(corpus_name=self.cypher_safe_name,
     def has_syllables(self):
         return 'syllable' in self.hierarchy.annotation_types
 
-    def encode_syllables(self, algorithm='maxonset', syllabic_label='syllabic', call_back=None, stop_check=None):
+    def compile_syllabifier(self, algorithm='maxonset', syllabic_label='syllabic', compile=True):
+        """
+        Create a syllabifier from the corpus's syllabic segments and onset and coda counts
+
+        Parameters
+        ----------
+        algorithm : str
+            Either 'maxonset' or 'probabilistic', defaults to 'maxonset'
+        syllabic_label : str
+            Label of the syllabic segment subset, defaults to 'syllabic'
+        compile : bool
+            Flag for computing the splits of clusters made up of observed codas and onsets ahead of time,
+            defaults to True
+
+        Returns
+        -------
+        :class:`~polyglotdb.syllabification.main.Syllabifier`
+            Syllabifier with a batch API over phone sequences
+        """
+        onset_counts = self.find_onsets(syllabic_label=syllabic_label)
+        coda_counts = None
+        if algorithm == 'probabilistic' or compile:
+            coda_counts = self.find_codas(syllabic_label=syllabic_label)
+        statement = '''MATCH (n:{}:{}) return n.label as label'''.format(self.cypher_safe_name, make_label_safe_for_cypher(syllabic_label))
+        res = self.execute_cypher(statement)
+        syllabics = set(x['label'] for x in res)
+        return Syllabifier.from_counts(syllabics, onset_counts, coda_counts, algorithm=algorithm,
+                                       corpus_name=self.corpus_name, compile=compile)
+
+    def encode_syllables(self, algorithm='maxonset', syllabic_label='syllabic', multiprocessing=False,
+                         num_jobs=None, discourses=None, call_back=None, stop_check=None):
         """
         Encodes syllables to a corpus
 
@@ -161,169 +192,153 @@ return coda, count(coda) as freq'''.format(corpus_name=self.cypher_safe_name,
         ----------
         algorithm : str defaults to 'probabilistic'
             determines which algorithm will be used to encode syllables
+        multiprocessing : bool
+            If True, the words of each speaker are streamed one discourse at a time and syllabified in a process
+            pool, defaults to False
+        num_jobs : int, optional
+            Number of processes to use for multiprocessing, defaults to the number of CPUs
+        discourses : list, optional
+            Discourses to encode syllables in, such as newly imported ones, without resetting the syllables of
+            the rest of the corpus, whose onsets and codas are used for syllabification.  Defaults to all
+            discourses
         """
 
-        self.reset_syllables(call_back, stop_check)
-
-        onsets = self.find_onsets(syllabic_label=syllabic_label)
-        if algorithm == 'probabilistic':
-            onsets = norm_count_dict(onsets, onset=True)
-            codas = self.find_codas(syllabic_label=syllabic_label)
-            codas = norm_count_dict(codas, onset=False)
-        elif algorithm == 'maxonset':
-            onsets = set(onsets.keys())
-        else:
+        if algorithm not in ['maxonset', 'probabilistic']:
             raise (NotImplementedError)
+        partial = discourses is not None
+        if not partial:
+            self.reset_syllables(call_back, stop_check)
+            ImportJournal(self).record_enrichment('syllables', {'algorithm': algorithm,
+                                                                'syllabic_label': syllabic_label})
 
-        statement = '''MATCH (n:{}:{}) return n.label as label'''.format(self.cypher_safe_name, make_label_safe_for_cypher(syllabic_label))
-        res = self.execute_cypher(statement)
-        syllabics = set(x['label'] for x in res)
-
-        word_type = getattr(self, self.word_name)
-        phone_type = getattr(word_type, self.phone_name)
+        syllabifier = self.compile_syllabifier(algorithm, syllabic_label, compile=algorithm == 'probabilistic')
 
         create_syllabic_csvs(self)
         create_nonsyllabic_csvs(self)
 
-        splits = self.speakers
+        if partial:
+            splits = sorted(set(s for d in discourses for s in self.get_speakers_in_discourse(d)))
+        else:
+            splits = self.speakers
         process_string = 'Processing speaker {} of {} ({})...'
         if call_back is not None:
             call_back(0, len(splits))
 
-        for i, s in enumerate(splits):
-            if stop_check is not None and stop_check():
-                break
+        if multiprocessing:
+            if not self._syllabify_in_pool(syllabifier, splits, num_jobs, discourses, call_back, stop_check):
+                return
+        else:
+            word_type = getattr(self, self.word_name)
+            phone_type = getattr(word_type, self.phone_name)
+            for i, s in enumerate(splits):
+                if stop_check is not None and stop_check():
+                    break
+                if call_back is not None:
+                    call_back(i)
+                    call_back(process_string.format(i, len(splits), s))
+                q = self.query_graph(word_type)
+                q = q.filter(word_type.speaker.name == s)
+                if partial:
+                    q = q.filter(word_type.discourse.name.in_(discourses))
+                q = q.order_by(word_type.discourse.name.column_name('discourse'))
+                q = q.order_by(word_type.begin)
+                q = q.columns(word_type.id.column_name('id'), phone_type.id.column_name('phone_id'),
+                              word_type.begin.column_name('begin'),
+                              word_type.label.column_name('label'),
+                              word_type.end.column_name('end'),
+                              phone_type.label.column_name('phones'),
+                              phone_type.begin.column_name('begins'),
+                              phone_type.end.column_name('ends'),
+                              word_type.discourse.name.column_name('discourse'))
+                results = q.all()
+                syllables, non_syls = syllabifier.syllabify_words(results)
+                syllables_data_to_csvs(self, {s: syllables})
+                nonsyls_data_to_csvs(self, {s: non_syls})
             if call_back is not None:
-                call_back(i)
-                call_back(process_string.format(i, len(splits), s))
-            q = self.query_graph(word_type)
-            q = q.filter(word_type.speaker.name == s)
-            q = q.order_by(word_type.discourse.name.column_name('discourse'))
-            q = q.order_by(word_type.begin)
-            q = q.columns(word_type.id.column_name('id'), phone_type.id.column_name('phone_id'),
-                          word_type.begin.column_name('begin'),
-                          word_type.label.column_name('label'),
-                          word_type.end.column_name('end'),
-                          phone_type.label.column_name('phones'),
-                          phone_type.begin.column_name('begins'),
-                          phone_type.end.column_name('ends'),
-                          word_type.discourse.name.column_name('discourse'))
-            results = q.all()
-            speaker_boundaries = {s: []}
-            speaker_non_syls = {s: []}
-            prev_id = None
-            cur_discourse = None
-            for w in results:
-                phones = w['phones']
-                phone_ids = w['phone_id']
-
-                if not phone_ids:
-                    print('The word {} in file {} ({} to {}) did not have any phones.'.format(w['label'], w['discourse'], w['begin'], w['end']))
-                    continue
-                phone_begins = w['begins']
-                phone_ends = w['ends']
-                discourse = w['discourse']
-                if discourse != cur_discourse:
-                    prev_id = None
-                    cur_discourse = discourse
-                vow_inds = [i for i, x in enumerate(phones) if x in syllabics]
-                if len(vow_inds) == 0:
-                    cur_id = uuid1()
-                    if algorithm == 'probabilistic':
-                        split = split_nonsyllabic_prob(phones, onsets, codas)
-                    elif algorithm == 'maxonset':
-                        split = split_nonsyllabic_maxonset(phones, onsets)
-                    label = '.'.join(phones)
-                    row = {'id': cur_id, 'prev_id': prev_id,
-                           'onset_id': phone_ids[0],
-                           'break': split,
-                           'coda_id': phone_ids[-1],
-                           'begin': phone_begins[0],
-                           'label': label,
-                           'type_id': make_type_id([label], self.corpus_name),
-                           'end': phone_ends[-1]}
-                    speaker_non_syls[s].append(row)
-                    prev_id = cur_id
-                    continue
-                for j, i in enumerate(vow_inds):
-                    cur_id = uuid1()
-                    cur_vow_id = phone_ids[i]
-                    begin = phone_begins[i]
-                    end = phone_ends[i]
-                    if j == 0:
-                        begin_ind = 0
-                        if i != 0:
-                            cur_ons_id = phone_ids[begin_ind]
-                            begin = phone_begins[begin_ind]
-                        else:
-                            cur_ons_id = None
-                    else:
-                        prev_vowel_ind = vow_inds[j - 1]
-                        cons_string = phones[prev_vowel_ind + 1:i]
-                        if algorithm == 'probabilistic':
-                            split = split_ons_coda_prob(cons_string, onsets, codas)
-                        elif algorithm == 'maxonset':
-                            split = split_ons_coda_maxonset(cons_string, onsets)
-                        if split is None:
-                            cur_ons_id = None
-                            begin_ind = i
-                        else:
-                            begin_ind = prev_vowel_ind + 1 + split
-                            cur_ons_id = phone_ids[begin_ind]
-
-                    if j == len(vow_inds) - 1:
-                        end_ind = len(phones) - 1
-                        if i != len(phones) - 1:
-                            cur_coda_id = phone_ids[end_ind]
-                            end = phone_ends[end_ind]
-                        else:
-                            cur_coda_id = None
-                    else:
-                        foll_vowel_ind = vow_inds[j + 1]
-                        cons_string = phones[i + 1:foll_vowel_ind]
-                        if algorithm == 'probabilistic':
-                            split = split_ons_coda_prob(cons_string, onsets, codas)
-                        elif algorithm == 'maxonset':
-                            split = split_ons_coda_maxonset(cons_string, onsets)
-                        if split is None:
-                            cur_coda_id = None
-                            end_ind = i
-                        else:
-                            end_ind = i + split
-                            cur_coda_id = phone_ids[end_ind]
-                    begin = phone_begins[begin_ind]
-                    end = phone_ends[end_ind]
-                    label = '.'.join(phones[begin_ind:end_ind + 1])
-                    row = {'id': cur_id, 'prev_id': prev_id,
-                           'vowel_id': cur_vow_id, 'onset_id': cur_ons_id,
-                           'label': label,
-                           'type_id': make_type_id([label], self.corpus_name),
-                           'coda_id': cur_coda_id, 'begin': begin, 'end': end}
-                    speaker_boundaries[s].append(row)
-                    prev_id = cur_id
-            syllables_data_to_csvs(self, speaker_boundaries)
-            nonsyls_data_to_csvs(self, speaker_non_syls)
+                call_back(format_cache_info(syllabifier.cache_info()))
         import_syllable_csv(self, call_back, stop_check)
         import_nonsyl_csv(self, call_back, stop_check)
+        import_precedence_csvs(self, 'syllable', ['syllable', 'nonsyl'], stop_check=stop_check)
         if stop_check is not None and stop_check():
             return
 
-        if call_back is not None:
-            call_back('Cleaning up...')
-        for s in self.speakers:
-            self.execute_cypher(
-                '''MATCH (s:{corpus_name}:Speaker)<-[:spoken_by]-(n:{corpus_name}:syllable) 
-                where s.name = {{speaker_name}} and n.prev_id is not Null 
-                REMOVE n.prev_id'''.format(corpus_name = self.cypher_safe_name), speaker_name=s)
-
-        self.hierarchy.add_annotation_type('syllable', above=self.phone_name, below=self.word_name)
+        if not self.has_syllables:
+            self.hierarchy.add_annotation_type('syllable', above=self.phone_name, below=self.word_name)
         self.hierarchy.add_token_labels(self, self.phone_name, ['onset', 'coda', 'nucleus'])
         self.hierarchy.add_token_properties(self, self.phone_name, [('syllable_position', str)])
         self.encode_hierarchy()
+        self.refresh_ordinals([self.phone_name], discourses=discourses if partial else None)
         if call_back is not None:
             call_back('Finished!')
             call_back(1, 1)
 
+    def _syllabify_in_pool(self, syllabifier, speakers, num_jobs=None, discourses=None, call_back=None,
+                           stop_check=None):
+        """
+        Stream the words of each speaker one discourse at a time to a process pool for syllabification, and
+        write the syllables to CSVs as they are returned, reporting the combined cache hit rates of the workers
+
+        Returns
+        -------
+        bool
+            False if stopped, True otherwise
+        """
+        statement = '''MATCH (w:{word_name}:{corpus}:speech)-[:spoken_by]->(s:Speaker:{corpus}),
+        (w)-[:spoken_in]->(d:Discourse:{corpus})
+        WHERE s.name = {{speaker}} AND ({{discourses}} IS NULL OR d.name IN {{discourses}})
+        OPTIONAL MATCH (p:{phone_name}:{corpus}:speech)-[:contained_by]->(w)
+        WITH w, d, p
+        ORDER BY p.begin
+        WITH w, d, collect(p) AS ps
+        RETURN w.id AS id, w.label AS label, w.begin AS begin, w.end AS end, d.name AS discourse,
+        [x in ps | x.id] AS phone_id, [x in ps | x.label] AS phones,
+        [x in ps | x.begin] AS begins, [x in ps | x.end] AS ends
+        ORDER BY discourse, begin'''.format(corpus=self.cypher_safe_name, word_name=self.word_name,
+                                              phone_name=self.phone_name)
+        if num_jobs is None:
+            num_jobs = os.cpu_count() or 1
+        num_jobs = max(1, num_jobs)
+        process_string = 'Processing speaker {} of {} ({})...'
+        pending = set()
+        cache_infos = []
+
+        def write_results(done):
+            for future in done:
+                s, syllables, non_syls, info = future.result()
+                syllables_data_to_csvs(self, {s: syllables})
+                nonsyls_data_to_csvs(self, {s: non_syls})
+                cache_infos.append(info)
+
+        with ProcessPoolExecutor(max_workers=num_jobs, initializer=_initialize_worker,
+                                 initargs=(syllabifier,)) as executor:
+            for i, s in enumerate(speakers):
+                if call_back is not None:
+                    call_back(i)
+                    call_back(process_string.format(i, len(speakers), s))
+                words = []
+                # Records are consumed while the session is open, so they are fetched as they are needed rather
+                # than buffered for the whole speaker
+                with self.graph_driver.session() as session:
+                    for r in session.run(statement, speaker=s, discourses=discourses):
+                        if stop_check is not None and stop_check():
+                            for f in pending:
+                                f.cancel()
+                            return False
+                        if words and r['discourse'] != words[-1]['discourse']:
+                            pending.add(executor.submit(_syllabify_in_worker, s, words))
+                            words = []
+                        words.append(dict(r))
+                        if len(pending) >= num_jobs * 2:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            write_results(done)
+                if words:
+                    pending.add(executor.submit(_syllabify_in_worker, s, words))
+            done, pending = wait(pending)
+            write_results(done)
+        if call_back is not None:
+            call_back(format_cache_info(combine_cache_info(cache_infos)))
+        return True
+
     def enrich_syllables(self, syllable_data, type_data=None):
         """
         Sets the data type and syllable data, initializes importers for syllable data, adds features to hierarchy for a phone
@@ -341,8 +356,11 @@ return coda, count(coda) as freq'''.format(corpus_name=self.cypher_safe_name,
 
             # labels = set(self.lexicon.syllables())
             #  syllable_data = {k: v for k,v in syllable_data.items() if k in labels}
-        syllables_enrichment_data_to_csvs(self, syllable_data)
-        import_syllable_enrichment_csvs(self, type_data)
+        if use_unwind(self, syllable_data):
+            import_syllable_enrichment_data(self, syllable_data, type_data)
+        else:
+            syllables_enrichment_data_to_csvs(self, syllable_data)
+            import_syllable_enrichment_csvs(self, type_data)
         # self.hierarchy.add_type_labels(self, 'syllable', ['test'])
         self.hierarchy.add_type_properties(self, 'syllable', type_data.items())
 
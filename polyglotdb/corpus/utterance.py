@@ -1,13 +1,74 @@
+import os
 from uuid import uuid1
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from ..query.annotations import SplitQuery
 from ..query.base.func import Max, Min
 from ..exceptions import GraphQueryError
+from ..io.importer.journal import ImportJournal
 from ..io.importer import utterance_data_to_csvs, import_utterance_csv, create_utterance_csvs, \
-    utterance_enriched_data_to_csvs, import_utterance_enrichment_csvs
+    utterance_enriched_data_to_csvs, import_utterance_enrichment_csvs, use_unwind, import_utterance_enrichment_data
 from .pause import PauseContext
 
 
+def segment_utterances(words, min_pause_length=0.5, min_utterance_length=0):
+    """
+    Find the utterances in a speaker's words in a discourse
+
+    Stretches of speech words are split wherever pauses separate two speech words by at least the minimum pause
+    length.  Stretches that are not longer than the minimum utterance length are merged with the neighbouring
+    stretch that is separated by the shorter pause.
+
+    Parameters
+    ----------
+    words : list
+        Dictionaries with 'id', 'begin', 'end' and 'pause' keys for all of a speaker's words in a discourse,
+        ordered by begin
+    min_pause_length : float, defaults to 0.5
+        Time in seconds that is the minimum duration of a pause to count
+        as an utterance boundary
+    min_utterance_length : float, defaults to 0.0
+        Time in seconds that is the minimum duration of a stretch of
+        speech to count as an utterance
+
+    Returns
+    -------
+    list
+        Tuples of the first and last words of each utterance
+    """
+    stretches = []
+    pause_found = False
+    for w in words:
+        if w['pause']:
+            pause_found = True
+            continue
+        if not stretches:
+            stretches.append([w, w, None])
+        elif pause_found and w['begin'] - stretches[-1][1]['end'] >= min_pause_length:
+            stretches.append([w, w, w['begin'] - stretches[-1][1]['end']])
+        else:
+            stretches[-1][1] = w
+        pause_found = False
+
+    utterances = []
+    carried = None
+    for i, (first, last, pause_before) in enumerate(stretches):
+        if carried is not None:
+            first = carried
+            carried = None
+        if last['end'] - first['begin'] > min_utterance_length:
+            utterances.append([first, last])
+            continue
+        pause_after = stretches[i + 1][2] if i + 1 < len(stretches) else None
+        if utterances and (pause_after is None or pause_before <= pause_after):
+            utterances[-1][1] = last
+        elif pause_after is not None:
+            carried = first
+        else:
+            utterances.append([first, last])
+    return [tuple(x) for x in utterances]
+
+
 class UtteranceContext(PauseContext):
     """
     Class that contains methods for dealing specifically with utterances
@@ -28,8 +89,8 @@ class UtteranceContext(PauseContext):
     def has_utterances(self):
         return 'utterance' in self.hierarchy.annotation_types
 
-    def encode_utterances(self, min_pause_length=0.5, min_utterance_length=0,
-                          call_back=None, stop_check=None):
+    def encode_utterances(self, min_pause_length=0.5, min_utterance_length=0, linear_scan=False, num_jobs=None,
+                          discourses=None, call_back=None, stop_check=None):
         """
         Encode utterance annotations based on minimum pause length and minimum
         utterance length.  See `get_pauses` for more information about
@@ -47,48 +108,133 @@ class UtteranceContext(PauseContext):
         min_utterance_length : float, defaults to 0.0
             Time in seconds that is the minimum duration of a stretch of
             speech to count as an utterance
-        """
-        self.reset_utterances()
 
-        self.hierarchy.add_annotation_type('utterance', above=self.word_name, below=None)
-        self.encode_hierarchy()
+        linear_scan : bool, defaults to False
+            If True, the words of each discourse are fetched with a single query and utterances are found in one
+            pass over them (see :func:`segment_utterances`), with discourses processed in parallel.  The utterance
+            ids of acoustic measures are then updated from the utterances found, rather than by querying the
+            encoded utterances
+
+        num_jobs : int, optional
+            Number of discourses to process at once when using the linear scan, defaults to the number of CPUs
+
+        discourses : list, optional
+            Discourses to encode utterances in, such as newly imported ones, without resetting the utterances of
+            the rest of the corpus.  Acoustic measures are not updated, as they are analyzed after utterances
+            are encoded.  Defaults to all discourses
+        """
+        partial = discourses is not None
+        if not partial:
+            self.reset_utterances()
+            ImportJournal(self).record_enrichment('utterances', {'min_pause_length': min_pause_length,
+                                                                 'min_utterance_length': min_utterance_length})
+            discourses = self.discourses
+
+        if not self.has_utterances:
+            self.hierarchy.add_annotation_type('utterance', above=self.word_name, below=None)
+            self.encode_hierarchy()
 
-        discourses = self.discourses
         if call_back is not None:
             call_back(0, len(discourses))
         create_utterance_csvs(self)
 
-        for i, d in enumerate(discourses):
-            if stop_check is not None and stop_check():
+        if linear_scan:
+            utterance_spans = self._write_linear_utterance_csvs(discourses, min_pause_length, min_utterance_length,
+                                                                num_jobs, call_back, stop_check)
+            if utterance_spans is None:
                 return
-            if call_back is not None:
-                call_back(i)
-                call_back('Parsing utterances for discourse {} of {} ({})...'.format(i, len(discourses), d))
-            utt_data = self.get_utterance_ids(d, min_pause_length, min_utterance_length)
-            speaker_data = {}
-            for s, utterances in utt_data.items():
-                speaker_data[s] = []
-                prev_id = None
-                for u in utterances:
-                    cur_id = uuid1()
-                    row = {'id': cur_id, 'prev_id': prev_id,
-                           'begin_word_id': u[0],
-                           'end_word_id': u[1]}
-                    speaker_data[s].append(row)
-                    prev_id = cur_id
-            utterance_data_to_csvs(self, speaker_data)
+        else:
+            for i, d in enumerate(discourses):
+                if stop_check is not None and stop_check():
+                    return
+                if call_back is not None:
+                    call_back(i)
+                    call_back('Parsing utterances for discourse {} of {} ({})...'.format(i, len(discourses), d))
+                utt_data = self.get_utterance_ids(d, min_pause_length, min_utterance_length)
+                speaker_data = {}
+                for s, utterances in utt_data.items():
+                    speaker_data[s] = []
+                    prev_id = None
+                    for u in utterances:
+                        cur_id = uuid1()
+                        row = {'id': cur_id, 'prev_id': prev_id,
+                               'begin_word_id': u[0],
+                               'end_word_id': u[1]}
+                        speaker_data[s].append(row)
+                        prev_id = cur_id
+                utterance_data_to_csvs(self, speaker_data)
         import_utterance_csv(self, call_back, stop_check)
-        for m in self.hierarchy.acoustics:
-            self.reassess_utterances(m)
-            if m == 'pitch':
-                self.hierarchy.add_token_properties(self, 'utterance', [('pitch_last_edited', int)])
-                self.encode_hierarchy()
+        if not partial:
+            for m in self.hierarchy.acoustics:
+                if linear_scan:
+                    client = self.acoustic_client()
+                    for d, speaker_spans in utterance_spans.items():
+                        data = []
+                        for s, utterances in speaker_spans.items():
+                            if utterances:
+                                data.extend(self._utterance_points(client, m, d, s, utterances))
+                        client.write_points(data, batch_size=1000, time_precision='ms')
+                else:
+                    self.reassess_utterances(m)
+                if m == 'pitch':
+                    self.hierarchy.add_token_properties(self, 'utterance', [('pitch_last_edited', int)])
+                    self.encode_hierarchy()
         if stop_check is not None and stop_check():
             return
+        self.refresh_ordinals(self.hierarchy.get_lower_types('utterance'),
+                              discourses=discourses if partial else None)
         if call_back is not None:
-            call_back(i + 1)
+            call_back(len(discourses))
             call_back('Finished!')
 
+    def _write_linear_utterance_csvs(self, discourses, min_pause_length, min_utterance_length, num_jobs=None,
+                                     call_back=None, stop_check=None):
+        """
+        Find utterances with :func:`segment_utterances` for discourses in parallel and write them to the
+        utterance CSVs
+
+        Returns
+        -------
+        dict
+            Lists of dictionaries with 'utterance_id', 'begin' and 'end' keys for the utterances found, keyed by
+            discourse and then speaker, or None if stopped
+        """
+        if num_jobs is None:
+            num_jobs = os.cpu_count() or 1
+
+        def segment_discourse(discourse):
+            return {s: segment_utterances(words, min_pause_length, min_utterance_length)
+                    for s, words in self.get_word_sequences(discourse).items()}
+
+        utterance_spans = {}
+        with ThreadPoolExecutor(max_workers=max(1, num_jobs)) as executor:
+            futures = {executor.submit(segment_discourse, d): d for d in discourses}
+            for i, future in enumerate(as_completed(futures)):
+                if stop_check is not None and stop_check():
+                    for f in futures:
+                        f.cancel()
+                    return None
+                d = futures[future]
+                if call_back is not None:
+                    call_back(i)
+                    call_back('Parsing utterances for discourse {} of {} ({})...'.format(i, len(discourses), d))
+                speaker_data = {}
+                utterance_spans[d] = {}
+                for s, utterances in future.result().items():
+                    speaker_data[s] = []
+                    utterance_spans[d][s] = []
+                    prev_id = None
+                    for first, last in utterances:
+                        cur_id = uuid1()
+                        speaker_data[s].append({'id': cur_id, 'prev_id': prev_id,
+                                                'begin_word_id': first['id'],
+                                                'end_word_id': last['id']})
+                        utterance_spans[d][s].append({'utterance_id': str(cur_id),
+                                                      'begin': first['begin'], 'end': last['end']})
+                        prev_id = cur_id
+                utterance_data_to_csvs(self, speaker_data)
+        return utterance_spans
+
     def get_utterance_ids(self, discourse,
                           min_pause_length=0.5, min_utterance_length=0):
         """
@@ -117,7 +263,18 @@ class UtteranceContext(PauseContext):
         speaker_utts = {}
         for s in speakers:
             utterances = []
-            statement = '''MATCH p = (prev_node_word:{word_type}:speech:{corpus})-[:precedes_pause*1..]->(foll_node_word:{word_type}:speech:{corpus}),
+            if self.has_pause_adjacency:
+                statement = '''MATCH (prev_node_word:{word_type}:speech:{corpus})-[:spoken_in]->(d:Discourse:{corpus}),
+            (prev_node_word)-[:spoken_by]->(s:Speaker:{corpus})
+            WHERE d.name = {{discourse}} AND s.name = {{speaker}}
+            AND prev_node_word.following_pause_duration IS NOT NULL
+            WITH prev_node_word
+            MATCH (foll_node_word:{word_type}:speech:{corpus} {{id: prev_node_word.following_speech_id}})
+            WHERE foll_node_word.begin - prev_node_word.end >= {{node_pause_duration}}
+            RETURN prev_node_word.end AS begin, prev_node_word.id AS begin_id, foll_node_word.begin AS end, foll_node_word.id AS end_id, foll_node_word.begin - prev_node_word.end AS duration
+            ORDER BY begin'''.format(corpus=self.cypher_safe_name, word_type=word_type)
+            else:
+                statement = '''MATCH p = (prev_node_word:{word_type}:speech:{corpus})-[:precedes_pause*1..]->(foll_node_word:{word_type}:speech:{corpus}),
             (prev_node_word)-[:spoken_in]->(d:Discourse:{corpus}),
             (prev_node_word)-[:spoken_by]->(s:Speaker:{corpus})
             WHERE d.name = {{discourse}} AND s.name = {{speaker}}
@@ -229,7 +386,16 @@ class UtteranceContext(PauseContext):
             speech to count as an utterance
         """
         word_type = self.word_name
-        statement = '''MATCH p = (prev_node_word:{word_type}:speech:{corpus})-[:precedes_pause*1..]->(foll_node_word:{word_type}:speech:{corpus}),
+        if self.has_pause_adjacency:
+            statement = '''MATCH (prev_node_word:{word_type}:speech:{corpus})-[:spoken_in]->(d:Discourse:{corpus})
+        WHERE d.name = {{discourse}} AND prev_node_word.following_pause_duration IS NOT NULL
+        WITH prev_node_word
+        MATCH (foll_node_word:{word_type}:speech:{corpus} {{id: prev_node_word.following_speech_id}})
+        WHERE foll_node_word.begin - prev_node_word.end >= {{node_pause_duration}}
+        RETURN prev_node_word.end AS begin, foll_node_word.begin AS end, foll_node_word.begin - prev_node_word.end AS duration
+        ORDER BY begin'''.format(corpus=self.cypher_safe_name, word_type=word_type)
+        else:
+            statement = '''MATCH p = (prev_node_word:{word_type}:speech:{corpus})-[:precedes_pause*1..]->(foll_node_word:{word_type}:speech:{corpus}),
         (prev_node_word)-[:spoken_in]->(d:Discourse:{corpus})
         WHERE d.name = {{discourse}}
 WITH nodes(p)[1..-1] as ns,foll_node_word, prev_node_word
@@ -290,10 +456,24 @@ ORDER BY begin'''.format(corpus=self.cypher_safe_name, word_type=word_type)
             utterances[0] = (times['min_begin'], utterances[0][1])
         return utterances
 
-    def encode_utterance_position(self, call_back=None, stop_check=None):
-        """ Encodes position_in_utterance for a word """
+    def encode_utterance_position(self, discourses=None, call_back=None, stop_check=None):
+        """
+        Encodes position_in_utterance for a word
+
+        Parameters
+        ----------
+        discourses : list, optional
+            Discourses to encode positions in, defaults to all discourses
+        """
         w_type = self.word_name
-        if self.config.query_behavior == 'speaker':
+        if self.hierarchy.has_token_property(w_type, 'ordinal_in_utterance'):
+            # Positions are already available from encoded ordinals
+            statement = '''MATCH (n:{w_type}:{corpus_name})-[:spoken_in]->(discourse:Discourse:{corpus_name})
+            WHERE discourse.name = {{split_name}} AND n.ordinal_in_utterance > 0
+            SET n.position_in_utterance = n.ordinal_in_utterance
+            '''.format(w_type=w_type, corpus_name=self.cypher_safe_name)
+            split_names = self.discourses
+        elif self.config.query_behavior == 'speaker' and discourses is None:
             statement = '''MATCH (node_utterance:utterance:speech:{corpus_name})-[:spoken_by]->(speaker:Speaker:{corpus_name}),
             (node_word_in_node_utterance:{w_type}:{corpus_name})-[:contained_by]->(node_utterance)
             WHERE speaker.name = {{split_name}}
@@ -307,7 +487,7 @@ ORDER BY begin'''.format(corpus=self.cypher_safe_name, word_type=word_type)
             SET n.position_in_utterance = p + 1
             '''.format(w_type=w_type, corpus_name=self.cypher_safe_name)
             split_names = self.speakers
-        elif self.config.query_behavior == 'discourse':
+        elif self.config.query_behavior == 'discourse' or discourses is not None:
             statement = '''MATCH (node_utterance:utterance:speech:{corpus_name})-[:spoken_in]->(discourse:Discourse:{corpus_name}),
             (node_word_in_node_utterance:{w_type}:{corpus_name})-[:contained_by]->(node_utterance)
             WHERE discourse.name = {{split_name}}
@@ -335,6 +515,8 @@ ORDER BY begin'''.format(corpus=self.cypher_safe_name, word_type=word_type)
             '''.format(w_type=w_type, corpus_name=self.cypher_safe_name)
             split_names = None
 
+        if discourses is not None:
+            split_names = discourses
         if split_names is None:
             if call_back is not None:
                 call_back('Encoding utterance position...')
@@ -388,7 +570,10 @@ ORDER BY begin'''.format(corpus=self.cypher_safe_name, word_type=word_type)
             type_data = {k: type(v) for k, v in next(iter(utterance_data.values())).items()}
 
         # self.add_type_properties('utterance', type_data)
-        utterance_enriched_data_to_csvs(self, utterance_data)
-        import_utterance_enrichment_csvs(self, type_data)
+        if use_unwind(self, utterance_data):
+            import_utterance_enrichment_data(self, utterance_data, type_data)
+        else:
+            utterance_enriched_data_to_csvs(self, utterance_data)
+            import_utterance_enrichment_csvs(self, type_data)
         self.hierarchy.add_type_properties(self, 'utterance', type_data.items())
         self.encode_hierarchy()
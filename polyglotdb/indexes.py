@@ -0,0 +1,485 @@
+import re
+from collections import OrderedDict
+
+from .profiling import normalize_statement
+from .query.base.complex import ComplexClause
+from .query.base.elements import (EqualClauseElement, InClauseElement, NotInClauseElement, GtClauseElement,
+                                  GteClauseElement, LtClauseElement, LteClauseElement)
+from .query.base.helper import key_for_cypher
+from .query.annotations.attributes.base import special_attributes
+from .query.lexicon.attributes import LexiconNode
+
+INDEX_PATTERN = re.compile(r'ON\s+:\s*`?([^`(\s]+)`?\s*\(([^)]*)\)')
+
+EQUALITY_CLAUSES = (EqualClauseElement, InClauseElement)
+RANGE_CLAUSES = (GtClauseElement, GteClauseElement, LtClauseElement, LteClauseElement)
+
+
+def attribute_index_label(attribute):
+    """
+    Get the node label that an index on a query attribute would be created for
+
+    Parameters
+    ----------
+    attribute : :class:`~polyglotdb.query.base.attributes.NodeAttribute`
+        Attribute used in a filter or ordering
+
+    Returns
+    -------
+    str or None
+        Node label, or None if the attribute cannot be indexed (i.e., acoustic measures, computed attributes like
+        duration, or attributes of annotations matched in subqueries)
+    """
+    if getattr(attribute, 'acoustic', False) or attribute.label in special_attributes:
+        return None
+    node = attribute.node
+    if node.has_subquery:
+        return None
+    if isinstance(node, LexiconNode):
+        return '{}_type'.format(node.node_type)
+    if hasattr(attribute, 'requires_type'):
+        if attribute.requires_type():
+            return '{}_type'.format(node.node_type)
+    return node.node_type
+
+
+def query_index_candidates(query):
+    """
+    Get the indexes that would support the filters and ordering of a query.
+
+    Equality and range filters and orderings on a property give single property indexes, and equality filters on
+    more than one property of the same node give a composite index as well.  Filters comparing two attributes,
+    filters inside ``or_`` clauses (which only give single property indexes), and filters on subsets (which use
+    node labels) are otherwise not indexable.
+
+    Parameters
+    ----------
+    query : :class:`~polyglotdb.query.base.query.BaseQuery`
+        Query to inspect
+
+    Returns
+    -------
+    set
+        Set of (label, properties) tuples, where properties is a tuple of property names
+    """
+    candidates = set()
+    equality = {}
+
+    def add_clause(c, composite=True):
+        if isinstance(c, ComplexClause):
+            for x in c.clauses:
+                add_clause(x, composite=False)
+            return
+        attribute = getattr(c, 'attribute', None)
+        if attribute is None or not hasattr(attribute, 'node') or hasattr(c.value, 'node'):
+            return
+        if isinstance(c, NotInClauseElement) or not isinstance(c, EQUALITY_CLAUSES + RANGE_CLAUSES):
+            return
+        label = attribute_index_label(attribute)
+        if label is None:
+            return
+        candidates.add((label, (attribute.label,)))
+        if composite and isinstance(c, EQUALITY_CLAUSES):
+            equality.setdefault(label, set()).add(attribute.label)
+
+    for c in query._criterion:
+        add_clause(c)
+    for attribute, _ in query._order_by:
+        if not hasattr(attribute, 'node'):
+            continue
+        label = attribute_index_label(attribute)
+        if label is not None:
+            candidates.add((label, (attribute.label,)))
+    for label, properties in equality.items():
+        if len(properties) > 1:
+            candidates.add((label, tuple(sorted(properties))))
+    return candidates
+
+
+class IndexProposal(object):
+    """
+    Proposed index for a label and one or more properties
+
+    Attributes
+    ----------
+    label : str
+        Node label
+    properties : tuple
+        Property names, more than one for a composite index
+    from_hierarchy : bool
+        Whether the index is proposed for a property that the corpus's hierarchy has
+    queries : dict
+        Statement templates of recorded queries that would use the index, with the number of times they were run
+    """
+    def __init__(self, label, properties):
+        self.label = label
+        self.properties = properties
+        self.from_hierarchy = False
+        self.queries = {}
+
+    def __repr__(self):
+        return '<IndexProposal \'{}\'>'.format(self.statement)
+
+    @property
+    def key(self):
+        return self.label, self.properties
+
+    @property
+    def count(self):
+        return sum(self.queries.values())
+
+    @property
+    def statement(self):
+        return 'CREATE INDEX ON :{}({})'.format(key_for_cypher(self.label),
+                                                ', '.join(key_for_cypher(x) for x in self.properties))
+
+
+class IndexManager(object):
+    """
+    Manages the Neo4j indexes used by a corpus, proposing and creating indexes for the properties that the
+    corpus's hierarchy has and that recent queries filter and order by
+
+    Every query a corpus context generates is recorded, keeping the most recent ``max_queries`` distinct statement
+    templates along with the indexes that would support them.
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.BaseContext`
+        Corpus context to manage indexes for
+    max_queries : int
+        Number of distinct statement templates to keep, defaults to 500
+    """
+    def __init__(self, corpus_context, max_queries=500):
+        self.corpus_context = corpus_context
+        self.max_queries = max_queries
+        self.queries = OrderedDict()
+
+    def record(self, query, statement):
+        """
+        Record the index candidates of a query
+
+        Parameters
+        ----------
+        query : :class:`~polyglotdb.query.base.query.BaseQuery`
+            Query generating the statement
+        statement : str
+            Cypher statement of the query
+        """
+        template = normalize_statement(statement)
+        if template in self.queries:
+            self.queries.move_to_end(template)
+            self.queries[template]['count'] += 1
+            return
+        self.queries[template] = {'count': 1, 'candidates': query_index_candidates(query)}
+        while len(self.queries) > self.max_queries:
+            self.queries.popitem(last=False)
+
+    def reset(self):
+        """Clear the recorded queries"""
+        self.queries = OrderedDict()
+
+    def existing_indexes(self):
+        """
+        Get the indexes and uniqueness constraints in the database, as looked up by the corpus's
+        :class:`SchemaManager`
+
+        Returns
+        -------
+        set
+            Set of (label, properties) tuples, where properties is a tuple of property names
+        """
+        return set((label, properties) for _, label, properties in self.corpus_context.schema_manager.existing)
+
+    def hierarchy_candidates(self):
+        """
+        Get the baseline indexes for the corpus's hierarchy: time and label properties of annotations, labels
+        of annotation types, and names of speakers and discourses
+
+        Returns
+        -------
+        set
+            Set of (label, properties) tuples
+        """
+        hierarchy = self.corpus_context.hierarchy
+        candidates = {('Speaker', ('name',)), ('Discourse', ('name',))}
+        for at in hierarchy.annotation_types:
+            for prop in ['begin', 'end', 'label']:
+                if hierarchy.has_token_property(at, prop):
+                    candidates.add((at, (prop,)))
+            for prop in ['label', 'label_insensitive']:
+                if hierarchy.has_type_property(at, prop):
+                    candidates.add(('{}_type'.format(at), (prop,)))
+        for subannotations in hierarchy.subannotations.values():
+            for s in subannotations:
+                candidates.add((s, ('begin',)))
+        return candidates
+
+    def propose(self, include_hierarchy=True, min_count=1):
+        """
+        Propose the indexes missing from the database
+
+        Candidates from recorded queries and the hierarchy are merged, so each label and set of properties is
+        proposed once, and candidates covered by an existing index or uniqueness constraint are dropped.
+
+        Parameters
+        ----------
+        include_hierarchy : bool
+            Flag for including the baseline indexes for the hierarchy, defaults to True
+        min_count : int
+            Minimum number of recorded queries using an index for it to be proposed from queries alone
+
+        Returns
+        -------
+        list
+            List of :class:`IndexProposal`, ordered by the number of recorded queries that would use them
+        """
+        existing = self.existing_indexes()
+        proposals = {}
+        for template, data in self.queries.items():
+            for key in data['candidates']:
+                if key in existing:
+                    continue
+                if key not in proposals:
+                    proposals[key] = IndexProposal(*key)
+                proposals[key].queries[template] = data['count']
+        if include_hierarchy:
+            for key in self.hierarchy_candidates():
+                if key in existing:
+                    continue
+                if key not in proposals:
+                    proposals[key] = IndexProposal(*key)
+                proposals[key].from_hierarchy = True
+        proposals = [x for x in proposals.values() if x.from_hierarchy or x.count >= min_count]
+        return sorted(proposals, key=lambda x: (-x.count, x.label, x.properties))
+
+    def create(self, proposals=None, call_back=None, stop_check=None):
+        """
+        Create proposed indexes
+
+        Parameters
+        ----------
+        proposals : list, optional
+            List of :class:`IndexProposal` to create, defaults to all proposals from :meth:`propose`
+        call_back : callable, optional
+            Function to report progress
+        stop_check : callable, optional
+            Function to check whether to stop
+
+        Returns
+        -------
+        list
+            List of :class:`IndexProposal` that were created
+        """
+        if proposals is None:
+            proposals = self.propose()
+        if call_back is not None:
+            call_back('Creating indexes...')
+            call_back(0, len(proposals))
+        created = []
+        for i, p in enumerate(proposals):
+            if stop_check is not None and stop_check():
+                break
+            if call_back is not None:
+                call_back(i)
+            self.corpus_context.execute_cypher(p.statement)
+            created.append(p)
+        if created:
+            self.corpus_context.schema_manager.reset()
+        return created
+
+    def report(self, proposals=None):
+        """
+        Generate a text report of proposed indexes and the recorded queries that would use them
+
+        Parameters
+        ----------
+        proposals : list, optional
+            List of :class:`IndexProposal`, defaults to all proposals from :meth:`propose`
+
+        Returns
+        -------
+        str
+            Report
+        """
+        if proposals is None:
+            proposals = self.propose()
+        lines = []
+        for p in proposals:
+            source = ' (hierarchy)' if p.from_hierarchy else ''
+            lines.append('{}{}: used by {} recorded queries'.format(p.statement, source, p.count))
+            for template, count in sorted(p.queries.items(), key=lambda x: -x[1]):
+                lines.append('    {:>5}  {}'.format(count, template))
+        return '\n'.join(lines)
+
+
+def constraint_key(label, property='id'):
+    """Get the schema key of a uniqueness constraint on a property of a label"""
+    return 'constraint', label, (property,)
+
+
+def index_key(label, *properties):
+    """Get the schema key of an index on one or more properties of a label"""
+    return 'index', label, tuple(properties)
+
+
+def schema_statement(key):
+    """
+    Get the statement creating a constraint or index
+
+    Parameters
+    ----------
+    key : tuple
+        Schema key from :func:`constraint_key` or :func:`index_key`
+
+    Returns
+    -------
+    str
+        Cypher statement
+    """
+    kind, label, properties = key
+    if kind == 'constraint':
+        return 'CREATE CONSTRAINT ON (node:{}) ASSERT node.{} IS UNIQUE'.format(key_for_cypher(label),
+                                                                              key_for_cypher(properties[0]))
+    return 'CREATE INDEX ON :{}({})'.format(key_for_cypher(label), ', '.join(key_for_cypher(x) for x in properties))
+
+
+class SchemaManager(object):
+    """
+    Manages the constraints and indexes that a corpus's data requires, creating each one once
+
+    The required schema is computed from the corpus's hierarchy, and missing constraints and indexes are created
+    in a single schema transaction, followed by a single wait for the indexes to be populated.  The constraints
+    and indexes in the database are looked up once and then kept up to date, so that later imports and
+    enrichments skip the ones that already exist.
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.BaseContext`
+        Corpus context to manage the schema for
+    timeout : int
+        Number of seconds to wait for indexes to be populated, defaults to 300
+    """
+    def __init__(self, corpus_context, timeout=300):
+        self.corpus_context = corpus_context
+        self.timeout = timeout
+        self._existing = None
+
+    @property
+    def existing(self):
+        """
+        Constraints and indexes in the database
+
+        Returns
+        -------
+        set
+            Set of schema keys
+        """
+        if self._existing is None:
+            existing = set()
+            for r in self.corpus_context.execute_cypher('CALL db.indexes()'):
+                m = INDEX_PATTERN.search(r['description'])
+                if m is None:
+                    continue
+                properties = tuple(x.strip().strip('`') for x in m.group(2).split(','))
+                if 'unique' in (r.get('type') or ''):
+                    existing.add(('constraint', m.group(1), properties))
+                else:
+                    existing.add(('index', m.group(1), properties))
+            self._existing = existing
+        return self._existing
+
+    def reset(self):
+        """Forget the constraints and indexes looked up, for when the schema is changed elsewhere"""
+        self._existing = None
+
+    def hierarchy_schema(self):
+        """
+        Get the constraints and indexes required by the corpus's hierarchy: unique ids, time and other token
+        properties of annotations, properties of annotation types, and names and properties of speakers and
+        discourses
+
+        Returns
+        -------
+        set
+            Set of schema keys
+        """
+        hierarchy = self.corpus_context.hierarchy
+        schema = {constraint_key('Corpus', 'name'), index_key('Discourse', 'name'), index_key('Speaker', 'name')}
+        for name, _ in hierarchy.speaker_properties:
+            if name != 'name':
+                schema.add(index_key('Speaker', name))
+        for name, _ in hierarchy.discourse_properties:
+            if name != 'name':
+                schema.add(index_key('Discourse', name))
+        for at in hierarchy.annotation_types:
+            schema.add(constraint_key(at))
+            schema.add(constraint_key('{}_type'.format(at)))
+            for name, _ in hierarchy.token_properties.get(at, []):
+                if name == 'id':
+                    continue
+                schema.add(index_key(at, name))
+                if name == 'label':
+                    schema.add(index_key(at, 'label_insensitive'))
+            schema.add(index_key(at, 'begin'))
+            schema.add(index_key(at, 'end'))
+            for name, _ in hierarchy.type_properties.get(at, []):
+                if name == 'id':
+                    continue
+                schema.add(index_key('{}_type'.format(at), name))
+                if name == 'label':
+                    schema.add(index_key('{}_type'.format(at), 'label_insensitive'))
+        for subannotations in hierarchy.subannotations.values():
+            for s in subannotations:
+                schema.add(constraint_key(s))
+        return schema
+
+    def missing(self, schema):
+        """
+        Get the constraints and indexes that do not exist yet
+
+        Parameters
+        ----------
+        schema : iterable
+            Schema keys
+
+        Returns
+        -------
+        list
+            Sorted list of schema keys, constraints first
+        """
+        existing = self.existing
+        return sorted(set(schema) - existing)
+
+    def ensure(self, schema=None, call_back=None):
+        """
+        Create the constraints and indexes that do not exist yet and wait for them to be populated
+
+        Parameters
+        ----------
+        schema : iterable, optional
+            Schema keys to create, defaults to the schema required by the hierarchy
+        call_back : callable, optional
+            Function to report progress
+
+        Returns
+        -------
+        list
+            List of schema keys that were created
+        """
+        if schema is None:
+            schema = self.hierarchy_schema()
+        missing = self.missing(schema)
+        if not missing:
+            return missing
+        if call_back is not None:
+            call_back('Creating {} constraints and indexes...'.format(len(missing)))
+
+        def create_schema(tx):
+            for key in missing:
+                tx.run(schema_statement(key))
+
+        with self.corpus_context.graph_driver.session() as session:
+            session.write_transaction(create_schema)
+        self.corpus_context.execute_cypher('CALL db.awaitIndexes({})'.format(self.timeout))
+        self._existing.update(missing)
+        return missing
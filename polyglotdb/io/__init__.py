@@ -8,7 +8,7 @@ from .parsers import (BuckeyeParser, IlgParser, OrthographyTextParser,
 from .inspect import (inspect_buckeye, inspect_orthography,
                     inspect_transcription, inspect_textgrid, inspect_timit,
                     inspect_ilg, inspect_mfa, inspect_labbcat,
-                    inspect_fave, inspect_partitur)
+                    inspect_fave, inspect_partitur, autodetect_parser)
 
 from .exporters import save_results
 
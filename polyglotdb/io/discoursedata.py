@@ -1,3 +1,6 @@
+from .helper import make_type_id
+
+
 class DiscourseData(object):
     """
     Class for collecting information about a discourse to be loaded
@@ -117,7 +120,8 @@ class DiscourseData(object):
         return ((x, self.data[x]) for x in self.keys())
 
     def types(self, corpus_name):
-        """ Returns tuple of types and type headers
+        """ Returns tuple of types and type headers, with type ids from the type id cache of the import so that
+        each distinct type is hashed once
 
         Parameters
         ----------
@@ -130,7 +134,6 @@ class DiscourseData(object):
             for w in v:
                 if k not in type_headers:
                     type_headers[k] = ['id'] + w.type_keys()
-                id = w.sha(corpus_name)
-                props = tuple([id] + [x for x in w.type_values()])
-                types[k].add(props)
+                values = tuple(w.type_values())
+                types[k].add((make_type_id(values, corpus_name),) + values)
         return types, type_headers
@@ -7,9 +7,10 @@ import hashlib
 import wave
 from collections import Counter
 
-from textgrid import TextGrid
 
-from polyglotdb.exceptions import DelimiterError, TextGridError
+from polyglotdb.exceptions import DelimiterError
+
+from .textgrid_reader import read_textgrid
 
 ATT_TYPES = ['orthography', 'transcription', 'numeric',
              'morpheme', 'tobi', 'grouping']
@@ -112,13 +113,13 @@ def guess_trans_delimiter(values):
     return max(probable_values.items(), key=operator.itemgetter(1))[0]
 
 
-def inspect_directory(directory):
-    """
-    Function to inspect a directory and return the most likely type of
-    files within it.
+annotation_extensions = {'.textgrid': 'textgrid', '.txt': 'text', '.words': 'buckeye', '.wrd': 'timit',
+                         '.par,2': 'partitur'}
 
-    Searches currently for 'textgrid', 'text', 'buckeye', 'timit', and 'partitur' file
-    types.
+
+def find_annotation_files(directory):
+    """
+    Find the annotation files in a directory and its subdirectories and the most likely type of files
 
     Parameters
     ----------
@@ -130,37 +131,48 @@ def inspect_directory(directory):
     str
         Most likely type of files
     dict
-        Dictionary of the found files separated by the types searched for
+        Dictionary of the full paths of the found files separated by the types searched for
     """
-    types = ['textgrid', 'text', 'buckeye', 'timit', 'partitur']
-    counter = {x: 0 for x in types}
-    relevant_files = {x: [] for x in types}
+    relevant_files = {x: [] for x in annotation_extensions.values()}
     for root, subdirs, files in os.walk(directory):
         for f in files:
             ext = os.path.splitext(f)[-1].lower()
-            if ext == '.textgrid':
-                t = 'textgrid'
-            elif ext == '.txt':
-                t = 'text'
-            elif ext == '.words':
-                t = 'buckeye'
-            elif ext == '.wrd':
-                t = 'timit'
-            elif ext == '.par,2':
-                t = 'partitur'
-            else:
+            if ext not in annotation_extensions:
                 continue
-            counter[t] += 1
-            relevant_files[t].append(f)
-    max_value = max(counter.values())
+            relevant_files[annotation_extensions[ext]].append(os.path.join(root, f))
+    max_value = max(len(x) for x in relevant_files.values())
     for t in ['textgrid', 'buckeye', 'timit', 'text', 'partitur']:
-        if counter[t] == max_value:
+        if len(relevant_files[t]) == max_value:
             likely_type = t
             break
 
     return likely_type, relevant_files
 
 
+def inspect_directory(directory):
+    """
+    Function to inspect a directory and return the most likely type of
+    files within it.
+
+    Searches currently for 'textgrid', 'text', 'buckeye', 'timit', and 'partitur' file
+    types.
+
+    Parameters
+    ----------
+    directory : str
+        Full path to the directory
+
+    Returns
+    -------
+    str
+        Most likely type of files
+    dict
+        Dictionary of the found files separated by the types searched for
+    """
+    likely_type, relevant_files = find_annotation_files(directory)
+    return likely_type, {k: [os.path.basename(x) for x in v] for k, v in relevant_files.items()}
+
+
 def text_to_lines(path):
     """
     Parse a text file into lines.
@@ -321,9 +333,94 @@ def log_annotation_types(annotation_types):
         logging.info(a.pretty_print())
 
 
+def _hash_type_values(type_values, corpus):
+    m = hashlib.sha1()
+    value = ' '.join(map(str, type_values))
+    value += ' ' + corpus
+    m.update(value.encode())
+    return m.hexdigest()
+
+
+class TypeIdCache(object):
+    """
+    Bounded cache of type ids keyed on corpus and type values
+
+    Corpora have few distinct types relative to their number of tokens, so interning the ids means each type is
+    hashed once per import rather than once per token.  When the cache is full, the oldest ids are evicted.
+
+    Parameters
+    ----------
+    max_size : int
+        Maximum number of ids to keep, defaults to 1,000,000
+    """
+    def __init__(self, max_size=1000000):
+        self.max_size = max_size
+        self.ids = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def get(self, type_values, corpus):
+        """
+        Get the type id of a set of type values, hashing them if they have not been seen
+
+        Parameters
+        ----------
+        type_values : iterable
+            Type values
+        corpus : str
+            Name of the corpus
+
+        Returns
+        -------
+        str
+            Type id
+        """
+        # Keyed on the strings that are hashed, so that values such as 1, 1.0 and True do not share an id
+        key = (corpus, tuple(str(x) for x in type_values))
+        try:
+            type_id = self.ids[key]
+            self.hits += 1
+        except KeyError:
+            self.misses += 1
+            type_id = _hash_type_values(key[1], corpus)
+            if len(self.ids) >= self.max_size:
+                del self.ids[next(iter(self.ids))]
+                self.evictions += 1
+            self.ids[key] = type_id
+        return type_id
+
+    def clear(self):
+        """Remove all ids and reset the statistics"""
+        self.ids = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def cache_info(self):
+        """
+        Get the statistics of the cache
+
+        Returns
+        -------
+        dict
+            Dictionary with 'hits', 'misses', 'evictions', 'size', 'max_size' and 'hit_rate' keys
+        """
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self.ids),
+                'max_size': self.max_size, 'hit_rate': self.hits / total if total else 0}
+
+
+type_id_cache = TypeIdCache()
+
+
 def make_type_id(type_values, corpus):
     """
-    Constructs hash table of values and corpus
+    Constructs hash table of values and corpus, interned in the type id cache of the import
+    (see :class:`TypeIdCache`)
 
     Parameters
     ----------
@@ -337,17 +434,40 @@ def make_type_id(type_values, corpus):
     str
         a hex string containing the digest of the values as hexadecimal numbers
     """
-    m = hashlib.sha1()
-    value = ' '.join(map(str, type_values))
-    value += ' ' + corpus
-    m.update(value.encode())
-    return m.hexdigest()
+    return type_id_cache.get(type_values, corpus)
+
+
+def textgrid_format(tg, path):
+    """
+    Guess the aligner format of a TextGrid from its tiers
+
+    Parameters
+    ----------
+    tg : :class:`~polyglotdb.io.textgrid_reader.Textgrid`
+        The TextGrid
+    path : str
+        Path to the TextGrid file
+
+    Returns
+    -------
+    str or None
+        'labbcat', 'mfa' or 'fave', or None if the TextGrid is not in any of those formats
+    """
+    from .inspect import inspect_labbcat, inspect_mfa, inspect_fave
+    for name, inspect in [('labbcat', inspect_labbcat), ('mfa', inspect_mfa), ('fave', inspect_fave)]:
+        _, is_valid = inspect(path)._is_valid(tg)
+        if is_valid:
+            return name
+    return None
 
 
 def guess_textgrid_format(path):
     """
     Given a directory, tries to guess what format the textgrids are in
 
+    TextGrids are read with :func:`~polyglotdb.io.textgrid_reader.read_textgrid`, which detects whether
+    they are encoded in UTF-8 or UTF-16
+
     Parameters
     ----------
     path : str
@@ -358,7 +478,6 @@ def guess_textgrid_format(path):
     str or None
         textgrid format or None if file is not textgrid and directory doesn't contain textgrids
     """
-    from .inspect import inspect_labbcat, inspect_mfa, inspect_fave
     if os.path.isdir(path):
         counts = {'mfa': 0, 'labbcat': 0, 'fave': 0, None: 0}
         for root, subdirs, files in os.walk(path):
@@ -366,34 +485,8 @@ def guess_textgrid_format(path):
                 if not f.lower().endswith('.textgrid'):
                     continue
                 tg_path = os.path.join(root, f)
-                tg = TextGrid()
-                try:
-                    tg.read(tg_path)
-                except ValueError as e:
-                    raise (TextGridError('The file {} could not be parsed: {}'.format(tg_path, str(e))))
-
-                labbcat_parser = inspect_labbcat(tg_path)
-                mfa_parser = inspect_mfa(tg_path)
-                fave_parser = inspect_fave(tg_path)
-                if labbcat_parser._is_valid(tg):
-                    counts['labbcat'] += 1
-                elif mfa_parser._is_valid(tg):
-                    counts['mfa'] += 1
-                elif fave_parser._is_valid(tg):
-                    counts['fave'] += 1
-                else:
-                    counts[None] += 1
+                counts[textgrid_format(read_textgrid(tg_path), tg_path)] += 1
         return max(counts.keys(), key=lambda x: counts[x])
     elif path.lower().endswith('.textgrid'):
-        tg = TextGrid()
-        tg.read(path)
-        labbcat_parser = inspect_labbcat(path)
-        mfa_parser = inspect_mfa(path)
-        fave_parser = inspect_fave(path)
-        if labbcat_parser._is_valid(tg):
-            return 'labbcat'
-        elif mfa_parser._is_valid(tg):
-            return 'mfa'
-        elif fave_parser._is_valid(tg):
-            return 'fave'
+        return textgrid_format(read_textgrid(path), path)
     return None
@@ -10,4 +10,11 @@ from .from_csv import (import_type_csvs, import_csvs, import_lexicon_csvs,
                        import_utterance_csv, import_subannotation_csv,
                        import_syllable_csv, import_nonsyl_csv,
                        import_feature_csvs, import_speaker_csvs,
-                       import_discourse_csvs, import_syllable_enrichment_csvs, import_utterance_enrichment_csvs)
+                       import_discourse_csvs, import_syllable_enrichment_csvs, import_utterance_enrichment_csvs,
+                       import_precedence_csvs)
+
+from .from_data import (use_unwind, import_lexicon_data, import_feature_data, import_speaker_data,
+                        import_discourse_data, import_syllable_enrichment_data, import_utterance_enrichment_data)
+
+from .bulk import (initialize_bulk_csvs, data_to_bulk_type_csvs, data_to_bulk_csvs,
+                   bulk_import_csvs)
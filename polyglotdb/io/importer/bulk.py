@@ -0,0 +1,288 @@
+import os
+import csv
+import sys
+import glob
+import time
+import shutil
+import logging
+import subprocess
+
+from neo4j.v1 import GraphDatabase
+
+from ...exceptions import PGOSError, CorpusIntegrityError
+
+relationship_columns = ['type_id', 'id', 'previous_id', 'speaker', 'discourse', 'begin', 'end']
+
+
+def node_file(name):
+    return 'bulk_nodes_{}'.format(name)
+
+
+def relationship_file(name):
+    return 'bulk_relationships_{}'.format(name)
+
+
+def node_path(corpus_context, name):
+    return corpus_context.temporary_files.path(node_file(name))
+
+
+def relationship_path(corpus_context, name):
+    return corpus_context.temporary_files.path(relationship_file(name))
+
+
+def token_property_header(token_header, supertype):
+    """
+    Get the columns of a token header that are stored as properties on the token nodes
+    """
+    return [x for x in token_header if x not in relationship_columns and x != supertype]
+
+
+def bulk_labels(*labels):
+    return ';'.join(labels)
+
+
+def initialize_bulk_csvs(corpus_context, token_headers, subannotations=None, supertypes=None):
+    """
+    Create the node and relationship files for an offline import with ``neo4j-admin import``,
+    overwriting any files from a previous import
+
+    Tokens and subannotations share the ``speech`` id space, type nodes use a space per annotation type, and
+    speakers, discourses and the corpus are identified by their names.
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.CorpusContext`
+        the corpus
+    token_headers : dict
+        Token headers per annotation type
+    subannotations : dict, optional
+        Subannotation types per annotation type
+    supertypes : dict, optional
+        Containing annotation type per annotation type
+    """
+    temporary_files = corpus_context.temporary_files
+    for path in glob.glob(os.path.join(temporary_files.directory, 'bulk_*')):
+        os.remove(path)
+    if supertypes is None:
+        supertypes = {}
+    with temporary_files.open(node_file('Corpus')) as f:
+        writer = csv.writer(f)
+        writer.writerow(['name:ID(Corpus)', ':LABEL'])
+        writer.writerow([corpus_context.corpus_name, 'Corpus'])
+    for name in ['Speaker', 'Discourse']:
+        with temporary_files.open(node_file(name)) as f:
+            csv.writer(f).writerow(['name:ID({})'.format(name), ':LABEL'])
+    with temporary_files.open(relationship_file('speaks_in')) as f:
+        csv.writer(f).writerow([':START_ID(Speaker)', ':END_ID(Discourse)', 'channel:int', ':TYPE'])
+
+    for at, h in token_headers.items():
+        header = ['id:ID(speech)', 'begin:float', 'end:float'] + token_property_header(h, supertypes.get(at))
+        if 'label' in header:
+            header.append('label_insensitive')
+        header.append(':LABEL')
+        with temporary_files.open(node_file(at)) as f:
+            csv.writer(f).writerow(header)
+        relationships = [('is_a', '{}_type'.format(at)), ('spoken_in', 'Discourse'), ('spoken_by', 'Speaker'),
+                         ('precedes', 'speech')]
+        if supertypes.get(at) is not None:
+            relationships.append(('contained_by', 'speech'))
+        for rel, end_space in relationships:
+            with temporary_files.open(relationship_file('{}_{}'.format(at, rel))) as f:
+                csv.writer(f).writerow([':START_ID(speech)', ':END_ID({})'.format(end_space), ':TYPE'])
+    if subannotations is not None:
+        for k, v in subannotations.items():
+            for s in v:
+                with temporary_files.open(node_file('{}_{}'.format(k, s))) as f:
+                    csv.writer(f).writerow(['id:ID(speech)', 'begin:float', 'end:float', 'label', ':LABEL'])
+                with temporary_files.open(relationship_file('{}_{}_annotates'.format(k, s))) as f:
+                    csv.writer(f).writerow([':START_ID(speech)', ':END_ID(speech)', ':TYPE'])
+
+
+def data_to_bulk_type_csvs(corpus_context, types, type_headers):
+    """
+    Write type nodes for an offline import
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.CorpusContext`
+        the corpus
+    types : dict
+        Type tuples per annotation type
+    type_headers : dict
+        Headers of the type tuples per annotation type
+    """
+    for at, h in type_headers.items():
+        header = ['id:ID({}_type)'.format(at)] + h[1:]
+        if 'label' in h:
+            header.append('label_insensitive')
+        header.append(':LABEL')
+        labels = bulk_labels('{}_type'.format(at), corpus_context.corpus_name)
+        label_index = h.index('label') if 'label' in h else None
+        with corpus_context.temporary_files.open(node_file('{}_type'.format(at))) as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for t in sorted(types[at], key=lambda x: x[0]):
+                row = list(t)
+                if label_index is not None:
+                    label = t[label_index]
+                    row.append(label.lower() if label is not None else None)
+                row.append(labels)
+                writer.writerow(row)
+
+
+def data_to_bulk_csvs(corpus_context, data):
+    """
+    Append the speakers, discourse, tokens and relationships of a DiscourseData object to the files for an
+    offline import
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.CorpusContext`
+        the corpus
+    data : :class:`~polyglotdb.io.helper.DiscourseData`
+        Data to load into a graph
+    """
+    corpus_name = corpus_context.corpus_name
+    writer = corpus_context.temporary_files.writer
+
+    writer(node_file('Discourse')).writerow([data.name, bulk_labels('Discourse', corpus_name)])
+    for s in sorted(data.speakers):
+        writer(node_file('Speaker')).writerow([s, bulk_labels('Speaker', corpus_name)])
+        writer(relationship_file('speaks_in')).writerow(
+            [s, data.name, data.speaker_channel_mapping.get(s, 0), 'speaks_in'])
+
+    token_headers = data.token_headers
+    for level in data.highest_to_lowest():
+        supertype = data[level].supertype
+        properties = token_property_header(token_headers[level], supertype)
+        has_label = 'label' in properties
+        labels = bulk_labels(level, corpus_name, 'speech')
+        # Writers are looked up for each row, as the manager may close files when too many are open
+        node_name = node_file(level)
+        is_a_name = relationship_file('{}_is_a'.format(level))
+        spoken_in_name = relationship_file('{}_spoken_in'.format(level))
+        spoken_by_name = relationship_file('{}_spoken_by'.format(level))
+        precedes_name = relationship_file('{}_precedes'.format(level))
+        contained_by_name = relationship_file('{}_contained_by'.format(level))
+        for d in data[level]:
+            if d.begin is None or d.end is None:
+                continue
+            token_additional = dict(zip(d.token_keys(), d.token_values()))
+            row = [d.id, d.begin, d.end] + [token_additional.get(x) for x in properties]
+            if has_label:
+                label = token_additional.get('label')
+                row.append(label.lower() if label is not None else None)
+            row.append(labels)
+            writer(node_name).writerow(row)
+            s = d.speaker
+            if s is None:
+                s = 'unknown'
+            writer(is_a_name).writerow([d.id, d.sha(corpus=corpus_name), 'is_a'])
+            writer(spoken_in_name).writerow([d.id, data.name, 'spoken_in'])
+            writer(spoken_by_name).writerow([d.id, s, 'spoken_by'])
+            if d.previous_id is not None:
+                writer(precedes_name).writerow([d.previous_id, d.id, 'precedes'])
+            if supertype is not None and d.super_id is not None:
+                writer(contained_by_name).writerow([d.id, d.super_id, 'contained_by'])
+            if d.subannotations:
+                for sub in d.subannotations:
+                    label = sub.label if sub.label is not None else ''
+                    writer(node_file('{}_{}'.format(level, sub.type))).writerow(
+                        [sub.id, sub.begin, sub.end, label, bulk_labels(sub.type, corpus_name, 'speech')])
+                    writer(relationship_file('{}_{}_annotates'.format(level, sub.type))).writerow(
+                        [sub.id, d.id, 'annotates'])
+
+
+def neo4j_executable(neo4j_home, name):
+    if sys.platform.startswith('win'):
+        name += '.bat'
+    path = os.path.join(neo4j_home, 'bin', name)
+    if not os.path.exists(path):
+        raise PGOSError('Could not find {} in the Neo4j installation at {}.'.format(name, neo4j_home))
+    return path
+
+
+def wait_for_database(corpus_context, timeout=120):
+    """
+    Reconnect to the graph database after it has been restarted, waiting until it accepts queries
+    """
+    corpus_context.graph_driver.close()
+    begin = time.time()
+    while True:
+        try:
+            corpus_context.graph_driver = GraphDatabase.driver(corpus_context.config.graph_connection_string)
+            corpus_context.execute_cypher('RETURN 1')
+            return
+        except Exception:
+            if time.time() - begin > timeout:
+                raise
+            time.sleep(1)
+
+
+def bulk_import_csvs(corpus_context, database_name='graph.db', call_back=None, stop_check=None):
+    """
+    Load the node and relationship files with the offline importer of the local Neo4j installation
+
+    The offline importer can only create a new database, so the graph database must be empty.  The running
+    database is checked, stopped, its empty store replaced with the imported one, and then restarted.  The
+    imported database has no constraints or indexes, see
+    :meth:`~polyglotdb.indexes.SchemaManager.ensure`.  The node and relationship files are deleted once they
+    have been imported.
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.CorpusContext`
+        the corpus to load into
+    database_name : str
+        Name of the Neo4j database to import into, defaults to ``'graph.db'``
+    call_back : callable, optional
+        Function to report progress
+    stop_check : callable, optional
+        Function to check whether to stop
+    """
+    log = logging.getLogger('{}_loading'.format(corpus_context.corpus_name))
+    neo4j_home = corpus_context.config.neo4j_home
+    neo4j_bin = neo4j_executable(neo4j_home, 'neo4j')
+    admin_bin = neo4j_executable(neo4j_home, 'neo4j-admin')
+    store = os.path.join(neo4j_home, 'data', 'databases', database_name)
+
+    count = corpus_context.execute_cypher('MATCH (n) RETURN count(n) AS count').single()['count']
+    if count:
+        raise CorpusIntegrityError('The offline importer can only be used with an empty graph database, '
+                                   'but {} nodes were found.'.format(count))
+    if stop_check is not None and stop_check():
+        return
+
+    temporary_files = corpus_context.temporary_files
+    temporary_files.close()
+    names = sorted(x for x in temporary_files.files if x.startswith('bulk_'))
+    command = [admin_bin, 'import', '--mode=csv', '--database={}'.format(database_name),
+               '--id-type=STRING', '--ignore-missing-nodes=true', '--ignore-duplicate-nodes=true',
+               '--multiline-fields=true']
+    command += ['--nodes={}'.format(temporary_files.path(x)) for x in names if x.startswith('bulk_nodes_')]
+    command += ['--relationships={}'.format(temporary_files.path(x)) for x in names
+                if x.startswith('bulk_relationships_')]
+
+    if call_back is not None:
+        call_back('Stopping the graph database...')
+    subprocess.call([neo4j_bin, 'stop'])
+    if os.path.exists(store):
+        shutil.rmtree(store)
+    if call_back is not None:
+        call_back('Importing data with the offline importer...')
+    log.info('Beginning offline import into the graph database...')
+    begin = time.time()
+    proc = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+    log.debug(proc.stdout)
+    log.debug('Offline import took: {} seconds'.format(time.time() - begin))
+    if call_back is not None:
+        call_back('Starting the graph database...')
+    subprocess.call([neo4j_bin, 'start'])
+    if proc.returncode != 0:
+        raise PGOSError('The offline import failed:\n{}'.format(proc.stdout))
+    for name in names:
+        temporary_files.remove(name)
+    wait_for_database(corpus_context)
+    corpus_context.schema_manager.reset()
+    log.info('Finished offline import into the graph database!')
+
@@ -1,14 +1,64 @@
-import os
+import csv
 import logging
 import time
 
-
-def make_path_safe(path):
-    return path.replace('\\', '/').replace(' ', '%20')
+from ...indexes import constraint_key, index_key
+from .temporary_files import make_path_safe
 
 
 # Use planner=rule to avoid non-use of unique constraints
 
+def import_precedence_csvs(corpus_context, annotation_type, names, batch_size=10000, stop_check=None):
+    """
+    Create precedes relationships between annotations that have already been imported
+
+    Relationships are created from the ``prev_id`` and ``id`` columns of each speaker's CSV files, in batched
+    ``UNWIND`` transactions, rather than by matching the previous annotation as each row is imported.  The CSV
+    files are deleted once they have been read.
+
+    Parameters
+    ----------
+    corpus_context: :class:`~polyglotdb.corpus.CorpusContext`
+        the corpus to load into
+    annotation_type : str
+        Annotation type to link
+    names : list
+        Names of the CSV files, without the speaker prefix
+    batch_size : int
+        Number of relationships to create per transaction, defaults to 10000
+    stop_check : callable, optional
+        Function to check whether to stop
+    """
+    log = logging.getLogger('{}_loading'.format(corpus_context.corpus_name))
+    statement = '''UNWIND {{data}} AS row
+    MATCH (p:{annotation_type}:{corpus_name}:speech {{id: row.prev_id}}),
+    (t:{annotation_type}:{corpus_name}:speech {{id: row.id}})
+    CREATE (p)-[:precedes]->(t)'''.format(annotation_type=annotation_type,
+                                          corpus_name=corpus_context.cypher_safe_name)
+    temporary_files = corpus_context.temporary_files
+    begin = time.time()
+    for s in corpus_context.speakers:
+        for name in names:
+            if stop_check is not None and stop_check():
+                return
+            file_name = '{}_{}'.format(s, name)
+            if not temporary_files.exists(file_name):
+                continue
+            data = []
+            with temporary_files.open(file_name, 'r') as f:
+                for row in csv.DictReader(f):
+                    if not row['prev_id']:
+                        continue
+                    data.append({'prev_id': row['prev_id'], 'id': row['id']})
+                    if len(data) >= batch_size:
+                        corpus_context.execute_cypher(statement, data=data)
+                        data = []
+            if data:
+                corpus_context.execute_cypher(statement, data=data)
+            temporary_files.remove(file_name)
+    log.debug('{} precedence loading took: {} seconds.'.format(annotation_type, time.time() - begin))
+
+
 def import_type_csvs(corpus_context, type_headers):
     """
     Imports types into corpus from csv files
@@ -22,26 +72,22 @@ def import_type_csvs(corpus_context, type_headers):
     """
     log = logging.getLogger('{}_loading'.format(corpus_context.corpus_name))
     prop_temp = '''{name}: csvLine.{name}'''
+    schema = []
     for at, h in type_headers.items():
-        path = os.path.join(corpus_context.config.temporary_directory('csv'),
-                            '{}_type.csv'.format(at))
-        # If on the Docker version, the files live in /site/proj
-        if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-            type_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-        else:
-            type_path = 'file:///{}'.format(make_path_safe(path))
-
-        corpus_context.execute_cypher('CREATE CONSTRAINT ON (node:%s_type) ASSERT node.id IS UNIQUE' % at)
+        schema.append(constraint_key('{}_type'.format(at)))
+        schema.extend(index_key('{}_type'.format(at), x) for x in h if x != 'id')
+        if 'label' in h:
+            schema.append(index_key('{}_type'.format(at), 'label_insensitive'))
+    corpus_context.schema_manager.ensure(schema)
+    for at, h in type_headers.items():
+        name = '{}_type'.format(at)
+        type_path = corpus_context.temporary_files.url(name)
 
         properties = []
         for x in h:
             properties.append(prop_temp.format(name=x))
         if 'label' in h:
             properties.append('label_insensitive: lower(csvLine.label)')
-            corpus_context.execute_cypher('CREATE INDEX ON :%s_type(label_insensitive)' % at)
-        for x in h:
-            if x != 'id':
-                corpus_context.execute_cypher('CREATE INDEX ON :%s_type(%s)' % (at, x))
         if properties:
             type_prop_string = ', '.join(properties)
         else:
@@ -56,14 +102,8 @@ MERGE (n:{annotation_type}_type:{corpus_name} {{ {type_property_string} }})
         statement = type_import_statement.format(**kwargs)
         log.info('Loading {} types...'.format(at))
         begin = time.time()
-        try:
-            corpus_context.execute_cypher(statement)
-        except:
-            raise
-            # finally:
-            #    with open(path, 'w'):
-            #        pass
-            # os.remove(path) # FIXME Neo4j 2.3 does not release files
+        corpus_context.execute_cypher(statement)
+        corpus_context.temporary_files.remove(name)
 
         log.info('Finished loading {} types!'.format(at))
         log.debug('{} type loading took: {} seconds.'.format(at, time.time() - begin))
@@ -87,7 +127,6 @@ def import_csvs(corpus_context, data, call_back=None, stop_check=None):
 
     prop_temp = '''{name}: csvLine.{name}'''
 
-    directory = corpus_context.config.temporary_directory('csv')
     speakers = corpus_context.speakers
     annotation_types = data.highest_to_lowest()
     if call_back is not None:
@@ -96,120 +135,89 @@ def import_csvs(corpus_context, data, call_back=None, stop_check=None):
         cur = 0
     statements = []
 
-    def unique_function(tx, at):
-        tx.run('CREATE CONSTRAINT ON (node:%s) ASSERT node.id IS UNIQUE' % at)
-
-    def prop_index(tx, at, prop):
-        tx.run('CREATE INDEX ON :%s(%s)' % (at, prop))
-
-    def label_index(tx, at):
-        tx.run('CREATE INDEX ON :%s(label_insensitive)' % at)
-
-    def begin_index(tx, at):
-        tx.run('CREATE INDEX ON :%s(begin)' % (at,))
-
-    def end_index(tx, at):
-        tx.run('CREATE INDEX ON :%s(end)' % (at,))
-
-    with corpus_context.graph_driver.session() as session:
-        for i, s in enumerate(speakers):
-            speaker_statements = []
-            for at in annotation_types:
-                if stop_check is not None and stop_check():
-                    return
-                if call_back is not None:
-                    call_back(cur)
-                    cur += 1
-                path = os.path.join(directory, '{}_{}.csv'.format(s, at))
-                # If on the Docker version, the files live in /site/proj
-                if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-                    rel_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-                else:
-                    rel_path = 'file:///{}'.format(make_path_safe(path))
-
-                session.write_transaction(unique_function, at)
-
-                properties = []
-
-                for x in data[at].token_property_keys:
-                    properties.append(prop_temp.format(name=x))
-                    session.write_transaction(prop_index, at, x)
-                if 'label' in data[at].token_property_keys:
-                    properties.append('label_insensitive: lower(csvLine.label)')
-                    session.write_transaction(label_index, at)
-                st = data[at].supertype
-                if properties:
-                    token_prop_string = ', ' + ', '.join(properties)
-                else:
-                    token_prop_string = ''
-                if st is not None:
-                    rel_import_statement = '''CYPHER planner=rule USING PERIODIC COMMIT 4000
+    corpus_context.schema_manager.ensure()
+
+    for i, s in enumerate(speakers):
+        speaker_statements = []
+        for at in annotation_types:
+            if stop_check is not None and stop_check():
+                return
+            if call_back is not None:
+                call_back(cur)
+                cur += 1
+            name = '{}_{}'.format(s, at)
+            rel_path = corpus_context.temporary_files.url(name)
+
+            properties = []
+
+            for x in data[at].token_property_keys:
+                properties.append(prop_temp.format(name=x))
+            if 'label' in data[at].token_property_keys:
+                properties.append('label_insensitive: lower(csvLine.label)')
+            st = data[at].supertype
+            if properties:
+                token_prop_string = ', ' + ', '.join(properties)
+            else:
+                token_prop_string = ''
+            if st is not None:
+                rel_import_statement = '''CYPHER planner=rule USING PERIODIC COMMIT 4000
             LOAD CSV WITH HEADERS FROM '{path}' AS csvLine
             MATCH (n:{annotation_type}_type:{corpus_name} {{id: csvLine.type_id}}), (super:{stype}:{corpus_name} {{id: csvLine.{stype}}}),
             (d:Discourse:{corpus_name} {{name: csvLine.discourse}}),
             (s:Speaker:{corpus_name} {{name: csvLine.speaker}})
             CREATE (t:{annotation_type}:{corpus_name}:speech {{id: csvLine.id, begin: toFloat(csvLine.begin),
-                                        end: toFloat(csvLine.end){token_property_string} }}),
-                                        (t)-[:is_a]->(n),
-                                        (t)-[:contained_by]->(super),
-                                        (t)-[:spoken_in]->(d),
-                                        (t)-[:spoken_by]->(s)
-            WITH t, csvLine
-            MATCH (p:{annotation_type}:{corpus_name}:speech {{id: csvLine.previous_id}})
-            CREATE (p)-[:precedes]->(t)
+                                    end: toFloat(csvLine.end){token_property_string} }}),
+                                    (t)-[:is_a]->(n),
+                                    (t)-[:contained_by]->(super),
+                                    (t)-[:spoken_in]->(d),
+                                    (t)-[:spoken_by]->(s)
             '''
-                    kwargs = {'path': rel_path, 'annotation_type': at,
-                              'token_property_string': token_prop_string,
-                              'corpus_name': corpus_context.cypher_safe_name,
-                              'stype': st}
-                else:
+                kwargs = {'path': rel_path, 'annotation_type': at,
+                          'token_property_string': token_prop_string,
+                          'corpus_name': corpus_context.cypher_safe_name,
+                          'stype': st}
+            else:
 
-                    rel_import_statement = '''CYPHER planner=rule USING PERIODIC COMMIT 4000
+                rel_import_statement = '''CYPHER planner=rule USING PERIODIC COMMIT 4000
             LOAD CSV WITH HEADERS FROM '{path}' AS csvLine
             MATCH (n:{annotation_type}_type:{corpus_name} {{id: csvLine.type_id}}),
             (d:Discourse:{corpus_name} {{name: csvLine.discourse}}),
             (s:Speaker:{corpus_name} {{ name: csvLine.speaker}})
             CREATE (t:{annotation_type}:{corpus_name}:speech {{id: csvLine.id, begin: toFloat(csvLine.begin),
-                                        end: toFloat(csvLine.end){token_property_string} }}),
-                                        (t)-[:is_a]->(n),
-                                        (t)-[:spoken_in]->(d),
-                                        (t)-[:spoken_by]->(s)
-            WITH t, csvLine
-            MATCH (p:{annotation_type}:{corpus_name}:speech {{id: csvLine.previous_id}})
-            CREATE (p)-[:precedes]->(t)
+                                    end: toFloat(csvLine.end){token_property_string} }}),
+                                    (t)-[:is_a]->(n),
+                                    (t)-[:spoken_in]->(d),
+                                    (t)-[:spoken_by]->(s)
             '''
-                    kwargs = {'path': rel_path, 'annotation_type': at,
-                              'token_property_string': token_prop_string,
-                              'corpus_name': corpus_context.cypher_safe_name}
-                statement = rel_import_statement.format(**kwargs)
-                speaker_statements.append(statement)
-                begin = time.time()
-                session.write_transaction(begin_index, at)
-                session.write_transaction(end_index, at)
-            statements.append(speaker_statements)
+                kwargs = {'path': rel_path, 'annotation_type': at,
+                          'token_property_string': token_prop_string,
+                          'corpus_name': corpus_context.cypher_safe_name}
+            statement = rel_import_statement.format(**kwargs)
+            speaker_statements.append((name, statement))
+            begin = time.time()
+        statements.append(speaker_statements)
 
     for i, speaker_statements in enumerate(statements):
         if call_back is not None:
             call_back('Importing data for speaker {} of {} ({})...'.format(i, len(speakers), speakers[i]))
-        for s in speaker_statements:
+        for name, s in speaker_statements:
             log.info('Loading {} relationships...'.format(at))
             corpus_context.execute_cypher(s)
+            corpus_context.temporary_files.remove(name)
             log.info('Finished loading {} relationships!'.format(at))
             log.debug('{} relationships loading took: {} seconds.'.format(at, time.time() - begin))
 
+    for at in annotation_types:
+        import_precedence_csvs(corpus_context, at, ['{}_precedes'.format(at)], stop_check=stop_check)
+
     log.info('Finished importing {} into the graph database!'.format(data.name))
     log.debug('Graph importing took: {} seconds'.format(time.time() - initial_begin))
 
     for sp in corpus_context.speakers:
         for k, v in data.hierarchy.subannotations.items():
             for s in v:
-                path = os.path.join(directory, '{}_{}_{}.csv'.format(sp, k, s))
-                corpus_context.execute_cypher('CREATE CONSTRAINT ON (node:%s) ASSERT node.id IS UNIQUE' % s)
-                # If on the Docker version, the files live in /site/proj
-                if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-                    sub_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-                else:
-                    sub_path = 'file:///{}'.format(make_path_safe(path))
+                name = '{}_{}_{}'.format(sp, k, s)
+                sub_path = corpus_context.temporary_files.url(name)
 
                 rel_import_statement = '''CYPHER planner=rule USING PERIODIC COMMIT 1000
     LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
@@ -221,14 +229,8 @@ def import_csvs(corpus_context, data, call_back=None, stop_check=None):
                           'subannotation_type': s,
                           'corpus_name': corpus_context.cypher_safe_name}
                 statement = rel_import_statement.format(**kwargs)
-                try:
-                    corpus_context.execute_cypher(statement)
-                except:
-                    raise
-                    # finally:
-                    # with open(path, 'w'):
-                    #    pass
-                    # os.remove(path) # FIXME Neo4j 2.3 does not release files
+                corpus_context.execute_cypher(statement)
+                corpus_context.temporary_files.remove(name)
 
 
 def import_lexicon_csvs(corpus_context, typed_data, case_sensitive=False):
@@ -261,13 +263,8 @@ def import_lexicon_csvs(corpus_context, typed_data, case_sensitive=False):
             template = string_set_template
         properties.append(template.format(name=h))
     properties = ',\n'.join(properties)
-    directory = corpus_context.config.temporary_directory('csv')
-    path = os.path.join(directory, 'lexicon_import.csv')
-    # If on the Docker version, the files live in /site/proj
-    if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-        lex_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-    else:
-        lex_path = 'file:///{}'.format(make_path_safe(path))
+    name = 'lexicon_import'
+    lex_path = corpus_context.temporary_files.url(name)
     if case_sensitive:
         import_statement = '''CYPHER planner=rule USING PERIODIC COMMIT 3000
     LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
@@ -285,9 +282,8 @@ def import_lexicon_csvs(corpus_context, typed_data, case_sensitive=False):
                                         word_type=corpus_context.word_name,
                                         new_properties=properties)
     corpus_context.execute_cypher(statement)
-    for h, v in typed_data.items():
-        corpus_context.execute_cypher('CREATE INDEX ON :%s(%s)' % (corpus_context.word_name, h))
-        # os.remove(path) # FIXME Neo4j 2.3 does not release files
+    corpus_context.temporary_files.remove(name)
+    corpus_context.schema_manager.ensure(index_key(corpus_context.word_name, h) for h in typed_data.keys())
 
 
 def import_feature_csvs(corpus_context, typed_data):
@@ -317,14 +313,8 @@ def import_feature_csvs(corpus_context, typed_data):
             template = string_set_template
         properties.append(template.format(name=h))
     properties = ',\n'.join(properties)
-    directory = corpus_context.config.temporary_directory('csv')
-    path = os.path.join(directory, 'feature_import.csv')
-
-    # If on the Docker version, the files live in /site/proj
-    if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-        feat_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-    else:
-        feat_path = 'file:///{}'.format(make_path_safe(path))
+    name = 'feature_import'
+    feat_path = corpus_context.temporary_files.url(name)
     
     import_statement = '''CYPHER planner=rule
     LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
@@ -336,9 +326,8 @@ def import_feature_csvs(corpus_context, typed_data):
                                         phone_type=corpus_context.phone_name,
                                         new_properties=properties)
     corpus_context.execute_cypher(statement)
-    for h, v in typed_data.items():
-        corpus_context.execute_cypher('CREATE INDEX ON :%s(%s)' % (corpus_context.phone_name, h))
-        # os.remove(path) # FIXME Neo4j 2.3 does not release files
+    corpus_context.temporary_files.remove(name)
+    corpus_context.schema_manager.ensure(index_key(corpus_context.phone_name, h) for h in typed_data.keys())
 
 
 def import_syllable_enrichment_csvs(corpus_context, typed_data):
@@ -368,14 +357,8 @@ def import_syllable_enrichment_csvs(corpus_context, typed_data):
             template = string_set_template
         properties.append(template.format(name=h))
     properties = ',\n'.join(properties)
-    directory = corpus_context.config.temporary_directory('csv')
-    path = os.path.join(directory, 'syllable_import.csv')
-
-    # If on the Docker version, the files live in /site/proj
-    if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-        syl_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-    else:
-        syl_path = 'file:///{}'.format(make_path_safe(path))
+    name = 'syllable_import'
+    syl_path = corpus_context.temporary_files.url(name)
     
     import_statement = '''CYPHER planner=rule
     LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
@@ -387,8 +370,8 @@ def import_syllable_enrichment_csvs(corpus_context, typed_data):
                                         phone_type="syllable",
                                         new_properties=properties)
     corpus_context.execute_cypher(statement)
-    for h, v in typed_data.items():
-        corpus_context.execute_cypher('CREATE INDEX ON :%s(%s)' % ("syllable", h))
+    corpus_context.temporary_files.remove(name)
+    corpus_context.schema_manager.ensure(index_key('syllable', h) for h in typed_data.keys())
 
 
 def import_utterance_enrichment_csvs(corpus_context, typed_data):
@@ -418,14 +401,8 @@ def import_utterance_enrichment_csvs(corpus_context, typed_data):
             template = string_set_template
         properties.append(template.format(name=h))
     properties = ',\n'.join(properties)
-    directory = corpus_context.config.temporary_directory('csv')
-    path = os.path.join(directory, 'utterance_enrichment.csv')
-
-    # If on the Docker version, the files live in /site/proj
-    if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-        utt_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-    else:
-        utt_path = 'file:///{}'.format(make_path_safe(path))
+    name = 'utterance_enrichment'
+    utt_path = corpus_context.temporary_files.url(name)
     
     import_statement = '''CYPHER planner=rule
     LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
@@ -437,8 +414,8 @@ def import_utterance_enrichment_csvs(corpus_context, typed_data):
                                         phone_type="syllable",
                                         new_properties=properties)
     corpus_context.execute_cypher(statement)
-    for h, v in typed_data.items():
-        corpus_context.execute_cypher('CREATE INDEX ON :%s(%s)' % ("utterance", h))
+    corpus_context.temporary_files.remove(name)
+    corpus_context.schema_manager.ensure(index_key('utterance', h) for h in typed_data.keys())
 
 
 def import_speaker_csvs(corpus_context, typed_data):
@@ -468,14 +445,8 @@ def import_speaker_csvs(corpus_context, typed_data):
             template = string_set_template
         properties.append(template.format(name=h))
     properties = ',\n'.join(properties)
-    directory = corpus_context.config.temporary_directory('csv')
-    path = os.path.join(directory, 'speaker_import.csv')
-
-    # If on the Docker version, the files live in /site/proj
-    if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-        feat_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-    else:
-        feat_path = 'file:///{}'.format(make_path_safe(path))
+    name = 'speaker_import'
+    feat_path = corpus_context.temporary_files.url(name)
     
     import_statement = '''CYPHER planner=rule
     LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
@@ -486,9 +457,8 @@ def import_speaker_csvs(corpus_context, typed_data):
                                         corpus_name=corpus_context.cypher_safe_name,
                                         new_properties=properties)
     corpus_context.execute_cypher(statement)
-    for h, v in typed_data.items():
-        corpus_context.execute_cypher('CREATE INDEX ON :Speaker(%s)' % h)
-        # os.remove(path) # FIXME Neo4j 2.3 does not release files
+    corpus_context.temporary_files.remove(name)
+    corpus_context.schema_manager.ensure(index_key('Speaker', h) for h in typed_data.keys())
 
 
 def import_discourse_csvs(corpus_context, typed_data):
@@ -518,14 +488,8 @@ def import_discourse_csvs(corpus_context, typed_data):
             template = string_set_template
         properties.append(template.format(name=h))
     properties = ',\n'.join(properties)
-    directory = corpus_context.config.temporary_directory('csv')
-    path = os.path.join(directory, 'discourse_import.csv')
-
-    # If on the Docker version, the files live in /site/proj
-    if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-        feat_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-    else:
-        feat_path = 'file:///{}'.format(make_path_safe(path))
+    name = 'discourse_import'
+    feat_path = corpus_context.temporary_files.url(name)
     
     import_statement = '''CYPHER planner=rule
     LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
@@ -536,9 +500,8 @@ def import_discourse_csvs(corpus_context, typed_data):
                                         corpus_name=corpus_context.cypher_safe_name,
                                         new_properties=properties)
     corpus_context.execute_cypher(statement)
-    for h, v in typed_data.items():
-        corpus_context.execute_cypher('CREATE INDEX ON :Discourse(%s)' % h)
-        # os.remove(path) # FIXME Neo4j 2.3 does not release files
+    corpus_context.temporary_files.remove(name)
+    corpus_context.schema_manager.ensure(index_key('Discourse', h) for h in typed_data.keys())
 
 
 def import_utterance_csv(corpus_context, call_back=None, stop_check=None):
@@ -556,7 +519,7 @@ def import_utterance_csv(corpus_context, call_back=None, stop_check=None):
     if call_back is not None:
         call_back('Importing data...')
         call_back(0, len(speakers))
-    corpus_context.execute_cypher('CREATE CONSTRAINT ON (node:utterance) ASSERT node.id IS UNIQUE')
+    corpus_context.schema_manager.ensure([constraint_key('utterance')])
     for i, s in enumerate(speakers):
         if stop_check is not None and stop_check():
             return
@@ -564,13 +527,8 @@ def import_utterance_csv(corpus_context, call_back=None, stop_check=None):
             call_back('Importing data for speaker {} of {} ({})...'.format(i, len(speakers), s))
             call_back(i)
 
-        path = os.path.join(corpus_context.config.temporary_directory('csv'), '{}_utterance.csv'.format(s))
-        
-        # If on the Docker version, the files live in /site/proj
-        if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-            csv_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-        else:
-            csv_path = 'file:///{}'.format(make_path_safe(path))
+        name = '{}_utterance'.format(s)
+        csv_path = corpus_context.temporary_files.url(name)
 
         statement = '''USING PERIODIC COMMIT 1000
                 LOAD CSV WITH HEADERS FROM "{path}" AS csvLine
@@ -579,12 +537,6 @@ def import_utterance_csv(corpus_context, call_back=None, stop_check=None):
                 CREATE (utt:utterance:{corpus}:speech {{id: csvLine.id, begin: begin.begin, end: end.end}})-[:is_a]->(u_type:utterance_type:{corpus}),
                     (d)<-[:spoken_in]-(utt),
                     (s)<-[:spoken_by]-(utt)
-                WITH utt, begin, end, csvLine
-
-                OPTIONAL MATCH (prev:utterance {{id:csvLine.prev_id}})
-                FOREACH (o IN CASE WHEN prev IS NOT NULL THEN [prev] ELSE [] END |
-                  CREATE (prev)-[:precedes]->(utt)
-                )
                 WITH utt, begin, end
                 MATCH path = shortestPath((begin)-[:precedes*0..]->(end))
                 WITH utt, begin, end, nodes(path) as words
@@ -594,7 +546,12 @@ def import_utterance_csv(corpus_context, call_back=None, stop_check=None):
                                      corpus=corpus_context.cypher_safe_name,
                                      word_type=corpus_context.word_name)
         corpus_context.execute_cypher(statement)
-        # os.remove(path) # FIXME Neo4j 2.3 does not release files
+    import_precedence_csvs(corpus_context, 'utterance', ['utterance'], stop_check=stop_check)
+
+
+syllable_schema = [constraint_key('syllable'), constraint_key('syllable_type'),
+                   index_key('syllable', 'begin'), index_key('syllable', 'end'),
+                   index_key('syllable', 'label'), index_key('syllable_type', 'label')]
 
 
 def import_syllable_csv(corpus_context, call_back=None, stop_check=None):
@@ -613,27 +570,15 @@ def import_syllable_csv(corpus_context, call_back=None, stop_check=None):
     if call_back is not None:
         call_back('Importing syllables...')
         call_back(0, len(speakers))
-    corpus_context.execute_cypher('CREATE CONSTRAINT ON (node:syllable) ASSERT node.id IS UNIQUE')
-    corpus_context.execute_cypher('CREATE CONSTRAINT ON (node:syllable_type) ASSERT node.id IS UNIQUE')
-    corpus_context.execute_cypher('CREATE INDEX ON :syllable(begin)')
-    corpus_context.execute_cypher('CREATE INDEX ON :syllable(prev_id)')
-    corpus_context.execute_cypher('CREATE INDEX ON :syllable(end)')
-    corpus_context.execute_cypher('CREATE INDEX ON :syllable(label)')
-    corpus_context.execute_cypher('CREATE INDEX ON :syllable_type(label)')
+    corpus_context.schema_manager.ensure(syllable_schema)
     for i, s in enumerate(speakers):
         if stop_check is not None and stop_check():
             return
         if call_back is not None:
             call_back('Importing syllables for speaker {} of {} ({})...'.format(i, len(speakers), s))
             call_back(i)
-        path = os.path.join(corpus_context.config.temporary_directory('csv'),
-                            '{}_syllable.csv'.format(s))
-
-        # If on the Docker version, the files live in /site/proj
-        if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-            csv_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-        else:
-            csv_path = 'file:///{}'.format(make_path_safe(path))
+        name = '{}_syllable'.format(s)
+        csv_path = corpus_context.temporary_files.url(name)
 
         statement = '''CYPHER planner=rule USING PERIODIC COMMIT 3000
         LOAD CSV WITH HEADERS FROM "{path}" as csvLine
@@ -648,7 +593,7 @@ def import_syllable_csv(corpus_context, call_back=None, stop_check=None):
         WITH n, w, csvLine, sp, d, r,s_type
         DELETE r
         WITH n, w, csvLine, sp, d,s_type
-        CREATE (s:syllable:{corpus}:speech {{id: csvLine.id, prev_id:csvLine.prev_id,
+        CREATE (s:syllable:{corpus}:speech {{id: csvLine.id,
                             label: csvLine.label,
                             begin: toFloat(csvLine.begin), end: toFloat(csvLine.end)}}),
                 (s)-[:is_a]->(s_type),
@@ -657,11 +602,6 @@ def import_syllable_csv(corpus_context, call_back=None, stop_check=None):
                 (s)-[:spoken_by]->(sp),
                 (s)-[:spoken_in]->(d)
         with n, w, csvLine, s
-        OPTIONAL MATCH (prev:syllable {{id:csvLine.prev_id}})
-        FOREACH (o IN CASE WHEN prev IS NOT NULL THEN [prev] ELSE [] END |
-          CREATE (o)-[:precedes]->(s)
-        )
-        with n, w, csvLine, s
         OPTIONAL MATCH
                 (onset:{phone_name}:{corpus} {{id: csvLine.onset_id}}),
                 onspath = (onset)-[:precedes*1..10]->(n)
@@ -711,27 +651,15 @@ def import_nonsyl_csv(corpus_context, call_back=None, stop_check=None):
     if call_back is not None:
         call_back('Importing degenerate syllables...')
         call_back(0, len(speakers))
-    corpus_context.execute_cypher('CREATE CONSTRAINT ON (node:syllable) ASSERT node.id IS UNIQUE')
-    corpus_context.execute_cypher('CREATE CONSTRAINT ON (node:syllable_type) ASSERT node.id IS UNIQUE')
-    corpus_context.execute_cypher('CREATE INDEX ON :syllable(begin)')
-    corpus_context.execute_cypher('CREATE INDEX ON :syllable(prev_id)')
-    corpus_context.execute_cypher('CREATE INDEX ON :syllable(end)')
-    corpus_context.execute_cypher('CREATE INDEX ON :syllable(label)')
-    corpus_context.execute_cypher('CREATE INDEX ON :syllable_type(label)')
+    corpus_context.schema_manager.ensure(syllable_schema)
     for i, s in enumerate(speakers):
         if stop_check is not None and stop_check():
             return
         if call_back is not None:
             call_back('Importing degenerate syllables for speaker {} of {} ({})...'.format(i, len(speakers), s))
             call_back(i)
-        path = os.path.join(corpus_context.config.temporary_directory('csv'),
-                            '{}_nonsyl.csv'.format(s))
-
-        # If on the Docker version, the files live in /site/proj
-        if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-            csv_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-        else:
-            csv_path = 'file:///{}'.format(make_path_safe(path))
+        name = '{}_nonsyl'.format(s)
+        csv_path = corpus_context.temporary_files.url(name)
 
         statement = '''CYPHER planner=rule USING PERIODIC COMMIT 3000
         LOAD CSV WITH HEADERS FROM "{path}" as csvLine
@@ -751,16 +679,6 @@ def import_nonsyl_csv(corpus_context, call_back=None, stop_check=None):
             (s)-[:contained_by]->(w),
             (s)-[:spoken_by]->(sp),
             (s)-[:spoken_in]->(d)
-    with o, w, csvLine, s
-        OPTIONAL MATCH (prev:syllable {{id:csvLine.prev_id}})
-        FOREACH (pv IN CASE WHEN prev IS NOT NULL THEN [prev] ELSE [] END |
-          CREATE (pv)-[:precedes]->(s)
-        )
-    with o, w, csvLine, s
-        OPTIONAL MATCH (foll:syllable {{prev_id:csvLine.id}})
-        FOREACH (fv IN CASE WHEN foll IS NOT NULL THEN [foll] ELSE [] END |
-          CREATE (s)-[:precedes]->(fv)
-        )
     with o, w, csvLine, s
     OPTIONAL MATCH
     (c:{phone_name}:{corpus}:speech {{id: csvLine.coda_id}})-[:contained_by]->(w),
@@ -799,19 +717,15 @@ def import_subannotation_csv(corpus_context, type, annotated_type, props):
     props : list
 
     """
-    path = os.path.join(corpus_context.config.temporary_directory('csv'),
-                        '{}_subannotations.csv'.format(type))
-
-    # If on the Docker version, the files live in /site/proj
-    if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
-        csv_path = 'file:///site/proj/{}'.format(make_path_safe(path))
-    else:
-        csv_path = 'file:///{}'.format(make_path_safe(path))
+    name = '{}_subannotations'.format(type)
+    csv_path = corpus_context.temporary_files.url(name)
 
     prop_temp = '''{name}: csvLine.{name}'''
     properties = []
 
-    corpus_context.execute_cypher('CREATE CONSTRAINT ON (node:%s) ASSERT node.id IS UNIQUE' % type)
+    schema = [constraint_key(type)]
+    schema.extend(index_key(type, p) for p in props if p not in ['id', 'annotated_id'])
+    corpus_context.schema_manager.ensure(schema)
 
     for p in props:
         if p in ['id', 'annotated_id', 'begin', 'end']:
@@ -834,8 +748,4 @@ def import_subannotation_csv(corpus_context, type, annotated_type, props):
                                  type=type,
                                  properties=properties)
     corpus_context.execute_cypher(statement)
-    for p in props:
-        if p in ['id', 'annotated_id']:
-            continue
-        corpus_context.execute_cypher('CREATE INDEX ON :%s(%s)' % (type, p))
-        # os.remove(path) # FIXME Neo4j 2.3 does not release files
+    corpus_context.temporary_files.remove(name)
@@ -0,0 +1,218 @@
+import logging
+import time
+
+from ...exceptions import AlphabetError
+from ...indexes import index_key
+
+
+def use_unwind(corpus_context, data):
+    """
+    Check whether enrichment data is small enough to be written directly with ``UNWIND`` rather than through a
+    temporary CSV file and ``LOAD CSV``
+
+    Parameters
+    ----------
+    corpus_context: :class:`~polyglotdb.corpus.CorpusContext`
+        the corpus to load into
+    data : dict
+        the enrichment data
+
+    Returns
+    -------
+    bool
+        True if the number of rows is at most the corpus config's ``enrichment_unwind_threshold``
+    """
+    return len(data) <= corpus_context.config.enrichment_unwind_threshold
+
+
+def coerce_value(value, value_type):
+    """
+    Convert a value to the type of its property, as the ``LOAD CSV`` imports do with ``toFloat`` and ``toInt``
+
+    Parameters
+    ----------
+    value : object
+        the value
+    value_type : type
+        the type of the property
+
+    Returns
+    -------
+    object
+        the converted value, None for missing values and numeric properties with values that are not numbers
+    """
+    if value is None or value == '':
+        return None
+    if value_type == bool:
+        if isinstance(value, str):
+            return value != 'False'
+        return bool(value)
+    try:
+        if value_type == int:
+            if isinstance(value, int):
+                return value
+            return int(float(value))
+        if value_type == float:
+            return float(value)
+    except (ValueError, TypeError):
+        # Values that are not numbers are null, as with toInt and toFloat
+        return None
+    return str(value)
+
+
+def import_enrichment_data(corpus_context, match, data, typed_data, batch_size=None):
+    """
+    Set properties of nodes from in-memory data in batched ``UNWIND`` transactions
+
+    Parameters
+    ----------
+    corpus_context: :class:`~polyglotdb.corpus.CorpusContext`
+        the corpus to load into
+    match : str
+        Pattern for matching the node ``n`` to set the properties of a ``row`` on, with the key of the row as
+        ``row.key``
+    data : dict
+        Dictionaries of properties keyed by the label or name of their node
+    typed_data : dict
+        Types of the properties to set
+    batch_size : int, optional
+        Number of rows per transaction, defaults to the corpus config's ``enrichment_batch_size``
+    """
+    log = logging.getLogger('{}_loading'.format(corpus_context.corpus_name))
+    if batch_size is None:
+        batch_size = corpus_context.config.enrichment_batch_size
+    statement = '''UNWIND {{data}} AS row
+    MATCH {match}
+    SET n += row.properties'''.format(match=match)
+    begin = time.time()
+    rows = []
+    for k, v in data.items():
+        rows.append({'key': str(k),
+                     'properties': {h: coerce_value(v.get(h), t) for h, t in typed_data.items()}})
+        if len(rows) >= batch_size:
+            corpus_context.execute_cypher(statement, data=rows)
+            rows = []
+    if rows:
+        corpus_context.execute_cypher(statement, data=rows)
+    log.debug('Enriching {} rows took: {} seconds.'.format(len(data), time.time() - begin))
+
+
+def import_lexicon_data(corpus_context, data, typed_data, case_sensitive=False):
+    """
+    Import a lexicon from in-memory data
+
+    Parameters
+    ----------
+    corpus_context: :class:`~polyglotdb.corpus.CorpusContext`
+        the corpus to load into
+    data : dict
+        the data
+    typed_data : dict
+        the types of the data
+    case_sensitive : boolean
+        defaults to false
+    """
+    if case_sensitive:
+        match = '(n:{word_type}_type:{corpus_name}) WHERE n.label = row.key'
+    else:
+        data = {k.lower(): v for k, v in sorted(data.items())}
+        match = '(n:{word_type}_type:{corpus_name}) WHERE n.label_insensitive = row.key'
+    match = match.format(word_type=corpus_context.word_name, corpus_name=corpus_context.cypher_safe_name)
+    import_enrichment_data(corpus_context, match, data, typed_data)
+    corpus_context.schema_manager.ensure(index_key(corpus_context.word_name, h) for h in typed_data.keys())
+
+
+def import_feature_data(corpus_context, data, typed_data):
+    """
+    Import features from in-memory data
+
+    Parameters
+    ----------
+    corpus_context: :class:`~polyglotdb.corpus.CorpusContext`
+        the corpus to load into
+    data : dict
+        the data
+    typed_data : dict
+        the types of the data
+    """
+    if not data:
+        raise (AlphabetError)
+    match = '(n:{phone_type}_type:{corpus_name}) WHERE n.label = row.key'.format(
+        phone_type=corpus_context.phone_name, corpus_name=corpus_context.cypher_safe_name)
+    import_enrichment_data(corpus_context, match, data, typed_data)
+    corpus_context.schema_manager.ensure(index_key(corpus_context.phone_name, h) for h in typed_data.keys())
+
+
+def import_syllable_enrichment_data(corpus_context, data, typed_data):
+    """
+    Import syllable features from in-memory data
+
+    Parameters
+    ----------
+    corpus_context: :class:`~polyglotdb.corpus.syllabic.SyllabicContext`
+        the corpus to load into
+    data : dict
+        the data
+    typed_data : dict
+        the types of the data
+    """
+    if not data:
+        raise (AlphabetError)
+    match = '(n:syllable_type:{corpus_name}) WHERE n.label = row.key'.format(
+        corpus_name=corpus_context.cypher_safe_name)
+    import_enrichment_data(corpus_context, match, data, typed_data)
+    corpus_context.schema_manager.ensure(index_key('syllable', h) for h in typed_data.keys())
+
+
+def import_utterance_enrichment_data(corpus_context, data, typed_data):
+    """
+    Import utterance properties from in-memory data
+
+    Parameters
+    ----------
+    corpus_context: :class:`~polyglotdb.corpus.CorpusContext`
+        the corpus to load into
+    data : dict
+        the data
+    typed_data : dict
+        the types of the data
+    """
+    match = '(n:utterance:{corpus_name}) WHERE n.id = row.key'.format(corpus_name=corpus_context.cypher_safe_name)
+    import_enrichment_data(corpus_context, match, data, typed_data)
+    corpus_context.schema_manager.ensure(index_key('utterance', h) for h in typed_data.keys())
+
+
+def import_speaker_data(corpus_context, data, typed_data):
+    """
+    Import speaker properties from in-memory data
+
+    Parameters
+    ----------
+    corpus_context: :class:`~polyglotdb.corpus.CorpusContext`
+        the corpus to load into
+    data : dict
+        the data
+    typed_data : dict
+        the types of the data
+    """
+    match = '(n:Speaker:{corpus_name}) WHERE n.name = row.key'.format(corpus_name=corpus_context.cypher_safe_name)
+    import_enrichment_data(corpus_context, match, data, typed_data)
+    corpus_context.schema_manager.ensure(index_key('Speaker', h) for h in typed_data.keys())
+
+
+def import_discourse_data(corpus_context, data, typed_data):
+    """
+    Import discourse properties from in-memory data
+
+    Parameters
+    ----------
+    corpus_context: :class:`~polyglotdb.corpus.CorpusContext`
+        the corpus to load into
+    data : dict
+        the data
+    typed_data : dict
+        the types of the data
+    """
+    match = '(n:Discourse:{corpus_name}) WHERE n.name = row.key'.format(corpus_name=corpus_context.cypher_safe_name)
+    import_enrichment_data(corpus_context, match, data, typed_data)
+    corpus_context.schema_manager.ensure(index_key('Discourse', h) for h in typed_data.keys())
@@ -0,0 +1,209 @@
+import os
+import json
+import hashlib
+import time
+
+
+def source_fingerprint(path, block_size=65536):
+    """
+    Generate a fingerprint for a source file of a discourse
+
+    Parameters
+    ----------
+    path : str
+        Path to the source file
+    block_size : int
+        Number of bytes to read at a time when hashing the file's contents
+
+    Returns
+    -------
+    dict
+        Fingerprint with the absolute 'path', 'size' and modification time ('mtime') of the file and the
+        SHA1 'hash' of its contents
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return {'path': path, 'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'hash': h.hexdigest()}
+
+
+class ImportJournal(object):
+    """
+    Journal of the source files that the discourses of a corpus were imported from, so that later imports
+    can be restricted to new or changed files.
+
+    The journal is stored as JSON in the corpus's base directory, with a fingerprint of the source file of
+    each discourse along with the time of import, and the parameters of the enrichments (i.e., utterances)
+    that have been encoded, so that they can be encoded the same way for newly imported discourses.
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.ImportContext`
+        Corpus context of the import
+    """
+    file_name = 'import_journal.json'
+
+    def __init__(self, corpus_context):
+        self.path = os.path.join(corpus_context.config.base_dir, self.file_name)
+        self.data = self.load()
+        self.data.setdefault('discourses', {})
+        self.data.setdefault('enrichments', {})
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, 'r', encoding='utf8') as f:
+            try:
+                return json.load(f)
+            except ValueError:
+                return {}
+
+    def save(self):
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf8') as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def imported(self, discourse):
+        """
+        Get the journal record for a discourse
+
+        Returns
+        -------
+        dict or None
+            Record with the fingerprint of the source file and time of import, or None if not recorded
+        """
+        return self.data['discourses'].get(discourse, None)
+
+    def unchanged(self, discourse, path):
+        """
+        Check whether the source file of a discourse is the one recorded in the journal.
+
+        Files with the same path, size and modification time are taken to be unchanged without reading
+        them.  Otherwise the hash of the file's contents is compared, and the record is updated if only
+        the modification time has changed.
+        """
+        record = self.imported(discourse)
+        if record is None:
+            return False
+        stat = os.stat(path)
+        if record['path'] == os.path.abspath(path) and record['size'] == stat.st_size and \
+                record['mtime'] == stat.st_mtime_ns:
+            return True
+        fingerprint = source_fingerprint(path)
+        if fingerprint['hash'] != record['hash']:
+            return False
+        record.update(fingerprint)
+        return True
+
+    def pending(self, paths, discourses):
+        """
+        Filter source files to those of discourses that are new or have changed since they were imported
+
+        Discourses already in the corpus without a journal record (i.e., imported without ``incremental=True``)
+        are taken to be unchanged and are recorded.
+
+        Parameters
+        ----------
+        paths : list
+            Paths of the source files, with discourse names taken from the file names
+        discourses : list
+            Names of the discourses in the corpus
+
+        Returns
+        -------
+        list
+            Paths of the source files to import
+        list
+            Names of discourses in the corpus whose source files have changed
+        """
+        discourses = set(discourses)
+        pending = []
+        changed = []
+        for path in paths:
+            name = os.path.splitext(os.path.basename(path))[0]
+            if name not in discourses:
+                pending.append(path)
+            elif self.imported(name) is None:
+                self.record(name, path, save=False)
+            elif not self.unchanged(name, path):
+                pending.append(path)
+                changed.append(name)
+        self.save()
+        return pending, changed
+
+    def removed(self, directory, discourses):
+        """
+        Get the discourses in the corpus whose recorded source files were in a directory but no longer exist
+
+        Parameters
+        ----------
+        directory : str
+            Directory of the source files
+        discourses : list
+            Names of the discourses in the corpus
+
+        Returns
+        -------
+        list
+            Names of the discourses
+        """
+        directory = os.path.join(os.path.abspath(directory), '')
+        return sorted(x for x in discourses if self.imported(x) is not None and
+                      self.imported(x)['path'].startswith(directory) and not os.path.exists(self.imported(x)['path']))
+
+    def record(self, discourse, path, time_stamp=None, save=True):
+        """
+        Record the source file of an imported discourse
+
+        Parameters
+        ----------
+        discourse : str
+            Name of the discourse
+        path : str
+            Path to the source file
+        time_stamp : float, optional
+            Time of import, defaults to now
+        save : bool
+            Flag for saving the journal, defaults to True
+        """
+        if time_stamp is None:
+            time_stamp = time.time()
+        record = source_fingerprint(path)
+        record['imported'] = time_stamp
+        self.data['discourses'][discourse] = record
+        if save:
+            self.save()
+
+    def remove(self, discourse):
+        """Remove the record of a discourse that has been removed from the corpus"""
+        if self.data['discourses'].pop(discourse, None) is not None:
+            self.save()
+
+    def enrichment(self, name):
+        """
+        Get the parameters an enrichment was last encoded with
+
+        Returns
+        -------
+        dict or None
+            Parameters of the enrichment, or None if not recorded
+        """
+        return self.data['enrichments'].get(name, None)
+
+    def record_enrichment(self, name, parameters):
+        """
+        Record the parameters an enrichment of the whole corpus was encoded with
+
+        Parameters
+        ----------
+        name : str
+            Name of the enrichment (i.e., ``'utterances'``)
+        parameters : dict
+            Parameters of the enrichment, which must be serializable as JSON
+        """
+        self.data['enrichments'][name] = parameters
+        self.save()
@@ -0,0 +1,302 @@
+import io
+import os
+import csv
+import gzip
+import logging
+from collections import OrderedDict
+
+
+def make_path_safe(path):
+    return path.replace('\\', '/').replace(' ', '%20')
+
+
+def load_csv_url(path):
+    """
+    Get the URL that ``LOAD CSV`` reads a local file from
+
+    Parameters
+    ----------
+    path : str
+        Path to the file
+
+    Returns
+    -------
+    str
+        File URL
+    """
+    # If on the Docker version, the files live in /site/proj
+    if os.path.exists('/site/proj') and not path.startswith('/site/proj'):
+        return 'file:///site/proj/{}'.format(make_path_safe(path))
+    return 'file:///{}'.format(make_path_safe(path))
+
+
+class TemporaryFileManager(object):
+    """
+    Manages the temporary CSV files that imports and enrichments write for ``LOAD CSV``
+
+    Files are referred to by name without an extension, i.e., ``speaker_word`` for the words of a speaker, and
+    are written with large buffers, optionally compressed with gzip (which ``LOAD CSV`` reads directly).  Files
+    kept open with :meth:`writer` are appended to without reopening them, and are closed when their URL is
+    requested for loading or when more than ``max_open_files`` are open.  Files are deleted once they have been
+    loaded (see :meth:`remove`), when an operation that wrote them finishes successfully (see :meth:`operation`),
+    or when the corpus context exits successfully, unless the corpus config's ``keep_temporary_files`` is set.
+
+    Parameters
+    ----------
+    corpus_context : :class:`~polyglotdb.corpus.BaseContext`
+        Corpus context to manage the files for
+    max_open_files : int
+        Number of files kept open by :meth:`writer`, beyond which the least recently used file is closed,
+        defaults to 64
+    """
+    def __init__(self, corpus_context, max_open_files=64):
+        self.corpus_context = corpus_context
+        self.max_open_files = max_open_files
+        config = corpus_context.config
+        self.compress = config.compress_temporary_files
+        self.buffer_size = config.temporary_file_buffer_size
+        self.keep = config.keep_temporary_files
+        self.files = set()
+        self.bytes_removed = 0
+        self._handles = OrderedDict()
+        self._writers = {}
+        self._operations = []
+
+    @property
+    def directory(self):
+        """Directory of the CSV files"""
+        return self.corpus_context.config.temporary_directory('csv')
+
+    def path(self, name):
+        """
+        Get the path of a file
+
+        Parameters
+        ----------
+        name : str
+            Name of the file, without an extension
+
+        Returns
+        -------
+        str
+            Path to the file
+        """
+        extension = '.csv.gz' if self.compress else '.csv'
+        return os.path.join(self.directory, name + extension)
+
+    def exists(self, name):
+        """Check whether a file exists"""
+        return os.path.exists(self.path(name))
+
+    def url(self, name):
+        """
+        Get the URL to load a file from with ``LOAD CSV``, closing the file if it is open for writing
+
+        Parameters
+        ----------
+        name : str
+            Name of the file
+
+        Returns
+        -------
+        str
+            File URL
+        """
+        self.close(name)
+        return load_csv_url(self.path(name))
+
+    def open(self, name, mode='w'):
+        """
+        Open a file as text with a large buffer, compressing or decompressing it if the manager uses gzip
+
+        Parameters
+        ----------
+        name : str
+            Name of the file
+        mode : str
+            'w' to write, 'a' to append or 'r' to read, defaults to 'w'
+
+        Returns
+        -------
+        file object
+            Open text file
+        """
+        self.close(name)
+        path = self.path(name)
+        if mode != 'r':
+            self.files.add(name)
+            if self._operations and not any(name in x for x in self._operations):
+                self._operations[-1].add(name)
+        if self.compress:
+            f = gzip.open(path, mode + 'b', compresslevel=1)
+            if mode == 'r':
+                f = io.BufferedReader(f, self.buffer_size)
+            else:
+                f = io.BufferedWriter(f, self.buffer_size)
+            return io.TextIOWrapper(f, encoding='utf8', newline='')
+        return open(path, mode, buffering=self.buffer_size, encoding='utf8', newline='')
+
+    def write(self, name, header, rows, mode='w'):
+        """
+        Write rows of dictionaries to a file
+
+        Parameters
+        ----------
+        name : str
+            Name of the file
+        header : list
+            Columns of the file, written as a header unless appending
+        rows : iterable
+            Dictionaries of column values
+        mode : str
+            'w' to write or 'a' to append, defaults to 'w'
+        """
+        with self.open(name, mode) as f:
+            writer = csv.DictWriter(f, header, delimiter=',')
+            if mode == 'w':
+                writer.writeheader()
+            writer.writerows(rows)
+
+    def writer(self, name, header=None):
+        """
+        Get a CSV writer for a file that stays open until the file is loaded or closed, so repeated appends do
+        not reopen it
+
+        Parameters
+        ----------
+        name : str
+            Name of the file
+        header : list, optional
+            Columns of the file for a :class:`csv.DictWriter`, a plain :class:`csv.writer` is returned if None
+
+        Returns
+        -------
+        :class:`csv.DictWriter` or :func:`csv.writer`
+            CSV writer
+        """
+        if name in self._writers:
+            self._handles.move_to_end(name)
+        else:
+            if len(self._handles) >= self.max_open_files:
+                self.close(next(iter(self._handles)))
+            handle = self.open(name, 'a' if self.exists(name) else 'w')
+            self._handles[name] = handle
+            if header is None:
+                self._writers[name] = csv.writer(handle, delimiter=',')
+            else:
+                self._writers[name] = csv.DictWriter(handle, header, delimiter=',')
+        return self._writers[name]
+
+    def close(self, name=None):
+        """
+        Close a file kept open by :meth:`writer`, or all of them
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the file, all files are closed if None
+        """
+        if name is None:
+            names = list(self._handles.keys())
+        elif name in self._handles:
+            names = [name]
+        else:
+            return
+        for n in names:
+            self._handles.pop(n).close()
+            del self._writers[n]
+
+    def remove(self, name):
+        """
+        Delete a file once it has been loaded, unless temporary files are kept
+
+        Parameters
+        ----------
+        name : str
+            Name of the file
+        """
+        self.close(name)
+        if self.keep:
+            return
+        path = self.path(name)
+        if os.path.exists(path):
+            self.bytes_removed += os.path.getsize(path)
+            os.remove(path)
+        self.files.discard(name)
+
+    def cleanup(self):
+        """Delete all files written through the manager"""
+        for name in list(self.files):
+            self.remove(name)
+
+    def operation(self):
+        """
+        Context manager for the lifetime of the files of an operation, which are deleted when the operation
+        finishes without errors and kept for inspection otherwise
+
+        Returns
+        -------
+        :class:`TemporaryFileOperation`
+            Context manager
+        """
+        return TemporaryFileOperation(self)
+
+    def disk_usage(self):
+        """
+        Get the size of the files in the CSV directory
+
+        Returns
+        -------
+        dict
+            Sizes in bytes keyed by file name, with the total under 'total'
+        """
+        usage = {}
+        for f in os.listdir(self.directory):
+            path = os.path.join(self.directory, f)
+            if os.path.isfile(path):
+                usage[f] = os.path.getsize(path)
+        usage['total'] = sum(usage.values())
+        return usage
+
+    def report(self):
+        """
+        Log and return a summary of the disk used by temporary files
+
+        Returns
+        -------
+        str
+            Summary of the disk usage
+        """
+        usage = self.disk_usage()
+        total = usage.pop('total')
+        largest = sorted(usage.items(), key=lambda x: -x[1])[:5]
+        summary = '{} temporary files using {:.1f} MB in {} ({:.1f} MB loaded and deleted)'.format(
+            len(usage), total / 1e6, self.directory, self.bytes_removed / 1e6)
+        if largest:
+            summary += ', largest: ' + ', '.join('{} ({:.1f} MB)'.format(k, v / 1e6) for k, v in largest)
+        logging.getLogger('{}_loading'.format(self.corpus_context.corpus_name)).debug(summary)
+        return summary
+
+
+class TemporaryFileOperation(object):
+    """
+    Context manager tracking the files first written during an operation, see
+    :meth:`TemporaryFileManager.operation`
+    """
+    def __init__(self, manager):
+        self.manager = manager
+        self.files = set()
+
+    def __enter__(self):
+        self.manager._operations.append(self.files)
+        return self
+
+    def __exit__(self, exc_type, exc, exc_tb):
+        self.manager._operations.remove(self.files)
+        if exc_type is None:
+            for name in self.files:
+                self.manager.remove(name)
+        else:
+            for name in self.files:
+                self.manager.close(name)
+        return False
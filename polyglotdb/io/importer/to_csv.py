@@ -1,18 +1,7 @@
 import csv
-import os
-from collections import defaultdict
 from ...exceptions import AlphabetError
 
 
-def write_csv_file(path, header, data, mode='w'):
-    with open(path, mode, newline='', encoding='utf8') as f:
-        writer = csv.DictWriter(f, header, delimiter=',')
-        if mode == 'w':
-            writer.writeheader()
-        for d in data:
-            writer.writerow(d)
-
-
 def data_to_type_csvs(corpus_context, types, type_headers):
     """
     Convert a types object into a CSV file
@@ -26,14 +15,8 @@ def data_to_type_csvs(corpus_context, types, type_headers):
     type_headers : dict
         headers for types
     """
-    directory = corpus_context.config.temporary_directory('csv')
-    tfs = {}
-
     for k, v in type_headers.items():
-        path = os.path.join(directory, '{}_type.csv'.format(k))
-        header = v
-        data = [dict(zip(v, t)) for t in types[k]]
-        write_csv_file(path, header, data)
+        corpus_context.temporary_files.write('{}_type'.format(k), v, (dict(zip(v, t)) for t in types[k]))
 
 
 def data_to_graph_csvs(corpus_context, data):
@@ -45,27 +28,10 @@ def data_to_graph_csvs(corpus_context, data):
     ----------
     data : :class:`~polyglotdb.io.helper.DiscourseData`
         Data to load into a graph
-    directory: str
-        Full path to a directory to store CSV files
     """
-    directory = corpus_context.config.temporary_directory('csv')
-    rfs = {}
-    rel_writers = {}
+    temporary_files = corpus_context.temporary_files
     token_headers = data.token_headers
-    for s in data.speakers:
-        for x in data.annotation_types:
-            path = os.path.join(directory, '{}_{}.csv'.format(s, x))
-            rfs[s, x] = open(path, 'a', newline='', encoding='utf8')
-            rel_writers[s, x] = csv.DictWriter(rfs[s, x], token_headers[x], delimiter=',')
-    subanno_files = {}
-    subanno_writers = {}
-    for sp in data.speakers:
-        for k, v in data.hierarchy.subannotations.items():
-            for s in v:
-                path = os.path.join(directory, '{}_{}_{}.csv'.format(sp, k, s))
-                subanno_files[sp, k, s] = open(path, 'a', newline='', encoding='utf8')
-                header = ['id', 'begin', 'end', 'annotation_id', 'label']
-                subanno_writers[sp, k, s] = csv.DictWriter(subanno_files[sp, k, s], header, delimiter=',')
+    subanno_header = ['id', 'begin', 'end', 'annotation_id', 'label']
 
     segment_type = data.segment_type
     for level in data.highest_to_lowest():
@@ -78,21 +44,17 @@ def data_to_graph_csvs(corpus_context, data):
             s = d.speaker
             if s is None:
                 s = 'unknown'
-            rel_writers[s, level].writerow(dict(begin=d.begin, end=d.end,
-                                                type_id=d.sha(corpus=corpus_context.corpus_name),
-                                                id=d.id, speaker=s, discourse=data.name,
-                                                previous_id=d.previous_id,
-                                                **token_additional))
+            temporary_files.writer('{}_{}'.format(s, level), token_headers[level]).writerow(
+                dict(begin=d.begin, end=d.end, type_id=d.sha(corpus=corpus_context.corpus_name),
+                     id=d.id, speaker=s, discourse=data.name, previous_id=d.previous_id,
+                     **token_additional))
+            if d.previous_id is not None:
+                temporary_files.writer('{}_{}_precedes'.format(s, level)).writerow([d.previous_id, d.id])
             if d.subannotations:
                 for sub in d.subannotations:
                     row = {'begin': sub.begin, 'end': sub.end, 'label': sub.label,
                            'annotation_id': d.id, 'id': sub.id}
-                    subanno_writers[s, level, sub.type].writerow(row)
-
-    for x in rfs.values():
-        x.close()
-    for x in subanno_files.values():
-        x.close()
+                    temporary_files.writer('{}_{}_{}'.format(s, level, sub.type), subanno_header).writerow(row)
 
 
 def utterance_data_to_csvs(corpus_context, speaker_data):
@@ -111,10 +73,8 @@ def utterance_data_to_csvs(corpus_context, speaker_data):
         the timing data
     """
     for s, data in speaker_data.items():
-        path = os.path.join(corpus_context.config.temporary_directory('csv'),
-                            '{}_utterance.csv'.format(s))
         header = ['id', 'prev_id', 'begin_word_id', 'end_word_id']
-        write_csv_file(path, header, data, 'a')
+        corpus_context.temporary_files.writer('{}_utterance'.format(s), header).writerows(data)
 
 
 def utterance_enriched_data_to_csvs(corpus_context, utterance_data):
@@ -132,8 +92,7 @@ def utterance_enriched_data_to_csvs(corpus_context, utterance_data):
     timed_data : list
         the timing data
     """
-    directory = corpus_context.config.temporary_directory('csv')
-    with open(os.path.join(directory, 'utterance_enrichment.csv'), 'w') as f:
+    with corpus_context.temporary_files.open('utterance_enrichment') as f:
         header = ['id'] + sorted(next(iter(utterance_data.values())).keys())
         writer = csv.DictWriter(f, header, delimiter=',')
         writer.writeheader()
@@ -156,10 +115,8 @@ def syllables_data_to_csvs(corpus_context, speaker_data):
 
     """
     for s, data in speaker_data.items():
-        path = os.path.join(corpus_context.config.temporary_directory('csv'),
-                            '{}_syllable.csv'.format(s))
         header = ['id', 'prev_id', 'vowel_id', 'onset_id', 'coda_id', 'begin', 'end', 'label', 'type_id']
-        write_csv_file(path, header, data, 'a')
+        corpus_context.temporary_files.writer('{}_syllable'.format(s), header).writerows(data)
 
 
 def syllables_enrichment_data_to_csvs(corpus_context, data):
@@ -173,8 +130,7 @@ def syllables_enrichment_data_to_csvs(corpus_context, data):
     data : Dict
         Data to load into a csv
     """
-    directory = corpus_context.config.temporary_directory('csv')
-    with open(os.path.join(directory, 'syllable_import.csv'), 'w') as f:
+    with corpus_context.temporary_files.open('syllable_import') as f:
         try:
             header = ['label'] + sorted(next(iter(data.values())).keys())
         except(StopIteration):
@@ -201,10 +157,8 @@ def nonsyls_data_to_csvs(corpus_context, speaker_data):
 
     """
     for s, data in speaker_data.items():
-        path = os.path.join(corpus_context.config.temporary_directory('csv'),
-                            '{}_nonsyl.csv'.format(s))
         header = ['id', 'prev_id', 'break', 'onset_id', 'coda_id', 'begin', 'end', 'label', 'type_id']
-        write_csv_file(path, header, data, 'a')
+        corpus_context.temporary_files.writer('{}_nonsyl'.format(s), header).writerows(data)
 
 
 def subannotations_data_to_csv(corpus_context, type, data):
@@ -221,10 +175,8 @@ def subannotations_data_to_csv(corpus_context, type, data):
         identifier of the file to load
 
     """
-    path = os.path.join(corpus_context.config.temporary_directory('csv'),
-                        '{}_subannotations.csv'.format(type))
     header = sorted(data[0].keys())
-    write_csv_file(path, header, data)
+    corpus_context.temporary_files.write('{}_subannotations'.format(type), header, data)
 
 
 def lexicon_data_to_csvs(corpus_context, data, case_sensitive=False):
@@ -240,8 +192,7 @@ def lexicon_data_to_csvs(corpus_context, data, case_sensitive=False):
     case_sensitive : boolean
         defaults to False
     """
-    directory = corpus_context.config.temporary_directory('csv')
-    with open(os.path.join(directory, 'lexicon_import.csv'), 'w') as f:
+    with corpus_context.temporary_files.open('lexicon_import') as f:
         header = ['label'] + sorted(next(iter(data.values())).keys())
         writer = csv.DictWriter(f, header, delimiter=',')
         writer.writeheader()
@@ -263,8 +214,7 @@ def feature_data_to_csvs(corpus_context, data):
     data : :class:`~polyglotdb.io.helper.DiscourseData`
         Data to load into a graph
     """
-    directory = corpus_context.config.temporary_directory('csv')
-    with open(os.path.join(directory, 'feature_import.csv'), 'w') as f:
+    with corpus_context.temporary_files.open('feature_import') as f:
         try:
             header = ['label'] + sorted(next(iter(data.values())).keys())
         except(StopIteration):
@@ -287,8 +237,7 @@ def speaker_data_to_csvs(corpus_context, data):
     data : :class:`~polyglotdb.io.helper.DiscourseData`
         Data to load into a graph
     """
-    directory = corpus_context.config.temporary_directory('csv')
-    with open(os.path.join(directory, 'speaker_import.csv'), 'w') as f:
+    with corpus_context.temporary_files.open('speaker_import') as f:
         header = ['name'] + sorted(next(iter(data.values())).keys())
         writer = csv.DictWriter(f, header, delimiter=',')
         writer.writeheader()
@@ -310,8 +259,7 @@ def discourse_data_to_csvs(corpus_context, data):
     type : str
         identifier of the file to load
     """
-    directory = corpus_context.config.temporary_directory('csv')
-    with open(os.path.join(directory, 'discourse_import.csv'), 'w') as f:
+    with corpus_context.temporary_files.open('discourse_import') as f:
         header = ['name'] + sorted(next(iter(data.values())).keys())
         writer = csv.DictWriter(f, header, delimiter=',')
         writer.writeheader()
@@ -323,28 +271,16 @@ def discourse_data_to_csvs(corpus_context, data):
 def create_utterance_csvs(corpus_context):
     header = ['id', 'prev_id', 'begin_word_id', 'end_word_id']
     for s in corpus_context.speakers:
-        path = os.path.join(corpus_context.config.temporary_directory('csv'),
-                            '{}_utterance.csv'.format(s))
-        with open(path, 'w', newline='', encoding='utf8') as f:
-            writer = csv.DictWriter(f, header, delimiter=',')
-            writer.writeheader()
+        corpus_context.temporary_files.write('{}_utterance'.format(s), header, [])
 
 
 def create_syllabic_csvs(corpus_context):
     header = ['id', 'prev_id', 'vowel_id', 'onset_id', 'coda_id', 'begin', 'end', 'label', 'type_id']
     for s in corpus_context.speakers:
-        path = os.path.join(corpus_context.config.temporary_directory('csv'),
-                            '{}_syllable.csv'.format(s))
-        with open(path, 'w', newline='', encoding='utf8') as f:
-            writer = csv.DictWriter(f, header, delimiter=',')
-            writer.writeheader()
+        corpus_context.temporary_files.write('{}_syllable'.format(s), header, [])
 
 
 def create_nonsyllabic_csvs(corpus_context):
     header = ['id', 'prev_id', 'break', 'onset_id', 'coda_id', 'begin', 'end', 'label', 'type_id']
     for s in corpus_context.speakers:
-        path = os.path.join(corpus_context.config.temporary_directory('csv'),
-                            '{}_nonsyl.csv'.format(s))
-        with open(path, 'w', newline='', encoding='utf8') as f:
-            writer = csv.DictWriter(f, header, delimiter=',')
-            writer.writeheader()
+        corpus_context.temporary_files.write('{}_nonsyl'.format(s), header, [])
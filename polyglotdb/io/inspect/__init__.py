@@ -17,3 +17,5 @@ from .textgrid import inspect_textgrid
 from .timit import inspect_timit
 
 from .fave import inspect_fave
+
+from .autodetect import autodetect_parser
@@ -0,0 +1,174 @@
+import os
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+from ...exceptions import ParseError
+from ..helper import find_annotation_files, textgrid_format
+from ..textgrid_reader import read_textgrid
+from ..parsers import TextgridParser
+
+from .buckeye import inspect_buckeye
+from .fave import inspect_fave
+from .labbcat import inspect_labbcat
+from .mfa import inspect_mfa
+from .partitur import inspect_partitur
+from .text_orthography import inspect_orthography
+from .timit import inspect_timit
+from .textgrid import guess_tiers_from_durations, make_annotation_type
+
+inspect_functions = {'buckeye': inspect_buckeye, 'timit': inspect_timit, 'partitur': inspect_partitur,
+                     'text': inspect_orthography, 'mfa': inspect_mfa, 'fave': inspect_fave,
+                     'labbcat': inspect_labbcat}
+
+
+def sample_files(paths, sample_size):
+    """
+    Sample files evenly spaced over the sorted paths, so that the sample covers the whole directory tree
+
+    Parameters
+    ----------
+    paths : list
+        Paths to sample from
+    sample_size : int or None
+        Number of files to sample, all files are used if None
+
+    Returns
+    -------
+    list
+        Sampled paths
+    """
+    paths = sorted(paths)
+    if sample_size is None or len(paths) <= sample_size:
+        return paths
+    step = len(paths) / sample_size
+    return [paths[int(i * step)] for i in range(sample_size)]
+
+
+def summarize_textgrid(path):
+    """
+    Summarize the tiers of a TextGrid for inspection
+
+    Parameters
+    ----------
+    path : str
+        Path to the TextGrid file
+
+    Returns
+    -------
+    dict
+        The aligner format of the TextGrid (see :func:`~polyglotdb.io.helper.textgrid_format`) under 'format' and
+        a list of tier summaries with 'name', 'is_interval', 'count', 'duration' (total duration of the elements),
+        'labels' and 'annotations' (the first 10 annotations) keys under 'tiers'
+    """
+    tg = read_textgrid(path)
+    tiers = []
+    for ti in tg.tiers:
+        tiers.append({'name': ti.name, 'is_interval': ti.is_interval, 'count': len(ti),
+                      'duration': ti.average_duration() * len(ti), 'labels': ti.unique_labels(),
+                      'annotations': list(islice(ti.annotations(), 10))})
+    return {'path': path, 'format': textgrid_format(tg, path), 'tiers': tiers}
+
+
+def aggregate_tier_summaries(summaries):
+    """
+    Pool the tier summaries of TextGrids by tier name, in the order of the tiers of the first TextGrid
+
+    Parameters
+    ----------
+    summaries : list
+        Summaries from :func:`summarize_textgrid`
+
+    Returns
+    -------
+    list
+        Tier summaries with 'name', 'is_interval', 'count', 'duration', 'labels' and 'annotations' keys
+    """
+    tiers = {}
+    order = []
+    for summary in summaries:
+        for t in summary['tiers']:
+            if t['name'] not in tiers:
+                tiers[t['name']] = {'name': t['name'], 'is_interval': t['is_interval'], 'count': 0,
+                                    'duration': 0, 'labels': set(), 'annotations': []}
+                order.append(t['name'])
+            tier = tiers[t['name']]
+            tier['count'] += t['count']
+            tier['duration'] += t['duration']
+            tier['labels'].update(t['labels'])
+            tier['annotations'].extend(t['annotations'][:10 - len(tier['annotations'])])
+    return [tiers[x] for x in order]
+
+
+def textgrid_parser_from_summaries(summaries):
+    """
+    Generate a :class:`~polyglotdb.io.parsers.textgrid.TextgridParser` from TextGrid summaries, guessing tiers
+    from their average durations over all the summarized files
+
+    Parameters
+    ----------
+    summaries : list
+        Summaries from :func:`summarize_textgrid`
+
+    Returns
+    -------
+    :class:`~polyglotdb.io.parsers.textgrid.TextgridParser`
+        Autodetected parser
+    """
+    tiers = aggregate_tier_summaries(summaries)
+    durations = [(i, t['name'], t['duration'] / t['count']) for i, t in enumerate(tiers) if t['count']]
+    tier_guesses, hierarchy = guess_tiers_from_durations(durations)
+    anno_types = []
+    for t in tiers:
+        a = make_annotation_type(t['name'], t['is_interval'], tier_guesses, t['labels'])
+        if not a.ignored:
+            a.add(t['annotations'], save=False)
+        anno_types.append(a)
+    return TextgridParser(anno_types, hierarchy)
+
+
+def autodetect_parser(directory, sample_size=10, num_jobs=None):
+    """
+    Generate a parser for a directory of annotation files, detecting the type of files and, for TextGrids, the
+    aligner format and tiers from a sample of files parsed in parallel
+
+    Parameters
+    ----------
+    directory : str
+        Full path to the directory
+    sample_size : int, optional
+        Number of TextGrids to parse, evenly spaced over the sorted paths, defaults to 10.  All TextGrids are
+        parsed if None
+    num_jobs : int, optional
+        Number of processes for parsing TextGrids, defaults to the number of CPUs
+
+    Returns
+    -------
+    :class:`~polyglotdb.io.parsers.base.BaseParser`
+        Autodetected parser, the same as the one from the ``inspect_*`` function for the detected format
+
+    Raises
+    ------
+    :class:`~polyglotdb.exceptions.ParseError`
+        If the directory does not contain any annotation files
+    """
+    likely_type, relevant_files = find_annotation_files(directory)
+    if not relevant_files[likely_type]:
+        raise ParseError('No annotation files were found in {}.'.format(directory))
+    if likely_type != 'textgrid':
+        return inspect_functions[likely_type](directory)
+    paths = sample_files(relevant_files['textgrid'], sample_size)
+    if num_jobs is None:
+        num_jobs = os.cpu_count() or 1
+    num_jobs = max(1, min(num_jobs, len(paths)))
+    if num_jobs == 1:
+        summaries = [summarize_textgrid(x) for x in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=num_jobs) as executor:
+            summaries = list(executor.map(summarize_textgrid, paths))
+    counts = {'mfa': 0, 'labbcat': 0, 'fave': 0, None: 0}
+    for s in summaries:
+        counts[s['format']] += 1
+    textgrid_type = max(counts.keys(), key=lambda x: counts[x])
+    if textgrid_type is not None:
+        return inspect_functions[textgrid_type](directory)
+    return textgrid_parser_from_summaries(summaries)
@@ -1,11 +1,10 @@
 import os
 import math
 
-from textgrid import TextGrid, IntervalTier
-
 from polyglotdb.structure import Hierarchy
 
 from ..helper import guess_type, guess_trans_delimiter
+from ..textgrid_reader import read_textgrid
 
 from ..types.parsing import *
 
@@ -73,7 +72,7 @@ def uniqueLabels(tier):
 
     Parameters
     ----------
-    tier : IntervalTier
+    tier : :class:`~polyglotdb.io.textgrid_reader.TextgridTier`
         the tier to collect labels from
 
     Returns
@@ -81,10 +80,7 @@ def uniqueLabels(tier):
     set
         label from the tier
     """
-    try:
-        return set(x.mark for x in tier.intervals)
-    except AttributeError:
-        return set(x.mark for x in tier.points)
+    return tier.unique_labels()
 
 
 def average_duration(tier):
@@ -93,7 +89,7 @@ def average_duration(tier):
 
     Parameters
     ----------
-    tier : IntervalTier
+    tier : :class:`~polyglotdb.io.textgrid_reader.TextgridTier`
         the tier to get duration from
 
     Returns
@@ -101,11 +97,7 @@ def average_duration(tier):
     double
         average duration
     """
-
-    if isinstance(tier, IntervalTier):
-        return sum(float(x.maxTime) - float(x.minTime) for x in tier) / len(tier)
-    else:
-        return float(tier.maxTime) / len(tier)
+    return tier.average_duration()
 
 
 def averageLabelLen(tier):
@@ -114,7 +106,7 @@ def averageLabelLen(tier):
 
     Parameters
     ----------
-    tier : IntervalTier
+    tier : :class:`~polyglotdb.io.textgrid_reader.TextgridTier`
         the tier to collect labels from
 
     Returns
@@ -156,7 +148,7 @@ def guess_tiers(tg):
 
     Parameters
     ----------
-    tg : TextGrid
+    tg : :class:`~polyglotdb.io.textgrid_reader.Textgrid`
         the textgrid object
 
     Returns
@@ -166,13 +158,34 @@ def guess_tiers(tg):
     hierarchy : `~polyglotdb.structure.Hierarchy`
         the hierarchy object
     """
-    tier_properties = {}
-    tier_guesses = {}
+    durations = []
     for i, t in enumerate(tg.tiers):
         if len(t) == 0:
             continue
-        t.maxTime = tg.maxTime
-        tier_properties[t.name] = (i, average_duration(t))
+        durations.append((i, t.name, average_duration(t)))
+    return guess_tiers_from_durations(durations)
+
+
+def guess_tiers_from_durations(durations):
+    """
+    Guesses whether tiers are words or segments from the average durations of their elements
+
+    Parameters
+    ----------
+    durations : list
+        (index, name, average duration) tuples of the non-empty tiers
+
+    Returns
+    -------
+    tier_guesses : dict
+        the tiers and their likelihoods
+    hierarchy : `~polyglotdb.structure.Hierarchy`
+        the hierarchy object
+    """
+    tier_properties = {}
+    tier_guesses = {}
+    for i, name, duration in durations:
+        tier_properties[name] = (i, duration)
     for k, v in tier_properties.items():
         if v is None:
             continue
@@ -198,6 +211,61 @@ def guess_tiers(tg):
     return tier_guesses, hierarchy
 
 
+def make_annotation_type(name, is_interval, tier_guesses, labels, trans_delimiters=None):
+    """
+    Make the annotation type of a TextGrid tier from the guesses of :func:`guess_tiers` and its labels
+
+    Parameters
+    ----------
+    name : str
+        Name of the tier
+    is_interval : bool
+        True for interval tiers, False for point tiers
+    tier_guesses : dict
+        Linguistic types of the tiers
+    labels : set
+        Labels of the tier
+    trans_delimiters : list, optional
+        Possible transcription delimiters
+
+    Returns
+    -------
+    :class:`~polyglotdb.io.types.parsing.BaseTier`
+        Annotation type for the tier
+    """
+    if trans_delimiters is None:
+        trans_delimiters = ['.', ' ', ';', ',']
+    if name not in tier_guesses:
+        a = OrthographyTier('word', 'word')
+        a.ignored = True
+    elif tier_guesses[name] == 'segment':
+        a = SegmentTier(name, tier_guesses[name])
+    else:
+        cat = guess_type(labels, trans_delimiters)
+        if cat == 'transcription':
+            a = TranscriptionTier(name, tier_guesses[name])
+            a.trans_delimiter = guess_trans_delimiter(labels)
+        elif cat == 'numeric':
+            if is_interval:
+                raise (NotImplementedError)
+            else:
+                a = BreakIndexTier(name, tier_guesses[name])
+        elif cat == 'orthography':
+            if is_interval:
+                a = OrthographyTier(name, tier_guesses[name])
+            else:
+                a = TextOrthographyTier(name, tier_guesses[name])
+        elif cat == 'tobi':
+            a = TobiTier(name, tier_guesses[name])
+        elif cat == 'grouping':
+            a = GroupingTier(name, tier_guesses[name])
+        else:
+            print(name)
+            print(cat)
+            raise (NotImplementedError)
+    return a
+
+
 def inspect_textgrid(path):
     """
     Generate a :class:`~polyglotdb.io.parsers.textgrid.TextgridParser` for a specified TextGrid file
@@ -224,54 +292,19 @@ def inspect_textgrid(path):
         textgrids.append(path)
     anno_types = []
     for t in textgrids:
-        tg = TextGrid()
-        tg.read(t)
+        tg = read_textgrid(t)
         if len(anno_types) == 0:
             tier_guesses, hierarchy = guess_tiers(tg)
             for ti in tg.tiers:
-                if ti.name not in tier_guesses:
-                    a = OrthographyTier('word', 'word')
-                    a.ignored = True
-                elif tier_guesses[ti.name] == 'segment':
-                    a = SegmentTier(ti.name, tier_guesses[ti.name])
-                else:
-                    labels = uniqueLabels(ti)
-                    cat = guess_type(labels, trans_delimiters)
-                    if cat == 'transcription':
-                        a = TranscriptionTier(ti.name, tier_guesses[ti.name])
-                        a.trans_delimiter = guess_trans_delimiter(labels)
-                    elif cat == 'numeric':
-                        if isinstance(ti, IntervalTier):
-                            raise (NotImplementedError)
-                        else:
-                            a = BreakIndexTier(ti.name, tier_guesses[ti.name])
-                    elif cat == 'orthography':
-                        if isinstance(ti, IntervalTier):
-                            a = OrthographyTier(ti.name, tier_guesses[ti.name])
-                        else:
-                            a = TextOrthographyTier(ti.name, tier_guesses[ti.name])
-                    elif cat == 'tobi':
-                        a = TobiTier(ti.name, tier_guesses[ti.name])
-                    elif cat == 'grouping':
-                        a = GroupingTier(ti.name, tier_guesses[ti.name])
-                    else:
-                        print(ti.name)
-                        print(cat)
-                        raise (NotImplementedError)
+                a = make_annotation_type(ti.name, ti.is_interval, tier_guesses, uniqueLabels(ti), trans_delimiters)
                 if not a.ignored:
-                    try:
-                        a.add(((x.mark.strip(), x.minTime, x.maxTime) for x in ti), save=False)
-                    except AttributeError:
-                        a.add(((x.mark.strip(), x.time) for x in ti), save=False)
+                    a.add(ti.annotations(), save=False)
                 anno_types.append(a)
         else:
             for i, ti in enumerate(tg.tiers):
                 if anno_types[i].ignored:
                     continue
-                try:
-                    anno_types[i].add(((x.mark.strip(), x.minTime, x.maxTime) for x in ti), save=False)
-                except AttributeError:
-                    anno_types[i].add(((x.mark.strip(), x.time) for x in ti), save=False)
+                anno_types[i].add(ti.annotations(), save=False)
 
     parser = TextgridParser(anno_types, hierarchy)
     return parser
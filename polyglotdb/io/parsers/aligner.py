@@ -1,8 +1,6 @@
 #from __future__ import absolute_import
 import os
 
-from textgrid import TextGrid, IntervalTier
-
 from .textgrid import TextgridParser
 from ..types.parsing import OrthographyTier
 
@@ -80,12 +78,7 @@ class AlignerParser(TextgridParser):
         :class:`~polyglotdb.io.discoursedata.DiscourseData`
             Parsed data from the file
         '''
-        tg = TextGrid()
-        try:
-            tg.read(path)
-        except Exception as e:
-            print('There was an issue parsing {}:'.format(path))
-            raise
+        tg = self.load_textgrid(path)
 
         multiple_speakers, is_valid = self._is_valid(tg)
 
@@ -107,9 +100,9 @@ class AlignerParser(TextgridParser):
             # Parse the tiers
             for i, ti in enumerate(tg.tiers):
                 if ti.name.lower().startswith(self.word_label):
-                    self.annotation_types[0].add(((x.mark.strip(), x.minTime, x.maxTime) for x in ti))
+                    self.annotation_types[0].add(ti.annotations())
                 elif ti.name.lower().startswith(self.phone_label):
-                    self.annotation_types[1].add(((x.mark.strip(), x.minTime, x.maxTime) for x in ti))
+                    self.annotation_types[1].add(ti.annotations())
             pg_annotations = self._parse_annotations(types_only)
 
             data = DiscourseData(name, pg_annotations, self.hierarchy)
@@ -166,11 +159,11 @@ class AlignerParser(TextgridParser):
                     type = 'word'
                 elif type.lower().startswith(self.phone_label):
                     type = 'phone'
-                if len(ti) == 1 and ti[0].mark.strip() == '':
+                if len(ti) == 1 and ti.label(0).strip() == '':
                     continue
                 at = OrthographyTier(type, type)
                 at.speaker = speaker
-                at.add(((x.mark.strip(), x.minTime, x.maxTime) for x in ti))
+                at.add(ti.annotations())
                 self.annotation_types.append(at)
             pg_annotations = self._parse_annotations(types_only)
             data = DiscourseData(name, pg_annotations, self.hierarchy)
@@ -137,9 +137,7 @@ class BaseParser(object):
                             if False and not types_only:
                                 print(rl.name, 'is token!')
                             token_properties[rl.name] = rl[i].value
-                    a = PGAnnotation(label, begin, end)
-                    a.type_properties.update(type_properties)
-                    a.token_properties.update(token_properties)
+                    a = PGAnnotation(label, begin, end, type_properties, token_properties)
                     a.speaker = speaker
                     if i != 0:
                         a.previous_id = annotation_types[k][-1].id
@@ -158,7 +156,7 @@ class BaseParser(object):
                             a = PGSubAnnotation(sub.value, 'break', sub.begin, sub.end)
                         else:
                             a = PGSubAnnotation(None, sub.label, sub.begin, sub.end)
-                        annotation.subannotations.append(a)
+                        annotation.add_subannotation(a)
                         if k not in self.hierarchy.subannotations:
                             self.hierarchy.subannotations[k] = set()
                         self.hierarchy.subannotations[k].add(a.type)
@@ -180,7 +178,7 @@ class BaseParser(object):
                 annotation_types[segment_type].optimize_lookups()
                 for a in annotation_types[k]:
                     transcription = annotation_types[segment_type].lookup_range(a.begin, a.end, speaker=a.speaker)
-                    a.type_properties['transcription'] = [x.label for x in transcription]
+                    a.set_type_property('transcription', [x.label for x in transcription])
                 v.type_properties |= set([(tuple(['transcription', type("string")]))])
                 self.hierarchy.type_properties['word'] |= set([(tuple(['transcription', type("string")]))])
             if self.make_label and 'transcription' in v.type_property_keys and v.is_word:
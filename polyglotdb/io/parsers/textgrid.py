@@ -1,13 +1,12 @@
 import os
 
-from textgrid import TextGrid, IntervalTier
-
 from polyglotdb.exceptions import TextGridError
 from polyglotdb.structure import Hierarchy
 
 from .base import BaseParser, DiscourseData
 
 from ..helper import find_wav_path
+from ..textgrid_reader import read_textgrid
 
 
 class TextgridParser(BaseParser):
@@ -38,12 +37,15 @@ class TextgridParser(BaseParser):
                                              stop_check=stop_check, call_back=call_back)
 
     def load_textgrid(self, path):
-        tg = TextGrid()
-        try:
-            tg.read(path)
-        except ValueError as e:
-            raise (TextGridError('The file {} could not be parsed: {}'.format(path, str(e))))
-        return tg
+        """
+        Read a TextGrid file with :func:`~polyglotdb.io.textgrid_reader.read_textgrid`
+
+        Returns
+        -------
+        :class:`~polyglotdb.io.textgrid_reader.Textgrid`
+            The TextGrid
+        """
+        return read_textgrid(path)
 
     def parse_discourse(self, path, types_only=False):
         '''
@@ -78,11 +80,7 @@ class TextgridParser(BaseParser):
 
         # Parse the tiers
         for i, ti in enumerate(tg.tiers):
-
-            if isinstance(ti, IntervalTier):
-                self.annotation_types[i].add(((x.mark.strip(), x.minTime, x.maxTime) for x in ti))
-            else:
-                self.annotation_types[i].add(((x.mark.strip(), x.time) for x in ti))
+            self.annotation_types[i].add(ti.annotations())
         pg_annotations = self._parse_annotations(types_only)
 
         data = DiscourseData(name, pg_annotations, self.hierarchy)
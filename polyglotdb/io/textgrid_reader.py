@@ -0,0 +1,227 @@
+import re
+import codecs
+from array import array
+
+from polyglotdb.exceptions import TextGridError
+
+DEFAULT_PRECISION = 5
+
+# Each value of the long and short text formats is on its own line, either alone or after a key (``xmin = 0``), and
+# is a quoted string (which may span lines, with doubled quotes as escapes) or a number.  Lines without values,
+# such as ``item [1]:`` and ``<exists>``, do not match.
+_value_pattern = re.compile(r'^[ \t]*(?:[^"\n=]*= *)?(?:"((?:[^"]|"")*)"|(-?[\d.]+(?:[eE][-+]?\d+)?))[ \t]*\r?$', re.M)
+
+
+def detect_textgrid_encoding(path):
+    """
+    Detect the encoding of a TextGrid file from its byte order mark, falling back to checking for the null bytes
+    of UTF-16 without one, and then to UTF-8
+
+    Parameters
+    ----------
+    path : str
+        Path to the TextGrid file
+
+    Returns
+    -------
+    str
+        Name of the encoding
+    """
+    with open(path, 'rb') as f:
+        start = f.read(64)
+    if start.startswith(codecs.BOM_UTF16_LE) or start.startswith(codecs.BOM_UTF16_BE):
+        return 'utf-16'
+    if start.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if start[1:2] == b'\x00':
+        return 'utf-16-le'
+    if start[:1] == b'\x00':
+        return 'utf-16-be'
+    return 'utf-8'
+
+
+class TextgridTier(object):
+    """
+    Tier of a TextGrid, stored as arrays of times and indices into the label table of the TextGrid
+
+    Parameters
+    ----------
+    name : str
+        Name of the tier
+    is_interval : bool
+        True for interval tiers, False for point tiers
+    min_time : float
+        Beginning of the tier
+    max_time : float
+        End of the tier
+    labels : list
+        Label table of the TextGrid
+    """
+    __slots__ = ('name', 'is_interval', 'min_time', 'max_time', 'begins', 'ends', 'label_indices', 'labels')
+
+    def __init__(self, name, is_interval, min_time, max_time, labels):
+        self.name = name
+        self.is_interval = is_interval
+        self.min_time = min_time
+        self.max_time = max_time
+        self.begins = array('d')
+        self.ends = array('d') if is_interval else None
+        self.label_indices = array('l')
+        self.labels = labels
+
+    def __len__(self):
+        return len(self.begins)
+
+    def __iter__(self):
+        """
+        Iterate over the tier as (label, begin, end) tuples for interval tiers and (label, time) tuples for point
+        tiers
+        """
+        return self._tuples(self.labels)
+
+    def _tuples(self, labels):
+        indices = self.label_indices
+        if self.is_interval:
+            return ((labels[i], b, e) for i, b, e in zip(indices, self.begins, self.ends))
+        return ((labels[i], t) for i, t in zip(indices, self.begins))
+
+    def label(self, index):
+        """Get the label of an interval or point"""
+        return self.labels[self.label_indices[index]]
+
+    def annotations(self):
+        """
+        Iterate over the tier as tuples with whitespace stripped from the labels, as annotation types take them
+        """
+        return self._tuples([x.strip() for x in self.labels])
+
+    def unique_labels(self):
+        """Get the set of labels in the tier"""
+        labels = self.labels
+        return set(labels[i] for i in set(self.label_indices))
+
+    def average_duration(self):
+        """
+        Get the average duration of the intervals of the tier, or of the stretch between points for point tiers
+        """
+        if not len(self):
+            return 0
+        if self.is_interval:
+            return (sum(self.ends) - sum(self.begins)) / len(self)
+        return self.max_time / len(self)
+
+
+class Textgrid(object):
+    """
+    TextGrid read by :func:`read_textgrid`, with a label table shared by its tiers
+
+    Attributes
+    ----------
+    min_time : float
+        Beginning of the TextGrid
+    max_time : float
+        End of the TextGrid
+    tiers : list
+        List of :class:`TextgridTier`
+    labels : list
+        Distinct labels of the TextGrid
+    """
+
+    def __init__(self, min_time, max_time):
+        self.min_time = min_time
+        self.max_time = max_time
+        self.tiers = []
+        self.labels = []
+
+    def __len__(self):
+        return len(self.tiers)
+
+    def __iter__(self):
+        return iter(self.tiers)
+
+    def get_tier(self, name):
+        for t in self.tiers:
+            if t.name == name:
+                return t
+        return None
+
+
+def read_textgrid(path, encoding=None, round_digits=DEFAULT_PRECISION):
+    """
+    Read a TextGrid file in the long or short text format in a single pass over its values
+
+    Labels are interned in a table shared by the tiers, so each distinct label is stored once.  As with the
+    ``textgrid`` package, times are rounded and intervals that do not have a positive duration are skipped.
+
+    Parameters
+    ----------
+    path : str
+        Path to the TextGrid file
+    encoding : str, optional
+        Encoding of the file, detected with :func:`detect_textgrid_encoding` if not specified
+    round_digits : int
+        Number of digits to round times to, defaults to 5
+
+    Returns
+    -------
+    :class:`Textgrid`
+        The TextGrid
+    """
+    if encoding is None:
+        encoding = detect_textgrid_encoding(path)
+    try:
+        with open(path, 'r', encoding=encoding) as f:
+            text = f.read()
+    except UnicodeDecodeError as e:
+        raise TextGridError('The file {} could not be parsed: {}'.format(path, str(e)))
+    values = iter(_value_pattern.findall(text))
+
+    def string():
+        value, number = next(values)
+        if number:
+            raise ValueError('expected a string but found {}'.format(number))
+        if '"' in value:
+            value = value.replace('""', '"')
+        return value
+
+    def time():
+        return round(float(next(values)[1]), round_digits)
+
+    try:
+        file_type = string()
+        if not file_type.startswith('ooTextFile') or string() != 'TextGrid':
+            raise TextGridError('The file {} could not be parsed as a TextGrid as it is lacking a proper '
+                                'header.'.format(path))
+        tg = Textgrid(time(), time())
+        labels = tg.labels
+        label_table = {}
+        try:
+            num_tiers = int(next(values)[1])
+        except StopIteration:
+            num_tiers = 0
+        for _ in range(num_tiers):
+            tier_class = string()
+            if tier_class not in ('IntervalTier', 'TextTier'):
+                raise TextGridError('The file {} could not be parsed: unknown tier class {}.'.format(path, tier_class))
+            tier = TextgridTier(string(), tier_class == 'IntervalTier', time(), time(), labels)
+            begins, ends, indices = tier.begins, tier.ends, tier.label_indices
+            for _ in range(int(next(values)[1])):
+                begin = time()
+                if tier.is_interval:
+                    end = time()
+                label = string()
+                if tier.is_interval:
+                    if begin >= end:
+                        continue
+                    ends.append(end)
+                try:
+                    index = label_table[label]
+                except KeyError:
+                    index = label_table[label] = len(labels)
+                    labels.append(label)
+                begins.append(begin)
+                indices.append(index)
+            tg.tiers.append(tier)
+    except (StopIteration, ValueError) as e:
+        raise TextGridError('The file {} could not be parsed: {}'.format(path, str(e) or 'unexpected end of file'))
+    return tg
@@ -1,5 +1,13 @@
 class BaseAnnotation(object):
-    pass
+    """
+    Base class for annotations read by annotation types during inspection and parsing
+
+    Annotations are stored in slots to keep them small.  Content classes (i.e., :class:`OrthographyAnnotation`)
+    declare the slots for their values, while form classes (:class:`IntervalAnnotation` and
+    :class:`PointAnnotation`) declare none, as two bases with slots cannot be combined, so the classes combining
+    them declare the slots for their times.
+    """
+    __slots__ = ()
 
 
 class BaseAnnotationType(object):
@@ -9,6 +9,8 @@ from .base import BaseAnnotationType, BaseAnnotation
 
 
 class GroupingAnnotation(BaseAnnotation):
+    __slots__ = ()
+
     @property
     def value(self):
         """Returns empty string"""
@@ -20,6 +22,8 @@ class GroupingAnnotationType(BaseAnnotationType):
 
 
 class OrthographyAnnotation(BaseAnnotation):
+    __slots__ = ('label',)
+
     def __init__(self, label):
         self.label = label
 
@@ -46,6 +50,8 @@ class OrthographyAnnotationType(BaseAnnotationType):
 
 
 class MorphemeAnnotation(OrthographyAnnotation):
+    __slots__ = ('_list',)
+
     def __init__(self, morphemes):
         self._list = morphemes
 
@@ -95,6 +101,8 @@ class MorphemeAnnotationType(OrthographyAnnotationType):
 
 
 class TranscriptionAnnotation(MorphemeAnnotation):
+    __slots__ = ('morpheme_breaks', 'stress', 'tone')
+
     def __init__(self, segments, morpheme_breaks=None, stress=None, tone=None):
         self._list = segments
         if morpheme_breaks is None:
@@ -242,6 +250,8 @@ class TranscriptionAnnotationType(MorphemeAnnotationType):
 
 
 class NumericAnnotation(BaseAnnotation):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
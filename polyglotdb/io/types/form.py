@@ -2,6 +2,9 @@ from .base import BaseAnnotationType, BaseAnnotation
 
 
 class IntervalAnnotation(BaseAnnotation):
+    __slots__ = ()
+    time_slots = ('begin', 'end', 'midpoint')
+
     def __init__(self, begin, end):
         self.begin = begin
         self.end = end
@@ -10,6 +13,9 @@ class IntervalAnnotation(BaseAnnotation):
 
 
 class PointAnnotation(BaseAnnotation):
+    __slots__ = ()
+    time_slots = ('time',)
+
     def __init__(self, time):
         self.time = time
 
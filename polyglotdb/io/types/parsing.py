@@ -9,6 +9,8 @@ from .content import (OrthographyAnnotation, OrthographyAnnotationType,
 
 
 class Tobi(OrthographyAnnotation, PointAnnotation):
+    __slots__ = PointAnnotation.time_slots
+
     def __init__(self, label, time):
         OrthographyAnnotation.__init__(self, label)
         PointAnnotation.__init__(self, time)
@@ -19,6 +21,8 @@ class TobiTier(OrthographyAnnotationType, PointAnnotationType):
 
 
 class Orthography(OrthographyAnnotation, IntervalAnnotation):
+    __slots__ = IntervalAnnotation.time_slots
+
     def __init__(self, label, begin, end):
         OrthographyAnnotation.__init__(self, label)
         IntervalAnnotation.__init__(self, begin, end)
@@ -29,6 +33,8 @@ class OrthographyTier(OrthographyAnnotationType, IntervalAnnotationType):
 
 
 class Morpheme(MorphemeAnnotation, IntervalAnnotation):
+    __slots__ = IntervalAnnotation.time_slots
+
     def __init__(self, morphemes, begin, end):
         MorphemeAnnotation.__init__(self, morphemes)
         IntervalAnnotation.__init__(self, begin, end)
@@ -39,6 +45,8 @@ class MorphemeTier(MorphemeAnnotationType, IntervalAnnotationType):
 
 
 class Transcription(TranscriptionAnnotation, IntervalAnnotation):
+    __slots__ = IntervalAnnotation.time_slots
+
     def __init__(self, segments, begin, end, morpheme_breaks=None, stress=None, tone=None):
         TranscriptionAnnotation.__init__(self, segments, morpheme_breaks, stress, tone)
         IntervalAnnotation.__init__(self, begin, end)
@@ -49,7 +57,7 @@ class TranscriptionTier(TranscriptionAnnotationType, IntervalAnnotationType):
 
 
 class Segment(Orthography):
-    pass
+    __slots__ = ()
 
 
 class SegmentTier(IntervalAnnotationType, OrthographyAnnotationType):
@@ -57,6 +65,8 @@ class SegmentTier(IntervalAnnotationType, OrthographyAnnotationType):
 
 
 class Grouping(IntervalAnnotation, GroupingAnnotation):
+    __slots__ = IntervalAnnotation.time_slots
+
     def __init__(self, begin, end):
         IntervalAnnotation.__init__(self, begin, end)
 
@@ -75,6 +85,8 @@ class GroupingTier(GroupingAnnotationType, IntervalAnnotationType):
 
 
 class TextOrthography(OrthographyAnnotation, PointAnnotation):
+    __slots__ = PointAnnotation.time_slots
+
     def __init__(self, label, time):
         OrthographyAnnotation.__init__(self, label)
         PointAnnotation.__init__(self, time)
@@ -85,6 +97,8 @@ class TextOrthographyTier(OrthographyAnnotationType, PointAnnotationType):
 
 
 class TextMorpheme(MorphemeAnnotation, PointAnnotation):
+    __slots__ = PointAnnotation.time_slots
+
     def __init__(self, morphemes, time):
         MorphemeAnnotation.__init__(self, morphemes)
         PointAnnotation.__init__(self, time)
@@ -95,6 +109,8 @@ class TextMorphemeTier(MorphemeAnnotationType, PointAnnotationType):
 
 
 class TextTranscription(TranscriptionAnnotation, PointAnnotation):
+    __slots__ = PointAnnotation.time_slots
+
     def __init__(self, segments, time, morpheme_breaks=None, stress=None, tone=None):
         TranscriptionAnnotation.__init__(self, segments, morpheme_breaks, stress, tone)
         PointAnnotation.__init__(self, time)
@@ -105,6 +121,8 @@ class TextTranscriptionTier(TranscriptionAnnotationType, PointAnnotationType):
 
 
 class BreakIndex(NumericAnnotation, PointAnnotation):
+    __slots__ = PointAnnotation.time_slots
+
     def __init__(self, value, time):
         NumericAnnotation.__init__(self, value)
         PointAnnotation.__init__(self, time)
@@ -1,11 +1,72 @@
 from uuid import uuid1
+from types import MappingProxyType
 import hashlib
 
-from ..helper import normalize_values_for_neo4j
+from ..helper import normalize_values_for_neo4j, make_type_id
+
+# Annotations of a type share their property keys, so key tuples are interned and each annotation only stores a
+# reference to its keys and a tuple of values
+_property_keys = {(): ()}
+_sorted_keys = {}
+
+
+def intern_property_keys(keys):
+    """
+    Get the shared tuple for a sequence of property keys
+
+    Parameters
+    ----------
+    keys : iterable
+        Property keys
+
+    Returns
+    -------
+    tuple
+        Interned tuple of the keys
+    """
+    keys = tuple(keys)
+    return _property_keys.setdefault(keys, keys)
+
+
+def _sorted_property_keys(keys, has_label):
+    try:
+        return _sorted_keys[keys, has_label]
+    except KeyError:
+        sorted_keys = list(keys)
+        if has_label:
+            sorted_keys.append('label')
+        sorted_keys = _sorted_keys[keys, has_label] = sorted(sorted_keys)
+        return sorted_keys
+
+
+def _set_properties(keys, values, properties):
+    current = dict(zip(keys, values))
+    current.update(properties)
+    return intern_property_keys(current.keys()), tuple(current.values())
 
 
 class PGAnnotation(object):
-    def __init__(self, label, begin, end):
+    """
+    Annotation parsed from a discourse, stored in slots with its type and token properties as shared key tuples
+    and value tuples
+
+    Parameters
+    ----------
+    label : str
+        Label of the annotation
+    begin : float
+        Beginning of the annotation
+    end : float
+        End of the annotation
+    type_properties : dict, optional
+        Type properties of the annotation
+    token_properties : dict, optional
+        Token properties of the annotation
+    """
+    __slots__ = ('id', 'label', 'begin', 'end', 'midpoint', 'super_id', 'previous_id', 'speaker', 'subannotations',
+                 '_type_keys', '_type_values', '_token_keys', '_token_values')
+
+    def __init__(self, label, begin, end, type_properties=None, token_properties=None):
         self.id = uuid1()
         self.label = label
         if begin > end:
@@ -17,13 +78,62 @@ class PGAnnotation(object):
         except TypeError:
             self.midpoint = None
 
-        self.type_properties = {}
-        self.token_properties = {}
+        self._type_keys, self._type_values = _set_properties((), (), type_properties or {})
+        self._token_keys, self._token_values = _set_properties((), (), token_properties or {})
         self.super_id = None
         self.previous_id = None
         self.speaker = None
 
-        self.subannotations = []
+        self.subannotations = ()
+
+    @property
+    def type_properties(self):
+        """Read-only mapping of the type properties, see :meth:`set_type_property` for setting them"""
+        return MappingProxyType(dict(zip(self._type_keys, self._type_values)))
+
+    @property
+    def token_properties(self):
+        """Read-only mapping of the token properties, see :meth:`set_token_property` for setting them"""
+        return MappingProxyType(dict(zip(self._token_keys, self._token_values)))
+
+    def set_type_property(self, key, value):
+        """
+        Set a type property of the annotation
+
+        Parameters
+        ----------
+        key : str
+            Name of the property
+        value : object
+            Value of the property
+        """
+        self._type_keys, self._type_values = _set_properties(self._type_keys, self._type_values, {key: value})
+
+    def set_token_property(self, key, value):
+        """
+        Set a token property of the annotation
+
+        Parameters
+        ----------
+        key : str
+            Name of the property
+        value : object
+            Value of the property
+        """
+        self._token_keys, self._token_values = _set_properties(self._token_keys, self._token_values, {key: value})
+
+    def add_subannotation(self, subannotation):
+        """
+        Add a subannotation to the annotation
+
+        Parameters
+        ----------
+        subannotation : :class:`PGSubAnnotation`
+            The subannotation
+        """
+        if not self.subannotations:
+            self.subannotations = []
+        self.subannotations.append(subannotation)
 
     def sha(self, corpus=None):
         """
@@ -38,10 +148,10 @@ class PGAnnotation(object):
         str
             a hex string containing the digest of the values as hexadecimal numbers
         """
+        if corpus is not None:
+            return make_type_id(self.type_values(), corpus)
         m = hashlib.sha1()
         value = ' '.join(map(str, self.type_values()))
-        if corpus is not None:
-            value += ' ' + corpus
         m.update(value.encode())
         out = m.hexdigest()
         return out
@@ -55,10 +165,7 @@ class PGAnnotation(object):
         list 
             sorted list of property keys
         """
-        keys = list(self.type_properties.keys())
-        if self.label is not None:
-            keys.append('label')
-        return sorted(keys)
+        return list(_sorted_property_keys(self._type_keys, self.label is not None))
 
     def type_values(self):
         """
@@ -71,8 +178,8 @@ class PGAnnotation(object):
         
 
         """
-        normalized = normalize_values_for_neo4j(self.type_properties)
-        for k in self.type_keys():
+        normalized = normalize_values_for_neo4j(dict(zip(self._type_keys, self._type_values)))
+        for k in _sorted_property_keys(self._type_keys, self.label is not None):
             if k == 'label':
                 yield self.label
             else:
@@ -87,10 +194,7 @@ class PGAnnotation(object):
         list 
             sorted list of property keys
         """
-        keys = list(self.token_properties.keys())
-        if self.label is not None:
-            keys.append('label')
-        return sorted(keys)
+        return list(_sorted_property_keys(self._token_keys, self.label is not None))
 
     def token_values(self):
         """
@@ -103,8 +207,8 @@ class PGAnnotation(object):
         
 
         """
-        normalized = normalize_values_for_neo4j(self.token_properties)
-        for k in self.token_keys():
+        normalized = normalize_values_for_neo4j(dict(zip(self._token_keys, self._token_values)))
+        for k in _sorted_property_keys(self._token_keys, self.label is not None):
             if k == 'label':
                 yield self.label
             else:
@@ -148,14 +252,15 @@ class PGAnnotationType(object):
         """
         self._list.append(annotation)
         self.type_property_keys.update(annotation.type_keys())
-        for k, v in annotation.type_properties.items():
+        for k, v in zip(annotation._type_keys, annotation._type_values):
             if isinstance(v, list):
                 t = str
             else:
                 t = type(v)
             self.type_properties.add((k, t))
         self.token_property_keys.update(annotation.token_keys())
-        self.token_properties.update((k, type(v)) for k, v in annotation.token_properties.items() if v is not None)
+        self.token_properties.update((k, type(v)) for k, v in zip(annotation._token_keys, annotation._token_values)
+                                     if v is not None)
 
     @property
     def speakers(self):
@@ -265,6 +370,8 @@ class PGAnnotationType(object):
 
 
 class PGSubAnnotation(PGAnnotation):
+    __slots__ = ('type',)
+
     def __init__(self, label, type, begin, end):
         self.id = uuid1()
         self.label = label
@@ -272,5 +379,5 @@ class PGSubAnnotation(PGAnnotation):
         self.begin = begin
         self.end = end
 
-        self.type_properties = {}
-        self.token_properties = {}
+        self._type_keys, self._type_values = (), ()
+        self._token_keys, self._token_values = (), ()
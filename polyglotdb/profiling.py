@@ -0,0 +1,264 @@
+import os
+import re
+import time
+import logging
+
+from influxdb import InfluxDBClient
+
+from .config import setup_logger
+
+STRING_PATTERN = re.compile(r'''('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")''')
+NUMBER_PATTERN = re.compile(r'(?<![\w`.])-?\d+(\.\d+)?(e-?\d+)?\b')
+LIST_PATTERN = re.compile(r'\[\s*\?(\s*,\s*\?)*\s*\]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+UNPROFILABLE_PATTERN = re.compile(r'^\s*(PROFILE|EXPLAIN|USING\s+PERIODIC\s+COMMIT|CREATE\s+INDEX|DROP\s+INDEX|'
+                                  r'CREATE\s+CONSTRAINT|DROP\s+CONSTRAINT|CALL)\b', re.IGNORECASE)
+
+
+def normalize_statement(statement):
+    """
+    Reduce a statement to a template, so that statements differing only in their literal values are
+    aggregated together
+
+    String and numeric literals are replaced with ``?``, lists of literals with ``[?]``, and whitespace is
+    collapsed.
+
+    Parameters
+    ----------
+    statement : str
+        Cypher or InfluxQL statement
+
+    Returns
+    -------
+    str
+        Statement template
+    """
+    template = STRING_PATTERN.sub('?', statement)
+    template = NUMBER_PATTERN.sub('?', template)
+    template = LIST_PATTERN.sub('[?]', template)
+    return WHITESPACE_PATTERN.sub(' ', template).strip()
+
+
+def sum_db_hits(plan):
+    """Get the total number of database hits in a profiled Neo4j plan"""
+    if plan is None:
+        return None
+    return getattr(plan, 'db_hits', 0) + sum(sum_db_hits(x) for x in getattr(plan, 'children', []))
+
+
+class StatementStatistics(object):
+    """
+    Aggregate costs of the statements matching a template
+
+    Attributes
+    ----------
+    template : str
+        Normalized statement
+    kind : str
+        ``'cypher'`` or ``'influxql'``
+    count : int
+        Number of times a matching statement was executed
+    total_time : float
+        Total wall time in seconds
+    max_time : float
+        Longest wall time in seconds
+    rows : int
+        Total rows (or points) returned
+    db_hits : int or None
+        Total Neo4j database hits, if profiled
+    """
+    def __init__(self, template, kind):
+        self.template = template
+        self.kind = kind
+        self.count = 0
+        self.total_time = 0
+        self.max_time = 0
+        self.rows = 0
+        self.db_hits = None
+
+    @property
+    def mean_time(self):
+        if not self.count:
+            return 0
+        return self.total_time / self.count
+
+    def update(self, elapsed, rows, db_hits=None):
+        self.count += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        if rows is not None:
+            self.rows += rows
+        if db_hits is not None:
+            self.db_hits = (self.db_hits or 0) + db_hits
+
+
+class QueryProfiler(object):
+    """
+    Records the cost of every Cypher and InfluxQL statement executed by a corpus context
+
+    Parameters
+    ----------
+    profile_db_hits : bool
+        If True, Cypher statements are run with ``PROFILE`` so that Neo4j database hits are recorded (statements
+        that cannot be profiled, such as schema changes and periodic commits, are run as is)
+    slow_threshold : float, optional
+        Statements taking longer than this number of seconds are kept in the slow query log, and written to
+        the logger if there is one
+    logger_name : str, optional
+        Name of a logger (set up with :func:`~polyglotdb.config.setup_logger`) to write slow queries and reports to
+    """
+    def __init__(self, profile_db_hits=False, slow_threshold=None, logger_name=None):
+        self.profile_db_hits = profile_db_hits
+        self.slow_threshold = slow_threshold
+        self.logger_name = logger_name
+        self.statistics = {}
+        self.slow_queries = []
+
+    @property
+    def logger(self):
+        if self.logger_name is None:
+            return None
+        return logging.getLogger(self.logger_name)
+
+    def profile_statement(self, statement):
+        """Prefix a Cypher statement with ``PROFILE`` if database hits are being recorded"""
+        if self.profile_db_hits and not UNPROFILABLE_PATTERN.match(statement):
+            return 'PROFILE ' + statement
+        return statement
+
+    def record(self, kind, statement, elapsed, rows=None, db_hits=None):
+        """
+        Record the execution of a statement
+
+        Parameters
+        ----------
+        kind : str
+            ``'cypher'`` or ``'influxql'``
+        statement : str
+            Statement executed
+        elapsed : float
+            Wall time in seconds
+        rows : int, optional
+            Number of rows returned
+        db_hits : int, optional
+            Number of database hits
+        """
+        template = normalize_statement(statement)
+        key = (kind, template)
+        if key not in self.statistics:
+            self.statistics[key] = StatementStatistics(template, kind)
+        self.statistics[key].update(elapsed, rows, db_hits)
+        if self.slow_threshold is not None and elapsed >= self.slow_threshold:
+            self.slow_queries.append((kind, statement, elapsed, rows))
+            if self.logger is not None:
+                self.logger.warning('Slow {} query ({:.3f} s, {} rows): {}'.format(
+                    kind, elapsed, rows, WHITESPACE_PATTERN.sub(' ', statement).strip()))
+
+    def summary(self, sort_by='total_time', limit=None):
+        """
+        Get the aggregated statistics per statement template
+
+        Parameters
+        ----------
+        sort_by : str
+            Attribute of :class:`StatementStatistics` to sort by (descending), defaults to ``'total_time'``
+        limit : int, optional
+            Maximum number of templates to return
+
+        Returns
+        -------
+        list
+            List of :class:`StatementStatistics`
+        """
+        statistics = sorted(self.statistics.values(), key=lambda x: getattr(x, sort_by) or 0, reverse=True)
+        if limit is not None:
+            statistics = statistics[:limit]
+        return statistics
+
+    def report(self, sort_by='total_time', limit=20):
+        """
+        Generate a text report of the most expensive statement templates
+
+        Parameters
+        ----------
+        sort_by : str
+            Attribute of :class:`StatementStatistics` to sort by, defaults to ``'total_time'``
+        limit : int
+            Maximum number of templates to include
+
+        Returns
+        -------
+        str
+            Report
+        """
+        lines = ['{:>8} {:>7} {:>10} {:>10} {:>10} {:>12} {:>12}  {}'.format('kind', 'count', 'total (s)', 'mean (s)',
+                                                                        'max (s)', 'rows', 'db hits',
+                                                                        'statement')]
+        for s in self.summary(sort_by, limit):
+            db_hits = '' if s.db_hits is None else s.db_hits
+            lines.append('{:>8} {:>7} {:>10.3f} {:>10.3f} {:>10.3f} {:>12} {:>12}  {}'.format(
+                s.kind, s.count, s.total_time, s.mean_time, s.max_time, s.rows, db_hits, s.template))
+        if self.slow_queries:
+            lines.append('')
+            lines.append('{} queries took over {} s'.format(len(self.slow_queries), self.slow_threshold))
+        return '\n'.join(lines)
+
+    def log_report(self, sort_by='total_time', limit=20):
+        """Write the report to the profiler's logger"""
+        if self.logger is not None:
+            self.logger.info('\n' + self.report(sort_by, limit))
+
+    def reset(self):
+        """Clear all recorded statistics"""
+        self.statistics = {}
+        self.slow_queries = []
+
+
+def setup_query_logger(config):
+    """
+    Set up a logger for query profiling in the corpus's log directory
+
+    Parameters
+    ----------
+    config : :class:`~polyglotdb.config.CorpusConfig`
+        Config of the corpus
+
+    Returns
+    -------
+    str
+        Name of the logger
+    """
+    logger_name = '{}_queries'.format(config.corpus_name)
+    if not logging.getLogger(logger_name).handlers:
+        setup_logger(logger_name, os.path.join(config.log_dir, 'queries.log'), level=config.log_level)
+    return logger_name
+
+
+def count_points(result):
+    """Count the points in an InfluxDB result set"""
+    try:
+        return sum(len(series.get('values', [])) for series in result.raw.get('series', []))
+    except AttributeError:
+        return None
+
+
+class ProfiledInfluxDBClient(InfluxDBClient):
+    """InfluxDB client that records the cost of its queries and writes with a :class:`QueryProfiler`"""
+    def __init__(self, profiler, **kwargs):
+        super(ProfiledInfluxDBClient, self).__init__(**kwargs)
+        self.profiler = profiler
+
+    def query(self, query, *args, **kwargs):
+        begin = time.time()
+        result = super(ProfiledInfluxDBClient, self).query(query, *args, **kwargs)
+        self.profiler.record('influxql', query, time.time() - begin, count_points(result))
+        return result
+
+    def write_points(self, points, *args, **kwargs):
+        begin = time.time()
+        result = super(ProfiledInfluxDBClient, self).write_points(points, *args, **kwargs)
+        measurements = sorted(set(p.get('measurement', '') for p in points))
+        self.profiler.record('influxql', 'WRITE POINTS {}'.format(','.join(measurements)), time.time() - begin,
+                             len(points))
+        return result
@@ -220,6 +220,9 @@ class PathAttribute(AnnotationCollectionAttribute):
             return self.rate_return_template.format(alias=self.node.collection_alias,
                                                     node_alias=self.node.anchor_node.alias)
         elif self.label == 'position':
+            ordinal = self.ordinal_property
+            if ordinal is not None:
+                return '{}.{}'.format(self.node.collected_node.alias, ordinal)
             return self.position_return_template.format(alias=self.node.collection_alias,
                                                         node_alias=self.node.collected_node.alias)
         if self.requires_type():
@@ -229,6 +232,25 @@ class PathAttribute(AnnotationCollectionAttribute):
     def for_filter(self):
         return self.filter_template.format(alias=self.node.collection_alias, property=self.label)
 
+    @property
+    def ordinal_property(self):
+        """
+        Encoded ordinal property that gives the position of the annotation in its higher annotation,
+        or None if positions have to be computed from the collection (see ``encode_ordinals``)
+        """
+        if self.label != 'position' or self.node.collected_node.subset_labels:
+            return None
+        ordinal = 'ordinal_in_{}'.format(self.node.anchor_node.node_type)
+        if not self.node.hierarchy.has_token_property(self.node.collected_node.node_type, ordinal):
+            return None
+        return ordinal
+
+    @property
+    def nodes(self):
+        if self.ordinal_property is not None:
+            return self.node.collected_node.nodes
+        return self.node.nodes
+
     def requires_type(self):
         from .subannotation import SubAnnotation
         if isinstance(self.node, SubAnnotation):
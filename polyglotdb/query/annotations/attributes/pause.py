@@ -78,6 +78,8 @@ class FollowingPauseAnnotation(AnnotationCollectionNode):
     path_prefix = 'path_'
 
     subquery_match_template = '''{collection_alias} = ({anchor_alias})-[:precedes_pause*0..]->(:speech:word)'''
+    adjacency_match_template = '''{collection_alias} = ({anchor_alias})-[:precedes_pause*]->(:speech:word {{id: {anchor_alias}.following_speech_id}})'''
+    duration_property = 'following_pause_duration'
     subquery_template = '''{optional}MATCH {for_match}
         WHERE NONE (x in nodes({collection_alias})[1..-1] where x:speech)
          AND size(nodes({collection_alias})[1..-1]) > 0
@@ -127,8 +129,10 @@ class FollowingPauseAnnotation(AnnotationCollectionNode):
                     relevant.append(c.for_cypher())
             if relevant:
                 where_string = 'WHERE ' + '\nAND '.join(relevant)
-        for_match = self.subquery_match_template.format(anchor_alias=self.anchor_node.alias,
-                                                        collection_alias=self.collection_alias)
+        template = self.subquery_match_template
+        if self.has_adjacency:
+            template = self.adjacency_match_template
+        for_match = template.format(anchor_alias=self.anchor_node.alias, collection_alias=self.collection_alias)
         kwargs = {'for_match': for_match,
                   'optional': '',
                   'collection_alias': self.collection_alias,
@@ -137,6 +141,11 @@ class FollowingPauseAnnotation(AnnotationCollectionNode):
             kwargs['optional'] = 'OPTIONAL '
         return self.subquery_template.format(**kwargs)
 
+    @property
+    def has_adjacency(self):
+        """Whether the neighbouring speech words and pause durations have been encoded (see ``encode_pauses``)"""
+        return self.anchor_node.hierarchy.has_token_property(self.anchor_node.node_type, self.duration_property)
+
     def with_statement(self):
         return 'nodes({alias})[1..-1] as {alias}'.format(alias=self.collection_alias)
 
@@ -156,6 +165,8 @@ class FollowingPauseAnnotation(AnnotationCollectionNode):
 
 class PreviousPauseAnnotation(FollowingPauseAnnotation):
     subquery_match_template = '''{collection_alias} = (:speech:word)-[:precedes_pause*0..]->({anchor_alias})'''
+    adjacency_match_template = '''{collection_alias} = (:speech:word {{id: {anchor_alias}.previous_speech_id}})-[:precedes_pause*]->({anchor_alias})'''
+    duration_property = 'previous_pause_duration'
 
     @property
     def key(self):
@@ -167,13 +178,29 @@ class PausePathAttribute(AnnotationCollectionAttribute):
     duration_filter_template = 'extract(n in nodes({alias})[-1..]| n.end)[0] - extract(n in nodes({alias})[0..1]| n.begin)[0]'
     duration_return_template = 'extract(n in {alias}[-1..]| n.end)[0] - extract(n in {alias}[0..1]| n.begin)[0]'
     filter_template = 'extract(n in nodes({alias})|n.{property})'
+    stored_template = '{alias}.{property}'
+
+    @property
+    def stored_duration(self):
+        """Whether the duration is read from the pause durations encoded on the anchor word"""
+        return self.label == 'duration' and self.node.has_adjacency
+
+    @property
+    def nodes(self):
+        if self.stored_duration:
+            return self.node.anchor_node.nodes
+        return self.node.nodes
 
     def for_filter(self):
+        if self.stored_duration:
+            return self.stored_template.format(alias=self.node.anchor_node.alias, property=self.node.duration_property)
         if self.label == 'duration':
             return self.duration_filter_template.format(alias=self.node.collection_alias)
         return self.filter_template.format(alias=self.node.collection_alias, property=self.label)
 
     def for_return(self):
+        if self.stored_duration:
+            return self.stored_template.format(alias=self.node.anchor_node.alias, property=self.node.duration_property)
         if self.label == 'duration':
             return self.duration_return_template.format(alias=self.node.collection_alias)
         return self.return_template.format(alias=self.node.collection_alias, property=self.label)
@@ -6,6 +6,8 @@ from ....exceptions import AnnotationAttributeError
 class PrecedenceAnnotation(AnnotationNode):
     non_optional = False
     match_template = '({anchor_alias})-[:precedes]-({token_alias})-[:is_a]->({type_alias})'
+    ordinal_match_template = '''({token_alias} {{sequence_id: {root_alias}.sequence_id,
+    sequence_ordinal: {root_alias}.sequence_ordinal {sign} {offset}}})-[:is_a]->({type_alias})'''
     alias_prefix = ''
 
     def __init__(self, node, pos):
@@ -38,11 +40,31 @@ class PrecedenceAnnotation(AnnotationNode):
         """Returns a cypher formatted string of keys and prefixes"""
         return key_for_cypher(self.alias_template.format(t=self.key, prefix=''))
 
+    @property
+    def root_node(self):
+        """The annotation that the chain of precedence annotations is anchored to"""
+        node = self.anchor_node
+        while isinstance(node, PrecedenceAnnotation):
+            node = node.anchor_node
+        return node
+
+    @property
+    def has_ordinals(self):
+        """Whether sequence ordinals have been encoded for the annotation type (see ``encode_ordinals``)"""
+        return self.hierarchy is not None and self.hierarchy.has_token_property(self.node_type, 'sequence_ordinal')
+
     def for_match(self):
         """ sets 'token_alias' and 'type_alias'  keyword arguments for an annotation """
         kwargs = {'token_alias': self.define_alias,
                   'type_alias': self.define_type_alias,
                   'anchor_alias': self.anchor_node.alias}
+        if self.has_ordinals:
+            # Look up the token directly by its position in the speaker's sequence, rather than following
+            # precedes relationships hop by hop
+            kwargs['root_alias'] = self.root_node.alias
+            kwargs['sign'] = '-' if self.pos < 0 else '+'
+            kwargs['offset'] = abs(self.pos)
+            return self.ordinal_match_template.format(**kwargs)
         return self.match_template.format(**kwargs)
 
     @property
@@ -80,6 +80,7 @@ class LinguisticAnnotation(BaseAnnotation):
         self._tracks = {}
 
         self._preloaded = False
+        self._page = None
 
     def __str__(self):
         return '<{} annotation with id: {}>'.format(self._type, self._node['id'])
@@ -186,6 +187,8 @@ class LinguisticAnnotation(BaseAnnotation):
         if key == 'label' and self._type == 'utterance':
             return '{} ({} to {})'.format(self.discourse.name, self.begin, self.end)
         if key == 'previous':
+            if self._previous is None and self._page is not None:
+                self._page.load_relation(self, key)
             if self._previous == 'empty':
                 return None
             if self._previous is None:
@@ -200,6 +203,8 @@ class LinguisticAnnotation(BaseAnnotation):
                 self._previous.type_node = res[0]['previous_type']
             return self._previous
         if key == 'following':
+            if self._following is None and self._page is not None:
+                self._page.load_relation(self, key)
             if self._following == 'empty':
                 return None
             if self._following is None:
@@ -226,6 +231,8 @@ class LinguisticAnnotation(BaseAnnotation):
                 return None
             return getattr(f, key)
         if key == 'speaker':
+            if self._speaker is None and self._page is not None:
+                self._page.load_relation(self, key)
             if self._speaker == 'empty':
                 return None
             if self._speaker is None:
@@ -239,6 +246,8 @@ class LinguisticAnnotation(BaseAnnotation):
                 self._speaker.node = res[0]['speaker']
             return self._speaker
         if key == 'discourse':
+            if self._discourse is None and self._page is not None:
+                self._page.load_relation(self, key)
             if self._discourse == 'empty':
                 return None
             if self._discourse is None:
@@ -252,6 +261,8 @@ class LinguisticAnnotation(BaseAnnotation):
                 self._discourse.node = res[0]['discourse']
             return self._discourse
         if key in self.corpus_context.hierarchy.get_lower_types(self._type):
+            if key not in self._subs and self._page is not None:
+                self._page.load_relation(self, key)
             if key not in self._subs:
                 res = self.corpus_context.execute_cypher(
                     '''MATCH (lower_type)<-[:is_a]-(lower_token:{a_type})-[:contained_by*1..]->(token {{id: {{id}}}})
@@ -264,6 +275,8 @@ class LinguisticAnnotation(BaseAnnotation):
                     self._subs[key].append(a)
             return self._subs[key]
         if key in self.corpus_context.hierarchy.get_higher_types(self._type):
+            if key not in self._supers and self._page is not None:
+                self._page.load_relation(self, key)
             if key not in self._supers:
                 res = list(self.corpus_context.execute_cypher(
                     '''MATCH (higher_type)<-[:is_a]-(higher_token:{a_type})<-[:contained_by*1..]-(token {{id: {{id}}}})
@@ -279,7 +292,9 @@ class LinguisticAnnotation(BaseAnnotation):
             if key in self.corpus_context.hierarchy.subannotations[self._type]:
                 if self._preloaded and key not in self._subannotations:
                     return []
-                elif key not in self._subannotations:
+                if key not in self._subannotations and self._page is not None:
+                    self._page.load_relation(self, key)
+                if key not in self._subannotations:
                     res = self.corpus_context.execute_cypher(
                         '''MATCH (sub:{a_type})-[:annotates]->(token {{id: {{id}}}})
                             RETURN sub'''.format(a_type=key), id=self._id)
@@ -574,3 +589,140 @@ class Discourse(Speaker):
         self._type = 'Discourse'
         self._id = None
         self._node = None
+
+
+class AnnotationPage(object):
+    """
+    Group of sibling annotations (i.e., a page of query results) whose relations are loaded together
+
+    The first time a relation (previous, following, speaker, discourse, lower or higher annotations, or
+    subannotations) is accessed on one annotation of the page, it is fetched for every annotation in the page
+    that has not loaded it yet with a single ``UNWIND`` query, rather than one query per annotation.
+    Annotations loaded this way form a page of their own, so their relations are batched as well.
+    """
+    def __init__(self):
+        self.annotations = []
+        self.attempted = {}
+
+    def __len__(self):
+        return len(self.annotations)
+
+    def add(self, annotation):
+        """
+        Add an annotation to the page
+
+        Parameters
+        ----------
+        annotation : :class:`LinguisticAnnotation`
+            Annotation to add
+        """
+        annotation._page = self
+        self.annotations.append(annotation)
+
+    @staticmethod
+    def relation_loaded(annotation, key):
+        if key == 'previous':
+            return annotation._previous is not None
+        if key == 'following':
+            return annotation._following is not None
+        if key == 'speaker':
+            return annotation._speaker is not None
+        if key == 'discourse':
+            return annotation._discourse is not None
+        if key in annotation._subs or key in annotation._supers or key in annotation._subannotations:
+            return True
+        if annotation._preloaded and key in annotation.corpus_context.hierarchy.subannotations.get(annotation._type,
+                                                                                                   []):
+            return True
+        return False
+
+    def load_relation(self, annotation, key):
+        """
+        Load a relation for an annotation and all of its unloaded siblings of the same type
+
+        Parameters
+        ----------
+        annotation : :class:`LinguisticAnnotation`
+            Annotation the relation was accessed on
+        key : str
+            Name of the relation
+        """
+        attempted = self.attempted.setdefault(key, set())
+        if annotation._id in attempted:
+            # Already fetched for this annotation but not found, so leave it to the single annotation query
+            return
+        corpus_context = annotation.corpus_context
+        hierarchy = corpus_context.hierarchy
+        siblings = {a._id: a for a in self.annotations
+                    if a._type == annotation._type and a._id not in attempted and not self.relation_loaded(a, key)}
+        siblings[annotation._id] = annotation
+        attempted.update(siblings.keys())
+        match_token = '''UNWIND {{ids}} AS id
+            MATCH (token:{a_type}:{corpus_name}) WHERE token.id = id
+            '''.format(a_type=annotation._type, corpus_name=corpus_context.cypher_safe_name)
+        related_page = AnnotationPage()
+        if key in ('previous', 'following'):
+            if key == 'previous':
+                pattern = '(previous_type)<-[:is_a]-(previous_token)-[:precedes]->(token)'
+            else:
+                pattern = '(following_type)<-[:is_a]-(following_token)<-[:precedes]-(token)'
+            statement = match_token + '''MATCH {pattern}
+                RETURN id, {key}_token AS node, {key}_type AS type_node'''.format(pattern=pattern, key=key)
+            found = {}
+            for r in corpus_context.execute_cypher(statement, ids=list(siblings.keys())):
+                a = LinguisticAnnotation(corpus_context)
+                a.node = r['node']
+                a.type_node = r['type_node']
+                related_page.add(a)
+                found[r['id']] = a
+            for k, v in siblings.items():
+                setattr(v, '_' + key, found.get(k, 'empty'))
+        elif key in ('speaker', 'discourse'):
+            if key == 'speaker':
+                pattern = '(node:Speaker)<-[:spoken_by]-(token)'
+                model = Speaker
+            else:
+                pattern = '(node:Discourse)<-[:spoken_in]-(token)'
+                model = Discourse
+            statement = match_token + '''MATCH {pattern}
+                RETURN id, node'''.format(pattern=pattern)
+            found = {}
+            for r in corpus_context.execute_cypher(statement, ids=list(siblings.keys())):
+                a = model(corpus_context)
+                a.node = r['node']
+                found[r['id']] = a
+            for k, v in siblings.items():
+                setattr(v, '_' + key, found.get(k, 'empty'))
+        elif key in hierarchy.get_lower_types(annotation._type):
+            statement = match_token + '''MATCH (lower_type)<-[:is_a]-(lower_token:{a_type})-[:contained_by*1..]->(token)
+                RETURN id, lower_token, lower_type ORDER BY lower_token.begin'''.format(a_type=key)
+            for v in siblings.values():
+                v._subs[key] = []
+            for r in corpus_context.execute_cypher(statement, ids=list(siblings.keys())):
+                a = LinguisticAnnotation(corpus_context)
+                a.node = r['lower_token']
+                a.type_node = r['lower_type']
+                related_page.add(a)
+                siblings[r['id']]._subs[key].append(a)
+        elif key in hierarchy.get_higher_types(annotation._type):
+            statement = match_token + '''MATCH (higher_type)<-[:is_a]-(higher_token:{a_type})<-[:contained_by*1..]-(token)
+                RETURN id, higher_token, higher_type'''.format(a_type=key)
+            for r in corpus_context.execute_cypher(statement, ids=list(siblings.keys())):
+                if key in siblings[r['id']]._supers:
+                    continue
+                a = LinguisticAnnotation(corpus_context)
+                a.node = r['higher_token']
+                a.type_node = r['higher_type']
+                related_page.add(a)
+                siblings[r['id']]._supers[key] = a
+        else:
+            statement = match_token + '''MATCH (sub:{a_type})-[:annotates]->(token)
+                RETURN id, sub'''.format(a_type=key)
+            for v in siblings.values():
+                v._subannotations[key] = []
+            for r in corpus_context.execute_cypher(statement, ids=list(siblings.keys())):
+                parent = siblings[r['id']]
+                a = SubAnnotation(corpus_context)
+                a._annotation = parent
+                a.node = r['sub']
+                parent._subannotations[key].append(a)
@@ -9,7 +9,7 @@ from .attributes import (HierarchicalAnnotation, SubPathAnnotation,
                          SpeakerAnnotation, DiscourseAnnotation,
                          Track as TrackAnnotation)
 from ...acoustics.classes import Track
-from .models import LinguisticAnnotation, SubAnnotation, Speaker, Discourse
+from .models import LinguisticAnnotation, SubAnnotation, Speaker, Discourse, AnnotationPage
 
 
 def hydrate_model(r, to_find, to_find_type, to_preload, to_preload_acoustics, corpus):
@@ -82,8 +82,12 @@ def hydrate_model(r, to_find, to_find_type, to_preload, to_preload_acoustics, co
 
 
 class QueryResults(BaseQueryResults):
+    # Number of models whose relations are loaded together when first accessed
+    page_size = 100
+
     def __init__(self, query):
         super(QueryResults, self).__init__(query)
+        self._page = None
         self.speaker_discourse_channels = {}
         self.num_tracks = 0
         self.track_columns = []
@@ -120,6 +124,9 @@ class QueryResults(BaseQueryResults):
         if self.models:
 
             r = hydrate_model(r, self._to_find, self._to_find_type, self._preload, self._preload_acoustics, self.corpus)
+            if self._page is None or len(self._page) >= self.page_size:
+                self._page = AnnotationPage()
+            self._page.add(r)
         else:
             r = AnnotationRecord(r)
             for a in self._acoustic_columns:
@@ -65,7 +65,7 @@ class ClauseElement(object):
         from .attributes import CollectionNode
         n = self.attribute.node
         if isinstance(n, CollectionNode):
-            ns = n.nodes
+            ns = list(self.attribute.nodes)
         else:
             ns = [n]
         try:
@@ -254,7 +254,7 @@ class BaseQuery(object):
 
         kwargs['return'] = self.generate_return()
         cypher = self.query_template.format(**kwargs)
-
+        self.corpus.index_manager.record(self, cypher)
         return cypher
 
     def create_subset(self, label):
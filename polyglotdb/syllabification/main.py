@@ -1,6 +1,9 @@
+from uuid import uuid1
+
+from ..io.helper import make_type_id
 from .maxonset import split_nonsyllabic_maxonset, split_ons_coda_maxonset
 
-from .probabilistic import split_nonsyllabic_prob, split_ons_coda_prob
+from .probabilistic import split_nonsyllabic_prob, split_ons_coda_prob, norm_count_dict
 
 
 def syllabify(phones, syllabics, onsets, codas, algorithm='probabilistic'):
@@ -96,3 +99,348 @@ def syllabify(phones, syllabics, onsets, codas, algorithm='probabilistic'):
             'coda': cur_coda_id}
         syllables.append(row)
     return syllables
+
+
+class Syllabifier(object):
+    """
+    Syllabifies words from their phones, memoizing the syllable boundaries of each distinct phone sequence, the
+    splits of consonant clusters and the type ids of syllable labels
+
+    Corpora have few distinct words and consonant clusters relative to their number of tokens, so most lookups
+    are cache hits, which are counted (see :meth:`cache_info`).  Splits for the clusters expected from observed
+    codas and onsets can be computed ahead of time with :meth:`compile`.
+
+    Parameters
+    ----------
+    syllabics : set
+        Labels of syllabic segments
+    onsets : set or dict
+        Possible onsets for the maximum onset algorithm, or normalized onset counts for the
+        probabilistic algorithm
+    codas : dict, optional
+        Normalized coda counts for the probabilistic algorithm
+    algorithm : str
+        Either 'maxonset' or 'probabilistic', defaults to 'maxonset'
+    corpus_name : str
+        Name of the corpus, used for type ids
+    """
+    def __init__(self, syllabics, onsets, codas=None, algorithm='maxonset', corpus_name=''):
+        if algorithm not in ['maxonset', 'probabilistic']:
+            raise (NotImplementedError)
+        self.syllabics = syllabics
+        self.onsets = onsets
+        self.codas = codas
+        self.algorithm = algorithm
+        self.corpus_name = corpus_name
+        self.observed_codas = set()
+        self.syllable_spans_cache = {}
+        self.ons_coda_splits = {}
+        self.nonsyllabic_splits = {}
+        self.type_ids = {}
+        self.hits = {'words': 0, 'clusters': 0, 'nonsyllabic': 0, 'type_ids': 0}
+        self.misses = {'words': 0, 'clusters': 0, 'nonsyllabic': 0, 'type_ids': 0}
+
+    @classmethod
+    def from_counts(cls, syllabics, onset_counts, coda_counts=None, algorithm='maxonset', corpus_name='',
+                    compile=True):
+        """
+        Create a syllabifier from onset and coda counts (i.e., from
+        :meth:`~polyglotdb.corpus.SyllabicContext.find_onsets` and
+        :meth:`~polyglotdb.corpus.SyllabicContext.find_codas`)
+
+        Parameters
+        ----------
+        syllabics : set
+            Labels of syllabic segments
+        onset_counts : dict
+            Counts of onsets
+        coda_counts : dict, optional
+            Counts of codas, required for the probabilistic algorithm
+        algorithm : str
+            Either 'maxonset' or 'probabilistic', defaults to 'maxonset'
+        corpus_name : str
+            Name of the corpus, used for type ids
+        compile : bool
+            Flag for computing the splits of clusters made up of observed codas and onsets, defaults to True
+
+        Returns
+        -------
+        :class:`Syllabifier`
+        """
+        codas = None
+        if algorithm == 'probabilistic':
+            onsets = norm_count_dict(dict(onset_counts), onset=True)
+            codas = norm_count_dict(dict(coda_counts), onset=False)
+        elif algorithm == 'maxonset':
+            onsets = frozenset(onset_counts.keys())
+        else:
+            raise (NotImplementedError)
+        syllabifier = cls(set(syllabics), onsets, codas, algorithm=algorithm, corpus_name=corpus_name)
+        if coda_counts is not None:
+            syllabifier.observed_codas = set(coda_counts.keys())
+        if compile:
+            syllabifier.compile()
+        return syllabifier
+
+    def compile(self, clusters=None):
+        """
+        Compute the splits of consonant clusters ahead of time
+
+        Parameters
+        ----------
+        clusters : iterable, optional
+            Consonant clusters to split, defaults to every observed coda followed by every onset
+        """
+        if clusters is None:
+            onsets = [x for x in self.onsets if x is not None]
+            codas = self.observed_codas or {tuple()}
+            clusters = {tuple(c) + tuple(o) for c in codas for o in onsets}
+        for c in clusters:
+            c = tuple(c)
+            if c not in self.ons_coda_splits:
+                self.ons_coda_splits[c] = self._split_ons_coda(c)
+
+    def _split_ons_coda(self, string):
+        if self.algorithm == 'probabilistic':
+            return split_ons_coda_prob(string, self.onsets, self.codas)
+        return split_ons_coda_maxonset(string, self.onsets)
+
+    def split_ons_coda(self, string):
+        """Memoized split between the coda of one syllable and the onset of the next in a consonant cluster"""
+        key = tuple(string)
+        try:
+            split = self.ons_coda_splits[key]
+            self.hits['clusters'] += 1
+        except KeyError:
+            self.misses['clusters'] += 1
+            split = self.ons_coda_splits[key] = self._split_ons_coda(key)
+        return split
+
+    def split_nonsyllabic(self, string):
+        """Memoized split between the onset and coda of a word without syllabic segments"""
+        key = tuple(string)
+        try:
+            split = self.nonsyllabic_splits[key]
+            self.hits['nonsyllabic'] += 1
+        except KeyError:
+            self.misses['nonsyllabic'] += 1
+            if self.algorithm == 'probabilistic':
+                split = split_nonsyllabic_prob(key, self.onsets, self.codas)
+            else:
+                split = split_nonsyllabic_maxonset(key, self.onsets)
+            self.nonsyllabic_splits[key] = split
+        return split
+
+    def type_id(self, label):
+        """Memoized type id of a syllable label"""
+        try:
+            type_id = self.type_ids[label]
+            self.hits['type_ids'] += 1
+        except KeyError:
+            self.misses['type_ids'] += 1
+            type_id = self.type_ids[label] = make_type_id([label], self.corpus_name)
+        return type_id
+
+    def syllable_spans(self, phones):
+        """
+        Memoized syllable boundaries of a phone sequence
+
+        Parameters
+        ----------
+        phones : iterable
+            Phone labels
+
+        Returns
+        -------
+        list
+            Tuples of the indices of the first phone, the nucleus and the last phone of each syllable, empty
+            if there are no syllabic segments
+        """
+        key = tuple(phones)
+        try:
+            spans = self.syllable_spans_cache[key]
+            self.hits['words'] += 1
+            return spans
+        except KeyError:
+            self.misses['words'] += 1
+        vow_inds = [i for i, x in enumerate(key) if x in self.syllabics]
+        spans = []
+        for j, i in enumerate(vow_inds):
+            if j == 0:
+                begin_ind = 0
+            else:
+                prev_vowel_ind = vow_inds[j - 1]
+                split = self.split_ons_coda(key[prev_vowel_ind + 1:i])
+                if split is None:
+                    begin_ind = i
+                else:
+                    begin_ind = prev_vowel_ind + 1 + split
+            if j == len(vow_inds) - 1:
+                end_ind = len(key) - 1
+            else:
+                split = self.split_ons_coda(key[i + 1:vow_inds[j + 1]])
+                if split is None:
+                    end_ind = i
+                else:
+                    end_ind = i + split
+            spans.append((begin_ind, i, end_ind))
+        self.syllable_spans_cache[key] = spans
+        return spans
+
+    def syllabify_sequences(self, sequences):
+        """
+        Syllabify a batch of phone sequences
+
+        Parameters
+        ----------
+        sequences : list
+            Lists of phone labels
+
+        Returns
+        -------
+        list
+            Lists of syllable labels (phone labels joined by '.') for each sequence, where sequences without
+            syllabic segments are a single degenerate syllable
+        """
+        syllabified = []
+        for phones in sequences:
+            spans = self.syllable_spans(phones)
+            if not spans:
+                syllabified.append(['.'.join(phones)] if phones else [])
+                continue
+            syllabified.append(['.'.join(phones[b:e + 1]) for b, _, e in spans])
+        return syllabified
+
+    def cache_info(self):
+        """
+        Get the hits, misses, sizes and hit rates of the syllabifier's caches
+
+        Returns
+        -------
+        dict
+            Dictionaries with 'hits', 'misses', 'size' and 'hit_rate' keys for the 'words', 'clusters',
+            'nonsyllabic' and 'type_ids' caches
+        """
+        sizes = {'words': len(self.syllable_spans_cache), 'clusters': len(self.ons_coda_splits),
+                 'nonsyllabic': len(self.nonsyllabic_splits), 'type_ids': len(self.type_ids)}
+        info = {}
+        for k, size in sizes.items():
+            total = self.hits[k] + self.misses[k]
+            info[k] = {'hits': self.hits[k], 'misses': self.misses[k], 'size': size,
+                       'hit_rate': self.hits[k] / total if total else 0}
+        return info
+
+    def syllabify_words(self, words):
+        """
+        Syllabify a speaker's words in a discourse
+
+        Parameters
+        ----------
+        words : list
+            Dictionaries for words ordered by begin, with 'id', 'label', 'begin', 'end' and 'discourse' keys,
+            and 'phone_id', 'phones', 'begins' and 'ends' keys for lists of the words' phones' properties
+
+        Returns
+        -------
+        list
+            Rows for syllables, with vowel, onset and coda phone ids
+        list
+            Rows for degenerate syllables of words without syllabic segments, with the onset and coda phone
+            ids and the index of the split between them
+        """
+        syllables = []
+        non_syls = []
+        prev_id = None
+        cur_discourse = None
+        for w in words:
+            phones = w['phones']
+            phone_ids = w['phone_id']
+
+            if not phone_ids:
+                print('The word {} in file {} ({} to {}) did not have any phones.'.format(w['label'], w['discourse'],
+                                                                                         w['begin'], w['end']))
+                continue
+            phone_begins = w['begins']
+            phone_ends = w['ends']
+            if w['discourse'] != cur_discourse:
+                prev_id = None
+                cur_discourse = w['discourse']
+            spans = self.syllable_spans(phones)
+            if not spans:
+                cur_id = uuid1()
+                label = '.'.join(phones)
+                row = {'id': cur_id, 'prev_id': prev_id,
+                       'onset_id': phone_ids[0],
+                       'break': self.split_nonsyllabic(phones),
+                       'coda_id': phone_ids[-1],
+                       'begin': phone_begins[0],
+                       'label': label,
+                       'type_id': self.type_id(label),
+                       'end': phone_ends[-1]}
+                non_syls.append(row)
+                prev_id = cur_id
+                continue
+            for begin_ind, i, end_ind in spans:
+                cur_id = uuid1()
+                label = '.'.join(phones[begin_ind:end_ind + 1])
+                row = {'id': cur_id, 'prev_id': prev_id,
+                       'vowel_id': phone_ids[i],
+                       'onset_id': phone_ids[begin_ind] if begin_ind < i else None,
+                       'label': label,
+                       'type_id': self.type_id(label),
+                       'coda_id': phone_ids[end_ind] if end_ind > i else None,
+                       'begin': phone_begins[begin_ind], 'end': phone_ends[end_ind]}
+                syllables.append(row)
+                prev_id = cur_id
+        return syllables, non_syls
+
+
+def combine_cache_info(infos):
+    """
+    Combine the cache info of several syllabifiers, such as those of the workers of a process pool
+
+    Parameters
+    ----------
+    infos : iterable
+        Cache info from :meth:`Syllabifier.cache_info`
+
+    Returns
+    -------
+    dict
+        Cache info with the summed hits and misses of each cache, the largest size and the overall hit rate
+    """
+    combined = {}
+    for info in infos:
+        for k, v in info.items():
+            c = combined.setdefault(k, {'hits': 0, 'misses': 0, 'size': 0})
+            c['hits'] += v['hits']
+            c['misses'] += v['misses']
+            c['size'] = max(c['size'], v['size'])
+    for c in combined.values():
+        total = c['hits'] + c['misses']
+        c['hit_rate'] = c['hits'] / total if total else 0
+    return combined
+
+
+def format_cache_info(info):
+    """Summarize the hit rates of cache info for logging"""
+    return 'Syllabification cache hit rates: ' + ', '.join(
+        '{} {:.1%}'.format(k, info[k]['hit_rate']) for k in sorted(info))
+
+
+_worker_syllabifier = None
+
+
+def _initialize_worker(syllabifier):
+    global _worker_syllabifier
+    _worker_syllabifier = syllabifier
+
+
+def _syllabify_in_worker(speaker, words):
+    before = _worker_syllabifier.cache_info()
+    syllables, non_syls = _worker_syllabifier.syllabify_words(words)
+    after = _worker_syllabifier.cache_info()
+    # Counts for this task only, as the worker's syllabifier is reused across tasks
+    info = {k: {'hits': v['hits'] - before[k]['hits'], 'misses': v['misses'] - before[k]['misses'],
+                'size': v['size']} for k, v in after.items()}
+    return speaker, syllables, non_syls, info
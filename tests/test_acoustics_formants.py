@@ -7,6 +7,7 @@ from polyglotdb import CorpusContext
 from polyglotdb.acoustics.formants.base import analyze_formant_points
 from polyglotdb.acoustics.formants.refined import get_mean_SD, \
     analyze_formant_points_refinement, save_formant_point_data
+from polyglotdb.acoustics.formants.helper import get_mahalanobis, get_mahalanobis_batch
 
 acoustic = pytest.mark.skipif(
     pytest.config.getoption("--skipacoustics"),
@@ -53,6 +54,21 @@ def test_analyze_formants_vowel_segments(acoustic_utt_config, praat_path, result
         assert not g.has_formants(g.discourses[0])
 
 
+def test_analyze_formants_basic_burg(acoustic_utt_config, results_test_dir):
+    with CorpusContext(acoustic_utt_config) as g:
+        g.reset_acoustics()
+        g.analyze_formant_tracks(source='burg', multiprocessing=False)
+        assert (g.has_formants(g.discourses[0]))
+        q = g.query_graph(g.phone).filter(g.phone.label == 'ow')
+        q = q.columns(g.phone.begin, g.phone.end, g.phone.formants.track)
+        results = q.all()
+        output_path = os.path.join(results_test_dir, 'formant_burg_data.csv')
+        q.to_csv(output_path)
+        assert (len(results) > 0)
+        for r in results:
+            assert (len(r.track))
+
+
 @acoustic
 def test_analyze_formants_gendered_praat(acoustic_utt_config, praat_path, results_test_dir):
     with CorpusContext(acoustic_utt_config) as g:
@@ -214,6 +230,36 @@ def test_extract_formants_full(acoustic_utt_config, praat_path, export_test_dir)
             assert (r['F1'])
 
 
+def test_extract_formants_full_burg(acoustic_utt_config, export_test_dir):
+    output_path = os.path.join(export_test_dir, 'full_formant_vowel_burg_data.csv')
+    with CorpusContext(acoustic_utt_config) as g:
+        test_phone_label = 'ow'
+        g.encode_class(['ih', 'iy', 'ah', 'uw', 'er', 'ay', 'aa', 'ae', 'eh', 'ow'], 'vowel')
+        analyze_formant_points_refinement(g, 'vowel', source='burg', multiprocessing=False)
+        assert (g.hierarchy.has_token_property('phone', 'F1'))
+        q = g.query_graph(g.phone).filter(g.phone.label == test_phone_label)
+        q = q.columns(g.phone.begin, g.phone.end, g.phone.F1.column_name('F1'))
+        q.to_csv(output_path)
+        results = q.all()
+        assert (len(results) > 0)
+
+        for r in results:
+            assert (r['F1'])
+
+
+def test_mahalanobis_batch():
+    prototype = [500, 1500, 2500, 100, 150, 200]
+    inverse_covariance = [[1 / (i + 1) if i == j else 0 for j in range(6)] for i in range(6)]
+    observations = [[[450, 1600, 2400, 90, 160, 210], [520, 1400, 2550, 120, 140, 180]],
+                    [[500, 1500, 2500, 100, 150, 200], [700, 1200, 2600, 80, 100, 300]]]
+    distances = get_mahalanobis_batch(prototype, observations, inverse_covariance)
+    assert distances.shape == (2, 2)
+    for i, token in enumerate(observations):
+        for j, candidate in enumerate(token):
+            expected = get_mahalanobis(prototype, candidate, inverse_covariance)
+            assert abs(distances[i, j] - expected) < 1e-6
+
+
 def test_reset_refined_formants(acoustic_utt_config):
     with CorpusContext(acoustic_utt_config) as g:
         assert (g.hierarchy.has_token_property('phone', 'F1'))
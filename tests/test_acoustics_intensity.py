@@ -4,6 +4,9 @@ from decimal import Decimal
 import pytest
 
 from polyglotdb import CorpusContext
+from polyglotdb.acoustics.journal import AnalysisJournal
+from polyglotdb.acoustics.segments import generate_utterance_segments
+from polyglotdb.acoustics.utils import PADDING
 
 acoustic = pytest.mark.skipif(
     pytest.config.getoption("--skipacoustics"),
@@ -93,3 +96,48 @@ def test_analyze_intensity_basic_praat(acoustic_utt_config, praat_path, results_
 
         g.reset_intensity()
         assert not g.has_intensity(g.discourses[0])
+
+
+def test_analyze_intensity_native(acoustic_utt_config, results_test_dir):
+    with CorpusContext(acoustic_utt_config) as g:
+        g.analyze_intensity(source='native', multiprocessing=False)
+        assert (g.has_intensity(g.discourses[0]))
+        q = g.query_graph(g.phone).filter(g.phone.label == 'ow')
+        q = q.columns(g.phone.begin, g.phone.end, g.phone.intensity.track)
+        results = q.all()
+        output_path = os.path.join(results_test_dir, 'intensity_native_data.csv')
+        q.to_csv(output_path)
+        assert (len(results) > 0)
+        for r in results:
+            assert (len(r.track))
+
+        g.reset_intensity()
+        assert not g.has_intensity(g.discourses[0])
+
+
+@acoustic
+def test_analyze_pitch_with_intensity(acoustic_utt_config, praat_path):
+    with CorpusContext(acoustic_utt_config) as g:
+        g.reset_acoustics()
+        g.config.praat_path = praat_path
+        g.config.pitch_algorithm = 'base'
+        g.analyze_pitch(source='praat', multiprocessing=False, with_intensity=True)
+        assert (g.has_pitch(g.discourses[0]))
+        assert (g.has_intensity(g.discourses[0]))
+        assert 'intensity' in g.hierarchy.acoustics
+
+
+def test_analyze_intensity_incremental(acoustic_utt_config):
+    with CorpusContext(acoustic_utt_config) as g:
+        g.analyze_intensity(source='native')
+        segments = generate_utterance_segments(g, padding=PADDING, file_type='consonant')
+        journal = AnalysisJournal(g, 'intensity', {'source': 'native'})
+        pending, changed = journal.pending(segments)
+        assert len(pending) == 0
+        assert not changed
+        g.analyze_intensity(source='native', incremental=True)
+        assert g.has_intensity(g.discourses[0])
+
+        journal = AnalysisJournal(g, 'intensity', {'source': 'praat'})
+        pending, changed = journal.pending(segments)
+        assert len(pending) == len(segments)
@@ -0,0 +1,40 @@
+import numpy as np
+from scipy.signal import lfilter
+
+from polyglotdb.acoustics.formants.lpc import burg_lpc, lpc_formant_track
+
+
+def synthesize_vowel(formants, bandwidths, sr, f0=100, duration=0.5):
+    source = np.zeros(int(sr * duration))
+    source[::sr // f0] = 1
+    signal = source
+    for f, b in zip(formants, bandwidths):
+        radius = np.exp(-np.pi * b / sr)
+        theta = 2 * np.pi * f / sr
+        signal = lfilter([1], [1, -2 * radius * np.cos(theta), radius ** 2], signal)
+    return signal
+
+
+def test_burg_lpc():
+    coeffs = [1, -0.9, 0.5]
+    signal = lfilter([1], coeffs, np.random.RandomState(0).randn(20000))
+    estimated = burg_lpc(signal, 2)
+    assert estimated.shape == (1, 3)
+    assert np.allclose(estimated[0], coeffs, atol=0.05)
+
+    all_orders = burg_lpc(signal, 2, all_orders=True)
+    assert [x.shape for x in all_orders] == [(1, 1), (1, 2), (1, 3)]
+    assert np.allclose(all_orders[-1], estimated)
+
+
+def test_lpc_formant_track():
+    sr = 11000
+    formants = [700, 1220, 2600]
+    signal = synthesize_vowel(formants, [80, 90, 120], sr)
+    track = lpc_formant_track(signal, sr, 5, 5500, 0.01, 0.025)
+    assert len(track) > 0
+    times = sorted(track.keys())
+    assert all(0 <= t <= 0.5 for t in times)
+    for i, expected in enumerate(formants):
+        measured = np.median([track[t]['F{}'.format(i + 1)] for t in times])
+        assert abs(measured - expected) / expected < 0.1
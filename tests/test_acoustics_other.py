@@ -3,6 +3,7 @@ import os
 import pytest
 
 from polyglotdb import CorpusContext
+from polyglotdb.acoustics.other import parse_batch_output
 
 acoustic = pytest.mark.skipif(
     pytest.config.getoption("--skipacoustics"),
@@ -48,3 +49,36 @@ def test_analyze_script(acoustic_utt_config, praat_path, praatscript_test_dir):
         assert (len(results) > 0)
         for r in results:
             assert (r.values)
+
+
+def test_parse_batch_output():
+    text = '''#polyglotdb-segment a
+cog peak
+1.5 --undefined--
+#polyglotdb-segment b
+Warning: something
+cog peak
+2 3
+#polyglotdb-segment c
+#polyglotdb-segment
+'''
+    output = parse_batch_output(text)
+    assert output == {'a': {'cog': 1.5, 'peak': None}, 'b': {'cog': 2.0, 'peak': 3.0}}
+
+
+@acoustic
+def test_analyze_script_per_segment(acoustic_utt_config, praat_path, praatscript_test_dir):
+    with CorpusContext(acoustic_utt_config) as g:
+        g.config.praat_path = praat_path
+        g.encode_class(['s', 'z', 'sh', 'zh'], 'sibilant')
+        script_path = os.path.join(praatscript_test_dir, 'sibilant_jane.praat')
+        q = g.query_graph(g.phone).filter(g.phone.subset == 'sibilant')
+        q = q.columns(g.phone.id.column_name('id'), g.phone.cog.column_name('cog'))
+        g.analyze_script('sibilant', script_path, multiprocessing=False)
+        batched = {r['id']: r['cog'] for r in q.all()}
+        props = g.analyze_script('sibilant', script_path, multiprocessing=False, batch=False)
+        assert props == sorted(['cog', 'peak', 'slope', 'spread'])
+        results = q.all()
+        assert len(results) > 0
+        for r in results:
+            assert r['cog'] == batched[r['id']]
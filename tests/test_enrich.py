@@ -51,6 +51,27 @@ def test_relativized_enrichment_utterances(acoustic_config):
         assert (c.hierarchy.has_token_property("utterance", "baseline_duration"))
 
 
+def test_summary_statistics_enrichment(acoustic_config):
+    with CorpusContext(acoustic_config) as c:
+        results = c.encode_summary_statistics('phone', ['duration'], quantiles=[0.25, 0.75])
+        assert c.hierarchy.has_type_property('phone', 'mean_duration')
+        assert c.hierarchy.has_type_property('phone', 'q75_duration')
+        assert c.has_summary_statistics('phone', ['mean_duration', 'sd_duration'])
+        statement = '''MATCH (p:phone:{}) RETURN p.label AS label, avg(p.end - p.begin) AS mean'''.format(
+            c.cypher_safe_name)
+        means = {x['label']: x['mean'] for x in c.execute_cypher(statement)}
+        for label, statistics in results.items():
+            assert statistics['mean_duration'] == pytest.approx(means[label])
+            assert statistics['q25_duration'] <= statistics['median_duration'] <= statistics['q75_duration']
+            assert statistics['count_duration'] > 0
+
+        results = c.encode_summary_statistics('phone', ['duration'], ['mean', 'sd'], by_speaker=True)
+        assert c.has_summary_statistics('phone', ['mean_duration', 'sd_duration'], by_speaker=True)
+        assert all(len(k) == 2 for k in results.keys())
+        c.encode_relativized('phone', 'duration', by_speaker=True)
+        assert c.hierarchy.has_token_property('phone', 'relativized_duration_by_speaker')
+
+
 @pytest.mark.skip
 def dicthelper(dict1, dict2):
     # compare innermost dictionaries
@@ -0,0 +1,126 @@
+from polyglotdb.structure import Hierarchy
+from polyglotdb.query.annotations import GraphQuery
+from polyglotdb.query.annotations.attributes import AnnotationNode
+from polyglotdb.indexes import IndexManager, SchemaManager, query_index_candidates, constraint_key, index_key
+
+
+class FakeSession(object):
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def write_transaction(self, function, *args):
+        self.corpus.transactions.append([])
+        function(self, *args)
+
+    def run(self, statement, **parameters):
+        self.corpus.transactions[-1].append(statement)
+
+
+class FakeDriver(object):
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    def session(self):
+        return FakeSession(self.corpus)
+
+
+class IndexCorpus(object):
+    corpus_name = 'index_test'
+
+    def __init__(self, hierarchy):
+        self.hierarchy = hierarchy
+        self.index_manager = IndexManager(self)
+        self.schema_manager = SchemaManager(self)
+        self.graph_driver = FakeDriver(self)
+        self.statements = []
+        self.transactions = []
+
+    def execute_cypher(self, statement, **parameters):
+        self.statements.append(statement)
+        if statement.startswith('CALL db.indexes'):
+            return [{'description': 'INDEX ON :phone(begin)', 'type': 'node_label_property'},
+                    {'description': 'INDEX ON :phone(label, stress)', 'type': 'node_label_property'},
+                    {'description': 'INDEX ON :phone(id)', 'type': 'node_unique_property'}]
+        return []
+
+
+def make_hierarchy():
+    h = Hierarchy({'phone': 'word', 'word': None}, corpus_name='index_test')
+    h.token_properties = {'phone': {('id', str), ('label', str), ('begin', float), ('end', float), ('stress', str)},
+                          'word': {('id', str), ('label', str), ('begin', float), ('end', float)}}
+    h.type_properties = {'phone': {('label', str)},
+                         'word': {('label', str), ('transcription', str)}}
+    return h
+
+
+def test_query_index_candidates():
+    h = make_hierarchy()
+    corpus = IndexCorpus(h)
+    phone = AnnotationNode('phone', corpus=corpus.corpus_name, hierarchy=h)
+    q = GraphQuery(corpus, phone)
+    q = q.filter(phone.label == 'aa', phone.stress == '1', phone.word.transcription == 'k.ae.t',
+                 phone.end > phone.word.begin, phone.duration > 0.1)
+    q = q.order_by(phone.begin)
+    assert query_index_candidates(q) == {('phone', ('label',)), ('phone', ('stress',)),
+                                         ('phone', ('label', 'stress')), ('phone', ('begin',)),
+                                         ('word_type', ('transcription',))}
+
+
+def test_index_proposals():
+    h = make_hierarchy()
+    corpus = IndexCorpus(h)
+    phone = AnnotationNode('phone', corpus=corpus.corpus_name, hierarchy=h)
+    for label in ['aa', 'iy']:
+        q = GraphQuery(corpus, phone).filter(phone.label == label, phone.stress == '1',
+                                             phone.word.transcription == 'k.ae.t')
+        q.cypher()
+    assert len(corpus.index_manager.queries) == 1
+
+    proposals = {p.key: p for p in corpus.index_manager.propose(include_hierarchy=False)}
+    assert set(proposals) == {('phone', ('label',)), ('phone', ('stress',)), ('word_type', ('transcription',))}
+    assert proposals[('phone', ('label',))].count == 2
+
+    proposals = {p.key: p for p in corpus.index_manager.propose()}
+    assert ('phone', ('begin',)) not in proposals
+    assert proposals[('word', ('end',))].from_hierarchy
+
+    assert corpus.statements.count('CALL db.indexes()') == 1
+
+    created = corpus.index_manager.create([proposals[('word_type', ('transcription',))]])
+    assert len(created) == 1
+    assert corpus.statements[-1] == 'CREATE INDEX ON :word_type(transcription)'
+    # The schema manager looks up the indexes again rather than keeping a stale set
+    corpus.schema_manager.existing
+    assert corpus.statements.count('CALL db.indexes()') == 2
+
+
+def test_schema_manager():
+    h = make_hierarchy()
+    corpus = IndexCorpus(h)
+    schema = corpus.schema_manager.hierarchy_schema()
+    assert constraint_key('phone') in schema
+    assert constraint_key('word_type') in schema
+    assert index_key('phone', 'label_insensitive') in schema
+    assert index_key('word_type', 'transcription') in schema
+    assert index_key('phone', 'id') not in schema
+
+    created = corpus.schema_manager.ensure()
+    assert constraint_key('phone') not in created
+    assert index_key('phone', 'begin') not in created
+    assert len(corpus.transactions) == 1
+    assert len(corpus.transactions[0]) == len(created)
+    assert 'CREATE CONSTRAINT ON (node:word) ASSERT node.id IS UNIQUE' in corpus.transactions[0]
+    assert corpus.statements.count('CALL db.indexes()') == 1
+    assert corpus.statements[-1].startswith('CALL db.awaitIndexes')
+
+    assert corpus.schema_manager.ensure() == []
+    assert corpus.schema_manager.ensure([index_key('phone', 'stress')]) == []
+    assert corpus.schema_manager.ensure([index_key('syllable', 'begin')]) == [index_key('syllable', 'begin')]
+    assert corpus.transactions[-1] == ['CREATE INDEX ON :syllable(begin)']
+    assert corpus.statements.count('CALL db.indexes()') == 1
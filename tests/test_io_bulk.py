@@ -0,0 +1,66 @@
+import os
+import csv
+from types import SimpleNamespace
+
+from polyglotdb.config import CorpusConfig
+from polyglotdb.io.importer.temporary_files import TemporaryFileManager
+from polyglotdb.io.importer.bulk import (initialize_bulk_csvs, data_to_bulk_type_csvs, data_to_bulk_csvs,
+                                         node_path, relationship_path)
+
+
+def read_bulk_csv(path):
+    with open(path, 'r', newline='', encoding='utf8') as f:
+        return list(csv.DictReader(f))
+
+
+def test_bulk_csvs(graph_db, subannotation_data):
+    config = CorpusConfig('bulk_subannotations', **graph_db)
+    c = SimpleNamespace(config=config, corpus_name='bulk_subannotations')
+    c.temporary_files = TemporaryFileManager(c)
+    initialize_bulk_csvs(c, subannotation_data.token_headers, subannotation_data.hierarchy.subannotations,
+                         dict(subannotation_data.hierarchy.items()))
+    data_to_bulk_type_csvs(c, *subannotation_data.types(c.corpus_name))
+    data_to_bulk_csvs(c, subannotation_data)
+    c.temporary_files.close()
+
+    discourses = read_bulk_csv(node_path(c, 'Discourse'))
+    assert [x['name:ID(Discourse)'] for x in discourses] == ['test_sub']
+    assert discourses[0][':LABEL'] == 'Discourse;bulk_subannotations'
+
+    phone_types = read_bulk_csv(node_path(c, 'phone_type'))
+    assert len(phone_types) == len(set(x['label'] for x in phone_types))
+    assert all(x[':LABEL'] == 'phone_type;bulk_subannotations' for x in phone_types)
+
+    words = read_bulk_csv(node_path(c, 'word'))
+    phones = read_bulk_csv(node_path(c, 'phone'))
+    assert len(words) == 8
+    assert len(phones) == 21
+    assert phones[0]['label'] == 'k'
+    assert phones[0]['begin:float'] == '0.0'
+    assert phones[0][':LABEL'] == 'phone;bulk_subannotations;speech'
+    word_ids = set(x['id:ID(speech)'] for x in words)
+    phone_ids = set(x['id:ID(speech)'] for x in phones)
+    phone_type_ids = set(x['id:ID(phone_type)'] for x in phone_types)
+
+    is_a = read_bulk_csv(relationship_path(c, 'phone_is_a'))
+    assert len(is_a) == 21
+    assert all(x[':END_ID(phone_type)'] in phone_type_ids for x in is_a)
+
+    contained_by = read_bulk_csv(relationship_path(c, 'phone_contained_by'))
+    assert len(contained_by) == 21
+    assert all(x[':END_ID(speech)'] in word_ids for x in contained_by)
+    assert not os.path.exists(relationship_path(c, 'word_contained_by'))
+
+    precedes = read_bulk_csv(relationship_path(c, 'phone_precedes'))
+    assert len(precedes) == 20
+    assert all(x[':START_ID(speech)'] in phone_ids and x[':END_ID(speech)'] in phone_ids for x in precedes)
+
+    bursts = read_bulk_csv(node_path(c, 'phone_burst'))
+    assert len(bursts) == 3
+    assert bursts[0][':LABEL'] == 'burst;bulk_subannotations;speech'
+    annotates = read_bulk_csv(relationship_path(c, 'phone_burst_annotates'))
+    assert len(annotates) == 3
+    assert all(x[':END_ID(speech)'] in phone_ids for x in annotates)
+
+    c.temporary_files.cleanup()
+    assert not os.path.exists(node_path(c, 'phone'))
@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import pytest
+
+from polyglotdb.exceptions import AlphabetError
+from polyglotdb.io.importer.from_data import (coerce_value, use_unwind, import_lexicon_data, import_feature_data,
+                                              import_speaker_data)
+
+
+class EnrichmentCorpus(object):
+    corpus_name = 'enrichment_test'
+    cypher_safe_name = '`enrichment_test`'
+    word_name = 'word'
+    phone_name = 'phone'
+
+    def __init__(self):
+        self.config = SimpleNamespace(enrichment_unwind_threshold=3, enrichment_batch_size=2)
+        self.schema_manager = SimpleNamespace(ensure=lambda keys: self.schema.extend(keys))
+        self.statements = []
+        self.schema = []
+
+    def execute_cypher(self, statement, **parameters):
+        self.statements.append((statement, parameters['data']))
+        return []
+
+
+def test_coerce_value():
+    assert coerce_value('1.5', float) == 1.5
+    assert coerce_value('2', int) == 2
+    assert coerce_value(2.7, int) == 2
+    assert coerce_value('False', bool) is False
+    assert coerce_value('True', bool) is True
+    assert coerce_value(0, bool) is False
+    assert coerce_value(3, str) == '3'
+    assert coerce_value('', str) is None
+    assert coerce_value(None, float) is None
+    assert coerce_value('abc', float) is None
+    assert coerce_value('abc', int) is None
+    assert coerce_value([1], int) is None
+
+
+def test_import_enrichment_data():
+    c = EnrichmentCorpus()
+    data = {'Cat': {'frequency': '3', 'category': 'N'}, 'dog': {'frequency': 2}, 'a': {'frequency': 10}}
+    assert use_unwind(c, data)
+    assert not use_unwind(c, dict(data, the={'frequency': 1}))
+
+    import_lexicon_data(c, data, {'frequency': int})
+    assert len(c.statements) == 2
+    statement, rows = c.statements[0]
+    assert statement.startswith('UNWIND {data} AS row')
+    assert 'n.label_insensitive = row.key' in statement
+    assert rows == [{'key': 'cat', 'properties': {'frequency': 3}}, {'key': 'a', 'properties': {'frequency': 10}}]
+    assert c.statements[1][1] == [{'key': 'dog', 'properties': {'frequency': 2}}]
+    assert len(c.schema) == 1
+
+    c = EnrichmentCorpus()
+    import_speaker_data(c, {1: {'age': '30'}, 'b': {}}, {'age': float})
+    statement, rows = c.statements[0]
+    assert 'n.name = row.key' in statement
+    assert rows == [{'key': '1', 'properties': {'age': 30.0}}, {'key': 'b', 'properties': {'age': None}}]
+
+    with pytest.raises(AlphabetError):
+        import_feature_data(c, {}, {'voiced': bool})
@@ -1,6 +1,13 @@
+import os
+import shutil
+
 from polyglotdb.io.helper import (inspect_directory, find_wav_path,
                                   normalize_values_for_neo4j,
-                                  guess_type, text_to_lines)
+                                  guess_type, text_to_lines, TypeIdCache,
+                                  guess_textgrid_format)
+from polyglotdb.io.inspect import autodetect_parser, inspect_textgrid
+from polyglotdb.io.parsers import MfaParser, BuckeyeParser, TimitParser, TextgridParser
+from polyglotdb.io.types.standardized import PGAnnotation
 
 
 def test_inspect_directory(textgrid_test_dir, buckeye_test_dir, timit_test_dir):
@@ -14,6 +21,43 @@ def test_inspect_directory(textgrid_test_dir, buckeye_test_dir, timit_test_dir):
     assert (likely == 'timit')
 
 
+def test_autodetect_parser(textgrid_test_dir, mfa_test_dir, buckeye_test_dir, timit_test_dir, tmpdir):
+    assert isinstance(autodetect_parser(mfa_test_dir, num_jobs=2), MfaParser)
+    assert isinstance(autodetect_parser(buckeye_test_dir, num_jobs=1), BuckeyeParser)
+    assert isinstance(autodetect_parser(timit_test_dir), TimitParser)
+
+    path = os.path.join(textgrid_test_dir, 'pronunc_variants_corpus.TextGrid')
+    assert guess_textgrid_format(path) is None
+    for name in ['a', 'b', 'c']:
+        shutil.copy(path, os.path.join(str(tmpdir), name + '.TextGrid'))
+    parser = autodetect_parser(str(tmpdir), sample_size=2, num_jobs=2)
+    assert isinstance(parser, TextgridParser)
+    expected_parser = inspect_textgrid(str(tmpdir))
+    expected = [(a.name, a.linguistic_type) for a in expected_parser.annotation_types]
+    assert [(a.name, a.linguistic_type) for a in parser.annotation_types] == expected
+    assert parser.hierarchy.to_json() == expected_parser.hierarchy.to_json()
+
+
+def test_type_id_cache():
+    cache = TypeIdCache(max_size=2)
+    a = PGAnnotation('cat', 0, 1)
+    a.set_type_property('transcription', 'k.ae.t')
+    type_id = a.sha(corpus='test')
+    assert cache.get(['cat', 'k.ae.t'], 'test') == type_id
+    assert cache.get(('cat', 'k.ae.t'), 'test') == type_id
+    assert cache.get(['cat', 'k.ae.t'], 'other') != type_id
+    cache.get(['dog', 'd.aa.g'], 'test')
+    info = cache.cache_info()
+    assert info['hits'] == 1
+    assert info['misses'] == 3
+    assert info['evictions'] == 1
+    assert len(cache) == 2
+
+    cache = TypeIdCache()
+    type_ids = [cache.get([x], 'test') for x in [1, 1.0, True]]
+    assert len(set(type_ids)) == 3
+    assert TypeIdCache().get(['1.0'], 'test') == type_ids[1]
+
 def test_find_wav_path():
     pass
 
@@ -0,0 +1,92 @@
+import os
+import shutil
+from types import SimpleNamespace
+
+import pytest
+
+from polyglotdb.io import inspect_mfa
+from polyglotdb.io.importer.journal import ImportJournal, source_fingerprint
+from polyglotdb.corpus.importable import check_parsed_hierarchy
+from polyglotdb.exceptions import HierarchyError
+from polyglotdb.structure import Hierarchy
+
+from polyglotdb import CorpusContext
+
+
+def test_import_journal(mfa_test_dir, tmpdir):
+    directory = str(tmpdir)
+    source = os.path.join(mfa_test_dir, 'mfa_test.TextGrid')
+    first = os.path.join(directory, 'first.TextGrid')
+    second = os.path.join(directory, 'second.TextGrid')
+    shutil.copy(source, first)
+    shutil.copy(source, second)
+    c = SimpleNamespace(config=SimpleNamespace(base_dir=directory))
+
+    journal = ImportJournal(c)
+    assert journal.pending([first, second], []) == ([first, second], [])
+    journal.record('first', first)
+    assert journal.imported('first')['hash'] == source_fingerprint(source)['hash']
+
+    journal = ImportJournal(c)
+    assert journal.pending([first, second], ['first']) == ([second], [])
+    journal.record('second', second)
+
+    stat = os.stat(first)
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    assert journal.pending([first, second], ['first', 'second']) == ([], [])
+    assert journal.imported('first')['mtime'] == os.stat(first).st_mtime_ns
+
+    with open(second, 'a', encoding='utf8') as f:
+        f.write('\n')
+    assert journal.pending([first, second], ['first', 'second']) == ([second], ['second'])
+
+    os.remove(first)
+    assert journal.removed(directory, ['first', 'second']) == ['first']
+    journal.remove('first')
+    assert ImportJournal(c).imported('first') is None
+
+    journal.record_enrichment('utterances', {'min_pause_length': 0.5, 'min_utterance_length': 0})
+    assert ImportJournal(c).enrichment('utterances') == {'min_pause_length': 0.5, 'min_utterance_length': 0}
+    assert ImportJournal(c).enrichment('syllables') is None
+
+
+def test_check_parsed_hierarchy():
+    hierarchy = Hierarchy({'phone': 'word', 'word': 'utterance', 'utterance': None})
+    check_parsed_hierarchy(hierarchy, Hierarchy({'phone': 'word', 'word': None}))
+    with pytest.raises(HierarchyError):
+        check_parsed_hierarchy(hierarchy, Hierarchy({'phone': 'word', 'word': None, 'tone': 'word'}))
+
+
+def test_load_incremental(mfa_test_dir, graph_db, tmpdir):
+    directory = os.path.join(str(tmpdir), 'mfa')
+    os.makedirs(directory)
+    source = os.path.join(mfa_test_dir, 'mfa_test.TextGrid')
+    first = os.path.join(directory, 'first.TextGrid')
+    shutil.copy(source, first)
+    with CorpusContext('test_incremental', **graph_db) as c:
+        c.reset()
+        parser = inspect_mfa(directory)
+        c.load(parser, directory, incremental=True)
+        assert c.discourses == ['first']
+        c.encode_pauses('<SIL>')
+        c.encode_utterances(min_pause_length=0)
+        num_words = c.query_graph(c.word).count()
+        num_utterances = c.query_graph(c.utterance).count()
+
+        c.load(parser, directory, incremental=True)
+        assert c.query_graph(c.word).count() == num_words
+
+        shutil.copy(source, os.path.join(directory, 'second.TextGrid'))
+        c.load(parser, directory, incremental=True)
+        assert sorted(c.discourses) == ['first', 'second']
+        assert c.query_graph(c.word).count() == num_words * 2
+        q = c.query_graph(c.utterance).filter(c.utterance.discourse.name == 'second')
+        assert q.count() == num_utterances
+        q = c.query_graph(c.pause).filter(c.pause.discourse.name == 'second')
+        assert q.count() == c.query_graph(c.pause).filter(c.pause.discourse.name == 'first').count()
+
+        os.remove(first)
+        c.load(parser, directory, incremental=True)
+        assert c.discourses == ['second']
+        assert c.query_graph(c.word).count() == num_words
+        assert c.query_graph(c.utterance).count() == num_utterances
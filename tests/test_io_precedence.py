@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+from polyglotdb import CorpusContext
+from polyglotdb.config import CorpusConfig
+from polyglotdb.io.importer.from_csv import import_precedence_csvs
+from polyglotdb.io.importer.temporary_files import TemporaryFileManager
+
+
+class PrecedenceCorpus(object):
+    corpus_name = 'precedence_test'
+    cypher_safe_name = '`precedence_test`'
+    speakers = ['a', 'b']
+
+    def __init__(self, directory):
+        self.config = CorpusConfig(self.corpus_name, data_dir=directory)
+        self.temporary_files = TemporaryFileManager(SimpleNamespace(config=self.config,
+                                                                    corpus_name=self.corpus_name))
+        self.statements = []
+
+    def execute_cypher(self, statement, **parameters):
+        self.statements.append((statement, parameters['data']))
+        return []
+
+
+def test_import_precedence_csvs(tmpdir):
+    c = PrecedenceCorpus(str(tmpdir))
+    header = ['prev_id', 'id']
+    c.temporary_files.write('a_phone_precedes', header, [{'prev_id': str(i), 'id': str(i + 1)} for i in range(5)])
+    c.temporary_files.write('b_phone_precedes', header, [{'prev_id': '', 'id': '10'}, {'prev_id': '10', 'id': '11'}])
+
+    import_precedence_csvs(c, 'phone', ['phone_precedes'], batch_size=2)
+    assert all('CREATE (p)-[:precedes]->(t)' in statement for statement, _ in c.statements)
+    assert [len(rows) for _, rows in c.statements] == [2, 2, 1, 1]
+    assert c.statements[0][1] == [{'prev_id': '0', 'id': '1'}, {'prev_id': '1', 'id': '2'}]
+    assert c.statements[-1][1] == [{'prev_id': '10', 'id': '11'}]
+    assert not c.temporary_files.exists('a_phone_precedes')
+    assert not c.temporary_files.exists('b_phone_precedes')
+
+
+def test_precedence_import(timed_config):
+    with CorpusContext(timed_config) as g:
+        statement = '''MATCH (p:{type}:{corpus})-[:precedes]->(f:{type}:{corpus})
+        RETURN count(*) AS count, sum(CASE WHEN p.end <= f.begin THEN 1 ELSE 0 END) AS ordered'''
+        for annotation_type, count in [('phone', 20), ('word', 7), ('line', 2)]:
+            r = g.execute_cypher(statement.format(type=annotation_type, corpus=g.cypher_safe_name)).single()
+            assert r['count'] == count
+            assert r['ordered'] == count
@@ -0,0 +1,63 @@
+import os
+import csv
+import gzip
+from types import SimpleNamespace
+
+import pytest
+
+from polyglotdb.config import CorpusConfig
+from polyglotdb.io.importer.temporary_files import TemporaryFileManager
+
+
+def make_manager(directory, **kwargs):
+    config = CorpusConfig('temporary_files_test', data_dir=directory, **kwargs)
+    return TemporaryFileManager(SimpleNamespace(config=config, corpus_name=config.corpus_name), max_open_files=2)
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_temporary_files(tmpdir, compress):
+    manager = make_manager(str(tmpdir), compress_temporary_files=compress)
+    header = ['id', 'label']
+    manager.write('speaker_word', header, [])
+    for discourse in range(3):
+        for name in ['speaker_word', 'other_word', 'third_word']:
+            manager.writer(name, header).writerow({'id': discourse, 'label': 'cat'})
+    assert len(manager._handles) == 2
+
+    path = manager.path('speaker_word')
+    assert path.endswith('.csv.gz' if compress else '.csv')
+    assert manager.url('speaker_word').endswith(path.replace('\\', '/').replace(' ', '%20'))
+    assert 'speaker_word' not in manager._handles
+    if compress:
+        with gzip.open(path, 'rt', encoding='utf8') as f:
+            assert f.readline().strip() == 'id,label'
+    with manager.open('speaker_word', 'r') as f:
+        assert [x['id'] for x in csv.DictReader(f)] == ['0', '1', '2']
+    assert set(manager.disk_usage().keys()) == {os.path.basename(manager.path(x)) for x in
+                                                ['speaker_word', 'other_word', 'third_word']} | {'total'}
+
+    manager.remove('speaker_word')
+    assert not os.path.exists(path)
+    assert manager.bytes_removed > 0
+
+    manager.cleanup()
+    assert manager.disk_usage() == {'total': 0}
+
+
+def test_temporary_file_operations(tmpdir):
+    manager = make_manager(str(tmpdir))
+    with manager.operation():
+        manager.write('lexicon_import', ['label'], [{'label': 'cat'}])
+    assert not manager.exists('lexicon_import')
+
+    with pytest.raises(ValueError):
+        with manager.operation():
+            manager.writer('speaker_word', ['id']).writerow({'id': 1})
+            raise ValueError
+    assert manager.exists('speaker_word')
+    assert not manager._handles
+
+    manager = make_manager(str(tmpdir), keep_temporary_files=True)
+    manager.write('lexicon_import', ['label'], [{'label': 'cat'}])
+    manager.remove('lexicon_import')
+    assert manager.exists('lexicon_import')
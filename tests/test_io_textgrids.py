@@ -2,6 +2,7 @@ import pytest
 import os
 
 from polyglotdb.io import inspect_textgrid
+from polyglotdb.io.textgrid_reader import read_textgrid
 
 from polyglotdb.io.types.parsing import TobiTier, OrthographyTier
 
@@ -17,6 +18,56 @@ def test_tobi(textgrid_test_dir):
     assert (isinstance(parser.annotation_types[1], OrthographyTier))
 
 
+SHORT_TEXTGRID = '''File type = "ooTextFile short"
+"TextGrid"
+
+0
+1
+<exists>
+2
+"IntervalTier"
+"word"
+0
+1
+2
+0
+0.5
+"a ""quoted"" word"
+0.5
+1
+"b"
+"TextTier"
+"tone"
+0
+1
+1
+0.25
+"H*"
+'''
+
+
+@pytest.mark.parametrize('encoding', ['utf-8', 'utf-16'])
+def test_read_short_textgrid(tmpdir, encoding):
+    path = os.path.join(str(tmpdir), 'short_{}.TextGrid'.format(encoding))
+    with open(path, 'w', encoding=encoding) as f:
+        f.write(SHORT_TEXTGRID)
+    tg = read_textgrid(path)
+    assert tg.max_time == 1
+    assert [x.name for x in tg.tiers] == ['word', 'tone']
+    assert list(tg.tiers[0]) == [('a "quoted" word', 0, 0.5), ('b', 0.5, 1)]
+    assert not tg.tiers[1].is_interval
+    assert list(tg.tiers[1]) == [('H*', 0.25)]
+    assert tg.labels == ['a "quoted" word', 'b', 'H*']
+
+
+def test_read_long_textgrid(textgrid_test_dir):
+    tg = read_textgrid(os.path.join(textgrid_test_dir, 'phone_word.TextGrid'))
+    phones = tg.get_tier('phone')
+    assert list(phones) == [('', 0, 0.25), ('a', 0.25, 0.5), ('b', 0.5, 0.75), ('', 0.75, 1)]
+    assert phones.unique_labels() == {'', 'a', 'b'}
+    assert phones.average_duration() == 0.25
+
+
 @pytest.mark.xfail
 def test_guess_tiers(textgrid_test_dir):
     tg = load_textgrid(os.path.join(textgrid_test_dir, 'phone_word.TextGrid'))
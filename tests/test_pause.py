@@ -1,4 +1,5 @@
 from polyglotdb import CorpusContext
+from polyglotdb.corpus.pause import pause_adjacency
 
 
 def test_encode_pause(acoustic_config):
@@ -84,6 +85,51 @@ def test_query_with_pause(acoustic_config):
         assert (abs(results[0]['following_pause_duration'] - 1.152438) < 0.001)
 
 
+def test_pause_adjacency():
+    words = [{'id': 'a', 'begin': 0, 'end': 0.5, 'pause': True},
+             {'id': 'b', 'begin': 0.5, 'end': 1, 'pause': False},
+             {'id': 'c', 'begin': 1, 'end': 1.5, 'pause': False},
+             {'id': 'd', 'begin': 1.5, 'end': 1.75, 'pause': True},
+             {'id': 'e', 'begin': 1.75, 'end': 2.5, 'pause': True},
+             {'id': 'f', 'begin': 2.5, 'end': 3, 'pause': False},
+             {'id': 'g', 'begin': 3, 'end': 3.5, 'pause': True}]
+    rows = pause_adjacency(words)
+    assert [x['id'] for x in rows] == ['b', 'c', 'f']
+    assert rows[0]['previous_speech_id'] is None
+    assert rows[0]['previous_pause_duration'] is None
+    assert rows[0]['following_speech_id'] == 'c'
+    assert rows[0]['following_pause_duration'] is None
+    assert rows[1]['following_speech_id'] == 'f'
+    assert rows[1]['following_pause_duration'] == 1
+    assert rows[2]['previous_speech_id'] == 'c'
+    assert rows[2]['previous_pause_duration'] == 1
+    assert rows[2]['following_speech_id'] is None
+    assert rows[2]['following_pause_duration'] is None
+
+
+def test_query_stored_pause_duration(acoustic_config):
+    with CorpusContext(acoustic_config) as g:
+        g.encode_pauses(['sil', 'uh', 'um'])
+        assert g.hierarchy.has_token_property('word', 'following_pause_duration')
+        q = g.query_graph(g.word).filter(g.word.following_pause.duration > 1)
+        q = q.columns(g.word.label.column_name('label'),
+                      g.word.following_pause.duration.column_name('following_pause_duration'))
+        print(q.cypher())
+        assert 'precedes_pause' not in q.cypher()
+        results = q.all()
+        assert 'cares' in [x['label'] for x in results]
+        for r in results:
+            assert r['following_pause_duration'] > 1
+
+        q = g.query_graph(g.word).filter(g.word.label == 'cares')
+        q = q.columns(g.word.following_pause_duration.column_name('following_pause_duration'))
+        results = q.all()
+        assert (abs(results[0]['following_pause_duration'] - 1.035027) < 0.001)
+
+        g.reset_pauses()
+        assert not g.hierarchy.has_token_property('word', 'following_pause_duration')
+
+
 def test_pause_both_sides(acoustic_config):
     with CorpusContext(acoustic_config) as g:
         g.encode_pauses(['sil', 'uh', 'um'])
@@ -17,6 +17,32 @@ def test_position_query(timed_config):
             assert (results[i]['position'] == expected[i])
 
 
+def test_ordinal_queries(timed_config):
+    with CorpusContext(timed_config) as g:
+        g.encode_ordinals()
+        try:
+            assert g.hierarchy.has_token_property('phone', 'ordinal_in_word')
+            q = g.query_graph(g.word).filter(g.word.label == 'cute')
+            q = q.filter(g.word.previous.previous.label == 'cats')
+            q = q.columns(g.word.previous.label.column_name('previous_label'),
+                          g.word.following.label.column_name('following_label'))
+            print(q.cypher())
+            assert 'precedes' not in q.cypher()
+            results = q.all()
+            assert (len(results) == 1)
+            assert (results[0]['previous_label'] == 'are')
+
+            q = g.query_graph(g.phone).filter(g.phone.label == 'k')
+            q = q.columns(g.phone.word.phone.position.column_name('position'))
+            q = q.order_by(g.phone.word.begin)
+            print(q.cypher())
+            results = q.all()
+            assert [x['position'] for x in results] == [1, 1]
+        finally:
+            g.reset_ordinals()
+        assert not g.hierarchy.has_token_property('word', 'sequence_ordinal')
+
+
 def test_initial_query(acoustic_config):
     with CorpusContext(acoustic_config) as g:
         q = g.query_graph(g.word).filter(g.word.label == 'this')
@@ -0,0 +1,27 @@
+from polyglotdb.profiling import normalize_statement, QueryProfiler
+
+
+def test_normalize_statement():
+    first = normalize_statement('''MATCH (n:phone:`acoustic`) WHERE n.label = 'aa' AND n.begin > 1.5 RETURN n''')
+    second = normalize_statement('''MATCH (n:phone:`acoustic`)
+                                    WHERE n.label = "iy" AND n.begin > 20 RETURN n''')
+    assert first == second == 'MATCH (n:phone:`acoustic`) WHERE n.label = ? AND n.begin > ? RETURN n'
+    assert normalize_statement("MATCH (n) WHERE n.id IN ['a', 'b'] RETURN n") == 'MATCH (n) WHERE n.id IN [?] RETURN n'
+
+
+def test_query_profiler():
+    profiler = QueryProfiler(profile_db_hits=True, slow_threshold=0.5)
+    profiler.record('cypher', "MATCH (n) WHERE n.label = 'aa' RETURN n", 0.2, 5, 10)
+    profiler.record('cypher', "MATCH (n) WHERE n.label = 'iy' RETURN n", 0.7, 3, 4)
+    profiler.record('influxql', 'SELECT "F0" FROM "pitch"', 0.1, 100)
+    summary = profiler.summary()
+    assert len(summary) == 2
+    assert summary[0].count == 2
+    assert summary[0].rows == 8
+    assert summary[0].db_hits == 14
+    assert summary[0].max_time == 0.7
+    assert len(profiler.slow_queries) == 1
+    assert profiler.summary(sort_by='rows')[0].kind == 'influxql'
+
+    assert profiler.profile_statement('MATCH (n) RETURN n') == 'PROFILE MATCH (n) RETURN n'
+    assert profiler.profile_statement('CREATE INDEX ON :phone(label)') == 'CREATE INDEX ON :phone(label)'
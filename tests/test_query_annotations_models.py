@@ -181,3 +181,21 @@ def test_delete(subannotation_config):
         model.load(id)
 
         assert (model.voicing_during_closure == [])
+
+
+def test_batched_relations(acoustic_config):
+    with CorpusContext(acoustic_config) as c:
+        q = c.query_graph(c.word).order_by(c.word.begin)
+        results = q.all()
+        batched = [(r.label, r.following.label if r.following is not None else None,
+                    [x.label for x in r.phone], r.speaker.name, r.discourse.name) for r in results]
+        assert all(r._page is not None for r in results)
+
+        for r, expected in zip(results, batched):
+            model = LinguisticAnnotation(c)
+            model.load(r.id)
+            following = model.following.label if model.following is not None else None
+            assert expected == (model.label, following, [x.label for x in model.phone], model.speaker.name,
+                                model.discourse.name)
+        assert batched[1][0] == 'this'
+        assert batched[1][2] == ['dh', 'ih', 's']
@@ -276,6 +276,19 @@ def test_baseline_syllable(acoustic_config):
         print(res)
 
 
+def test_baseline_syllable_by_speaker(acoustic_config):
+    with CorpusContext(acoustic_config) as g:
+        res = g.baseline_duration('syllable')
+        by_speaker = g.baseline_duration('syllable', by_speaker=True)
+        assert g.hierarchy.has_token_property('syllable', 'baseline_duration')
+        assert g.hierarchy.has_token_property('syllable', 'baseline_duration_by_speaker')
+        assert len(by_speaker) == 1
+        for k, v in list(by_speaker.values())[0].items():
+            assert v == approx(res[k], 1e-3)
+        q = g.query_graph(g.syllable).columns(g.syllable.baseline_duration.column_name('baseline_duration'))
+        assert all(x['baseline_duration'] is not None for x in q.all())
+
+
 @pytest.mark.xfail
 def test_average_speech_rate(acoustic_config):
     with CorpusContext(acoustic_config) as g:
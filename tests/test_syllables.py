@@ -2,7 +2,8 @@ from polyglotdb import CorpusContext
 
 from polyglotdb.syllabification.probabilistic import split_ons_coda_prob, split_nonsyllabic_prob, norm_count_dict
 from polyglotdb.syllabification.maxonset import split_ons_coda_maxonset, split_nonsyllabic_maxonset
-from polyglotdb.syllabification.main import syllabify
+from polyglotdb.syllabification.main import (syllabify, Syllabifier, combine_cache_info, _initialize_worker,
+                                              _syllabify_in_worker)
 
 
 def test_find_onsets(timed_config):
@@ -85,6 +86,82 @@ def test_syllabify():
                 assert (v2 == test[i][k2])
 
 
+def test_syllabifier():
+    syllabifier = Syllabifier({'ay', 'iy', 'ow', 'er'}, {('n',), ('v',), ('w',), ('l',), ()}, corpus_name='test')
+    words = [{'id': 'w1', 'label': 'naive', 'begin': 0, 'end': 4, 'discourse': 'd',
+              'phone_id': ['p1', 'p2', 'p3', 'p4'], 'phones': ['n', 'ay', 'iy', 'v'],
+              'begins': [0, 1, 2, 3], 'ends': [1, 2, 3, 4]},
+             {'id': 'w2', 'label': 'shh', 'begin': 4, 'end': 5, 'discourse': 'd',
+              'phone_id': ['p5'], 'phones': ['sh'], 'begins': [4], 'ends': [5]},
+             {'id': 'w3', 'label': 'lower', 'begin': 5, 'end': 9, 'discourse': 'd',
+              'phone_id': ['p6', 'p7', 'p8', 'p9'], 'phones': ['l', 'ow', 'w', 'er'],
+              'begins': [5, 6, 7, 8], 'ends': [6, 7, 8, 9]}]
+    syllables, non_syls = syllabifier.syllabify_words(words)
+    assert [x['label'] for x in syllables] == ['n.ay', 'iy.v', 'l.ow', 'w.er']
+    assert [(x['begin'], x['end']) for x in syllables] == [(0, 2), (2, 4), (5, 7), (7, 9)]
+    assert syllables[1]['prev_id'] == syllables[0]['id']
+    assert syllables[1]['onset_id'] is None
+    assert syllables[1]['coda_id'] == 'p4'
+    assert len(non_syls) == 1
+    assert non_syls[0]['label'] == 'sh'
+    assert non_syls[0]['prev_id'] == syllables[1]['id']
+    assert syllables[2]['prev_id'] == non_syls[0]['id']
+    assert ('w',) in syllabifier.ons_coda_splits
+    assert set(syllabifier.type_ids.keys()) == {'n.ay', 'iy.v', 'sh', 'l.ow', 'w.er'}
+
+
+def test_compiled_syllabifier():
+    onset_counts = {('n',): 3, ('v',): 1, ('w',): 2, ('l',): 2, tuple(): 4}
+    coda_counts = {('v',): 2, tuple(): 5}
+    syllabifier = Syllabifier.from_counts({'ay', 'iy', 'ow', 'er'}, onset_counts, coda_counts)
+    assert syllabifier.ons_coda_splits[('v', 'w')] == 1
+    assert syllabifier.syllabify_sequences([['n', 'ay', 'iy', 'v'], ['l', 'ow', 'w', 'er'],
+                                            ['n', 'ay', 'iy', 'v'], ['sh']]) == [['n.ay', 'iy.v'],
+                                                                                   ['l.ow', 'w.er'],
+                                                                                   ['n.ay', 'iy.v'],
+                                                                                   ['sh']]
+    info = syllabifier.cache_info()
+    assert info['words']['hits'] == 1
+    assert info['words']['misses'] == 3
+    assert info['words']['hit_rate'] == 0.25
+    assert info['clusters']['misses'] == 0
+
+    _initialize_worker(syllabifier)
+    words = [{'id': 'w1', 'label': 'lower', 'begin': 0, 'end': 4, 'discourse': 'd',
+              'phone_id': ['p1', 'p2', 'p3', 'p4'], 'phones': ['l', 'ow', 'w', 'er'], 'begins': [0, 1, 2, 3],
+              'ends': [1, 2, 3, 4]}]
+    worker_infos = [_syllabify_in_worker('s', words)[3] for _ in range(2)]
+    assert worker_infos[0]['words']['hits'] == 1
+    assert worker_infos[1]['words']['hits'] == 1
+    combined = combine_cache_info([info] + worker_infos)
+    assert combined['words']['hits'] == 3
+    assert combined['words']['misses'] == 3
+    assert combined['words']['hit_rate'] == 0.5
+
+    syllabifier = Syllabifier.from_counts({'ay', 'iy', 'ow', 'er'}, onset_counts, coda_counts,
+                                          algorithm='probabilistic')
+    assert syllabifier.syllabify_sequences([['l', 'ow', 'w', 'er']]) == [['l.ow', 'w.er']]
+
+
+def test_encode_syllables_multiprocessing(acoustic_config):
+    syllabics = ['ae', 'aa', 'uw', 'ay', 'eh', 'ih', 'aw', 'ey', 'iy',
+                 'uh', 'ah', 'ao', 'er', 'ow']
+    with CorpusContext(acoustic_config) as c:
+        c.encode_syllabic_segments(syllabics)
+        c.encode_syllables()
+        q = c.query_graph(c.syllable).order_by(c.syllable.begin)
+        expected = [(x.label, x.begin) for x in q.all()]
+
+        c.encode_syllables(multiprocessing=True, num_jobs=2)
+        assert c.has_syllables
+        q = c.query_graph(c.syllable).order_by(c.syllable.begin)
+        assert [(x.label, x.begin) for x in q.all()] == expected
+
+        statement = '''MATCH (n:syllable:{}) WHERE n.prev_id IS NOT NULL RETURN count(n) AS c'''.format(
+            c.cypher_safe_name)
+        assert c.execute_cypher(statement).single()['c'] == 0
+
+
 def test_encode_syllables_acoustic(acoustic_config):
     syllabics = ['ae', 'aa', 'uw', 'ay', 'eh', 'ih', 'aw', 'ey', 'iy',
                  'uh', 'ah', 'ao', 'er', 'ow']
@@ -5,6 +5,7 @@ import pytest
 from polyglotdb import CorpusContext
 from polyglotdb.io import inspect_textgrid
 from polyglotdb.query import Count
+from polyglotdb.corpus.utterance import segment_utterances
 
 
 def test_get_utterances(acoustic_config):
@@ -158,6 +159,50 @@ def test_no_speech_utterance(graph_db, textgrid_test_dir):
         assert (len(res) == 0)
 
 
+def test_segment_utterances():
+    words = [{'id': 'a', 'begin': 0, 'end': 1, 'pause': False},
+             {'id': 'b', 'begin': 1, 'end': 2, 'pause': True},
+             {'id': 'c', 'begin': 2, 'end': 3, 'pause': False},
+             {'id': 'd', 'begin': 3, 'end': 3.2, 'pause': True},
+             {'id': 'e', 'begin': 3.2, 'end': 3.5, 'pause': False},
+             {'id': 'f', 'begin': 3.5, 'end': 5, 'pause': True},
+             {'id': 'g', 'begin': 5, 'end': 6, 'pause': False},
+             {'id': 'h', 'begin': 6, 'end': 7, 'pause': False}]
+    utterances = segment_utterances(words, min_pause_length=0.5)
+    assert [(x[0]['id'], x[1]['id']) for x in utterances] == [('a', 'a'), ('c', 'e'), ('g', 'h')]
+
+    utterances = segment_utterances(words, min_pause_length=0.1)
+    assert [(x[0]['id'], x[1]['id']) for x in utterances] == [('a', 'a'), ('c', 'c'), ('e', 'e'), ('g', 'h')]
+
+    utterances = segment_utterances(words, min_pause_length=0.1, min_utterance_length=0.5)
+    assert [(x[0]['id'], x[1]['id']) for x in utterances] == [('a', 'a'), ('c', 'e'), ('g', 'h')]
+
+    utterances = segment_utterances(words, min_pause_length=0.5, min_utterance_length=1.5)
+    assert [(x[0]['id'], x[1]['id']) for x in utterances] == [('a', 'e'), ('g', 'h')]
+
+    assert segment_utterances([{'id': 'a', 'begin': 0, 'end': 1, 'pause': True}]) == []
+
+
+def test_encode_utterances_linear_scan(acoustic_config):
+    with CorpusContext(acoustic_config) as g:
+        g.encode_pauses(['sil', 'um'])
+        g.encode_utterances(min_pause_length=0, linear_scan=True, num_jobs=2)
+        q = g.query_graph(g.utterance)
+        q = q.columns(g.utterance.begin.column_name('begin'),
+                      g.utterance.end.column_name('end'))
+        q = q.order_by(g.utterance.begin)
+        results = q.all()
+        expected_utterances = [(1.059223, 7.541484), (8.576511, 11.807666),
+                               (12.167356, 13.898228), (14.509726, 17.207370),
+                               (18.359807, 19.434003), (19.599747, 21.017242),
+                               (21.208318, 22.331874),
+                               (24.174348, 24.706663), (24.980290, 25.251656)]
+        assert (len(results) == len(expected_utterances))
+        for i, r in enumerate(results):
+            assert (round(r['begin'], 3) == round(expected_utterances[i][0], 3))
+            assert (round(r['end'], 3) == round(expected_utterances[i][1], 3))
+
+
 def test_encode_utterances(acoustic_config):
     with CorpusContext(acoustic_config) as g:
         g.encode_pauses(['sil', 'um'])